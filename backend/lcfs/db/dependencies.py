@@ -1,4 +1,4 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 import structlog
 import re
 import sqlalchemy as sa
@@ -8,7 +8,11 @@ import os
 from fastapi import Request
 from sqlalchemy import text
 from sqlalchemy.engine import make_url
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.pool import NullPool
 
 from lcfs.db.base import current_user_var, get_current_user
@@ -82,6 +86,16 @@ async def get_async_db_session(
         # Session is automatically closed by 'async with AsyncSession(...)'
 
 
+def get_db_session_factory(request: Request) -> Optional[async_sessionmaker]:
+    """
+    Session factory for work that needs its own sessions alongside the
+    request session, e.g. loading independent data concurrently.
+
+    Returns None when the application has not set one up (tests, scripts).
+    """
+    return getattr(request.app.state, "db_session_factory", None)
+
+
 def create_role_if_not_exists():
     """Create database role and user if they don't exist"""
     try:
@@ -0,0 +1,31 @@
+"""Index audit_log by table for export data versions.
+
+Export jobs key their stored artifacts on the latest audit_log_id of the
+tables an export reads, which needs a max() per table_name.
+
+Revision ID: c2d4e6f8a0b1
+Revises: b8f9c0d1e2a3
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c2d4e6f8a0b1"
+down_revision = "b8f9c0d1e2a3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_audit_log_table_name_audit_log_id",
+        "audit_log",
+        ["table_name", "audit_log_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_audit_log_table_name_audit_log_id", table_name="audit_log")
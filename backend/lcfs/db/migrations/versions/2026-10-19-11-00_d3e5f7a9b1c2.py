@@ -0,0 +1,161 @@
+"""Speed up audit_trigger_func and record non-numeric primary keys.
+
+Every audited table shares this trigger function, so the change applies to
+all of them, not only the tables the FSE importer writes.
+
+The trigger looked up each table's primary key through information_schema on
+every row, which cost about 5 ms per inserted row and dominated bulk inserts:
+a 3,000-row FSE import spent most of its time here. It now reads the key from
+pg_index for the trigger's relation. Composite keys still record a single
+column, now always the first one rather than whichever the old LIMIT 1
+lookup returned.
+
+It also selected the key column straight into the JSONB row_id, which only
+parses for numeric keys. Inserts into tables keyed by text, such as
+final_supply_equipment_reg_number, failed, including the importer's upsert
+of reserved registration numbers. The key is now converted with to_jsonb;
+numeric keys are stored as before. The audit_log rows and their columns are
+otherwise unchanged.
+
+Revision ID: d3e5f7a9b1c2
+Revises: c2d4e6f8a0b1
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d3e5f7a9b1c2"
+down_revision = "c2d4e6f8a0b1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION audit_trigger_func()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            v_operation TEXT;
+            v_table_name TEXT := TG_TABLE_NAME;
+            v_row_id JSONB;
+            v_old_values JSONB;
+            v_new_values JSONB;
+            v_delta JSONB;
+            v_pk_col TEXT;
+        BEGIN
+            SELECT a.attname INTO v_pk_col
+            FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            WHERE i.indrelid = TG_RELID AND i.indisprimary;
+
+            IF (TG_OP = 'INSERT') THEN
+                v_operation := 'INSERT';
+                v_new_values := to_jsonb(NEW);
+                EXECUTE format('SELECT to_jsonb(($1).%I)', v_pk_col) INTO v_row_id USING NEW;
+            ELSIF (TG_OP = 'UPDATE') THEN
+                v_operation := 'UPDATE';
+                v_old_values := to_jsonb(OLD);
+                v_new_values := to_jsonb(NEW);
+                v_delta := generate_json_delta(v_old_values, v_new_values);
+                EXECUTE format('SELECT to_jsonb(($1).%I)', v_pk_col) INTO v_row_id USING NEW;
+            ELSIF (TG_OP = 'DELETE') THEN
+                v_operation := 'DELETE';
+                v_old_values := to_jsonb(OLD);
+                EXECUTE format('SELECT to_jsonb(($1).%I)', v_pk_col) INTO v_row_id USING OLD;
+            END IF;
+
+            INSERT INTO audit_log (
+                create_user,
+                update_user,
+                table_name,
+                operation,
+                row_id,
+                delta,
+                old_values,
+                new_values
+            )
+            VALUES (
+                current_setting('app.username', true),
+                current_setting('app.username', true),
+                v_table_name,
+                v_operation,
+                v_row_id,
+                v_delta,
+                v_old_values,
+                v_new_values
+            );
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION audit_trigger_func()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            v_operation TEXT;
+            v_table_name TEXT := TG_TABLE_NAME;
+            v_row_id JSONB;
+            v_old_values JSONB;
+            v_new_values JSONB;
+            v_delta JSONB;
+            v_pk_col TEXT;
+        BEGIN
+            SELECT c.column_name INTO v_pk_col
+            FROM information_schema.table_constraints tc
+            JOIN information_schema.constraint_column_usage AS ccu USING (constraint_schema, constraint_name)
+            JOIN information_schema.columns AS c ON c.table_schema = tc.constraint_schema
+              AND tc.table_name = c.table_name AND ccu.column_name = c.column_name
+            WHERE tc.constraint_type = 'PRIMARY KEY' AND tc.table_name = TG_TABLE_NAME
+            LIMIT 1;
+
+            IF (TG_OP = 'INSERT') THEN
+                v_operation := 'INSERT';
+                v_new_values := to_jsonb(NEW);
+                EXECUTE format('SELECT ($1).%I', v_pk_col) INTO v_row_id USING NEW;
+            ELSIF (TG_OP = 'UPDATE') THEN
+                v_operation := 'UPDATE';
+                v_old_values := to_jsonb(OLD);
+                v_new_values := to_jsonb(NEW);
+                v_delta := generate_json_delta(v_old_values, v_new_values);
+                EXECUTE format('SELECT ($1).%I', v_pk_col) INTO v_row_id USING NEW;
+            ELSIF (TG_OP = 'DELETE') THEN
+                v_operation := 'DELETE';
+                v_old_values := to_jsonb(OLD);
+                EXECUTE format('SELECT ($1).%I', v_pk_col) INTO v_row_id USING OLD;
+            END IF;
+
+            INSERT INTO audit_log (
+                create_user,
+                update_user,
+                table_name,
+                operation,
+                row_id,
+                delta,
+                old_values,
+                new_values
+            )
+            VALUES (
+                current_setting('app.username', true),
+                current_setting('app.username', true),
+                v_table_name,
+                v_operation,
+                v_row_id,
+                v_delta,
+                v_old_values,
+                v_new_values
+            );
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
@@ -0,0 +1,163 @@
+"""Add background_job table for the durable job queue.
+
+Imports and exports used to run inside whichever API process received the
+request and were lost if that process restarted. They are now queued in
+this table and claimed by job workers with FOR UPDATE SKIP LOCKED.
+
+Revision ID: e4f6a8b0c2d3
+Revises: d3e5f7a9b1c2
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "e4f6a8b0c2d3"
+down_revision = "d3e5f7a9b1c2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "background_job",
+        sa.Column(
+            "background_job_id", sa.Integer(), autoincrement=True, nullable=False
+        ),
+        sa.Column(
+            "job_id",
+            sa.String(length=36),
+            nullable=False,
+            comment="Public job identifier, also the key of the job's progress in Redis",
+        ),
+        sa.Column(
+            "job_type",
+            sa.String(length=100),
+            nullable=False,
+            comment="Registered job handler",
+        ),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "QUEUED",
+                "RUNNING",
+                "SUCCEEDED",
+                "FAILED",
+                name="background_job_status_enum",
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "priority",
+            sa.Integer(),
+            nullable=False,
+            comment="Higher priorities run first",
+        ),
+        sa.Column(
+            "organization_id",
+            sa.Integer(),
+            nullable=True,
+            comment="Organization the job works on, for per-organization limits",
+        ),
+        sa.Column(
+            "user_profile_id",
+            sa.Integer(),
+            nullable=True,
+            comment="User who requested the job and owns its status",
+        ),
+        sa.Column(
+            "idempotency_key",
+            sa.String(length=255),
+            nullable=True,
+            comment="Requests with the same key reuse the queued or running job",
+        ),
+        sa.Column(
+            "payload",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            comment="Job arguments",
+        ),
+        sa.Column(
+            "input_file",
+            sa.LargeBinary(),
+            nullable=True,
+            comment="Uploaded file the job reads, cleared when the job ends",
+        ),
+        sa.Column("input_file_name", sa.String(length=500), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "run_after",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="The job is not claimed before this time, e.g. while backing off",
+        ),
+        sa.Column(
+            "locked_by",
+            sa.String(length=200),
+            nullable=True,
+            comment="Worker running the job",
+        ),
+        sa.Column(
+            "locked_until",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Lease expiry; jobs whose worker stops renewing it are retried",
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("result", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column(
+            "create_date",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+            comment="Date and time (UTC) when the physical record was created in the database.",
+        ),
+        sa.Column(
+            "update_date",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+            comment="Date and time (UTC) when the physical record was updated in the database. It will be the same as the create_date until the record is first updated after creation.",
+        ),
+        sa.Column(
+            "create_user",
+            sa.String(),
+            nullable=True,
+            comment="The user who created this record in the database.",
+        ),
+        sa.Column(
+            "update_user",
+            sa.String(),
+            nullable=True,
+            comment="The user who last updated this record in the database.",
+        ),
+        sa.PrimaryKeyConstraint("background_job_id", name=op.f("pk_background_job")),
+        sa.UniqueConstraint("job_id", name=op.f("uq_background_job_job_id")),
+        comment="Durable queue of background jobs run by the job workers",
+    )
+    op.create_index(
+        "ix_background_job_claim",
+        "background_job",
+        ["status", sa.text("priority DESC"), "run_after"],
+    )
+    op.create_index(
+        "uq_background_job_idempotency_key",
+        "background_job",
+        ["job_type", "idempotency_key"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_background_job_idempotency_key", table_name="background_job")
+    op.drop_index("ix_background_job_claim", table_name="background_job")
+    op.drop_table("background_job")
+    sa.Enum(name="background_job_status_enum").drop(op.get_bind(), checkfirst=True)
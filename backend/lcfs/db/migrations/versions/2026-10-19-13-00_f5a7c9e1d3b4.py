@@ -0,0 +1,36 @@
+"""Add concurrency_class to scheduled_tasks.
+
+The dynamic scheduler runs due tasks in parallel. Tasks in the same
+concurrency class share that class's limit on how many run at once.
+
+Revision ID: f5a7c9e1d3b4
+Revises: e4f6a8b0c2d3
+Create Date: 2026-10-19 13:00:00.000000
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f5a7c9e1d3b4"
+down_revision = "e4f6a8b0c2d3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "scheduled_tasks",
+        sa.Column(
+            "concurrency_class",
+            sa.String(length=50),
+            server_default="default",
+            nullable=False,
+            comment="Tasks in the same class share a limit on how many run at once",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("scheduled_tasks", "concurrency_class")
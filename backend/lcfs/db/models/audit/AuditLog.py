@@ -30,6 +30,7 @@ class AuditLog(BaseModel, Auditable):
         Index("idx_audit_log_create_date", "create_date"),
         Index("idx_audit_log_create_user", "create_user"),
         Index("idx_audit_log_delta", "delta", postgresql_using="gin"),
+        Index("idx_audit_log_table_name_audit_log_id", "table_name", "audit_log_id"),
         {"comment": "Track changes in defined tables."},
     )
 
@@ -0,0 +1,116 @@
+import enum
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred
+
+from lcfs.db.base import Auditable, BaseModel
+
+
+class BackgroundJobStatusEnum(enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class BackgroundJob(BaseModel, Auditable):
+    """
+    A unit of background work, such as a spreadsheet import or an export,
+    waiting in or taken from the durable job queue.
+    """
+
+    __tablename__ = "background_job"
+    __table_args__ = (
+        Index(
+            "ix_background_job_claim",
+            "status",
+            text("priority DESC"),
+            "run_after",
+        ),
+        Index(
+            "uq_background_job_idempotency_key",
+            "job_type",
+            "idempotency_key",
+            unique=True,
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+        {"comment": "Durable queue of background jobs run by the job workers"},
+    )
+
+    background_job_id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(
+        String(36),
+        nullable=False,
+        unique=True,
+        comment="Public job identifier, also the key of the job's progress in Redis",
+    )
+    job_type = Column(String(100), nullable=False, comment="Registered job handler")
+    status = Column(
+        Enum(
+            BackgroundJobStatusEnum,
+            name="background_job_status_enum",
+            create_type=True,
+        ),
+        nullable=False,
+        default=BackgroundJobStatusEnum.QUEUED,
+    )
+    priority = Column(
+        Integer, nullable=False, default=0, comment="Higher priorities run first"
+    )
+    organization_id = Column(
+        Integer,
+        nullable=True,
+        comment="Organization the job works on, for per-organization limits",
+    )
+    user_profile_id = Column(
+        Integer, nullable=True, comment="User who requested the job and owns its status"
+    )
+    idempotency_key = Column(
+        String(255),
+        nullable=True,
+        comment="Requests with the same key reuse the queued or running job",
+    )
+    payload = Column(JSONB, nullable=False, default=dict, comment="Job arguments")
+    input_file = deferred(
+        Column(
+            LargeBinary,
+            nullable=True,
+            comment="Uploaded file the job reads, cleared when the job ends",
+        )
+    )
+    input_file_name = Column(String(500), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=1)
+    run_after = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("now()"),
+        comment="The job is not claimed before this time, e.g. while backing off",
+    )
+    locked_by = Column(String(200), nullable=True, comment="Worker running the job")
+    locked_until = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Lease expiry; jobs whose worker stops renewing it are retried",
+    )
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(JSONB, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<BackgroundJob(job_id={self.job_id}, job_type={self.job_type}, "
+            f"status={self.status})>"
+        )
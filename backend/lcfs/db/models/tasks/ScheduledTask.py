@@ -45,3 +45,10 @@ class ScheduledTask(BaseModel, Auditable):
     parameters = Column(JSON, nullable=True)  # Task-specific parameters
     max_retries = Column(Integer, default=3)
     timeout_seconds = Column(Integer, default=300)  # 5 minutes default
+    concurrency_class = Column(
+        String(50),
+        default="default",
+        server_default="default",
+        nullable=False,
+        comment="Tasks in the same class share a limit on how many run at once",
+    )
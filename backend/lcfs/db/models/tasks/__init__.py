@@ -1,7 +1,10 @@
+from .BackgroundJob import BackgroundJob, BackgroundJobStatusEnum
 from .ScheduledTask import ScheduledTask
 from .TaskExecution import TaskExecution
 
 __all__ = [
+    "BackgroundJob",
+    "BackgroundJobStatusEnum",
     "ScheduledTask",
     "TaskExecution",
 ]
@@ -5,8 +5,19 @@ Dynamic Task Scheduler for OpenShift CronJob
 This script:
 1. Connects to the database to fetch enabled tasks
 2. Checks which tasks should run based on their cron schedule
-3. Executes the tasks and updates their status
+3. Executes the tasks in parallel and updates their status
 4. Handles errors and logging appropriately
+5. Pushes metrics for the cycle and each task to a Prometheus Pushgateway
+
+Due tasks run at once up to SCHEDULER_MAX_CONCURRENCY. A task's
+concurrency_class can limit it further: SCHEDULER_CONCURRENCY_CLASSES sets
+how many tasks of each class may run at once, e.g. "reports=1,email=2".
+Classes without a limit share only the overall one.
+
+Each task runs under a Postgres advisory lock, so when several replicas
+run the scheduler, a task runs in only one of them. A replica that gets
+the lock after another has finished the task sees the new last_run and
+skips it.
 
 Usage:
     python dynamic_scheduler.py [--dry-run] [--verbose]
@@ -19,8 +30,9 @@ import logging
 import sys
 import os
 import traceback
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
@@ -41,7 +53,8 @@ tasks_dir.mkdir(exist_ok=True)
 
 try:
     from croniter import croniter
-    from sqlalchemy import create_engine, select
+    from prometheus_client import CollectorRegistry, Gauge, push_to_gateway
+    from sqlalchemy import create_engine, select, text
     from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
     from sqlalchemy.orm import sessionmaker
 
@@ -72,20 +85,113 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Advisory locks of scheduled tasks are keyed on this and the task ID
+TASK_LOCK_CLASS_ID = 0x4C435354
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TIMEOUT_SECONDS = 300  # 5 minutes
+METRICS_JOB_NAME = "lcfs_dynamic_scheduler"
+
+
+def parse_concurrency_classes(value: Optional[str]) -> Dict[str, int]:
+    """
+    Parse concurrency class limits written as "name=limit,name=limit".
+    Malformed entries are logged and ignored.
+    """
+    limits = {}
+    for entry in (value or "").split(","):
+        if not entry.strip():
+            continue
+        name, _, limit = entry.partition("=")
+        try:
+            limits[name.strip()] = max(int(limit), 1)
+        except ValueError:
+            logger.warning(f"Ignoring invalid concurrency class limit '{entry}'")
+    return limits
+
+
+def push_metrics(gateway_url: str, summary: Dict[str, Any]):
+    """
+    Push the cycle's metrics to a Prometheus Pushgateway. Each task's
+    metrics are pushed in a group of their own, so they are replaced only
+    by that task's next run, whichever replica runs it.
+    """
+    for task_name, task_metrics in summary["task_metrics"].items():
+        registry = CollectorRegistry()
+        Gauge(
+            "scheduler_task_lag_seconds",
+            "Seconds the task started after its scheduled next_run",
+            registry=registry,
+        ).set(task_metrics["lag_seconds"] or 0)
+        Gauge(
+            "scheduler_task_duration_seconds",
+            "Seconds the task's last run took",
+            registry=registry,
+        ).set(task_metrics["duration_seconds"])
+        Gauge(
+            "scheduler_task_success",
+            "Whether the task's last run succeeded",
+            registry=registry,
+        ).set(1 if task_metrics["success"] else 0)
+        Gauge(
+            "scheduler_task_last_run_timestamp_seconds",
+            "When the task last ran",
+            registry=registry,
+        ).set(task_metrics["start_time"].timestamp())
+        push_to_gateway(
+            gateway_url,
+            job=METRICS_JOB_NAME,
+            grouping_key={"task": task_name},
+            registry=registry,
+        )
+
+    registry = CollectorRegistry()
+    Gauge(
+        "scheduler_cycle_duration_seconds",
+        "Seconds the last scheduler cycle took",
+        registry=registry,
+    ).set(summary["cycle_duration_seconds"])
+    tasks = Gauge(
+        "scheduler_cycle_tasks",
+        "Tasks in the last scheduler cycle by outcome",
+        ["outcome"],
+        registry=registry,
+    )
+    for outcome in ("checked", "executed", "succeeded", "failed", "skipped"):
+        tasks.labels(outcome=outcome).set(summary[f"tasks_{outcome}"])
+    Gauge(
+        "scheduler_cycle_last_timestamp_seconds",
+        "When the last scheduler cycle started",
+        registry=registry,
+    ).set(summary["cycle_start"].timestamp())
+    push_to_gateway(gateway_url, job=METRICS_JOB_NAME, registry=registry)
+
 
 class DynamicTaskScheduler:
     """
     Dynamic task scheduler that loads configuration from database
     """
 
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, max_concurrency: Optional[int] = None):
         self.dry_run = dry_run
         self.execution_start = datetime.now(timezone.utc)
         self.worker_id = self._get_worker_id()
         self.app_version = os.getenv("APP_VERSION", "unknown")
+        self.max_concurrency = max(
+            max_concurrency
+            or int(os.getenv("SCHEDULER_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+            1,
+        )
+        self.concurrency_classes = parse_concurrency_classes(
+            os.getenv("SCHEDULER_CONCURRENCY_CLASSES")
+        )
+        self.metrics_gateway_url = os.getenv("SCHEDULER_PUSHGATEWAY_URL")
 
-        # Initialize async database engine and session factory
-        self.engine = create_async_engine(str(settings.db_url))
+        # Initialize async database engine and session factory. A running
+        # task holds one connection for its lock and one for its session.
+        self.engine = create_async_engine(
+            str(settings.db_url), pool_size=self.max_concurrency * 2 + 1
+        )
         self.session = sessionmaker(
             bind=self.engine,
             class_=AsyncSession,
@@ -96,6 +202,9 @@ class DynamicTaskScheduler:
         logger.info(f"Worker ID: {self.worker_id}")
         logger.info(f"App Version: {self.app_version}")
         logger.info(f"Dry Run: {self.dry_run}")
+        logger.info(f"Max Concurrency: {self.max_concurrency}")
+        if self.concurrency_classes:
+            logger.info(f"Concurrency Classes: {self.concurrency_classes}")
 
     def _get_worker_id(self) -> str:
         """Get unique identifier for this worker instance"""
@@ -550,9 +659,11 @@ class DynamicTaskScheduler:
 
     async def execute_tasks_with_timeout(self, task: ScheduledTask) -> Dict[str, Any]:
         """
-        Execute task with timeout handling
+        Execute task with timeout handling. A task that runs in a thread is
+        not interrupted by the timeout, but the scheduler stops waiting.
         """
-        timeout_seconds = task.timeout_seconds or 300  # Default 5 minutes
+        timeout_seconds = task.timeout_seconds or DEFAULT_TIMEOUT_SECONDS
+        start_time = datetime.now(timezone.utc)
 
         try:
             result = await asyncio.wait_for(
@@ -565,13 +676,100 @@ class DynamicTaskScheduler:
             )
             return {
                 "success": False,
-                "start_time": datetime.now(timezone.utc),
+                "start_time": start_time,
                 "end_time": datetime.now(timezone.utc),
                 "duration_seconds": timeout_seconds,
                 "result_message": "",
                 "error_message": f"Task timed out after {timeout_seconds} seconds",
             }
 
+    @asynccontextmanager
+    async def task_lock(self, task: ScheduledTask):
+        """
+        Try to take the task's advisory lock for as long as the context is
+        open, and yield whether it was taken. The lock is held on a
+        connection of its own, and is released if that connection drops.
+        """
+        params = {"class_id": TASK_LOCK_CLASS_ID, "task_id": task.id}
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await conn.scalar(
+                text("SELECT pg_try_advisory_lock(:class_id, :task_id)"), params
+            )
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    try:
+                        await conn.execute(
+                            text("SELECT pg_advisory_unlock(:class_id, :task_id)"),
+                            params,
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"Could not release the lock of task '{task.name}': {e}"
+                        )
+
+    async def is_still_due(self, task: ScheduledTask) -> bool:
+        """
+        Check the task is still due against its latest last_run, which
+        another replica may have updated since the tasks were fetched
+        """
+        async with self.session() as session:
+            fresh_task = await session.get(ScheduledTask, task.id)
+            if fresh_task is None or not fresh_task.is_enabled:
+                return False
+            task.last_run = fresh_task.last_run
+            task.next_run = fresh_task.next_run
+        return self.should_execute_task(task, datetime.now(timezone.utc))
+
+    async def run_task(
+        self,
+        task: ScheduledTask,
+        limit: asyncio.Semaphore,
+        class_limits: Dict[str, asyncio.Semaphore],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run a due task once a slot in its concurrency class and overall is
+        free. Returns the execution result, or None if the task was skipped.
+        """
+        class_limit = class_limits.get(task.concurrency_class or "default")
+        if class_limit is None:
+            async with limit:
+                return await self.run_locked_task(task)
+        async with class_limit, limit:
+            return await self.run_locked_task(task)
+
+    async def run_locked_task(self, task: ScheduledTask) -> Optional[Dict[str, Any]]:
+        """
+        Run a due task under its lock and update its status, or return None
+        if another scheduler is running it or already has.
+        """
+        async with self.task_lock(task) as acquired:
+            if not acquired:
+                logger.info(
+                    f"Skipping task '{task.name}': another scheduler is running it"
+                )
+                return None
+            if not await self.is_still_due(task):
+                logger.info(
+                    f"Skipping task '{task.name}': another scheduler already ran it"
+                )
+                return None
+
+            scheduled_run = task.next_run
+            logger.info(f"Executing task '{task.name}'")
+            execution_result = await self.execute_tasks_with_timeout(task)
+            if scheduled_run is not None:
+                execution_result["lag_seconds"] = max(
+                    (execution_result["start_time"] - scheduled_run).total_seconds(),
+                    0,
+                )
+
+            # Update task status and commit while the lock is held
+            await self.update_task_status(task, execution_result)
+            return execution_result
+
     async def run_scheduler_cycle(self) -> Dict[str, Any]:
         """
         Main scheduler cycle - check and execute all pending tasks
@@ -583,7 +781,11 @@ class DynamicTaskScheduler:
             "tasks_executed": 0,
             "tasks_succeeded": 0,
             "tasks_failed": 0,
+            "tasks_skipped": 0,
             "errors": [],
+            # Lag behind next_run, duration and outcome of each task run
+            "task_metrics": {},
+            "cycle_duration_seconds": 0,
         }
 
         # Initialize tasks_to_execute to empty list to avoid UnboundLocalError
@@ -619,46 +821,61 @@ class DynamicTaskScheduler:
                 f"Executing {len(tasks_to_execute)} tasks: {[t.name for t in tasks_to_execute]}"
             )
 
-            # Execute tasks sequentially to ensure proper database updates
-            for i, task in enumerate(tasks_to_execute, 1):
-                try:
-                    logger.info(
-                        f"Executing task {i}/{len(tasks_to_execute)}: '{task.name}'"
-                    )
-
-                    # Execute task with timeout
-                    execution_result = await self.execute_tasks_with_timeout(task)
-
-                    # Update task status and commit before proceeding
-                    await self.update_task_status(task, execution_result)
+            limit = asyncio.Semaphore(self.max_concurrency)
+            class_limits = {
+                name: asyncio.Semaphore(class_limit)
+                for name, class_limit in self.concurrency_classes.items()
+            }
+            results = await asyncio.gather(
+                *(
+                    self.run_task(task, limit, class_limits)
+                    for task in tasks_to_execute
+                ),
+                return_exceptions=True,
+            )
 
-                    # Update summary
-                    if execution_result["success"]:
-                        summary["tasks_succeeded"] += 1
-                        logger.info(
-                            f"✓ Task {i}/{len(tasks_to_execute)} '{task.name}' completed successfully"
-                        )
-                    else:
-                        summary["tasks_failed"] += 1
-                        summary["errors"].append(
-                            f"Task '{task.name}': {execution_result['error_message']}"
-                        )
-                        logger.error(
-                            f"✗ Task {i}/{len(tasks_to_execute)} '{task.name}' failed: {execution_result['error_message']}"
+            for task, execution_result in zip(tasks_to_execute, results):
+                if isinstance(execution_result, BaseException):
+                    error_msg = f"Unexpected error executing task '{task.name}': {str(execution_result)}"
+                    logger.error(error_msg)
+                    logger.error(
+                        "".join(
+                            traceback.format_exception(
+                                type(execution_result),
+                                execution_result,
+                                execution_result.__traceback__,
+                            )
                         )
-
-                    # Add a small delay between tasks to ensure database consistency
-                    if i < len(tasks_to_execute):  # Don't delay after the last task
-                        await asyncio.sleep(0.1)
-
-                except Exception as e:
-                    error_msg = (
-                        f"Unexpected error executing task '{task.name}': {str(e)}"
                     )
-                    logger.error(error_msg)
-                    logger.error(traceback.format_exc())
                     summary["tasks_failed"] += 1
                     summary["errors"].append(error_msg)
+                    continue
+                if execution_result is None:
+                    summary["tasks_skipped"] += 1
+                    continue
+
+                summary["task_metrics"][task.name] = {
+                    "success": execution_result["success"],
+                    "start_time": execution_result["start_time"],
+                    "lag_seconds": execution_result.get("lag_seconds"),
+                    "duration_seconds": (
+                        execution_result["end_time"] - execution_result["start_time"]
+                    ).total_seconds(),
+                }
+                if execution_result["success"]:
+                    summary["tasks_succeeded"] += 1
+                    logger.info(f"✓ Task '{task.name}' completed successfully")
+                else:
+                    summary["tasks_failed"] += 1
+                    summary["errors"].append(
+                        f"Task '{task.name}': {execution_result['error_message']}"
+                    )
+                    logger.error(
+                        f"✗ Task '{task.name}' failed: {execution_result['error_message']}"
+                    )
+
+            # Tasks another replica ran were due but not executed here
+            summary["tasks_executed"] -= summary["tasks_skipped"]
 
         except Exception as e:
             error_msg = f"Critical error in scheduler cycle: {str(e)}"
@@ -669,6 +886,7 @@ class DynamicTaskScheduler:
         finally:
             cycle_end = datetime.now(timezone.utc)
             cycle_duration = (cycle_end - cycle_start).total_seconds()
+            summary["cycle_duration_seconds"] = cycle_duration
 
             logger.info("=" * 60)
             logger.info(f"Scheduler cycle completed in {cycle_duration:.2f} seconds")
@@ -676,6 +894,13 @@ class DynamicTaskScheduler:
             logger.info(f"Tasks executed: {summary['tasks_executed']}")
             logger.info(f"Tasks succeeded: {summary['tasks_succeeded']}")
             logger.info(f"Tasks failed: {summary['tasks_failed']}")
+            logger.info(f"Tasks skipped: {summary['tasks_skipped']}")
+            for task_name, task_metrics in summary["task_metrics"].items():
+                lag = task_metrics["lag_seconds"]
+                logger.info(
+                    f"  - '{task_name}': took {task_metrics['duration_seconds']:.2f}s, "
+                    f"lag {'N/A' if lag is None else f'{lag:.2f}s'}"
+                )
 
             if summary["errors"]:
                 logger.error("Errors encountered:")
@@ -705,6 +930,14 @@ class DynamicTaskScheduler:
 
             logger.info("=" * 60)
 
+            if self.metrics_gateway_url and not self.dry_run:
+                try:
+                    await asyncio.to_thread(
+                        push_metrics, self.metrics_gateway_url, summary
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not push scheduler metrics: {e}")
+
         return summary
 
     async def cleanup(self):
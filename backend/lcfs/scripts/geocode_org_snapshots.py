@@ -1,20 +1,22 @@
 """
-Organization Snapshot Geocoding Script
+Organization Snapshot Geocoding Backfill
 
-This script extracts addresses from compliance_report_organization_snapshot,
-geocodes them using the BC Geocoder service, and outputs SQL UPDATE statements.
+Geocodes organization snapshots that have no coordinates and writes the
+coordinates to the database. Snapshots with identical addresses are
+geocoded once. Addresses are processed in batches, each committed as it
+finishes, so the script can be stopped and run again and will pick up the
+snapshots that still have no coordinates.
+
+New snapshots are geocoded by a background job when they are created; this
+script covers snapshots created before that, and any the job could not
+place.
 
 Usage:
     cd backend
-    poetry run python -m lcfs.scripts.geocode_org_snapshots
-
-Output:
-    Creates: org_snapshot_coordinates.sql (in current directory)
-
-Then run the SQL manually:
-    psql -h localhost -U lcfs -d lcfs -f org_snapshot_coordinates.sql
+    poetry run python -m lcfs.scripts.geocode_org_snapshots [--batch-size 100]
 """
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -23,128 +25,127 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import redis.asyncio as redis
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.engine import make_url
 
 from lcfs.settings import settings
 from lcfs.services.geocoder.client import BCGeocoderService
 
-
-async def get_unique_addresses(session: AsyncSession) -> list[dict]:
-    """Extract unique addresses from organization snapshots.
-
-    Priority for geocoding:
-    1. records_address - Required to be in BC where records are maintained
-    2. service_address - BC postal address for service
-    3. head_office_address - Can be international, last resort
-    """
-    query = text("""
-        SELECT DISTINCT ON (COALESCE(records_address, service_address, head_office_address))
-            organization_snapshot_id,
-            records_address,
-            service_address,
-            head_office_address,
-            name,
-            COALESCE(records_address, service_address, head_office_address) as primary_address
-        FROM compliance_report_organization_snapshot
-        WHERE (records_address IS NOT NULL AND records_address != '')
-           OR (service_address IS NOT NULL AND service_address != '')
-           OR (head_office_address IS NOT NULL AND head_office_address != '')
-        AND latitude IS NULL
-        ORDER BY COALESCE(records_address, service_address, head_office_address), organization_snapshot_id
-    """)
-
-    result = await session.execute(query)
-    rows = result.fetchall()
-
-    return [
-        {
-            "organization_snapshot_id": row[0],
-            "records_address": row[1],
-            "service_address": row[2],
-            "head_office_address": row[3],
-            "name": row[4],
-            "primary_address": row[5],
-        }
-        for row in rows
-    ]
+# The API packages load in the same order as in the server, which their
+# circular imports rely on
+import lcfs.web.application  # noqa: F401
+from lcfs.web.api.organization_snapshot.repo import OrganizationSnapshotRepository
+from lcfs.web.api.organization_snapshot.services import ADDRESS_FIELDS
 
 
 async def geocode_addresses(
     geocoder: BCGeocoderService,
-    addresses: list[dict]
+    addresses: list[dict],
+    concurrency: int = 10,
 ) -> list[dict]:
     """Geocode addresses and return results with coordinates.
 
-    Tries addresses in priority order:
+    Tries addresses in priority order, each pass geocoding the snapshots the
+    previous passes could not place as one concurrent batch:
     1. records_address (BC location where records are maintained)
     2. service_address (BC postal address)
     3. head_office_address (can be international)
     """
     results = []
-    total = len(addresses)
-
-    for i, addr_info in enumerate(addresses, 1):
-        primary_addr = addr_info["primary_address"]
-        records_addr = addr_info.get("records_address")
-        service_addr = addr_info.get("service_address")
-        head_office_addr = addr_info.get("head_office_address")
-
-        print(f"[{i}/{total}] Geocoding: {primary_addr[:60]}...")
-
-        result = None
-
-        # Try addresses in priority order
-        for addr, addr_type in [
-            (records_addr, "records_address"),
-            (service_addr, "service_address"),
-            (head_office_addr, "head_office_address"),
-        ]:
-            if addr:
-                result = await geocoder.forward_geocode(addr, use_fallback=True)
-                if result.success:
-                    print(f"  -> Success via {addr_type}")
-                    break
-                else:
-                    print(f"  -> {addr_type} failed, trying next...")
-
-        if result and result.success and result.address:
-            # Only store ID and coordinates - no identifying information
-            results.append({
-                "organization_snapshot_id": addr_info["organization_snapshot_id"],
-                "latitude": result.address.latitude,
-                "longitude": result.address.longitude,
-            })
-        else:
-            print(f"  -> All addresses failed")
+    remaining = addresses
+
+    for addr_type in ADDRESS_FIELDS:
+        pending = [addr_info for addr_info in remaining if addr_info.get(addr_type)]
+        remaining = [
+            addr_info for addr_info in remaining if not addr_info.get(addr_type)
+        ]
+        if not pending:
+            continue
+
+        print(f"\nGeocoding {len(pending)} snapshots by {addr_type}...")
+        geocoded = geocoder.iter_batch_geocode(
+            [addr_info[addr_type] for addr_info in pending], batch_size=concurrency
+        )
+        i = 0
+        async for result in geocoded:
+            addr_info = pending[i]
+            i += 1
+            if result.success and result.address:
+                print(f"[{i}/{len(pending)}] Success: {addr_info[addr_type][:60]}")
+                results.append({
+                    **addr_info,
+                    "latitude": result.address.latitude,
+                    "longitude": result.address.longitude,
+                })
+            else:
+                print(f"[{i}/{len(pending)}] Failed, trying next address type...")
+                remaining.append(addr_info)
+
+    for addr_info in remaining:
+        primary_address = next(filter(None, (addr_info[f] for f in ADDRESS_FIELDS)))
+        print(f"  -> All addresses failed: {primary_address[:60]}")
 
     return results
 
 
-def write_sql(results: list[dict], output_path: Path):
-    """Write SQL UPDATE statements for manual execution."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("-- Organization Snapshot Coordinates Update\n")
-        f.write("-- Generated by geocode_org_snapshots.py\n")
-        f.write(f"-- Total records: {len(results)}\n\n")
-        f.write("BEGIN;\n\n")
-
-        for r in results:
-            f.write(
-                f"UPDATE compliance_report_organization_snapshot "
-                f"SET latitude = {r['latitude']}, longitude = {r['longitude']} "
-                f"WHERE organization_snapshot_id = {r['organization_snapshot_id']};\n"
+async def backfill_coordinates(
+    session: AsyncSession,
+    geocoder: BCGeocoderService,
+    batch_size: int = 100,
+    concurrency: int = 10,
+) -> tuple[int, int]:
+    """Geocode snapshots without coordinates, committing each batch.
+
+    Each batch is a page of distinct address sets. Sets that another
+    snapshot already has coordinates for are copied without geocoding.
+    Pages are keyed by snapshot ID, so sets that could not be geocoded are
+    not fetched again in the same run.
+
+    Returns:
+        Tuple of (address sets processed, snapshots updated)
+    """
+    repo = OrganizationSnapshotRepository(session)
+    after_snapshot_id = 0
+    processed = updated = 0
+
+    while True:
+        addresses = await repo.get_ungeocoded_addresses(after_snapshot_id, batch_size)
+        if not addresses:
+            break
+        after_snapshot_id = addresses[-1]["organization_snapshot_id"]
+        processed += len(addresses)
+
+        results = []
+        to_geocode = []
+        for addr_info in addresses:
+            coordinates = await repo.get_coordinates_for_addresses(
+                *(addr_info[field] for field in ADDRESS_FIELDS)
             )
+            if coordinates:
+                latitude, longitude = coordinates
+                results.append({**addr_info, "latitude": latitude, "longitude": longitude})
+            else:
+                to_geocode.append(addr_info)
+        results.extend(await geocode_addresses(geocoder, to_geocode, concurrency))
+
+        for result in results:
+            updated += await repo.set_coordinates_for_addresses(
+                *(result[field] for field in ADDRESS_FIELDS),
+                result["latitude"],
+                result["longitude"],
+            )
+        await session.commit()
+        print(
+            f"Batch done: {len(results)}/{len(addresses)} address sets placed, "
+            f"{updated} snapshots updated so far"
+        )
 
-        f.write("\nCOMMIT;\n")
-
-    print(f"\nWritten {len(results)} UPDATE statements to {output_path}")
+    return processed, updated
 
 
-async def main():
+async def main(batch_size: int):
     print("=" * 60)
-    print("Organization Snapshot Geocoding Script")
+    print("Organization Snapshot Geocoding Backfill")
     print("=" * 60)
 
     # Setup database connection
@@ -167,32 +168,14 @@ async def main():
 
     try:
         async with AsyncSession(engine) as session:
-            # Get addresses to geocode
-            print("\nFetching addresses from database...")
-            addresses = await get_unique_addresses(session)
-            print(f"Found {len(addresses)} unique addresses to geocode")
-
-            if not addresses:
-                print("No addresses need geocoding. Exiting.")
-                return
-
-            # Geocode addresses
-            print("\nStarting geocoding...")
-            results = await geocode_addresses(geocoder, addresses)
-
-            # Write SQL file to current directory (not committed to repo)
-            output_path = Path.cwd() / "org_snapshot_coordinates.sql"
-
-            # Write results as SQL
-            write_sql(results, output_path)
+            processed, updated = await backfill_coordinates(
+                session, geocoder, batch_size=batch_size
+            )
 
             # Summary
-            successful = len(results)
-            failed = len(addresses) - successful
             print(f"\nSummary:")
-            print(f"  Total addresses: {len(addresses)}")
-            print(f"  Successful: {successful}")
-            print(f"  Failed: {failed}")
+            print(f"  Address sets processed: {processed}")
+            print(f"  Snapshots updated: {updated}")
 
     finally:
         await geocoder.shutdown()
@@ -201,4 +184,12 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=100,
+        help="Address sets geocoded and committed together",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -74,42 +74,38 @@ async def notify_expiring_fuel_code(db_session: AsyncSession):
             },
         }
 
+        # One email per contact and company, sent together so that they
+        # share the CHES connections and rate limit
+        recipients = []
+        notifications = []
         for contact_email, email_data in email_groups.items():
             for company_name, comp_data in email_data["companies"].items():
-                try:
-                    context = dict(base_context)  # shallow copy is fine here
-                    context["fuel_codes"] = comp_data["codes"]
-                    context["contact_email"] = contact_email
-                    context["company"] = company_name
-                    context["expiry_count"] = len(comp_data["codes"])
-
-                    logger.info(
-                        f"Sending notification to {contact_email} | {company_name} "
-                        f"for {len(comp_data['codes'])} expiring codes"
-                    )
-
-                    sent = await email_service.send_fuel_code_expiry_notifications(
-                        notification_type=NotificationTypeEnum.IDIR_ANALYST__FUEL_CODE__EXPIRY_NOTIFICATION,
-                        email=contact_email,
-                        notification_context=context,
-                    )
-                    if sent:
-                        success_count += 1
-                        # Collect fuel code IDs that were successfully notified
-                        for code in comp_data["codes"]:
-                            notified_fuel_code_ids.append(code.fuel_code_id)
-                        logger.info(
-                            f"Successfully sent to {contact_email} | {company_name}"
-                        )
-                    else:
-                        logger.error(
-                            f"Failed to send to {contact_email} | {company_name}"
-                        )
-
-                except Exception as e:
-                    logger.error(
-                        f"Error sending to {contact_email} | {company_name}: {e}"
-                    )
+                context = dict(base_context)  # shallow copy is fine here
+                context["fuel_codes"] = comp_data["codes"]
+                context["contact_email"] = contact_email
+                context["company"] = company_name
+                context["expiry_count"] = len(comp_data["codes"])
+
+                logger.info(
+                    f"Preparing notification to {contact_email} | {company_name} "
+                    f"for {len(comp_data['codes'])} expiring codes"
+                )
+                recipients.append((contact_email, company_name, comp_data["codes"]))
+                notifications.append((contact_email, context))
+
+        sent_results = await email_service.send_fuel_code_expiry_batch(
+            NotificationTypeEnum.IDIR_ANALYST__FUEL_CODE__EXPIRY_NOTIFICATION,
+            notifications,
+        )
+        for (contact_email, company_name, codes), sent in zip(recipients, sent_results):
+            if sent:
+                success_count += 1
+                # Collect fuel code IDs that were successfully notified
+                for code in codes:
+                    notified_fuel_code_ids.append(code.fuel_code_id)
+                logger.info(f"Successfully sent to {contact_email} | {company_name}")
+            else:
+                logger.error(f"Failed to send to {contact_email} | {company_name}")
 
         # Mark successfully notified fuel codes to prevent duplicate notifications
         if notified_fuel_code_ids:
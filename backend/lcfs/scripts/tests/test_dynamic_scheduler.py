@@ -1,9 +1,15 @@
 import pytest
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import asyncio
+import time
 
-from lcfs.scripts.dynamic_scheduler import DynamicTaskScheduler, TaskStatus
+from lcfs.scripts.dynamic_scheduler import (
+    DynamicTaskScheduler,
+    TaskStatus,
+    parse_concurrency_classes,
+)
 from lcfs.db.models.tasks import ScheduledTask
 
 
@@ -229,3 +235,143 @@ async def test_cleanup(scheduler):
 
     await scheduler.cleanup()
     mock_engine.dispose.assert_called_once()
+
+
+def make_due_task(task_id, name, concurrency_class="default"):
+    return ScheduledTask(
+        id=task_id,
+        name=name,
+        task_function="test_function",
+        schedule="0 * * * *",
+        is_enabled=True,
+        timeout_seconds=5,
+        concurrency_class=concurrency_class,
+        next_run=datetime.now(timezone.utc) - timedelta(seconds=30),
+    )
+
+
+@pytest.fixture
+def cycle_scheduler(scheduler):
+    """A scheduler whose tasks are all due, unlocked and take 0.2 seconds."""
+    running = {"now": 0, "peak": 0}
+
+    @asynccontextmanager
+    async def task_lock(task):
+        yield True
+
+    async def execute_task(task):
+        start_time = datetime.now(timezone.utc)
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.2)
+        running["now"] -= 1
+        return {
+            "success": True,
+            "start_time": start_time,
+            "end_time": datetime.now(timezone.utc),
+            "duration_seconds": 0,
+            "result_message": "",
+            "error_message": "",
+        }
+
+    scheduler.task_lock = task_lock
+    scheduler.is_still_due = AsyncMock(return_value=True)
+    scheduler.execute_task = execute_task
+    scheduler.update_task_status = AsyncMock()
+    scheduler.should_execute_task = MagicMock(return_value=True)
+    scheduler.session = MagicMock(side_effect=Exception("No database"))
+    return scheduler, running
+
+
+@pytest.mark.anyio
+async def test_run_scheduler_cycle_runs_tasks_in_parallel(cycle_scheduler):
+    scheduler, running = cycle_scheduler
+    scheduler.max_concurrency = 2
+    tasks = [make_due_task(i, f"task_{i}") for i in range(4)]
+
+    with patch.object(scheduler, "get_enabled_tasks", return_value=tasks):
+        started = time.monotonic()
+        summary = await scheduler.run_scheduler_cycle()
+
+    assert running["peak"] == 2
+    assert time.monotonic() - started < 0.7
+    assert summary["tasks_succeeded"] == 4
+    assert set(summary["task_metrics"]) == {f"task_{i}" for i in range(4)}
+    # Each task started after its next_run, later ones after waiting for a slot
+    lags = sorted(m["lag_seconds"] for m in summary["task_metrics"].values())
+    assert lags[0] >= 30 and lags[-1] >= lags[0] + 0.2
+    assert all(m["duration_seconds"] >= 0.2 for m in summary["task_metrics"].values())
+
+
+@pytest.mark.anyio
+async def test_run_scheduler_cycle_honours_concurrency_classes(cycle_scheduler):
+    scheduler, running = cycle_scheduler
+    scheduler.max_concurrency = 4
+    scheduler.concurrency_classes = {"reports": 1}
+    tasks = [make_due_task(i, f"task_{i}", "reports") for i in range(3)]
+
+    with patch.object(scheduler, "get_enabled_tasks", return_value=tasks):
+        summary = await scheduler.run_scheduler_cycle()
+
+    assert running["peak"] == 1
+    assert summary["tasks_succeeded"] == 3
+
+
+@pytest.mark.anyio
+async def test_run_scheduler_cycle_skips_tasks_locked_elsewhere(cycle_scheduler):
+    scheduler, _ = cycle_scheduler
+    tasks = [
+        make_due_task(1, "locked"),
+        make_due_task(2, "ran"),
+        make_due_task(3, "free"),
+    ]
+
+    @asynccontextmanager
+    async def task_lock(task):
+        yield task.name != "locked"
+
+    scheduler.task_lock = task_lock
+    scheduler.is_still_due = AsyncMock(side_effect=lambda task: task.name != "ran")
+
+    with patch.object(scheduler, "get_enabled_tasks", return_value=tasks):
+        summary = await scheduler.run_scheduler_cycle()
+
+    assert summary["tasks_skipped"] == 2
+    assert summary["tasks_executed"] == 1
+    assert list(summary["task_metrics"]) == ["free"]
+    scheduler.update_task_status.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_run_scheduler_cycle_pushes_metrics(cycle_scheduler):
+    scheduler, _ = cycle_scheduler
+    scheduler.dry_run = False
+    scheduler.metrics_gateway_url = "http://pushgateway:9091"
+
+    with patch.object(
+        scheduler, "get_enabled_tasks", return_value=[make_due_task(1, "task_1")]
+    ), patch("lcfs.scripts.dynamic_scheduler.push_to_gateway") as mock_push:
+        await scheduler.run_scheduler_cycle()
+
+    assert [call.kwargs.get("grouping_key") for call in mock_push.call_args_list] == [
+        {"task": "task_1"},
+        None,
+    ]
+    task_registry = mock_push.call_args_list[0].kwargs["registry"]
+    assert task_registry.get_sample_value("scheduler_task_lag_seconds") >= 30
+    cycle_registry = mock_push.call_args_list[1].kwargs["registry"]
+    assert (
+        cycle_registry.get_sample_value(
+            "scheduler_cycle_tasks", {"outcome": "succeeded"}
+        )
+        == 1
+    )
+
+
+def test_parse_concurrency_classes():
+    assert parse_concurrency_classes("reports=1, email = 2,bad,zero=0") == {
+        "reports": 1,
+        "email": 2,
+        "zero": 1,
+    }
+    assert parse_concurrency_classes(None) == {}
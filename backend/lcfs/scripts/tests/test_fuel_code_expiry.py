@@ -9,6 +9,7 @@ from lcfs.scripts.tasks.fuel_code_expiry import (
     _is_valid_email,
 )
 from lcfs.web.api.base import NotificationTypeEnum
+from lcfs.web.api.email.services import CHESEmailService
 
 
 # Mock fuel code data structure
@@ -17,6 +18,16 @@ MockFuelCode = namedtuple(
 )
 
 
+def all_sent(notification_type, notifications):
+    """Batch sender that reports every notification as sent"""
+    return [True] * len(notifications)
+
+
+def sent_notifications(mock_email_service):
+    """The (email, context) pairs passed to the batch sender"""
+    return mock_email_service.send_fuel_code_expiry_batch.await_args.args[1]
+
+
 @pytest.fixture
 def mock_db_session():
     """Mock database session"""
@@ -109,7 +120,7 @@ class TestNotifyExpiringFuelCode:
             mock_email_repo_class.return_value = mock_email_repo
 
             mock_email_service = AsyncMock()
-            mock_email_service.send_fuel_code_expiry_notifications.return_value = True
+            mock_email_service.send_fuel_code_expiry_batch.side_effect = all_sent
             mock_email_service_class.return_value = mock_email_service
 
             # Execute
@@ -119,10 +130,13 @@ class TestNotifyExpiringFuelCode:
             assert result is True
             mock_repo.get_expiring_fuel_codes.assert_called_once()
 
-            # Should send 2 emails (user1@example.com gets 1 for Company A, user2@example.com gets 1 for Company B)
-            assert (
-                mock_email_service.send_fuel_code_expiry_notifications.call_count == 2
-            )
+            # Should send 2 emails in one batch (user1@example.com gets 1 for Company A, user2@example.com gets 1 for Company B)
+            mock_email_service.send_fuel_code_expiry_batch.assert_awaited_once()
+            notifications = sent_notifications(mock_email_service)
+            assert [email for email, _ in notifications] == [
+                "user1@example.com",
+                "user2@example.com",
+            ]
 
             # Verify that fuel codes are marked as notified after successful email sending
             mock_repo.mark_fuel_codes_notified.assert_called_once()
@@ -217,7 +231,7 @@ class TestNotifyExpiringFuelCode:
             mock_email_repo_class.return_value = mock_email_repo
 
             mock_email_service = AsyncMock()
-            mock_email_service.send_fuel_code_expiry_notifications.return_value = False
+            mock_email_service.send_fuel_code_expiry_batch.return_value = [False, False]
             mock_email_service_class.return_value = mock_email_service
 
             result = await notify_expiring_fuel_code(mock_db_session)
@@ -229,6 +243,10 @@ class TestNotifyExpiringFuelCode:
             mock_db_session.commit.assert_not_called()
 
     @pytest.mark.anyio
+    @patch(
+        "lcfs.scripts.tasks.fuel_code_expiry.settings.feature_fuel_code_expiry_email",
+        True,
+    )
     async def test_notify_expiring_fuel_code_partial_success(
         self, mock_db_session, mock_fuel_codes
     ):
@@ -250,11 +268,8 @@ class TestNotifyExpiringFuelCode:
             mock_email_repo_class.return_value = mock_email_repo
 
             mock_email_service = AsyncMock()
-            # First call succeeds (Company A with codes 1,3), second fails (Company B with code 2)
-            mock_email_service.send_fuel_code_expiry_notifications.side_effect = [
-                True,
-                False,
-            ]
+            # First email succeeds (Company A with codes 1,3), second fails (Company B with code 2)
+            mock_email_service.send_fuel_code_expiry_batch.return_value = [True, False]
             mock_email_service_class.return_value = mock_email_service
 
             result = await notify_expiring_fuel_code(mock_db_session)
@@ -295,15 +310,73 @@ class TestNotifyExpiringFuelCode:
             mock_email_repo_class.return_value = mock_email_repo
 
             mock_email_service = AsyncMock()
-            mock_email_service.send_fuel_code_expiry_notifications.side_effect = (
-                Exception("Email error")
+            mock_email_service.send_fuel_code_expiry_batch.side_effect = Exception(
+                "Email error"
             )
+            mock_email_service_class.return_value = mock_email_service
 
             result = await notify_expiring_fuel_code(mock_db_session)
 
             assert result is False
 
 
+    @pytest.mark.anyio
+    @patch(
+        "lcfs.scripts.tasks.fuel_code_expiry.settings.feature_fuel_code_expiry_email",
+        True,
+    )
+    async def test_notify_expiring_fuel_code_group_raises(
+        self, mock_db_session, mock_fuel_codes
+    ):
+        """A group whose email raises fails only its own recipient"""
+
+        async def send_email(payload, raise_on_failure=False):
+            if "user2@example.com" in payload["bcc"]:
+                raise Exception("CHES unavailable")
+            return True
+
+        email_service = CHESEmailService(repo=AsyncMock())
+        send_batch = email_service.send_fuel_code_expiry_batch
+        batch_results = []
+
+        async def send_fuel_code_expiry_batch(*args):
+            batch_results.append(await send_batch(*args))
+            return batch_results[-1]
+
+        with patch(
+            "lcfs.scripts.tasks.fuel_code_expiry.FuelCodeRepository"
+        ) as mock_repo_class, patch(
+            "lcfs.scripts.tasks.fuel_code_expiry.CHESEmailService",
+            return_value=email_service,
+        ), patch(
+            "lcfs.web.api.email.services.settings.ches_enabled", True
+        ), patch.object(
+            email_service, "_validate_configuration", return_value=True
+        ), patch.object(
+            email_service, "_render_email_template", return_value="<p>body</p>"
+        ), patch.object(
+            email_service, "send_email", side_effect=send_email
+        ), patch.object(
+            email_service,
+            "send_fuel_code_expiry_batch",
+            side_effect=send_fuel_code_expiry_batch,
+        ):
+
+            mock_repo = AsyncMock()
+            mock_repo.get_expiring_fuel_codes.return_value = mock_fuel_codes
+            mock_repo_class.return_value = mock_repo
+
+            result = await notify_expiring_fuel_code(mock_db_session)
+
+            # user1@example.com (Company A) was sent, user2@example.com raised
+            assert batch_results == [[True, False]]
+            assert result is True
+            # Only Company A's codes were sent, so only they are marked
+            notified_ids = mock_repo.mark_fuel_codes_notified.call_args[0][0]
+            assert sorted(notified_ids) == [1, 3]
+            mock_db_session.commit.assert_called_once()
+
+
 class TestGroupCodesByEmailThenCompany:
     """Tests for the _group_codes_by_email_then_company function"""
 
@@ -411,16 +484,21 @@ class TestIsValidEmail:
             mock_email_repo_class.return_value = mock_email_repo
 
             mock_email_service = AsyncMock()
-            mock_email_service.send_fuel_code_expiry_notifications.return_value = True
+            mock_email_service.send_fuel_code_expiry_batch.side_effect = all_sent
             mock_email_service_class.return_value = mock_email_service
 
             result = await notify_expiring_fuel_code(mock_db_session)
 
             assert result is True
-            # Should have 3 email groups: valid email + lcfs@gov.bc.ca for 2 invalid companies
-            assert (
-                mock_email_service.send_fuel_code_expiry_notifications.call_count == 3
-            )
+            # Should have 3 email groups: lcfs@gov.bc.ca for 2 invalid companies + valid email
+            notifications = sent_notifications(mock_email_service)
+            assert sorted(
+                (email, context["company"]) for email, context in notifications
+            ) == [
+                ("lcfs@gov.bc.ca", "Company A"),
+                ("lcfs@gov.bc.ca", "Company C"),
+                ("user@valid.com", "Company B"),
+            ]
 
             # Verify all fuel codes are marked as notified
             mock_repo.mark_fuel_codes_notified.assert_called_once()
@@ -495,7 +573,7 @@ class TestIntegration:
             mock_email_repo_class.return_value = mock_email_repo
 
             mock_email_service = AsyncMock()
-            mock_email_service.send_fuel_code_expiry_notifications.return_value = True
+            mock_email_service.send_fuel_code_expiry_batch.side_effect = all_sent
             mock_email_service_class.return_value = mock_email_service
 
             # Execute
@@ -504,23 +582,19 @@ class TestIntegration:
             # Verify
             assert result is True
 
-            # Check that the function was called with correct parameters
-            calls = (
-                mock_email_service.send_fuel_code_expiry_notifications.call_args_list
+            # Check that the batch was sent with correct parameters
+            mock_email_service.send_fuel_code_expiry_batch.assert_awaited_once()
+            notification_type, notifications = (
+                mock_email_service.send_fuel_code_expiry_batch.await_args.args
             )
-            assert len(calls) == 2  # Two email groups
-
-            # Verify notification type
-            for call in calls:
-                args, kwargs = call
-                assert (
-                    kwargs["notification_type"]
-                    == NotificationTypeEnum.IDIR_ANALYST__FUEL_CODE__EXPIRY_NOTIFICATION
-                )
-                assert "email" in kwargs
-                assert "notification_context" in kwargs
-
-                context = kwargs["notification_context"]
+            assert (
+                notification_type
+                == NotificationTypeEnum.IDIR_ANALYST__FUEL_CODE__EXPIRY_NOTIFICATION
+            )
+            assert len(notifications) == 2  # Two email groups
+
+            for email, context in notifications:
+                assert email in ("valid@example.com", "lcfs@gov.bc.ca")
                 assert "subject" in context
                 assert "fuel_codes" in context
                 assert "contact_email" in context
@@ -557,7 +631,7 @@ class TestIntegration:
             mock_email_repo_class.return_value = mock_email_repo
 
             mock_email_service = AsyncMock()
-            mock_email_service.send_fuel_code_expiry_notifications.return_value = True
+            mock_email_service.send_fuel_code_expiry_batch.side_effect = all_sent
             mock_email_service_class.return_value = mock_email_service
 
             await notify_expiring_fuel_code(mock_db_session)
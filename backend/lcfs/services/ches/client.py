@@ -0,0 +1,123 @@
+"""
+Client for the Common Hosted Email Service (CHES).
+
+Each event loop keeps one pooled HTTP client, so sends reuse connections
+instead of opening one per email. The access token is cached for the whole
+process and replaced shortly before it expires, and a token bucket holds
+the process to ``ches_rate_limit`` emails per second.
+"""
+
+import asyncio
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import structlog
+
+from lcfs.settings import settings
+from lcfs.utils.rate_limit import TokenBucket
+
+logger = structlog.get_logger(__name__)
+
+# Seconds before a token expires that it is replaced
+TOKEN_REFRESH_MARGIN = 60
+
+rate_limiter = TokenBucket(settings.ches_rate_limit, settings.ches_rate_burst)
+
+# The current token and the monotonic time it should be replaced at
+_token: Optional[Tuple[str, float]] = None
+
+
+def _cached_token() -> Optional[str]:
+    token = _token
+    if token and time.monotonic() < token[1]:
+        return token[0]
+    return None
+
+
+def clear_token_cache() -> None:
+    global _token
+    _token = None
+
+
+class CHESClient:
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self._http = httpx.AsyncClient(
+            timeout=settings.ches_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.ches_max_connections,
+                max_keepalive_connections=settings.ches_max_connections,
+            ),
+            transport=transport,
+        )
+        # Sends that find the token expired wait for one refresh
+        self._refresh = asyncio.Lock()
+
+    async def token(self) -> str:
+        """Returns the cached access token, requesting a new one if it expired."""
+        global _token
+        if token := _cached_token():
+            return token
+        async with self._refresh:
+            if token := _cached_token():
+                return token
+            response = await self._http.post(
+                settings.ches_auth_url,
+                data={"grant_type": "client_credentials"},
+                auth=(settings.ches_client_id, settings.ches_client_secret),
+            )
+            response.raise_for_status()
+            token_data = response.json()
+            lifetime = token_data.get("expires_in", 3600)
+            _token = (
+                token_data["access_token"],
+                time.monotonic() + max(lifetime - TOKEN_REFRESH_MARGIN, 0),
+            )
+            logger.info("Retrieved new CHES token.")
+            return _token[0]
+
+    async def send(self, payload: Dict[str, Any]) -> None:
+        """Sends one email, raising if CHES does not accept it."""
+        await rate_limiter.acquire()
+        token = await self.token()
+        response = await self._post_email(payload, token)
+        if response.status_code == httpx.codes.UNAUTHORIZED:
+            # The token was revoked before it expired; get a new one once
+            if _cached_token() == token:
+                clear_token_cache()
+            response = await self._post_email(payload, await self.token())
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self._http.aclose()
+
+    async def _post_email(self, payload: Dict[str, Any], token: str) -> httpx.Response:
+        return await self._http.post(
+            settings.ches_email_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+
+# Connections belong to the event loop that opened them, so the API loop
+# and the job worker's loop each get their own client
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, CHESClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_ches_client() -> CHESClient:
+    """The CHES client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = CHESClient()
+    return client
+
+
+async def close_ches_client() -> None:
+    """Closes the running event loop's CHES connections."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
@@ -0,0 +1,185 @@
+"""
+Asynchronous connection pool for clamd.
+
+Each pooled connection holds a clamd session (IDSESSION), so one socket
+serves many scans instead of one connection per file. clamd ends sessions
+that sit idle for its IdleTimeout (30 seconds by default), so idle
+connections are dropped before that and a scan that finds its connection
+closed is retried once on a new one.
+"""
+
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, List, Optional
+
+import structlog
+
+from lcfs.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# Seconds a pooled connection may sit idle, below clamd's IdleTimeout
+CLAMD_IDLE_SECONDS = 20
+
+# Seconds the signature database version is reused before asking again
+CLAMD_VERSION_REFRESH_SECONDS = 5 * 60
+
+
+class ClamdError(Exception):
+    """clamd rejected a command, e.g. a stream over StreamMaxLength."""
+
+
+class _ClamdConnection:
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+        self.reused = False
+        self.closed = False
+
+    async def command(
+        self, command: bytes, payload: Optional[AsyncIterator[bytes]] = None
+    ) -> str:
+        """Sends a command, streaming ``payload`` for INSTREAM, and returns the reply."""
+        self.writer.write(b"z" + command + b"\0")
+        if payload is not None:
+            async for chunk in payload:
+                self.writer.write(len(chunk).to_bytes(4, byteorder="big") + chunk)
+                await self.writer.drain()
+            self.writer.write(b"\0\0\0\0")
+        await self.writer.drain()
+
+        reply = (await self.reader.readuntil(b"\0"))[:-1].decode().strip()
+        # Replies within a session are prefixed with the command's id
+        _, _, reply = reply.partition(": ")
+        if reply.endswith("ERROR"):
+            raise ClamdError(reply)
+        return reply
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+
+class ClamdPool:
+    """Up to ``size`` clamd sessions shared by the scans on one event loop."""
+
+    def __init__(
+        self, host: str, port: int, size: int = 4, timeout: float = 60
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(max(size, 1))
+        self._idle: List[_ClamdConnection] = []
+        self._version: Optional[str] = None
+        self._version_checked = 0.0
+
+    async def scan(self, payload: Callable[[], AsyncIterator[bytes]]) -> str:
+        """Scans the stream ``payload()`` returns and gives clamd's verdict."""
+        return await self._request(b"INSTREAM", payload)
+
+    async def database_version(self) -> str:
+        """
+        The signature database version, e.g. ``27431`` from
+        ``ClamAV 1.0.5/27431/Tue Oct 15 08:00:00 2026``.
+        """
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked > (
+            CLAMD_VERSION_REFRESH_SECONDS
+        ):
+            version = await self._request(b"VERSION")
+            parts = version.split("/")
+            self._version = parts[1] if len(parts) > 1 else version
+            self._version_checked = now
+        return self._version
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+    async def _request(
+        self,
+        command: bytes,
+        payload: Optional[Callable[[], AsyncIterator[bytes]]] = None,
+    ) -> str:
+        while True:
+            async with self._connection() as connection:
+                try:
+                    return await asyncio.wait_for(
+                        connection.command(command, payload() if payload else None),
+                        self.timeout,
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection.close()
+                    # clamd may have ended an idle session; a new one is
+                    # only tried once
+                    if not connection.reused:
+                        raise
+                    logger.debug("clamd session closed, reconnecting")
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[_ClamdConnection]:
+        async with self._slots:
+            connection = self._take_idle() or await self._connect()
+            try:
+                yield connection
+            except BaseException:
+                connection.close()
+                raise
+            if not connection.closed:
+                connection.last_used = time.monotonic()
+                self._idle.append(connection)
+
+    def _take_idle(self) -> Optional[_ClamdConnection]:
+        while self._idle:
+            connection = self._idle.pop()
+            if (
+                time.monotonic() - connection.last_used < CLAMD_IDLE_SECONDS
+                and not connection.reader.at_eof()
+            ):
+                connection.reused = True
+                return connection
+            connection.close()
+        return None
+
+    async def _connect(self) -> _ClamdConnection:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        writer.write(b"zIDSESSION\0")
+        await writer.drain()
+        return _ClamdConnection(reader, writer)
+
+
+# Streams belong to the event loop that opened them, so the API loop and
+# the job worker's loop each get their own pool
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ClamdPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_clamd_pool() -> ClamdPool:
+    """The clamd pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = ClamdPool(
+            settings.clamav_host,
+            settings.clamav_port,
+            settings.clamav_pool_size,
+            settings.clamav_timeout,
+        )
+    return pool
+
+
+async def close_clamd_pool() -> None:
+    """Closes the idle connections of the running event loop's pool."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
@@ -1,6 +1,13 @@
+import asyncio
+import hashlib
+from typing import AsyncIterator, BinaryIO, Optional
+
 import structlog
-import socket
+from fastapi import Depends, UploadFile
+from redis.asyncio import Redis
 
+from lcfs.services.clamav.clamd import get_clamd_pool
+from lcfs.services.redis.dependency import get_redis_client
 from lcfs.settings import settings
 
 logger = structlog.get_logger(__name__)
@@ -12,40 +19,65 @@ class VirusScanException(Exception):
     pass
 
 
+def _file_sha256(file: BinaryIO, chunk_size: int) -> str:
+    file.seek(0)
+    digest = hashlib.sha256()
+    while chunk := file.read(chunk_size):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+async def _read_chunks(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    await file.seek(0)
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
 class ClamAVService:
-    def __init__(self):
-        pass
-
-    def scan_file(self, file):
-        # Create a socket connection to ClamAV
-
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.connect((settings.clamav_host, settings.clamav_port))
-            sock.sendall(b"zINSTREAM\0")  # Initiate the INSTREAM scan
-
-            # Reset file pointer and send the file in chunks to ClamAV
-            file.file.seek(0)
-            while True:
-                chunk = file.file.read(1024)
-                if not chunk:
-                    break
-                size = len(chunk).to_bytes(4, byteorder="big")
-                sock.sendall(size + chunk)
-
-            sock.sendall(b"\0\0\0\0")  # Send a zero-length chunk to signal end
-
-            # Read ClamAV's response
-            response = sock.recv(1024)
-            result = response.decode("utf-8").strip()
-
-            # Reset file pointer after scan
-            file.file.seek(0)
-
-            # Check the response for virus detection
-            if "FOUND" in result:
-                logger.error(
-                    "Virus detected",
-                    result=result,
-                )
-                raise VirusScanException(f"Virus detected: {result}")
+    """
+    Scans uploads with clamd over pooled connections, streaming the file in
+    ``clamav_chunk_size`` chunks. Verdicts are cached in Redis by the file's
+    SHA-256 under the signature database version, so the same file is not
+    scanned again until the signatures are updated.
+    """
+
+    def __init__(self, redis_client: Redis = Depends(get_redis_client)):
+        self.redis_client = redis_client
+
+    async def scan_file(self, file: UploadFile) -> str:
+        pool = get_clamd_pool()
+        chunk_size = settings.clamav_chunk_size
+
+        digest = await asyncio.to_thread(_file_sha256, file.file, chunk_size)
+        cache_key = f"clamav/{await pool.database_version()}/{digest}"
+        result = await self._cached_result(cache_key)
+        if result is None:
+            result = await pool.scan(lambda: _read_chunks(file, chunk_size))
+            await self._cache_result(cache_key, result)
+
+        # Reset file pointer after scan
+        await file.seek(0)
+
+        # Check the response for virus detection
+        if "FOUND" in result:
+            logger.error(
+                "Virus detected",
+                result=result,
+            )
+            raise VirusScanException(f"Virus detected: {result}")
         return result
+
+    async def _cached_result(self, cache_key: str) -> Optional[str]:
+        # The cache only saves work, so an unavailable Redis means a scan
+        try:
+            return await self.redis_client.get(cache_key)
+        except Exception as e:
+            logger.warning("Could not read cached scan result", error=str(e))
+            return None
+
+    async def _cache_result(self, cache_key: str, result: str) -> None:
+        try:
+            await self.redis_client.set(cache_key, result, ex=settings.clamav_cache_ttl)
+        except Exception as e:
+            logger.warning("Could not cache scan result", error=str(e))
@@ -1,20 +1,51 @@
 """
-Redis-based caching implementation for BC Geocoder service.
+Two-tier caching implementation for BC Geocoder service.
+
+Lookups try an in-process LRU first and Redis second, so repeated lookups
+in one process skip the network and every process shares what the others
+have geocoded. Addresses are normalised before they are hashed into keys,
+and results for addresses that could not be found are kept for a shorter
+TTL than found ones.
 """
 
+import re
 import time
-import asyncio
 import json
 import hashlib
-from typing import Any, Optional, Dict, Union, List
+import unicodedata
+import weakref
+from collections import Counter as StatCounter, OrderedDict
+from typing import Any, Optional, Dict, List, Tuple
 from dataclasses import dataclass, asdict, is_dataclass
-from datetime import datetime, timedelta
 import logging
+from prometheus_client import Counter
 from redis.asyncio import Redis
 from redis.exceptions import RedisError
 
 logger = logging.getLogger(__name__)
 
+# Entries kept in each process, and the most seconds one is kept there, so
+# deletes made by other processes are picked up before long
+LOCAL_CACHE_SIZE = 10_000
+LOCAL_CACHE_TTL = 5 * 60
+
+CACHE_LOOKUPS = Counter(
+    "geocoder_cache_lookups",
+    "Geocoder cache lookups by tier and outcome",
+    ["tier", "outcome"],
+)
+
+_ADDRESS_PUNCTUATION = re.compile(r"[^\w\s/-]")
+
+
+def normalize_address(address: str) -> str:
+    """
+    The form of an address used in cache keys, ignoring case, spacing and
+    punctuation so trivially different spellings share an entry.
+    """
+    address = unicodedata.normalize("NFKC", address).casefold()
+    return " ".join(_ADDRESS_PUNCTUATION.sub(" ", address).split())
+
 
 @dataclass
 class CacheEntry:
@@ -26,39 +57,98 @@ class CacheEntry:
     last_accessed: Optional[float] = None
 
 
+class LocalCacheTier:
+    """
+    In-process LRU of serialized cache values. Each entry is kept until the
+    sooner of its own expiry and ``ttl`` seconds.
+    """
+
+    def __init__(
+        self, max_entries: int = LOCAL_CACHE_SIZE, ttl: float = LOCAL_CACHE_TTL
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats: StatCounter = StatCounter()
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Geocoder services are created per request, so the local tier belongs to
+# the Redis client they share, which lives as long as the process
+_local_tiers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_local_cache_tier(redis_client: Redis) -> LocalCacheTier:
+    """The process's local tier in front of ``redis_client``."""
+    tier = _local_tiers.get(redis_client)
+    if tier is None:
+        tier = _local_tiers[redis_client] = LocalCacheTier()
+    return tier
+
+
 class GeocoderCache:
     """
-    Redis-based caching implementation for geocoder service.
-    
+    Two-tier caching implementation for geocoder service.
+
     Features:
-    - TTL (Time-To-Live) support with Redis expiration
+    - In-process LRU in front of Redis, shared by the process's services
     - Distributed cache shared across service instances
-    - Statistics tracking
-    - JSON-serializable cache entries for better compatibility
-    - Redis connection management with fallback
+    - TTL (Time-To-Live) support, with a shorter TTL for negative results
+    - Batched lookups with a single MGET
+    - Per-tier hit and miss counts, exported to Prometheus
     """
-    
+
     def __init__(
         self,
         redis_client: Redis,
         default_ttl: int = 3600,  # 1 hour
-        key_prefix: str = "geocoder:"
+        key_prefix: str = "geocoder:",
+        negative_ttl: int = 300,  # 5 minutes
     ):
         """
-        Initialize the Redis-based cache.
-        
+        Initialize the two-tier cache.
+
         Args:
             redis_client: Redis client instance
             default_ttl: Default TTL in seconds
             key_prefix: Prefix for Redis keys
+            negative_ttl: TTL in seconds for results that found nothing
         """
         self.redis_client = redis_client
         self.default_ttl = default_ttl
         self.key_prefix = key_prefix
-        
-        # Stats are kept in Redis for persistence and sharing
-        self.stats_key = f"{self.key_prefix}stats"
-    
+        self.negative_ttl = negative_ttl
+        self.local = get_local_cache_tier(redis_client)
+
     def _generate_key(self, *args, **kwargs) -> str:
         """Generate a cache key from arguments."""
         key_data = {
@@ -68,25 +158,17 @@ class GeocoderCache:
         key_string = json.dumps(key_data, sort_keys=True, default=str)
         hash_key = hashlib.md5(key_string.encode()).hexdigest()
         return f"{self.key_prefix}{hash_key}"
-    
-    def cache_key_for_method(self, method_name: str, *args, **kwargs) -> str:
-        """Generate a cache key for a specific method call."""
-        key_data = {
-            "method": method_name,
-            "args": args,
-            "kwargs": kwargs
-        }
-        key_string = json.dumps(key_data, sort_keys=True, default=str)
-        hash_key = hashlib.md5(key_string.encode()).hexdigest()
-        return f"{self.key_prefix}{method_name}:{hash_key}"
-    
-    async def _increment_stat(self, stat_name: str, amount: int = 1) -> None:
-        """Increment a statistic in Redis."""
-        try:
-            await self.redis_client.hincrby(self.stats_key, stat_name, amount)
-        except RedisError as e:
-            logger.warning(f"Failed to update stat {stat_name}: {e}")
-    
+
+    def _redis_key(self, key: str) -> str:
+        return key if key.startswith(self.key_prefix) else f"{self.key_prefix}{key}"
+
+    def _record(self, tier: str, hits: int, misses: int) -> None:
+        """Count lookups answered and missed by a tier."""
+        for outcome, count in (("hits", hits), ("misses", misses)):
+            if count:
+                self.local.stats[f"{tier}_{outcome}"] += count
+                CACHE_LOOKUPS.labels(tier=tier, outcome=outcome).inc(count)
+
     def _serialize_value(self, value: Any) -> str:
         """Serialize a value to JSON string, handling dataclasses."""
         # Import here to avoid circular dependency
@@ -169,187 +251,172 @@ class GeocoderCache:
             logger.warning(f"Failed to deserialize JSON: {e}")
             return None
     
-    async def get(self, key: str) -> Optional[Any]:
-        """Get a value from Redis cache."""
+    def _load(self, redis_key: str, cached_data: Optional[str]) -> Optional[str]:
+        """
+        The serialized value of an entry read from Redis, also kept in the
+        local tier until the entry expires.
+        """
+        if cached_data is None:
+            return None
         try:
-            redis_key = f"{self.key_prefix}{key}" if not key.startswith(self.key_prefix) else key
-            
-            # Get JSON data from Redis
-            cached_data = await self.redis_client.get(redis_key)
-            
-            if cached_data is None:
-                await self._increment_stat("misses")
-                return None
-            
-            # Deserialize the cache entry
+            # Redis returns bytes, decode to string
+            if isinstance(cached_data, bytes):
+                cached_data = cached_data.decode('utf-8')
+            entry_data = json.loads(cached_data)
+            value = entry_data["value"]
+            expires_at = entry_data.get("expires_at")
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning(f"Failed to deserialize cache entry for key {redis_key}: {e}")
+            return None
+        self.local.set(
+            redis_key, value, None if expires_at is None else expires_at - time.time()
+        )
+        return value
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a value from the local tier, or else from Redis."""
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get values for several keys, in order, reading those missing from the
+        local tier from Redis in a single MGET. Missing values are None.
+        """
+        redis_keys = [self._redis_key(key) for key in keys]
+        values = [self.local.get(redis_key) for redis_key in redis_keys]
+        missing = [index for index, value in enumerate(values) if value is None]
+        self._record("local", len(keys) - len(missing), len(missing))
+
+        if missing:
             try:
-                # Redis returns bytes, decode to string
-                if isinstance(cached_data, bytes):
-                    cached_data = cached_data.decode('utf-8')
-                
-                entry_data = json.loads(cached_data)
-                
-                # Reconstruct the CacheEntry
-                entry = CacheEntry(
-                    value=self._deserialize_value(entry_data["value"]),
-                    created_at=entry_data["created_at"],
-                    expires_at=entry_data.get("expires_at"),
-                    access_count=entry_data.get("access_count", 0),
-                    last_accessed=entry_data.get("last_accessed")
+                cached = await self.redis_client.mget(
+                    [redis_keys[index] for index in missing]
                 )
-                
-                # Update access metadata and store back in Redis
-                current_time = time.time()
-                entry.access_count += 1
-                entry.last_accessed = current_time
-                
-                # Update the entry in Redis with new metadata
-                updated_entry = {
-                    "value": entry_data["value"],  # Keep original serialized value
-                    "created_at": entry.created_at,
-                    "expires_at": entry.expires_at,
-                    "access_count": entry.access_count,
-                    "last_accessed": entry.last_accessed
-                }
-                await self.redis_client.set(
-                    redis_key, 
-                    json.dumps(updated_entry), 
-                    ex=self.default_ttl
-                )
-                
-                await self._increment_stat("hits")
-                return entry.value
-                
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
-                logger.warning(f"Failed to deserialize cache entry for key {redis_key}: {e}")
-                await self.redis_client.delete(redis_key)
-                await self._increment_stat("misses")
-                return None
-                
-        except RedisError as e:
-            logger.warning(f"Redis error during get operation for key {key}: {e}")
-            await self._increment_stat("misses")
-            return None
-    
+            except RedisError as e:
+                logger.warning(f"Redis error during get operation for keys {keys}: {e}")
+                cached = [None] * len(missing)
+            for index, cached_data in zip(missing, cached):
+                values[index] = self._load(redis_keys[index], cached_data)
+            found = sum(values[index] is not None for index in missing)
+            self._record("redis", found, len(missing) - found)
+
+        return [
+            None if value is None else self._deserialize_value(value)
+            for value in values
+        ]
+
     async def set(
         self,
         key: str,
         value: Any,
         ttl: Optional[int] = None
     ) -> None:
-        """Set a value in Redis cache."""
+        """Set a value in both tiers."""
         try:
-            redis_key = f"{self.key_prefix}{key}" if not key.startswith(self.key_prefix) else key
+            redis_key = self._redis_key(key)
             ttl = ttl or self.default_ttl
             current_time = time.time()
-            
+            serialized = self._serialize_value(value)
+
             # Create cache entry with metadata
             entry_data = {
-                "value": self._serialize_value(value),
+                "value": serialized,
                 "created_at": current_time,
                 "expires_at": current_time + ttl if ttl > 0 else None,
                 "access_count": 1,
                 "last_accessed": current_time
             }
-            
+            self.local.set(redis_key, serialized, ttl if ttl > 0 else None)
+            self.local.stats["sets"] += 1
+
             # Store as JSON in Redis with TTL
             await self.redis_client.set(
-                redis_key, 
-                json.dumps(entry_data), 
+                redis_key,
+                json.dumps(entry_data),
                 ex=ttl if ttl > 0 else None
             )
-            
-            await self._increment_stat("sets")
+
             logger.debug(f"Cached entry for key {redis_key} with TTL {ttl}s")
-            
+
         except RedisError as e:
             logger.warning(f"Redis error during set operation for key {key}: {e}")
         except Exception as e:
             logger.warning(f"Failed to serialize value for key {key}: {e}")
-    
+
     async def delete(self, key: str) -> bool:
-        """Delete a key from Redis cache."""
+        """Delete a key from both tiers."""
         try:
-            redis_key = f"{self.key_prefix}{key}" if not key.startswith(self.key_prefix) else key
+            redis_key = self._redis_key(key)
+            self.local.delete(redis_key)
             result = await self.redis_client.delete(redis_key)
             return result > 0
         except RedisError as e:
             logger.warning(f"Redis error during delete operation for key {key}: {e}")
             return False
-    
+
     async def clear(self) -> None:
-        """Clear all geocoder cache entries."""
+        """
+        Clear all geocoder cache entries. Other processes keep their local
+        copies for up to LOCAL_CACHE_TTL.
+        """
+        self.local.clear()
+        self.local.stats.clear()
         try:
             # Use pattern matching to delete all keys with our prefix
             pattern = f"{self.key_prefix}*"
             keys = []
-            
+
             # Scan for keys with our prefix
             async for key in self.redis_client.scan_iter(match=pattern):
                 keys.append(key)
-            
+
             if keys:
                 await self.redis_client.delete(*keys)
                 logger.info(f"Cleared {len(keys)} cache entries")
-            
-            # Reset stats
-            await self.redis_client.delete(self.stats_key)
+
             logger.info("Cache cleared and stats reset")
-            
+
         except RedisError as e:
             logger.error(f"Redis error during clear operation: {e}")
-    
+
     async def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics from Redis."""
-        try:
-            # Get all stats from Redis hash
-            redis_stats = await self.redis_client.hgetall(self.stats_key)
-            
-            # Convert bytes to strings if needed, then to integers
-            stats = {}
-            for key, value in redis_stats.items():
-                if isinstance(key, bytes):
-                    key = key.decode('utf-8')
-                if isinstance(value, bytes):
-                    value = value.decode('utf-8')
-                stats[key] = int(value) if value.isdigit() else 0
-            
-            # Ensure we have the basic stats
-            stats = {
-                "hits": stats.get("hits", 0),
-                "misses": stats.get("misses", 0),
-                "sets": stats.get("sets", 0),
+        """
+        Get this process's cache statistics. A lookup is a hit if either tier
+        answers it, and each tier's hit rate is over the lookups it saw.
+        """
+        stats = self.local.stats
+        tiers = {}
+        for tier in ("local", "redis"):
+            hits, misses = stats[f"{tier}_hits"], stats[f"{tier}_misses"]
+            tiers[tier] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0,
             }
-            
-            # Calculate derived metrics
-            total_requests = stats["hits"] + stats["misses"]
-            hit_rate = stats["hits"] / total_requests if total_requests > 0 else 0
-            
+        tiers["local"]["size"] = len(self.local)
+
+        hits = tiers["local"]["hits"] + tiers["redis"]["hits"]
+        misses = tiers["redis"]["misses"]
+        result = {
+            "hits": hits,
+            "misses": misses,
+            "sets": stats["sets"],
+            "hit_rate": hits / (hits + misses) if hits + misses else 0,
+            "tiers": tiers,
+            "cache_type": "redis",
+        }
+        try:
             # Get approximate cache size (expensive operation, use sparingly)
             pattern = f"{self.key_prefix}*"
             cache_size = 0
             async for _ in self.redis_client.scan_iter(match=pattern):
                 cache_size += 1
-            
-            return {
-                **stats,
-                "size": cache_size,
-                "hit_rate": hit_rate,
-                "cache_type": "redis"
-            }
-            
+            return {**result, "size": cache_size}
+
         except RedisError as e:
             logger.warning(f"Redis error getting stats: {e}")
-            return {
-                "hits": 0,
-                "misses": 0,
-                "sets": 0,
-                "size": 0,
-                "hit_rate": 0.0,
-                "cache_type": "redis",
-                "error": str(e)
-            }
-    
+            return {**result, "size": 0, "error": str(e)}
+
     def cache_key_for_method(self, method_name: str, *args, **kwargs) -> str:
         """Generate cache key for a method call."""
         key_without_prefix = self._generate_key(*args, **kwargs)
@@ -357,7 +424,7 @@ class GeocoderCache:
         if key_without_prefix.startswith(self.key_prefix):
             key_without_prefix = key_without_prefix[len(self.key_prefix):]
         return f"{method_name}:{key_without_prefix}"
-    
+
     async def shutdown(self) -> None:
         """Shutdown the cache - Redis connection managed elsewhere."""
         logger.info("Geocoder cache shutdown complete")
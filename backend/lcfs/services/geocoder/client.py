@@ -11,16 +11,27 @@ This service provides a unified interface for:
 
 import asyncio
 import logging
-from typing import List, Optional, Dict, Any, Union, Tuple
+from functools import partial
+from typing import AsyncIterator, List, Optional, Dict, Any, Union, Tuple
 from dataclasses import dataclass
 from urllib.parse import urlencode
 import httpx
 
-from .cache import GeocoderCache, CacheDecorator
+from .cache import GeocoderCache, CacheDecorator, normalize_address
+from .executor import AdaptiveLimit, ordered_map
+from .spatial_index import get_bc_spatial_index
 from redis.asyncio import Redis
 
+from lcfs.settings import settings
+from lcfs.utils.rate_limit import TokenBucket
+
 logger = logging.getLogger(__name__)
 
+# Upstream requests are limited per process, so cache hits never wait.
+# Nominatim's usage policy allows one request per second.
+rate_limiter = TokenBucket(settings.geocoder_rate_limit, settings.geocoder_rate_burst)
+nominatim_rate_limiter = TokenBucket(1, 1)
+
 
 @dataclass
 class Address:
@@ -66,7 +77,8 @@ class BCGeocoderService:
         rate_limit_delay: float = 1.0,
         user_agent: str = "LCFS/1.0 (lcfs@gov.bc.ca)",
         cache_ttl: int = 3600,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        negative_cache_ttl: int = 300
     ):
         """
         Initialize the BC Geocoder service.
@@ -81,6 +93,7 @@ class BCGeocoderService:
             user_agent: User agent string for API requests
             cache_ttl: Cache TTL in seconds
             api_key: Optional BC Geocoder API key for authenticated access
+            negative_cache_ttl: Cache TTL in seconds for addresses not found
         """
         self.bc_geocoder_url = bc_geocoder_url.rstrip('/')
         self.nominatim_url = nominatim_url.rstrip('/')
@@ -95,7 +108,8 @@ class BCGeocoderService:
         # Initialize Redis-based caching
         self._cache = GeocoderCache(
             redis_client=redis_client,
-            default_ttl=cache_ttl
+            default_ttl=cache_ttl,
+            negative_ttl=negative_cache_ttl
         )
         
         # Performance metrics
@@ -116,7 +130,8 @@ class BCGeocoderService:
         self,
         address_string: str,
         min_score: int = 50,
-        max_results: int = 5
+        max_results: int = 5,
+        raise_errors: bool = False
     ) -> List[Address]:
         """
         Validate and standardize an address using BC Geocoder API.
@@ -125,12 +140,17 @@ class BCGeocoderService:
             address_string: The address string to validate
             min_score: Minimum confidence score (0-100)
             max_results: Maximum number of results to return
+            raise_errors: Whether to raise when the geocoder cannot be
+                reached, rather than return no addresses
             
         Returns:
             List of validated Address objects
         """
         cache_key = self._cache.cache_key_for_method(
-            "validate_address", address_string, min_score, max_results
+            "validate_address",
+            normalize_address(address_string),
+            min_score,
+            max_results,
         )
         
         cached_result = await self._cache.get(cache_key)
@@ -167,21 +187,25 @@ class BCGeocoderService:
             result = await self._make_request(url, params)
             addresses = self._parse_bc_geocoder_response(result)
             
-            # Cache successful results
-            if addresses:
-                await self._cache.set(cache_key, addresses)
-                logger.debug(f"Cached {len(addresses)} addresses for: {address_string[:50]}...")
+            # Cache results, keeping addresses that matched nothing for less time
+            await self._cache.set(
+                cache_key, addresses, None if addresses else self._cache.negative_ttl
+            )
+            logger.debug(f"Cached {len(addresses)} addresses for: {address_string[:50]}...")
             
             return addresses
         except Exception as e:
             self._metrics["api_errors"] += 1
             logger.error(f"Address validation failed for '{address_string}': {e}")
+            if raise_errors:
+                raise
             return []
 
     async def forward_geocode(
         self,
         address_string: str,
-        use_fallback: bool = True
+        use_fallback: bool = True,
+        raise_errors: bool = False
     ) -> GeocodingResult:
         """
         Convert an address to coordinates (forward geocoding).
@@ -189,17 +213,27 @@ class BCGeocoderService:
         Args:
             address_string: The address to geocode
             use_fallback: Whether to use Nominatim as fallback
+            raise_errors: Whether to raise the last upstream error when no
+                geocoder could place the address because of it, rather than
+                return a failed result
             
         Returns:
             GeocodingResult with coordinates
         """
-        cache_key = f"forward:{address_string}"
+        cache_key = self._forward_cache_key(address_string)
         cached_result = await self._cache.get(cache_key)
         if cached_result is not None:
+            self._metrics["cache_hits"] += 1
             return cached_result
 
         # Try BC Geocoder first
-        addresses = await self.validate_address(address_string, min_score=50, max_results=1)
+        upstream_error = None
+        try:
+            addresses = await self.validate_address(
+                address_string, min_score=50, max_results=1, raise_errors=True
+            )
+        except Exception as e:
+            addresses, upstream_error = [], e
         
         if addresses and addresses[0].latitude and addresses[0].longitude:
             result = GeocodingResult(
@@ -207,23 +241,28 @@ class BCGeocoderService:
                 address=addresses[0],
                 source="bc_geocoder"
             )
-            await self._cache.set(cache_key, result)
+            await self._cache_result(cache_key, result)
             return result
 
         # Fallback to Nominatim if enabled
         if use_fallback:
             try:
                 result = await self._nominatim_forward_geocode(address_string)
-                await self._cache.set(cache_key, result)
+                await self._cache_result(cache_key, result)
                 return result
             except Exception as e:
                 logger.warning(f"Nominatim fallback failed for '{address_string}': {e}")
+                upstream_error = e
 
+        if upstream_error is not None and raise_errors:
+            raise upstream_error
         result = GeocodingResult(
             success=False,
             error=f"No coordinates found for address: {address_string}"
         )
-        self._cache[cache_key] = result
+        # Failures to reach a geocoder are not cached, so they are retried
+        if not use_fallback and upstream_error is None:
+            await self._cache_result(cache_key, result)
         return result
 
     async def reverse_geocode(
@@ -252,7 +291,7 @@ class BCGeocoderService:
         # Use Nominatim for reverse geocoding
         try:
             result = await self._nominatim_reverse_geocode(latitude, longitude)
-            await self._cache.set(cache_key, result)
+            await self._cache_result(cache_key, result)
             return result
         except Exception as e:
             logger.error(f"Reverse geocoding failed: {e}")
@@ -260,47 +299,78 @@ class BCGeocoderService:
                 success=False,
                 error=f"Reverse geocoding failed: {e}"
             )
-            await self._cache.set(cache_key, result)
+            await self._cache_result(cache_key, result)
             return result
 
     async def batch_geocode(
         self,
         addresses: List[str],
-        batch_size: int = 5
+        batch_size: int = 5,
+        timeout: Optional[float] = None
     ) -> List[GeocodingResult]:
         """
         Perform batch geocoding of multiple addresses.
         
         Args:
             addresses: List of address strings to geocode
-            batch_size: Number of addresses to process concurrently
+            batch_size: Most addresses geocoded concurrently
+            timeout: Seconds allowed for each address, including any wait for
+                the rate limit; the client timeout by default
             
         Returns:
-            List of GeocodingResult objects
+            List of GeocodingResult objects, in input order
         """
-        results = []
-        
-        for i in range(0, len(addresses), batch_size):
-            batch = addresses[i:i + batch_size]
-            
-            # Process batch concurrently
-            batch_tasks = [self.forward_geocode(addr) for addr in batch]
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    results.append(GeocodingResult(
-                        success=False,
-                        error=str(result)
-                    ))
-                else:
-                    results.append(result)
-            
-            # Rate limiting
-            if i + batch_size < len(addresses):
-                await asyncio.sleep(self.rate_limit_delay)
+        return [
+            result
+            async for result in self.iter_batch_geocode(addresses, batch_size, timeout)
+        ]
+
+    async def iter_batch_geocode(
+        self,
+        addresses: List[str],
+        batch_size: int = 5,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[GeocodingResult]:
+        """
+        Geocode multiple addresses, yielding results in input order as they
+        become ready. Cached results are read in one batch, and the rest are
+        geocoded in a sliding window that backs off while requests fail or
+        time out.
         
-        return results
+        Args:
+            addresses: List of address strings to geocode
+            batch_size: Most addresses geocoded concurrently
+            timeout: Seconds allowed for each address, including any wait for
+                the rate limit; the client timeout by default
+        """
+        cached = await self._cache.get_many(
+            [self._forward_cache_key(address) for address in addresses]
+        )
+        uncached = [
+            address for address, result in zip(addresses, cached) if result is None
+        ]
+        self._metrics["cache_hits"] += len(addresses) - len(uncached)
+        
+        # Upstream errors are raised so that they shrink the window
+        geocoded = ordered_map(
+            partial(self.forward_geocode, raise_errors=True),
+            uncached,
+            AdaptiveLimit(batch_size, batch_size),
+            timeout or self.timeout,
+        )
+        try:
+            for result in cached:
+                if result is None:
+                    result = await geocoded.__anext__()
+                if isinstance(result, asyncio.TimeoutError):
+                    result = GeocodingResult(success=False, error="Geocoding timed out")
+                elif isinstance(result, Exception):
+                    result = GeocodingResult(
+                        success=False, error=f"Geocoding failed: {result}"
+                    )
+                yield result
+        finally:
+            await geocoded.aclose()
 
     async def check_bc_boundary(
         self,
@@ -308,7 +378,8 @@ class BCGeocoderService:
         longitude: float
     ) -> bool:
         """
-        Check if coordinates are within BC boundaries.
+        Check if coordinates are within BC boundaries. The local spatial
+        index answers unless the point is close to the border.
         
         Args:
             latitude: Latitude coordinate
@@ -317,7 +388,11 @@ class BCGeocoderService:
         Returns:
             True if coordinates are within BC, False otherwise
         """
-        # First try reverse geocoding to get precise location
+        in_bc = get_bc_spatial_index().locate(latitude, longitude)
+        if in_bc is not None:
+            return in_bc
+
+        # Near the border, reverse geocode to get precise location
         result = await self.reverse_geocode(latitude, longitude)
         
         if result.success and result.address:
@@ -373,6 +448,17 @@ class BCGeocoderService:
         await self._cache.shutdown()
         logger.info("BC Geocoder service shutdown complete")
 
+    def _forward_cache_key(self, address_string: str) -> str:
+        return self._cache.cache_key_for_method(
+            "forward", normalize_address(address_string)
+        )
+
+    async def _cache_result(self, cache_key: str, result: GeocodingResult) -> None:
+        """Cache a result, keeping one that found nothing for less time."""
+        await self._cache.set(
+            cache_key, result, None if result.success else self._cache.negative_ttl
+        )
+
     def _build_street_address_from_properties(self, properties: Dict[str, Any]) -> Optional[str]:
         """Build street address from BC Geocoder response properties."""
         parts = []
@@ -409,14 +495,19 @@ class BCGeocoderService:
         self,
         url: str,
         params: Dict[str, Any],
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        limiter: Optional[TokenBucket] = None
     ) -> Dict[str, Any]:
-        """Make an HTTP request with retry logic."""
+        """
+        Make an HTTP request with retry logic, waiting for ``limiter``
+        (the BC Geocoder's by default) before each attempt.
+        """
         default_headers = {"User-Agent": self.user_agent}
         if headers:
             default_headers.update(headers)
 
         for attempt in range(self.max_retries):
+            await (limiter or rate_limiter).acquire()
             try:
                 async with httpx.AsyncClient(timeout=self.timeout) as client:
                     response = await client.get(
@@ -474,7 +565,7 @@ class BCGeocoderService:
         }
         
         url = f"{self.nominatim_url}/search"
-        response = await self._make_request(url, params)
+        response = await self._make_request(url, params, limiter=nominatim_rate_limiter)
         
         if not response:
             return GeocodingResult(
@@ -516,7 +607,7 @@ class BCGeocoderService:
         }
         
         url = f"{self.nominatim_url}/reverse"
-        response = await self._make_request(url, params)
+        response = await self._make_request(url, params, limiter=nominatim_rate_limiter)
         
         if not response:
             return GeocodingResult(
@@ -40,7 +40,8 @@ def get_geocoder_service(redis_client: Redis) -> BCGeocoderService:
             "LCFS/1.0 (lcfs@gov.bc.ca)"
         ),
         cache_ttl=int(os.getenv("GEOCODER_CACHE_TTL", "3600")),
-        api_key=os.getenv("BC_GEOCODER_API_KEY")
+        api_key=os.getenv("BC_GEOCODER_API_KEY"),
+        negative_cache_ttl=int(os.getenv("GEOCODER_NEGATIVE_CACHE_TTL", "300"))
     )
 
 
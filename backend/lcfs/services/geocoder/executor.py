@@ -0,0 +1,87 @@
+"""
+Sliding-window execution for batch geocoding.
+
+Calls run concurrently up to a limit, and the next one starts as soon as
+any finishes, so a slow address holds up only its own slot. The limit
+adapts to the geocoder: it grows by one for each limit's worth of calls
+that succeed and halves when a call fails or times out. Results come back
+in input order, each as soon as every earlier one is ready.
+"""
+
+import asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class AdaptiveLimit:
+    """A concurrency limit with additive increase and multiplicative decrease."""
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1) -> None:
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self._limit = float(min(max(initial, self.minimum), self.maximum))
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def succeeded(self) -> None:
+        self._limit = min(self._limit + 1 / self._limit, self.maximum)
+
+    def failed(self) -> None:
+        self._limit = max(self._limit / 2, self.minimum)
+
+
+async def ordered_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Sequence[T],
+    limit: AdaptiveLimit,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[Union[R, BaseException]]:
+    """
+    Yields ``func(item)`` for each item in order, running no more calls at
+    once than ``limit`` allows. A call that raises, or takes longer than
+    ``timeout`` seconds, yields its exception instead.
+    """
+    running: Dict[asyncio.Task, int] = {}
+    results: Dict[int, Any] = {}
+    started = yielded = 0
+    try:
+        while yielded < len(items):
+            while started < len(items) and len(running) < limit.limit:
+                task = asyncio.ensure_future(
+                    asyncio.wait_for(func(items[started]), timeout)
+                )
+                running[task] = started
+                started += 1
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    limit.succeeded()
+                    results[index] = task.result()
+                else:
+                    limit.failed()
+                    results[index] = error
+            while yielded in results:
+                yield results.pop(yielded)
+                yielded += 1
+    finally:
+        # The caller stopped early
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
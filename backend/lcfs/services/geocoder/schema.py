@@ -29,13 +29,14 @@ class ReverseGeocodeRequest(BaseModel):
 class BatchGeocodeRequest(BaseModel):
     """Request schema for batch geocoding."""
     addresses: List[str] = Field(..., description="List of addresses to geocode")
-    batch_size: int = Field(5, ge=1, le=20, description="Batch processing size")
+    batch_size: int = Field(5, ge=1, le=20, description="Most addresses geocoded concurrently")
 
 
 class BoundaryCheckRequest(BaseModel):
     """Request schema for BC boundary checking."""
     latitude: float = Field(..., ge=-90, le=90, description="Latitude coordinate")
     longitude: float = Field(..., ge=-180, le=180, description="Longitude coordinate")
+    postal_code: Optional[str] = Field(None, description="Postal code to check against the coordinates")
 
 
 class AutocompleteRequest(BaseModel):
@@ -78,6 +79,9 @@ class AutocompleteResponse(BaseModel):
 class BoundaryCheckResponse(BaseModel):
     """Response schema for BC boundary checking."""
     is_in_bc: bool = Field(..., description="Whether coordinates are within BC")
+    postal_code_plausible: Optional[bool] = Field(
+        None, description="Whether the postal code fits the coordinates, if it can be told"
+    )
 
 
 class BatchGeocodeResponse(BaseModel):
@@ -0,0 +1,320 @@
+"""
+In-memory spatial index for BC boundary and postal code checks.
+
+The BC boundary is bundled as a simplified ring whose edges are held in an
+STR-tree, so deciding whether a point is in BC takes a few dozen
+microseconds and no network call. Each edge carries how far, in km, the
+simplified edge may stray from the real border: survey lines such as the
+49th parallel are exact, while the coast is drawn offshore and mountain
+borders are approximate. A point that close to an edge is reported as
+undetermined, and callers that need an answer there fall back to the
+geocoder.
+
+Postal codes are checked against the province their first letter belongs
+to, and for forward sortation areas (the first three characters) known to
+lie in a compact area, against the area's rough centre.
+"""
+
+import math
+from functools import lru_cache
+from typing import Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# min x, min y, max x, max y
+Box = Tuple[float, float, float, float]
+
+KM_PER_DEGREE_LAT = 110.57
+KM_PER_DEGREE_LON_AT_EQUATOR = 111.32
+
+# The BC boundary as (latitude, longitude, km) vertices, where km is the
+# tolerance of the edge to the next vertex. The ring runs west along the
+# 49th parallel, around Vancouver Island and Haida Gwaii offshore, up the
+# Alaska border, east along the 60th parallel, south down the 120th
+# meridian and along the continental divide.
+BC_BOUNDARY = (
+    (49.000, -114.068, 1),
+    (49.000, -123.322, 3),
+    (48.772, -123.008, 5),
+    (48.670, -123.250, 5),
+    (48.420, -123.180, 5),
+    (48.290, -123.250, 5),
+    (48.230, -123.550, 5),
+    (48.300, -124.000, 5),
+    (48.490, -124.750, 10),
+    (49.000, -126.600, 10),
+    (49.900, -128.100, 10),
+    (50.800, -129.400, 10),
+    (51.750, -131.200, 10),
+    (53.200, -133.300, 10),
+    (54.300, -133.500, 10),
+    (54.660, -132.680, 10),
+    (54.710, -130.610, 15),
+    (55.300, -130.100, 15),
+    (55.910, -130.020, 20),
+    (56.100, -130.100, 20),
+    (56.700, -131.820, 20),
+    (57.200, -132.250, 20),
+    (57.800, -133.100, 20),
+    (58.400, -133.400, 20),
+    (59.050, -134.200, 20),
+    (59.600, -135.100, 20),
+    (59.450, -136.350, 20),
+    (58.900, -137.530, 20),
+    (60.000, -139.050, 1),
+    (60.000, -120.000, 2),
+    (53.800, -120.000, 15),
+    (52.890, -118.460, 15),
+    (52.380, -118.180, 15),
+    (52.150, -117.440, 15),
+    (51.810, -116.770, 15),
+    (51.450, -116.290, 15),
+    (51.230, -116.050, 15),
+    (50.870, -115.650, 15),
+    (50.570, -115.250, 15),
+    (50.200, -114.750, 15),
+    (49.630, -114.700, 15),
+)
+
+# Provinces and territories by the first letter of their postal codes
+PROVINCE_BY_POSTAL_LETTER = {
+    "A": "NL",
+    "B": "NS",
+    "C": "PE",
+    "E": "NB",
+    "G": "QC",
+    "H": "QC",
+    "J": "QC",
+    "K": "ON",
+    "L": "ON",
+    "M": "ON",
+    "N": "ON",
+    "P": "ON",
+    "R": "MB",
+    "S": "SK",
+    "T": "AB",
+    "V": "BC",
+    "X": "NT",
+    "Y": "YT",
+}
+
+# Rough centres and radii (latitude, longitude, km) of areas made up of
+# BC forward sortation areas (the first three characters of a postal code)
+# that are each known to lie within the area. FSAs that are not listed,
+# such as rural codes (V0) and those of the interior or the north coast,
+# are checked against BC as a whole, so a code is only rejected for being
+# far from an area it certainly belongs to.
+_FSA_AREAS = (
+    # Vancouver, Burnaby and Richmond
+    (
+        (49.25, -123.05, 25),
+        "V5A V5B V5C V5E V5G V5H V5J V5K V5L V5M V5N V5P V5R V5S V5T V5V "
+        "V5W V5X V5Y V5Z V6A V6B V6C V6E V6G V6H V6J V6K V6L V6M V6N V6P "
+        "V6R V6S V6T V6V V6W V6X V6Y V6Z",
+    ),
+    # Richmond, North and West Vancouver
+    (
+        (49.25, -123.10, 30),
+        "V7A V7B V7C V7E V7G V7H V7J V7K V7L V7M V7N V7P V7R V7S V7T V7V "
+        "V7W V7X V7Y",
+    ),
+    # The Tri-Cities, New Westminster, Surrey, Delta, Langley, Maple Ridge
+    # and Abbotsford
+    (
+        (49.15, -122.70, 60),
+        "V3A V3B V3C V3E V3G V3H V3J V3K V3L V3M V3N V3R V3S V3T V3V V3W "
+        "V3X V3Y V3Z V4A V4B V4C V4E V4G V4K V4L V4M V4N V4P V4R V4W V4X",
+    ),
+    # Greater Victoria
+    (
+        (48.45, -123.40, 30),
+        "V8N V8P V8R V8S V8T V8V V8W V8X V8Y V8Z V9A V9B V9C V9E",
+    ),
+    # The rest of Vancouver Island
+    (
+        (49.40, -124.50, 200),
+        "V9G V9H V9J V9K V9L V9M V9N V9P V9R V9S V9T V9V V9W V9X V9Y V9Z",
+    ),
+)
+
+POSTAL_FSA_CENTROIDS = {
+    fsa: centroid for centroid, fsas in _FSA_AREAS for fsa in fsas.split()
+}
+
+
+def _union(boxes: Sequence[Box]) -> Box:
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class STRtree(Generic[T]):
+    """
+    A static R-tree bulk loaded with Sort-Tile-Recursive packing: entries
+    are sorted into vertical slices by x, each slice is sorted by y and cut
+    into nodes of ``node_capacity``, and the nodes are packed the same way
+    until one remains.
+    """
+
+    def __init__(self, entries: Sequence[Tuple[Box, T]], node_capacity: int = 8):
+        self.node_capacity = node_capacity
+        # A level is a list of (box, children, is_leaf) nodes
+        level = self._pack([(box, item, True) for box, item in entries])
+        while len(level) > 1:
+            level = self._pack(level)
+        self._root = level[0] if level else None
+
+    def _pack(self, nodes: list) -> list:
+        capacity = self.node_capacity
+        node_count = math.ceil(len(nodes) / capacity)
+        if not node_count:
+            return []
+        slice_size = capacity * math.ceil(math.sqrt(node_count))
+        nodes = sorted(nodes, key=lambda node: node[0][0] + node[0][2])
+        packed = []
+        for start in range(0, len(nodes), slice_size):
+            tile = sorted(
+                nodes[start : start + slice_size],
+                key=lambda node: node[0][1] + node[0][3],
+            )
+            for offset in range(0, len(tile), capacity):
+                children = tile[offset : offset + capacity]
+                packed.append(
+                    (_union([child[0] for child in children]), children, False)
+                )
+        return packed
+
+    def query(self, box: Box) -> Iterator[T]:
+        """Yields the items whose boxes intersect ``box``."""
+        if self._root is None:
+            return
+        stack = [self._root]
+        while stack:
+            node_box, children, is_leaf = stack.pop()
+            if not _intersects(node_box, box):
+                continue
+            if is_leaf:
+                yield children
+            else:
+                stack.extend(children)
+
+
+# An edge is (x1, y1, x2, y2, tolerance km) in longitude and latitude
+Edge = Tuple[float, float, float, float, float]
+
+
+def _distance_km(lat: float, lon: float, edge: Edge) -> float:
+    """Distance from a point to an edge, on a plane tangent at the point."""
+    x1, y1, x2, y2, _ = edge
+    kx = KM_PER_DEGREE_LON_AT_EQUATOR * math.cos(math.radians(lat))
+    ax, ay = (x1 - lon) * kx, (y1 - lat) * KM_PER_DEGREE_LAT
+    bx, by = (x2 - lon) * kx, (y2 - lat) * KM_PER_DEGREE_LAT
+    dx, dy = bx - ax, by - ay
+    length = dx * dx + dy * dy
+    t = 0.0 if length == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length))
+    return math.hypot(ax + t * dx, ay + t * dy)
+
+
+class BCSpatialIndex:
+    """Answers BC boundary and postal code checks from bundled data."""
+
+    def __init__(self, boundary: Sequence[Tuple[float, float, float]] = BC_BOUNDARY):
+        edges: List[Edge] = [
+            (lon, lat, next_lon, next_lat, km)
+            for (lat, lon, km), (next_lat, next_lon, _) in zip(
+                boundary, boundary[1:] + boundary[:1]
+            )
+        ]
+        self._max_tolerance = max(edge[4] for edge in edges)
+        self._bounds = _union([self._edge_box(edge) for edge in edges])
+        self._edges = STRtree([(self._edge_box(edge), edge) for edge in edges])
+
+    @staticmethod
+    def _edge_box(edge: Edge) -> Box:
+        x1, y1, x2, y2, _ = edge
+        return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+    def locate(self, latitude: float, longitude: float) -> Optional[bool]:
+        """
+        Whether the point is in BC, or None if it is too close to the border
+        for the simplified boundary to tell.
+        """
+        margin_lat = self._max_tolerance / KM_PER_DEGREE_LAT
+        margin_lon = self._max_tolerance / (
+            KM_PER_DEGREE_LON_AT_EQUATOR * max(math.cos(math.radians(latitude)), 0.01)
+        )
+        near = (
+            longitude - margin_lon,
+            latitude - margin_lat,
+            longitude + margin_lon,
+            latitude + margin_lat,
+        )
+        if not _intersects(near, self._bounds):
+            return False
+        for edge in self._edges.query(near):
+            if _distance_km(latitude, longitude, edge) <= edge[4]:
+                return None
+
+        # Count the edges crossed by a ray running east from the point
+        crossings = 0
+        ray = (longitude, latitude, self._bounds[2], latitude)
+        for x1, y1, x2, y2, _ in self._edges.query(ray):
+            if (y1 > latitude) != (y2 > latitude):
+                if longitude < x1 + (latitude - y1) * (x2 - x1) / (y2 - y1):
+                    crossings += 1
+        return crossings % 2 == 1
+
+    def postal_code_plausible(
+        self, postal_code: str, latitude: float, longitude: float
+    ) -> Optional[bool]:
+        """
+        Whether the point is plausibly where the postal code is, or None if
+        the index cannot tell: the point is too close to the border, or the
+        code is not one the index knows.
+        """
+        code = postal_code.replace(" ", "").upper()
+        province = PROVINCE_BY_POSTAL_LETTER.get(code[:1])
+        if province is None:
+            return None
+        in_bc = self.locate(latitude, longitude)
+        if province != "BC":
+            # Other provinces are not indexed, but a BC point is not in one
+            return False if in_bc else None
+        if in_bc is False:
+            return False
+
+        centroid = POSTAL_FSA_CENTROIDS.get(code[:3])
+        if centroid is None:
+            return in_bc
+        centre_lat, centre_lon, radius = centroid
+        centre = (centre_lon, centre_lat, centre_lon, centre_lat, 0)
+        return _distance_km(latitude, longitude, centre) <= radius
+
+    def site_location_error(
+        self, postal_code: str, latitude: float, longitude: float
+    ) -> Optional[str]:
+        """
+        Why the coordinates of a site in BC are wrong: outside BC, or far
+        from the site's postal code. None if they may be right.
+        """
+        if self.locate(latitude, longitude) is False:
+            return f"Coordinates ({latitude}, {longitude}) are outside British Columbia"
+        if self.postal_code_plausible(postal_code, latitude, longitude) is False:
+            return (
+                f"Coordinates ({latitude}, {longitude}) are not near "
+                f"postal code {postal_code}"
+            )
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_bc_spatial_index() -> BCSpatialIndex:
+    """The process's index, built on first use."""
+    return BCSpatialIndex()
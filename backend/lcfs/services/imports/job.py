@@ -0,0 +1,442 @@
+import asyncio
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import PurePath
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+from fastapi import HTTPException, UploadFile
+from openpyxl import load_workbook
+from openpyxl.worksheet.worksheet import Worksheet
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lcfs.db.models import UserProfile
+from lcfs.services.clamav.client import ClamAVService
+from lcfs.services.imports.runtime import (
+    get_job_redis,
+    import_session,
+    write_job_progress,
+)
+from lcfs.services.rendering.pool import run_in_render_pool
+from lcfs.services.s3.dependency import create_s3_client
+from lcfs.services.s3.exports import ExportArtifactStorage
+from lcfs.settings import settings
+from lcfs.utils.constants import FILE_MEDIA_TYPE
+from lcfs.utils.spreadsheet_builder import SpreadsheetBuilder, SpreadsheetColumn
+from lcfs.web.exception.exceptions import DataNotFoundException
+
+logger = structlog.get_logger(__name__)
+
+# Rows validated and written between progress updates
+IMPORT_CHUNK_SIZE = 100
+
+# Rows a row checker validates per task on the process pool, so a batch
+# is spread over several workers
+IMPORT_VALIDATION_SLICE = 100
+
+# (row number, message) pairs; a None message rejects the row silently
+RowErrors = List[Tuple[int, Optional[str]]]
+
+# (row number, accepted, error, parsed row) for each checked row
+CheckedRows = List[Tuple[int, bool, Optional[str], Any]]
+
+
+@dataclass(frozen=True)
+class ImportColumn:
+    """A sheet column; rows that leave a required column blank are rejected."""
+
+    label: str
+    required: bool = False
+
+
+class RowRejected(Exception):
+    """
+    Raised from a row hook to reject the row. The message, if any, is
+    reported as the row's error.
+    """
+
+
+def load_worksheet(file: UploadFile, sheet_name: Optional[str] = None) -> Worksheet:
+    """
+    Opens the named worksheet from the uploaded Excel file, or the first
+    sheet when no name is given. Raises an exception if the sheet does not
+    exist.
+
+    The workbook is opened read-only, so rows are parsed as they are
+    iterated rather than all up front, and the sheet keeps the file open
+    until ``sheet.parent.close()`` is called.
+    """
+    workbook = load_workbook(
+        filename=file.file, read_only=True, data_only=True, keep_links=False
+    )
+    if sheet_name is None:
+        sheet_name = workbook.sheetnames[0]
+    if sheet_name not in workbook.sheetnames:
+        workbook.close()
+        raise Exception(f"Uploaded Excel does not contain a '{sheet_name}' sheet.")
+    return workbook[sheet_name]
+
+
+def check_rows(
+    checker: Callable[[int, list], Any], rows: List[Tuple[int, list]]
+) -> CheckedRows:
+    """
+    Validates and parses rows with ``checker``, which returns the parsed row
+    or raises RowRejected. Runs on the process pool for importers with a
+    row checker, so it only uses what it is passed.
+    """
+    checked: CheckedRows = []
+    for row_idx, row in rows:
+        try:
+            checked.append((row_idx, True, None, checker(row_idx, row)))
+        except RowRejected as e:
+            checked.append((row_idx, False, str(e) or None, None))
+        except Exception as e:
+            logger.error(str(e))
+            checked.append((row_idx, False, f"Row {row_idx}: {e}", None))
+    return checked
+
+
+def _next_rows(rows: Iterator, count: int) -> list:
+    return list(islice(rows, count))
+
+
+def _is_blank(value) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+class SpreadsheetImportJob:
+    """
+    A spreadsheet import run on the shared import loop.
+
+    Subclasses declare the sheet and its columns and implement the row
+    hooks; this class owns the session, the ClamAV scan, progress updates
+    and writing rows in chunks. Each row is written in its own savepoint so
+    a failing row is rejected without undoing the rows around it, while the
+    import as a whole still commits or rolls back in one transaction.
+
+    A dry run validates every row the same way but rolls the transaction
+    back, and stores the rejected rows as a downloadable error workbook.
+    """
+
+    sheet_name: Optional[str] = None
+    columns: Sequence[ImportColumn] = ()
+    # Treat the first blank row as the end of the data instead of skipping it
+    stop_at_blank_row = False
+    chunk_size = IMPORT_CHUNK_SIZE
+    # What is being imported, for log lines and failure messages
+    description = "data"
+
+    def __init__(
+        self, job_id: str, user: UserProfile, file: UploadFile, dry_run: bool = False
+    ) -> None:
+        self.job_id = job_id
+        self.user = user
+        self.file = file
+        self.dry_run = dry_run
+        self.session: Optional[AsyncSession] = None
+        self.redis_client = get_job_redis()
+        self._messages: List[Tuple[int, str]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears the counts, e.g. when a failed import is rolled back."""
+        self.created = 0
+        self.rejected = 0
+        self.errors: List[str] = []
+        self.row_errors: List[Tuple[int, str]] = []
+        # The next update tells readers to drop errors published before
+        self._published_errors = 0
+        self._reset_pending = True
+
+    def progress_data(self) -> dict:
+        """Counts reported with each progress update."""
+        return {"created": self.created, "rejected": self.rejected}
+
+    async def update_progress(self, progress: float, status_msg: str) -> None:
+        # Only errors added since the last update are sent
+        await write_job_progress(
+            self.redis_client,
+            self.job_id,
+            {
+                "progress": progress,
+                "status": status_msg,
+                **self.progress_data(),
+                "errors": self.errors[self._published_errors :],
+            },
+            reset=self._reset_pending,
+        )
+        self._published_errors = len(self.errors)
+        self._reset_pending = False
+
+    def load_sheet(self) -> Worksheet:
+        return load_worksheet(self.file, self.sheet_name)
+
+    async def prepare(self) -> None:
+        """Builds repositories, loads lookups and clears data being replaced."""
+
+    def row_values(self, row: tuple) -> list:
+        """Pads or trims a sheet row to the declared columns."""
+        if not self.columns:
+            return list(row)
+        values = list(row[: len(self.columns)])
+        return values + [None] * (len(self.columns) - len(values))
+
+    def validate_row(self, row_idx: int, row: list) -> Optional[str]:
+        """Returns an error message for an invalid row, or None."""
+        missing_fields = [
+            column.label
+            for column, value in zip(self.columns, row)
+            if column.required and _is_blank(value)
+        ]
+        if missing_fields:
+            return (
+                f"Row {row_idx}: Missing required fields: {', '.join(missing_fields)}"
+            )
+        return None
+
+    def parse_row(self, row_idx: int, row: list) -> Any:
+        """Converts a valid row into what write_row stores."""
+        return row
+
+    def row_checker(self) -> Optional[Callable[[int, list], Any]]:
+        """
+        A picklable function that validates and parses one row, returning
+        the parsed row or raising RowRejected. Importers whose row checks
+        need nothing but reference data loaded in prepare return one so
+        rows are checked in parallel on the process pool; by default rows
+        go through validate_row and parse_row on the import loop.
+        """
+        return None
+
+    def warn(self, row_idx: int, message: str) -> None:
+        """Reports a problem with a row that is still imported."""
+        self._messages.append((row_idx, message))
+
+    async def write_row(self, row_idx: int, parsed: Any) -> bool:
+        """Stores one parsed row. Returns False if it was skipped instead."""
+        raise NotImplementedError
+
+    async def write_chunk(self, chunk: List[Tuple[int, Any]]) -> Tuple[int, RowErrors]:
+        """
+        Stores a chunk of parsed rows and returns the number created and the
+        errors of rejected rows. Importers that can write a chunk in bulk
+        override this.
+        """
+        created = 0
+        errors: RowErrors = []
+        for row_idx, parsed in chunk:
+            try:
+                async with self.session.begin_nested():
+                    if await self.write_row(row_idx, parsed):
+                        created += 1
+            except RowRejected as e:
+                errors.append((row_idx, str(e) or None))
+            except HTTPException as e:
+                logger.warning(
+                    f"{self.description} import validation failed", error=e.detail
+                )
+                errors.append((row_idx, f"Row {row_idx}: {e.detail}"))
+            except Exception as e:
+                logger.error(str(e))
+                errors.append((row_idx, f"Row {row_idx}: {e}"))
+        return created, errors
+
+    async def check_chunk(self, chunk: List[Tuple[int, Any]]) -> Tuple[int, RowErrors]:
+        """
+        Validates a chunk of parsed rows in a dry run, returning the number
+        that would be created and the errors of rejected rows. By default
+        the chunk goes through write_chunk and its writes are rolled back
+        with the dry run; importers that can check a chunk without writing
+        it override this.
+        """
+        return await self.write_chunk(chunk)
+
+    async def finish(self) -> None:
+        """Runs after the last row, inside the import transaction."""
+
+    async def run(self) -> dict:
+        logger.debug(f"Importing {self.description}...", job_id=self.job_id)
+        try:
+            if settings.clamav_enabled:
+                await self.update_progress(5, "Scanning file with ClamAV...")
+                await ClamAVService(self.redis_client).scan_file(self.file)
+
+            async with import_session(self.user, commit=not self.dry_run) as session:
+                self.session = session
+                await self.update_progress(10, "Initializing services...")
+                await self.prepare()
+
+                await self.update_progress(20, "Loading Excel sheet...")
+                sheet = await asyncio.to_thread(self.load_sheet)
+
+                await self.update_progress(
+                    20,
+                    (
+                        "Beginning validation..."
+                        if self.dry_run
+                        else "Beginning data import..."
+                    ),
+                )
+                await self._import_rows(sheet)
+                await self.finish()
+
+            report_key = None
+            if self.dry_run and self.row_errors:
+                await self.update_progress(99, "Saving error report...")
+                report_key = await self.store_report()
+        except DataNotFoundException as e:
+            return await self._fail("Data not found error.", e)
+        except Exception as e:
+            return await self._fail("Import process failed.", e)
+        finally:
+            self.session = None
+
+        result = {
+            "success": True,
+            "created": self.created,
+            "errors": self.errors,
+            "rejected": self.rejected,
+        }
+        if self.dry_run:
+            await self.update_progress(100, "Validation completed.")
+            logger.debug(f"Validated {self.description}, {self.rejected} rows rejected")
+            return {**result, "dry_run": True, "report_key": report_key}
+
+        # Reported once the transaction has committed
+        await self.update_progress(100, "Import process completed.")
+        logger.debug(
+            f"Completed importing {self.description}, {self.created} rows created"
+        )
+        return result
+
+    async def store_report(self) -> str:
+        """
+        Stores the rejected rows as an Excel workbook next to the export
+        artifacts, which expire on their own, and returns its key.
+        """
+        builder = SpreadsheetBuilder(file_format="xlsx", streaming=True)
+        builder.add_sheet(
+            sheet_name="Errors",
+            columns=[
+                SpreadsheetColumn("Row", "int"),
+                SpreadsheetColumn("Error", "text"),
+            ],
+            rows=[
+                [row_idx, message.removeprefix(f"Row {row_idx}: ")]
+                for row_idx, message in self.row_errors
+            ],
+        )
+        content = await asyncio.to_thread(builder.build_spreadsheet)
+
+        key = ExportArtifactStorage.artifact_key("import_validation", self.job_id)
+        file_name = f"{PurePath(self.file.filename or 'import').stem}_errors.xlsx"
+        await ExportArtifactStorage(create_s3_client()).put(
+            key, content, file_name, FILE_MEDIA_TYPE.XLSX.value
+        )
+        return key
+
+    async def _import_rows(self, sheet: Worksheet) -> None:
+        # Taken from the sheet's dimension record, which is missing or wrong
+        # in files from some writers; progress then just counts rows
+        row_count = sheet.max_row
+        rows = enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2)
+        chunk: List[Tuple[int, Any]] = []
+
+        try:
+            while True:
+                # Parsing the XML is the slow part, so each batch of rows is
+                # read off the import loop
+                batch = await asyncio.to_thread(_next_rows, rows, self.chunk_size)
+                if not batch:
+                    break
+                if await self._import_batch(batch, chunk, row_count):
+                    break
+        finally:
+            sheet.parent.close()
+
+        await self._flush(chunk)
+
+    async def _import_batch(
+        self,
+        batch: List[Tuple[int, tuple]],
+        chunk: List[Tuple[int, Any]],
+        row_count: Optional[int],
+    ) -> bool:
+        """Validates and parses a batch of rows. Returns True at the end of the data."""
+        rows: List[Tuple[int, list]] = []
+        end_of_data = False
+        for row_idx, row in batch:
+            if all(cell is None for cell in row):
+                if self.stop_at_blank_row:
+                    end_of_data = True
+                    break
+                continue
+            rows.append((row_idx, self.row_values(row)))
+
+        action = "Validating" if self.dry_run else "Importing"
+        for row_idx, accepted, error, parsed in await self._check_rows(rows):
+            if accepted:
+                chunk.append((row_idx, parsed))
+            else:
+                self._reject(row_idx, error)
+
+            if len(chunk) >= self.chunk_size:
+                await self._flush(chunk)
+                if row_count and row_count >= row_idx:
+                    await self.update_progress(
+                        20 + ((row_idx / row_count) * 80),
+                        f"{action} row {row_idx - 1} of {row_count - 1}...",
+                    )
+                else:
+                    await self.update_progress(20, f"{action} row {row_idx - 1}...")
+        return end_of_data
+
+    async def _check_rows(self, rows: List[Tuple[int, list]]) -> CheckedRows:
+        checker = self.row_checker()
+        if checker is None:
+            return check_rows(self._check_row, rows)
+
+        slices = [
+            rows[start : start + IMPORT_VALIDATION_SLICE]
+            for start in range(0, len(rows), IMPORT_VALIDATION_SLICE)
+        ]
+        checked = await asyncio.gather(
+            *(run_in_render_pool(check_rows, checker, rows) for rows in slices)
+        )
+        return [row for rows in checked for row in rows]
+
+    def _check_row(self, row_idx: int, row: list) -> Any:
+        error = self.validate_row(row_idx, row)
+        if error:
+            raise RowRejected(error)
+        return self.parse_row(row_idx, row)
+
+    async def _flush(self, chunk: List[Tuple[int, Any]]) -> None:
+        if chunk:
+            store = self.check_chunk if self.dry_run else self.write_chunk
+            created, errors = await store(chunk)
+            self.created += created
+            for row_idx, message in errors:
+                self._reject(row_idx, message)
+            chunk.clear()
+        # Messages are held until the chunk is written so they stay in row order
+        self._messages.sort(key=lambda message: message[0])
+        self.row_errors.extend(self._messages)
+        self.errors.extend(message for _, message in self._messages)
+        self._messages.clear()
+
+    def _reject(self, row_idx: int, message: Optional[str]) -> None:
+        self.rejected += 1
+        if message:
+            self._messages.append((row_idx, message))
+
+    async def _fail(self, status_msg: str, error: Exception) -> dict:
+        logger.error(
+            f"Could not import {self.description}", job_id=self.job_id, error=str(error)
+        )
+        # Nothing was kept, so only the reason is reported
+        self.reset()
+        self.errors = [str(error)]
+        await self.update_progress(100, status_msg)
+        return {"success": False, "created": 0, "errors": self.errors, "rejected": 0}
@@ -0,0 +1,159 @@
+import hashlib
+import io
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+import structlog
+from fastapi import HTTPException, UploadFile
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lcfs.db.base import current_user_var
+from lcfs.db.dependencies import set_user_context
+from lcfs.db.models import UserProfile
+from lcfs.services.job_queue.queue import JobFailed, JobQueue, QueuedJob
+from lcfs.services.job_queue.worker import get_job_resources
+from lcfs.services.redis.job_progress import publish_job_progress, read_job_progress
+from lcfs.utils.constants import (
+    ALLOWED_FILE_TYPES,
+    ALLOWED_MIME_TYPES,
+    MAX_FILE_SIZE_BYTES,
+    MAX_FILE_SIZE_MB,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Seconds an import job's status stays readable after its last update
+IMPORT_JOB_TTL = 5 * 60
+
+# Import jobs are retried once if the worker running them stops. An import
+# commits in a single transaction, so a retry starts from a clean slate.
+IMPORT_JOB_ATTEMPTS = 2
+
+
+async def queue_import(
+    queue: JobQueue,
+    job_type: str,
+    user: UserProfile,
+    file: UploadFile,
+    payload: dict,
+    organization_id: Optional[int] = None,
+) -> Tuple[str, bool]:
+    """
+    Validates the upload and queues the import with the file attached.
+    Returns the job_id and whether a new job was queued: uploading the same
+    file for the same target while its import is still queued or running
+    returns that import instead.
+    """
+    copied_file = await read_upload(file)
+    contents = copied_file.file.getvalue()
+    fingerprint = hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode() + contents
+    ).hexdigest()
+    return await queue.enqueue(
+        job_type,
+        payload,
+        user=user,
+        organization_id=organization_id,
+        idempotency_key=f"{user.user_profile_id}:{fingerprint}",
+        input_file=contents,
+        input_file_name=copied_file.filename,
+    )
+
+
+def import_file(job: QueuedJob) -> UploadFile:
+    """The upload attached to a queued import."""
+    return UploadFile(filename=job.input_file_name, file=io.BytesIO(job.input_file))
+
+
+def import_result(result: dict) -> dict:
+    """
+    The result stored with a finished import job. Failed imports have
+    already reported why, so they fail the job without a retry.
+    """
+    if not result.get("success"):
+        raise JobFailed("; ".join(result.get("errors") or []) or "Import failed.")
+    return {key: value for key, value in result.items() if key != "errors"}
+
+
+def get_job_redis() -> Redis:
+    """The Redis client shared by jobs running on this process's job worker."""
+    return get_job_resources().redis_client
+
+
+@asynccontextmanager
+async def import_session(
+    user: UserProfile, commit: bool = True
+) -> AsyncIterator[AsyncSession]:
+    """
+    A pooled session for an import job, inside a transaction that commits
+    when the block exits and with the user set for auditing. With
+    ``commit=False`` the transaction is rolled back instead, as dry runs do.
+    """
+    async with get_job_resources().session_factory() as session:
+        async with session.begin() as transaction:
+            await set_user_context(session, user.keycloak_username)
+            current_user_var.set(user)
+            yield session
+            if not commit:
+                await transaction.rollback()
+
+
+async def read_upload(file: UploadFile) -> UploadFile:
+    """
+    Read an uploaded spreadsheet into memory, check its type and size, and
+    return an in-memory copy the job can use after the request has ended.
+    """
+    file_contents = await file.read()
+
+    if file.content_type not in ALLOWED_MIME_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type '{file.content_type or 'unknown'}' is not allowed. Please upload files of the following types: {ALLOWED_FILE_TYPES}",
+        )
+
+    if len(file_contents) > MAX_FILE_SIZE_BYTES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File size exceeds the maximum limit of {MAX_FILE_SIZE_MB} MB.",
+        )
+
+    return UploadFile(filename=file.filename, file=io.BytesIO(file_contents))
+
+
+async def write_job_progress(
+    redis_client: Redis, job_id: str, data: dict, reset: bool = False
+) -> None:
+    """
+    Persists the job status and progress in Redis. ``data["errors"]`` holds
+    only the errors raised since the last update.
+    """
+    await publish_job_progress(
+        redis_client, job_id, data, ttl=IMPORT_JOB_TTL, reset=reset
+    )
+
+
+async def read_job_status(
+    redis_client: Redis, job_id: str, extra_fields: Iterable[str] = ()
+) -> dict:
+    """
+    Retrieves and returns the job's progress and status from Redis.
+    """
+    try:
+        progress_data = await read_job_progress(redis_client, job_id)
+    except json.JSONDecodeError:
+        return {"progress": 0, "status": "Invalid status data found."}
+    if progress_data is None:
+        return {"progress": 0, "status": "No job found with this ID."}
+
+    status = {
+        "progress": progress_data.get("progress", 0),
+        "status": progress_data.get("status", "No status available."),
+        "created": progress_data.get("created", 0),
+        "rejected": progress_data.get("rejected", 0),
+    }
+    for field in extra_fields:
+        status[field] = progress_data.get(field, 0)
+    status["errors"] = progress_data.get("errors", [])
+    return status
@@ -0,0 +1 @@
+"""Durable background job queue."""
@@ -0,0 +1,55 @@
+"""
+Runs a standalone job worker:
+
+    python -m lcfs.services.job_queue [--concurrency N] [--job-type TYPE ...]
+
+Deploy it next to the API with ``LCFS_JOB_WORKER_EMBEDDED=false`` so
+imports and exports run on the worker pods only.
+"""
+
+import argparse
+import asyncio
+import signal
+
+from lcfs.services.job_queue.registry import load_job_handlers
+from lcfs.services.job_queue.worker import JobWorker, create_job_resources
+from lcfs.settings import settings
+
+
+async def _main(concurrency: int, job_types) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    resources = create_job_resources(concurrency)
+    try:
+        await JobWorker(resources, concurrency=concurrency, job_types=job_types).run(
+            stop
+        )
+    finally:
+        await resources.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run LCFS background jobs.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.job_worker_concurrency,
+        help="Jobs run at once by this worker",
+    )
+    parser.add_argument(
+        "--job-type",
+        action="append",
+        dest="job_types",
+        help="Only run jobs of this type; may be repeated",
+    )
+    args = parser.parse_args()
+
+    load_job_handlers()
+    asyncio.run(_main(max(args.concurrency, 1), args.job_types))
+
+
+if __name__ == "__main__":
+    main()
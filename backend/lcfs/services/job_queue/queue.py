@@ -0,0 +1,379 @@
+"""
+Durable queue of background jobs, kept in the ``background_job`` table.
+
+API processes enqueue jobs in the request's transaction, so a job exists
+only if the request that created it succeeded. Workers in any process or
+pod claim jobs with ``FOR UPDATE SKIP LOCKED`` and hold them under a lease
+they renew while the job runs; a job whose worker disappears is retried
+once its lease runs out.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+from fastapi import Depends
+from sqlalchemy import and_, func, not_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lcfs.db.dependencies import get_async_db_session
+from lcfs.db.models.tasks import BackgroundJob, BackgroundJobStatusEnum
+from lcfs.services.job_queue.registry import get_job_definition
+
+# Imported for typing only, so services that the user model imports can
+# depend on the queue
+if TYPE_CHECKING:
+    from lcfs.db.models.user.UserProfile import UserProfile
+
+logger = structlog.get_logger(__name__)
+
+# Seconds a claimed job is held before another worker may take it over
+JOB_LEASE_SECONDS = 60
+
+# Delay before the first retry of a failed job, doubled for each later one
+RETRY_BACKOFF_SECONDS = 30
+MAX_RETRY_BACKOFF_SECONDS = 15 * 60
+
+# Serializes claims so the running-job counts behind the limits are exact
+_CLAIM_LOCK_ID = 0x4C434653
+
+_ACTIVE = (BackgroundJobStatusEnum.QUEUED, BackgroundJobStatusEnum.RUNNING)
+
+
+class JobFailed(Exception):
+    """Raised by a handler to fail its job without retrying it."""
+
+
+@dataclass
+class QueuedJob:
+    """A claimed job as its handler sees it."""
+
+    job_id: str
+    job_type: str
+    payload: dict
+    attempt: int
+    organization_id: Optional[int] = None
+    user_profile_id: Optional[int] = None
+    input_file_name: Optional[str] = None
+    input_file: Optional[bytes] = None
+    user: Optional["UserProfile"] = None
+
+
+def retry_delay(attempt: int) -> int:
+    """Seconds to wait before retrying a job that failed ``attempt`` times."""
+    return min(
+        RETRY_BACKOFF_SECONDS * 2 ** max(attempt - 1, 0), MAX_RETRY_BACKOFF_SECONDS
+    )
+
+
+class JobQueue:
+    def __init__(self, db: AsyncSession = Depends(get_async_db_session)) -> None:
+        self.db = db
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Optional[dict] = None,
+        user: Optional["UserProfile"] = None,
+        organization_id: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
+        priority: Optional[int] = None,
+        input_file: Optional[bytes] = None,
+        input_file_name: Optional[str] = None,
+    ) -> Tuple[str, bool]:
+        """
+        Queues a job and returns its job_id and whether it was created. A
+        job with the same type and idempotency key that is still queued or
+        running is returned instead of queuing another.
+        """
+        definition = get_job_definition(job_type)
+        values = {
+            "job_id": str(uuid.uuid4()),
+            "job_type": job_type,
+            "status": BackgroundJobStatusEnum.QUEUED,
+            "priority": definition.priority if priority is None else priority,
+            "organization_id": organization_id,
+            "user_profile_id": user.user_profile_id if user else None,
+            "idempotency_key": idempotency_key,
+            "payload": payload or {},
+            "input_file": input_file,
+            "input_file_name": input_file_name,
+            "attempts": 0,
+            "max_attempts": definition.max_attempts,
+        }
+        if idempotency_key is None:
+            await self.db.execute(insert(BackgroundJob).values(**values))
+            return values["job_id"], True
+
+        statement = (
+            insert(BackgroundJob)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=["job_type", "idempotency_key"],
+                index_where=text("status IN ('QUEUED', 'RUNNING')"),
+            )
+            .returning(BackgroundJob.job_id)
+        )
+        # The conflicting job may finish between the insert and the lookup,
+        # in which case the insert is tried again
+        for _ in range(2):
+            if (await self.db.execute(statement)).scalar_one_or_none():
+                return values["job_id"], True
+            existing = await self.db.scalar(
+                select(BackgroundJob.job_id).where(
+                    BackgroundJob.job_type == job_type,
+                    BackgroundJob.idempotency_key == idempotency_key,
+                    BackgroundJob.status.in_(_ACTIVE),
+                )
+            )
+            if existing:
+                return existing, False
+        raise RuntimeError(f"Could not queue {job_type} job")
+
+    async def get(self, job_id: str) -> Optional[BackgroundJob]:
+        return await self.db.scalar(
+            select(BackgroundJob).where(BackgroundJob.job_id == job_id)
+        )
+
+    async def claim(
+        self,
+        worker_id: str,
+        job_types: Iterable[str],
+        lease_seconds: int = JOB_LEASE_SECONDS,
+    ) -> Optional[QueuedJob]:
+        """
+        Takes the highest-priority job that is due and within its type's
+        concurrency limits, or returns None. Jobs whose lease has expired
+        are first put back in the queue or failed.
+        """
+        job_types = list(job_types)
+        if not job_types:
+            return None
+
+        await self.db.execute(select(func.pg_advisory_xact_lock(_CLAIM_LOCK_ID)))
+        await self._recover_expired()
+
+        candidate = (
+            select(BackgroundJob.background_job_id)
+            .where(
+                BackgroundJob.status == BackgroundJobStatusEnum.QUEUED,
+                BackgroundJob.run_after <= func.now(),
+                BackgroundJob.job_type.in_(job_types),
+                *await self._limit_filters(job_types),
+            )
+            .order_by(
+                BackgroundJob.priority.desc(),
+                BackgroundJob.run_after,
+                BackgroundJob.background_job_id,
+            )
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        row = (
+            await self.db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.background_job_id == candidate.scalar_subquery())
+                .values(
+                    status=BackgroundJobStatusEnum.RUNNING,
+                    attempts=BackgroundJob.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=func.now() + timedelta(seconds=lease_seconds),
+                    started_at=func.now(),
+                )
+                .returning(
+                    BackgroundJob.job_id,
+                    BackgroundJob.job_type,
+                    BackgroundJob.payload,
+                    BackgroundJob.attempts,
+                    BackgroundJob.organization_id,
+                    BackgroundJob.user_profile_id,
+                    BackgroundJob.input_file_name,
+                )
+            )
+        ).one_or_none()
+        if row is None:
+            return None
+
+        return QueuedJob(
+            job_id=row.job_id,
+            job_type=row.job_type,
+            payload=row.payload,
+            attempt=row.attempts,
+            organization_id=row.organization_id,
+            user_profile_id=row.user_profile_id,
+            input_file_name=row.input_file_name,
+        )
+
+    async def read_input_file(self, job_id: str) -> Optional[bytes]:
+        return await self.db.scalar(
+            select(BackgroundJob.input_file).where(BackgroundJob.job_id == job_id)
+        )
+
+    async def heartbeat(
+        self, job_id: str, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS
+    ) -> bool:
+        """Renews the job's lease. Returns False if the worker no longer holds it."""
+        result = await self.db.execute(
+            update(BackgroundJob)
+            .where(
+                BackgroundJob.job_id == job_id,
+                BackgroundJob.locked_by == worker_id,
+                BackgroundJob.status == BackgroundJobStatusEnum.RUNNING,
+            )
+            .values(locked_until=func.now() + timedelta(seconds=lease_seconds))
+        )
+        return result.rowcount > 0
+
+    async def complete(
+        self, job_id: str, worker_id: str, result: Optional[dict] = None
+    ) -> None:
+        await self.db.execute(
+            update(BackgroundJob)
+            .where(
+                BackgroundJob.job_id == job_id,
+                BackgroundJob.locked_by == worker_id,
+            )
+            .values(
+                status=BackgroundJobStatusEnum.SUCCEEDED,
+                result=result,
+                last_error=None,
+                **self._released(),
+            )
+        )
+
+    async def fail(
+        self, job_id: str, worker_id: str, error: str, retry: bool = True
+    ) -> bool:
+        """
+        Records a failed attempt. Unless ``retry`` is False the job is
+        queued again after a backoff while it has attempts left; returns
+        whether it will be retried.
+        """
+        job = await self.db.scalar(
+            select(BackgroundJob)
+            .where(
+                BackgroundJob.job_id == job_id,
+                BackgroundJob.locked_by == worker_id,
+            )
+            .with_for_update()
+        )
+        if job is None:
+            return False
+        retry = retry and job.attempts < job.max_attempts
+        await self.db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.background_job_id == job.background_job_id)
+            .values(**self._failed_values(job.attempts, retry, error))
+        )
+        return retry
+
+    async def _recover_expired(self) -> None:
+        expired = (
+            await self.db.execute(
+                select(
+                    BackgroundJob.background_job_id,
+                    BackgroundJob.job_id,
+                    BackgroundJob.attempts,
+                    BackgroundJob.max_attempts,
+                )
+                .where(
+                    BackgroundJob.status == BackgroundJobStatusEnum.RUNNING,
+                    BackgroundJob.locked_until < func.now(),
+                )
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+        for job in expired:
+            retry = job.attempts < job.max_attempts
+            logger.warning("Job lease expired", job_id=job.job_id, will_retry=retry)
+            await self.db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.background_job_id == job.background_job_id)
+                .values(
+                    **self._failed_values(
+                        job.attempts, retry, "The worker running the job stopped."
+                    )
+                )
+            )
+
+    async def _limit_filters(self, job_types: List[str]) -> list:
+        """Conditions excluding job types and organizations at their limits."""
+        running = (
+            await self.db.execute(
+                select(
+                    BackgroundJob.job_type,
+                    BackgroundJob.organization_id,
+                    func.count(),
+                )
+                .where(BackgroundJob.status == BackgroundJobStatusEnum.RUNNING)
+                .group_by(BackgroundJob.job_type, BackgroundJob.organization_id)
+            )
+        ).all()
+
+        by_type: Dict[str, int] = {}
+        for job_type, _, count in running:
+            by_type[job_type] = by_type.get(job_type, 0) + count
+
+        full_types = []
+        full_organizations = []
+        for job_type in job_types:
+            definition = get_job_definition(job_type)
+            if (
+                definition.concurrency is not None
+                and by_type.get(job_type, 0) >= definition.concurrency
+            ):
+                full_types.append(job_type)
+                continue
+            if definition.per_organization is None:
+                continue
+            full_organizations.extend(
+                (job_type, organization_id)
+                for running_type, organization_id, count in running
+                if running_type == job_type
+                and organization_id is not None
+                and count >= definition.per_organization
+            )
+
+        filters = []
+        if full_types:
+            filters.append(BackgroundJob.job_type.notin_(full_types))
+        if full_organizations:
+            filters.append(
+                not_(
+                    and_(
+                        BackgroundJob.organization_id.isnot(None),
+                        tuple_(
+                            BackgroundJob.job_type, BackgroundJob.organization_id
+                        ).in_(full_organizations),
+                    )
+                )
+            )
+        return filters
+
+    @staticmethod
+    def _released() -> dict:
+        return {
+            "locked_by": None,
+            "locked_until": None,
+            "finished_at": func.now(),
+            "input_file": None,
+        }
+
+    @staticmethod
+    def _failed_values(attempts: int, retry: bool, error: str) -> dict:
+        if retry:
+            return {
+                "status": BackgroundJobStatusEnum.QUEUED,
+                "locked_by": None,
+                "locked_until": None,
+                "run_after": func.now() + timedelta(seconds=retry_delay(attempts)),
+                "last_error": error,
+            }
+        return {
+            "status": BackgroundJobStatusEnum.FAILED,
+            "last_error": error,
+            **JobQueue._released(),
+        }
@@ -0,0 +1,79 @@
+import importlib
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+# Modules whose handlers a worker registers before it starts claiming jobs
+JOB_HANDLER_MODULES = (
+    "lcfs.web.api.allocation_agreement.importer",
+    "lcfs.web.api.final_supply_equipment.importer",
+    "lcfs.web.api.final_supply_equipment.fse_reporting_importer",
+    "lcfs.web.api.charging_equipment.importer",
+    "lcfs.web.api.charging_site.importer",
+    "lcfs.web.api.export_job.services",
+    "lcfs.web.api.notification.services",
+    "lcfs.web.api.organization_snapshot.services",
+)
+
+
+@dataclass(frozen=True)
+class JobDefinition:
+    """How a type of job is run and how much of it may run at once."""
+
+    job_type: str
+    handler: Callable[..., Awaitable[Optional[dict]]]
+    priority: int = 0
+    max_attempts: int = 1
+    # Jobs of this type running at once across all workers; None is unlimited
+    concurrency: Optional[int] = None
+    # Jobs of this type running at once for one organization
+    per_organization: Optional[int] = None
+
+
+_definitions: Dict[str, JobDefinition] = {}
+
+
+def register_job(
+    job_type: str,
+    priority: int = 0,
+    max_attempts: int = 1,
+    concurrency: Optional[int] = None,
+    per_organization: Optional[int] = None,
+):
+    """
+    Registers the decorated coroutine as the handler of ``job_type``. The
+    handler receives the claimed QueuedJob and may return a JSON-safe
+    result, which is stored with the job.
+    """
+
+    def decorator(handler):
+        _definitions[job_type] = JobDefinition(
+            job_type=job_type,
+            handler=handler,
+            priority=priority,
+            max_attempts=max_attempts,
+            concurrency=concurrency,
+            per_organization=per_organization,
+        )
+        return handler
+
+    return decorator
+
+
+def get_job_definition(job_type: str) -> JobDefinition:
+    try:
+        return _definitions[job_type]
+    except KeyError:
+        raise ValueError(f"No handler is registered for job type '{job_type}'")
+
+
+def registered_jobs() -> Dict[str, JobDefinition]:
+    return dict(_definitions)
+
+
+def load_job_handlers() -> None:
+    """Imports every module that registers job handlers."""
+    # The application is imported first so the API packages load in the
+    # same order as in the server, which their circular imports rely on
+    importlib.import_module("lcfs.web.application")
+    for module in JOB_HANDLER_MODULES:
+        importlib.import_module(module)
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from typing import Optional
+
+import structlog
+
+from lcfs.services.job_queue.registry import load_job_handlers
+from lcfs.services.job_queue.worker import JobWorker, create_job_resources
+from lcfs.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+# Seconds shutdown waits for running jobs; unfinished ones are retried
+# elsewhere once their lease expires
+SHUTDOWN_GRACE_SECONDS = 20
+
+
+class _EmbeddedWorker:
+    """
+    A job worker on its own event loop thread inside an API process, so
+    long jobs do not compete with requests for the server's loop.
+    """
+
+    def __init__(self, concurrency: int) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="job-worker", daemon=True
+        )
+        self.resources = create_job_resources(concurrency)
+        self.worker = JobWorker(self.resources, concurrency=concurrency)
+        self.stop = asyncio.Event()
+        self.thread.start()
+        self.done = asyncio.run_coroutine_threadsafe(self._run(), self.loop)
+
+    async def _run(self) -> None:
+        try:
+            await self.worker.run(self.stop)
+        finally:
+            await self.resources.close()
+
+    def shutdown(self) -> None:
+        self.loop.call_soon_threadsafe(self.stop.set)
+        try:
+            self.done.result(timeout=SHUTDOWN_GRACE_SECONDS)
+        except Exception as e:
+            logger.warning("Job worker did not stop cleanly", error=str(e))
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+
+
+_embedded: Optional[_EmbeddedWorker] = None
+_embedded_lock = threading.Lock()
+
+
+def start_embedded_worker() -> None:
+    """
+    Starts a job worker in this API process unless ``job_worker_embedded``
+    is off, as it is where dedicated worker pods run the queue.
+    """
+    global _embedded
+    if not settings.job_worker_embedded:
+        return
+    with _embedded_lock:
+        if _embedded is None:
+            load_job_handlers()
+            _embedded = _EmbeddedWorker(max(settings.job_worker_concurrency, 1))
+
+
+def shutdown_embedded_worker() -> None:
+    """Stops this process's job worker and its connections, if it was started."""
+    global _embedded
+    with _embedded_lock:
+        if _embedded is None:
+            return
+        embedded, _embedded = _embedded, None
+    embedded.shutdown()
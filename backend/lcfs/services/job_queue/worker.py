@@ -0,0 +1,224 @@
+import asyncio
+import os
+import socket
+import uuid
+from dataclasses import dataclass
+from typing import Iterable, Optional, Set
+
+import structlog
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from lcfs.db.dependencies import db_url
+from lcfs.services.ches.client import close_ches_client
+from lcfs.services.job_queue.queue import (
+    JOB_LEASE_SECONDS,
+    JobFailed,
+    JobQueue,
+    QueuedJob,
+)
+from lcfs.services.job_queue.registry import get_job_definition, registered_jobs
+from lcfs.settings import settings
+from lcfs.web.api.user.repo import UserRepository
+
+logger = structlog.get_logger(__name__)
+
+# Seconds an idle worker waits before looking for new jobs again
+JOB_POLL_INTERVAL = 2
+
+
+@dataclass
+class JobResources:
+    """Connections shared by the jobs a worker runs."""
+
+    session_factory: async_sessionmaker
+    redis_client: Redis
+    engine: Optional[AsyncEngine] = None
+
+    async def close(self) -> None:
+        await self.redis_client.close()
+        await close_ches_client()
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+_resources: Optional[JobResources] = None
+
+
+def create_job_resources(concurrency: int) -> JobResources:
+    """A pooled engine and Redis client sized for ``concurrency`` jobs."""
+    engine = create_async_engine(
+        db_url,
+        future=True,
+        # One more connection for claims and lease renewals
+        pool_size=concurrency + 1,
+        max_overflow=0,
+        pool_pre_ping=True,
+        connect_args={
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+        },
+    )
+    redis_client = Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        password=settings.redis_pass,
+        db=settings.redis_base or 0,
+        decode_responses=True,
+        max_connections=concurrency * 2,
+        socket_timeout=5,
+        socket_connect_timeout=5,
+    )
+    return JobResources(
+        session_factory=async_sessionmaker(engine, expire_on_commit=False),
+        redis_client=redis_client,
+        engine=engine,
+    )
+
+
+def get_job_resources() -> JobResources:
+    """The connections of the job worker running in this process."""
+    if _resources is None:
+        raise RuntimeError("No job worker is running in this process.")
+    return _resources
+
+
+def _default_worker_id() -> str:
+    host = os.getenv("HOSTNAME") or socket.gethostname()
+    return f"{host}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class JobWorker:
+    """
+    Claims jobs from the queue and runs up to ``concurrency`` of them at
+    once, renewing each job's lease until its handler returns.
+    """
+
+    def __init__(
+        self,
+        resources: JobResources,
+        concurrency: int = 1,
+        job_types: Optional[Iterable[str]] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+    ) -> None:
+        global _resources
+        _resources = resources
+        self.resources = resources
+        self.concurrency = max(concurrency, 1)
+        self.job_types = list(job_types or registered_jobs())
+        self.worker_id = worker_id or _default_worker_id()
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._running: Set[asyncio.Task] = set()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Runs jobs until ``stop`` is set, then waits for those in progress."""
+        logger.info(
+            "Job worker started",
+            worker_id=self.worker_id,
+            concurrency=self.concurrency,
+            job_types=self.job_types,
+        )
+        slots = asyncio.Semaphore(self.concurrency)
+        while not stop.is_set():
+            await slots.acquire()
+            try:
+                job = await self.claim()
+            except Exception as e:
+                logger.error("Could not claim a job", error=str(e))
+                job = None
+            if job is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self.run_job(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        logger.info("Job worker stopped", worker_id=self.worker_id)
+
+    async def run_once(self) -> bool:
+        """Claims and runs a single job. Returns False if none was due."""
+        job = await self.claim()
+        if job is None:
+            return False
+        await self.run_job(job)
+        return True
+
+    async def claim(self) -> Optional[QueuedJob]:
+        async with self.resources.session_factory() as session:
+            async with session.begin():
+                queue = JobQueue(session)
+                job = await queue.claim(
+                    self.worker_id, self.job_types, self.lease_seconds
+                )
+                if job is None:
+                    return None
+                if job.input_file_name is not None:
+                    job.input_file = await queue.read_input_file(job.job_id)
+                if job.user_profile_id is not None:
+                    job.user = await UserRepository(session).get_user_by_id(
+                        job.user_profile_id
+                    )
+        return job
+
+    async def run_job(self, job: QueuedJob) -> None:
+        log = logger.bind(job_id=job.job_id, job_type=job.job_type, attempt=job.attempt)
+        log.info("Running job")
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            result = await get_job_definition(job.job_type).handler(job)
+        except Exception as e:
+            log.error("Job failed", error=str(e))
+            retry = await self._finish(
+                lambda queue: queue.fail(
+                    job.job_id,
+                    self.worker_id,
+                    str(e) or type(e).__name__,
+                    retry=not isinstance(e, JobFailed),
+                )
+            )
+            if retry:
+                log.info("Job will be retried")
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self._finish(
+            lambda queue: queue.complete(job.job_id, self.worker_id, result)
+        )
+        log.info("Job finished")
+
+    async def _finish(self, action):
+        async with self.resources.session_factory() as session:
+            async with session.begin():
+                return await action(JobQueue(session))
+
+    async def _heartbeat(self, job: QueuedJob) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                held = await self._finish(
+                    lambda queue: queue.heartbeat(
+                        job.job_id, self.worker_id, self.lease_seconds
+                    )
+                )
+            except Exception as e:
+                logger.warning("Could not renew job lease", error=str(e))
+                continue
+            if not held:
+                logger.warning("Job lease lost", job_id=job.job_id)
+                return
@@ -16,10 +16,13 @@ from lcfs.web.api.compliance_report.summary_service import (
 )
 from lcfs.web.api.compliance_report.update_service import ComplianceReportUpdateService
 from lcfs.web.api.internal_comment.services import InternalCommentService
+from lcfs.services.job_queue.queue import JobQueue
 from lcfs.web.api.notification.services import NotificationService
 from lcfs.web.api.email.services import CHESEmailService
 from lcfs.web.api.email.repo import CHESEmailRepository
 from lcfs.web.api.notification.repo import NotificationRepository
+from lcfs.services.redis.unread_counts import reconcile_unread_counts
+from lcfs.settings import settings
 from lcfs.web.api.notional_transfer.services import NotionalTransferServices
 from lcfs.web.api.notional_transfer.repo import NotionalTransferRepository
 from lcfs.web.api.fuel_supply.repo import FuelSupplyRepository
@@ -27,6 +30,7 @@ from lcfs.web.api.fuel_export.repo import FuelExportRepository
 from lcfs.web.api.allocation_agreement.repo import AllocationAgreementRepository
 from lcfs.web.api.other_uses.repo import OtherUsesRepository
 from lcfs.web.api.fuel_code.repo import FuelCodeRepository
+from lcfs.web.api.organization_snapshot.repo import OrganizationSnapshotRepository
 from lcfs.web.api.organization_snapshot.services import OrganizationSnapshotService
 from lcfs.web.api.organizations.repo import OrganizationsRepository
 from lcfs.web.api.organizations.services import OrganizationsService
@@ -67,7 +71,11 @@ async def submit_supplemental_report(report_id: int, app: FastAPI):
 
             # Instantiate services
             document_service = DocumentService()
-            snapshot_service = OrganizationSnapshotService(session)
+            snapshot_service = OrganizationSnapshotService(
+                repo=OrganizationSnapshotRepository(session),
+                session=session,
+                job_queue=JobQueue(session),
+            )
             final_supply_equipment_service = FinalSupplyEquipmentServices(session)
             internal_comment_service = InternalCommentService(session)
 
@@ -107,12 +115,16 @@ async def submit_supplemental_report(report_id: int, app: FastAPI):
                 transaction_repo=transaction_repo,
             )
 
-            trx_service = TransactionsService(repo=transaction_repo)
+            trx_service = TransactionsService(
+                repo=transaction_repo, session_factory=None
+            )
 
             ches_email_repo = CHESEmailRepository(session)
             ches_email_service = CHESEmailService(ches_email_repo)
-            notfn_repo = NotificationRepository(session)
-            notfn_service = NotificationService(notfn_repo, ches_email_service)
+            notfn_repo = NotificationRepository(session, app.state.redis_client)
+            notfn_service = NotificationService(
+                notfn_repo, ches_email_service, JobQueue(session)
+            )
 
             update_service = ComplianceReportUpdateService(
                 repo=compliance_report_repo,
@@ -245,3 +257,24 @@ async def reindex_compliance_report_tables(app: FastAPI):
         await conn.close()
 
     logger.info("Finished compliance-report table reindex job")
+
+
+async def reconcile_unread_notification_counts(app: FastAPI):
+    """
+    Recounts the unread notification counts cached in Redis, correcting
+    any that drifted from Postgres.
+    """
+    redis_client = app.state.redis_client
+    # Every API process schedules the job, but one run per interval is enough
+    interval = settings.notification_unread_count_reconcile_interval
+    if not await redis_client.set(
+        "notifications/reconcile-lock", 1, nx=True, ex=max(interval // 2, 1)
+    ):
+        return
+    async with app.state.db_session_factory() as session:
+        repo = NotificationRepository(session, redis_client)
+        corrected = await reconcile_unread_counts(
+            redis_client, repo.get_unread_counts_by_user_ids
+        )
+    if corrected:
+        logger.info("Corrected %s unread notification counts", corrected)
@@ -0,0 +1,140 @@
+"""
+Progress of background import and export jobs, kept in Redis.
+
+A job's latest status and counts live in ``jobs/{job_id}``. Errors are
+appended to the ``jobs/{job_id}/errors`` list rather than rewritten with
+every update. Each update is also added to the ``jobs/{job_id}/events``
+stream as a delta, which clients follow over Server-Sent Events instead of
+polling the status endpoints.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from redis.asyncio import Redis
+from starlette.responses import StreamingResponse
+
+# Seconds a finished job's result stays readable
+JOB_RESULT_TTL = 60 * 60
+
+# How often an event stream checks for new updates. The reads do not block,
+# so a subscriber only holds a pooled connection for the read itself.
+EVENT_POLL_INTERVAL = 0.5
+
+# Idle seconds between keepalive comments on an event stream
+EVENT_KEEPALIVE_INTERVAL = 15
+
+
+def _keys(job_id: str):
+    return f"jobs/{job_id}", f"jobs/{job_id}/errors", f"jobs/{job_id}/events"
+
+
+async def publish_job_progress(
+    redis_client: Redis, job_id: str, data: dict, ttl: int, reset: bool = False
+) -> None:
+    """
+    Records a progress update. ``data["errors"]`` holds only the errors
+    raised since the previous update, and ``reset`` discards the errors
+    already recorded, e.g. when a failed job is rolled back. Once progress
+    reaches 100 the result is kept for at least JOB_RESULT_TTL.
+    """
+    status = dict(data)
+    new_errors = status.pop("errors", None) or []
+    if status.get("progress", 0) >= 100:
+        ttl = max(ttl, JOB_RESULT_TTL)
+
+    event = {**status, "errors": new_errors}
+    if reset:
+        event["reset"] = True
+
+    status_key, errors_key, events_key = _keys(job_id)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        if reset:
+            pipe.delete(errors_key)
+        pipe.set(status_key, json.dumps(status), ex=ttl)
+        if new_errors:
+            pipe.rpush(errors_key, *new_errors)
+        pipe.expire(errors_key, ttl)
+        pipe.xadd(events_key, {"data": json.dumps(event)})
+        pipe.expire(events_key, ttl)
+        await pipe.execute()
+
+
+async def read_job_progress(redis_client: Redis, job_id: str) -> Optional[dict]:
+    """
+    Returns the job's latest status with all of its errors, or None if
+    there is no such job. Raises json.JSONDecodeError for corrupt status.
+    """
+    status_key, errors_key, _ = _keys(job_id)
+    status_str = await redis_client.get(status_key)
+    if not status_str:
+        return None
+
+    status = json.loads(status_str)
+    # Status written before errors had their own list carries them inline
+    if "errors" not in status:
+        status["errors"] = await redis_client.lrange(errors_key, 0, -1)
+    return status
+
+
+def sse_event(data: dict, event_id: Optional[str] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id else []
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def job_progress_events(
+    redis_client: Redis, job_id: str, last_event_id: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Yields a job's updates as Server-Sent Events: those recorded after
+    ``last_event_id`` (all of them for a new subscriber), then new ones as
+    they are published, until the job finishes or its status expires.
+    Clients rebuild the error list by appending each event's errors and
+    clearing it on events marked ``reset``.
+    """
+    status_key, _, events_key = _keys(job_id)
+    status_str = await redis_client.get(status_key)
+    if not status_str:
+        yield sse_event({"progress": 0, "status": "No job found with this ID."})
+        return
+
+    # A finished job's events are all in the stream already
+    finished = json.loads(status_str).get("progress", 0) >= 100
+    last_id = last_event_id or "0"
+    idle = 0.0
+    while True:
+        response = await redis_client.xread({events_key: last_id}, count=100)
+        events = response[0][1] if response else []
+        for event_id, fields in events:
+            last_id = event_id
+            event = json.loads(fields["data"])
+            yield sse_event(event, event_id)
+            if event.get("progress", 0) >= 100:
+                return
+        if events:
+            idle = 0.0
+            continue
+        if finished:
+            return
+
+        if idle >= EVENT_KEEPALIVE_INTERVAL:
+            # A job that stopped reporting has let its status expire
+            if not await redis_client.exists(status_key):
+                return
+            yield ": keepalive\n\n"
+            idle = 0.0
+        await asyncio.sleep(EVENT_POLL_INTERVAL)
+        idle += EVENT_POLL_INTERVAL
+
+
+def job_progress_response(
+    redis_client: Redis, job_id: str, last_event_id: Optional[str] = None
+) -> StreamingResponse:
+    """A text/event-stream response following the job's progress."""
+    return StreamingResponse(
+        job_progress_events(redis_client, job_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
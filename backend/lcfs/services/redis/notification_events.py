@@ -0,0 +1,214 @@
+"""
+Live notification events for connected users, fanned out through Redis.
+
+Committed notification writes add their events to each recipient's
+``notifications/{user_id}/events`` stream and publish the stream's key on
+the ``notifications/events`` channel. Every process holds one subscription
+to the channel, shared by all of its Server-Sent Event connections, and
+wakes the connections of the users named in it; they read the events from
+the user's stream. The same user therefore hears about a write made on any
+worker or pod, and a client that reconnects with its Last-Event-ID resumes
+from the stream, which keeps each user's latest EVENT_HISTORY events.
+"""
+
+import asyncio
+import json
+import re
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.responses import StreamingResponse
+
+from lcfs.services.redis.job_progress import EVENT_KEEPALIVE_INTERVAL, sse_event
+
+logger = structlog.get_logger(__name__)
+
+NOTIFICATION_EVENTS_CHANNEL = "notifications/events"
+
+# Events kept for each user so reconnecting clients can catch up, and the
+# seconds a quiet user's events are kept
+EVENT_HISTORY = 100
+EVENT_HISTORY_TTL = 60 * 60
+
+# Seconds between attempts to restore a lost channel subscription
+RESUBSCRIBE_DELAY = 1
+
+# Appends ARGV[i + 3] to stream KEYS[i], capped at ARGV[1] entries that
+# expire after ARGV[2] seconds, then names each stream once on channel
+# ARGV[3]. Running as one script keeps each user's events in order.
+_PUBLISH = """
+local published = {}
+for i, key in ipairs(KEYS) do
+  redis.call('XADD', key, 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[i + 3])
+  redis.call('EXPIRE', key, ARGV[2])
+  published[key] = true
+end
+for key in pairs(published) do
+  redis.call('PUBLISH', ARGV[3], key)
+end
+"""
+
+_EVENT_ID = re.compile(r"^\d+-\d+$")
+
+
+def _events_key(user_id: int) -> str:
+    return f"notifications/{user_id}/events"
+
+
+async def publish_notification_events(
+    redis_client: Redis, events: Dict[int, List[dict]]
+) -> None:
+    """Adds the users' events to their streams and wakes their connections."""
+    keys, data = [], []
+    for user_id, user_events in events.items():
+        for event in user_events:
+            keys.append(_events_key(user_id))
+            data.append(json.dumps(event))
+    if keys:
+        await redis_client.eval(
+            _PUBLISH,
+            len(keys),
+            *keys,
+            EVENT_HISTORY,
+            EVENT_HISTORY_TTL,
+            NOTIFICATION_EVENTS_CHANNEL,
+            *data,
+        )
+
+
+class NotificationEventHub:
+    """
+    A process's subscription to the events channel. Connections register a
+    wakeup for their user's stream, set whenever the stream is published.
+    """
+
+    def __init__(self, redis_client: Redis) -> None:
+        self.redis_client = redis_client
+        self._wakeups: Dict[str, Set[asyncio.Event]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def watch(self, user_id: int) -> AsyncIterator[asyncio.Event]:
+        key = _events_key(user_id)
+        wakeup = asyncio.Event()
+        self._wakeups[key].add(wakeup)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        try:
+            yield wakeup
+        finally:
+            self._wakeups[key].discard(wakeup)
+            if not self._wakeups[key]:
+                del self._wakeups[key]
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(NOTIFICATION_EVENTS_CHANNEL)
+                    # Streams may have grown while the subscription was down
+                    self._wake(*self._wakeups)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._wake(message["data"])
+            except RedisError:
+                logger.warning("Notification events subscription lost", exc_info=True)
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    def _wake(self, *keys: str) -> None:
+        for key in keys:
+            for wakeup in self._wakeups.get(key, ()):
+                wakeup.set()
+
+
+# A subscription belongs to the event loop that opened it, so each loop
+# gets its own NotificationEventHub
+_hubs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_notification_event_hub(redis_client: Redis) -> NotificationEventHub:
+    """The running event loop's subscription to the events channel."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = NotificationEventHub(redis_client)
+    return hub
+
+
+async def close_notification_event_hub() -> None:
+    """Ends the running event loop's subscription to the events channel."""
+    hub = _hubs.pop(asyncio.get_running_loop(), None)
+    if hub is not None:
+        await hub.close()
+
+
+async def notification_events(
+    redis_client: Redis,
+    user_id: int,
+    count_unread: Callable[[], Awaitable[int]],
+    last_event_id: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Yields the user's notification events as Server-Sent Events. A new
+    subscriber starts with its unread count; one resuming after
+    ``last_event_id`` first gets the notifications it missed that are still
+    kept. ``notification`` events carry a new message, and an ``unread``
+    event with the current count follows every change to the user's
+    messages.
+    """
+    key = _events_key(user_id)
+    hub = get_notification_event_hub(redis_client)
+    async with hub.watch(user_id) as wakeup:
+        if last_event_id and _EVENT_ID.match(last_event_id):
+            last_id = last_event_id
+        else:
+            latest = await redis_client.xrevrange(key, count=1)
+            last_id = latest[0][0] if latest else "0-0"
+        changed = True
+        while True:
+            wakeup.clear()
+            entries = await redis_client.xrange(
+                key, min=f"({last_id}", count=EVENT_HISTORY
+            )
+            for entry_id, fields in entries:
+                last_id = entry_id
+                event = json.loads(fields["data"])
+                if event["type"] != "unread":
+                    yield sse_event(event, entry_id)
+                changed = True
+            if changed:
+                # Counted once the changes are read, however many there were
+                yield sse_event(
+                    {"type": "unread", "unread": await count_unread()}, last_id
+                )
+                changed = False
+            if len(entries) == EVENT_HISTORY:
+                continue
+            try:
+                await asyncio.wait_for(wakeup.wait(), EVENT_KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+
+
+def notification_events_response(
+    redis_client: Redis,
+    user_id: int,
+    count_unread: Callable[[], Awaitable[int]],
+    last_event_id: Optional[str] = None,
+) -> StreamingResponse:
+    """A text/event-stream response following the user's notifications."""
+    return StreamingResponse(
+        notification_events(redis_client, user_id, count_unread, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,249 @@
+"""
+Unread notification counts, kept in Redis.
+
+``notifications/{user_id}/unread`` holds a user's unread count, so polling
+it is one GET rather than a COUNT over ``notification_message``. A missing
+counter is rebuilt from Postgres by whoever reads it. Writes queue their
+changes on the database session, and the changes reach Redis only after
+the session commits, so rolled back work never touches a counter:
+
+- a change of known size is added to the counter if it exists; a counter
+  is never created from a delta alone
+- a change of unknown size deletes the counter for the next read to rebuild
+
+A rebuild that races a commit can miss that commit's delta, so counters
+expire after ``notification_unread_count_ttl`` and reconcile_unread_counts
+recounts the live ones on a schedule. Once the counters are updated, the
+new messages and count changes are published to the users' connections
+(see notification_events).
+"""
+
+import asyncio
+from collections import Counter, defaultdict
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from lcfs.services.redis.notification_events import publish_notification_events
+from lcfs.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+UNREAD_COUNT_KEYS = "notifications/*/unread"
+
+# Adds ARGV[i] to counter KEYS[i] where it exists. A counter that would go
+# negative has drifted from Postgres and is dropped instead.
+_APPLY_DELTAS = """
+for i, key in ipairs(KEYS) do
+  if redis.call('EXISTS', key) == 1 and redis.call('INCRBY', key, ARGV[i]) < 0 then
+    redis.call('DEL', key)
+  end
+end
+"""
+
+# Sets counter KEYS[i] to ARGV[2i] if it still holds ARGV[2i-1], the value
+# read before recounting, so a delta applied meanwhile is not overwritten.
+# Returns the number of counters set.
+_RECOUNT = """
+local corrected = 0
+for i, key in ipairs(KEYS) do
+  if redis.call('GET', key) == ARGV[2 * i - 1] then
+    redis.call('SET', key, ARGV[2 * i], 'KEEPTTL')
+    corrected = corrected + 1
+  end
+end
+return corrected
+"""
+
+# Session.info key of the changes waiting for the session to commit
+_PENDING = "unread_count_changes"
+
+# Updates applied after a commit, held until they finish
+_updates: Set[asyncio.Task] = set()
+
+
+def unread_count_key(user_id: int) -> str:
+    return f"notifications/{user_id}/unread"
+
+
+async def get_unread_count(redis_client: Redis, user_id: int) -> Optional[int]:
+    """The user's cached unread count, or None if it has to be rebuilt."""
+    try:
+        count = await redis_client.get(unread_count_key(user_id))
+    except RedisError:
+        logger.warning("Unread count not read from Redis", exc_info=True)
+        return None
+    return None if count is None else int(count)
+
+
+async def store_unread_count(redis_client: Redis, user_id: int, count: int) -> None:
+    """Caches a count rebuilt from Postgres, unless one was cached meanwhile."""
+    try:
+        await redis_client.set(
+            unread_count_key(user_id),
+            count,
+            ex=settings.notification_unread_count_ttl,
+            nx=True,
+        )
+    except RedisError:
+        logger.warning("Unread count not cached in Redis", exc_info=True)
+
+
+async def apply_unread_changes(
+    redis_client: Redis, deltas: Mapping[int, int], invalidated: Iterable[int] = ()
+) -> None:
+    """Adds ``deltas`` to the users' counters and drops the ``invalidated`` ones."""
+    invalidated = set(invalidated)
+    deltas = {
+        user_id: delta
+        for user_id, delta in deltas.items()
+        if delta and user_id not in invalidated
+    }
+    if invalidated:
+        await redis_client.delete(*map(unread_count_key, invalidated))
+    if deltas:
+        await redis_client.eval(
+            _APPLY_DELTAS,
+            len(deltas),
+            *map(unread_count_key, deltas),
+            *deltas.values(),
+        )
+
+
+class _PendingChanges:
+    def __init__(self, redis_client: Redis) -> None:
+        self.redis_client = redis_client
+        self.deltas: Counter = Counter()
+        self.invalidated: Set[int] = set()
+        self.created: List[Tuple[int, dict]] = []
+
+    def events(self) -> Dict[int, List[dict]]:
+        """New messages, then a count change, for each user affected."""
+        events = defaultdict(list)
+        for user_id, notification in self.created:
+            events[user_id].append(
+                {"type": "notification", "notification": notification}
+            )
+        changed = {user_id for user_id, delta in self.deltas.items() if delta}
+        for user_id in changed | self.invalidated | set(events):
+            events[user_id].append({"type": "unread"})
+        return events
+
+    async def apply(self) -> None:
+        try:
+            await apply_unread_changes(self.redis_client, self.deltas, self.invalidated)
+            await publish_notification_events(self.redis_client, self.events())
+        except RedisError:
+            # The counters expire or are recounted before long, and clients
+            # catch up on their next change
+            logger.warning("Unread counts not updated in Redis", exc_info=True)
+
+
+def record_unread_changes(
+    session: AsyncSession,
+    redis_client: Optional[Redis],
+    deltas: Optional[Mapping[int, int]] = None,
+    invalidated: Iterable[int] = (),
+    created: Iterable[Tuple[int, dict]] = (),
+) -> None:
+    """
+    Queues changes to the users' unread counts, and the ``created`` messages
+    to send to their connections as (user id, message) pairs. They are
+    applied once ``session`` commits and discarded if it rolls back. Does
+    nothing without Redis.
+    """
+    if redis_client is None:
+        return
+    sync_session = session.sync_session
+    pending = sync_session.info.get(_PENDING)
+    if pending is None:
+        pending = sync_session.info[_PENDING] = _PendingChanges(redis_client)
+        if not event.contains(sync_session, "after_commit", _after_commit):
+            event.listen(sync_session, "after_commit", _after_commit)
+            event.listen(sync_session, "after_rollback", _after_rollback)
+    pending.deltas.update(deltas or {})
+    pending.invalidated.update(
+        user_id for user_id in invalidated if user_id is not None
+    )
+    pending.created.extend(created)
+
+
+def _after_commit(sync_session: Session) -> None:
+    pending = sync_session.info.pop(_PENDING, None)
+    if pending is None:
+        return
+    # Async sessions commit on the event loop, so the update can be queued
+    # on it without holding up the commit
+    task = asyncio.get_running_loop().create_task(pending.apply())
+    _updates.add(task)
+    task.add_done_callback(_updates.discard)
+
+
+def _after_rollback(sync_session: Session) -> None:
+    sync_session.info.pop(_PENDING, None)
+
+
+async def wait_for_unread_updates() -> None:
+    """Waits for the updates queued on this event loop by committed sessions."""
+    loop = asyncio.get_running_loop()
+    updates = [task for task in _updates if task.get_loop() is loop]
+    if updates:
+        await asyncio.gather(*updates)
+
+
+async def reconcile_unread_counts(
+    redis_client: Redis,
+    count_unread: Callable[[List[int]], Awaitable[Dict[int, int]]],
+    batch_size: int = 500,
+) -> int:
+    """
+    Recounts the cached counters with ``count_unread``, which returns the
+    unread counts in Postgres of the given users, leaving out those with
+    none. A counter that changes while it is recounted is left for the next
+    run. Returns the number of counters corrected.
+    """
+    corrected = 0
+    keys: List[str] = []
+    async for key in redis_client.scan_iter(match=UNREAD_COUNT_KEYS, count=batch_size):
+        keys.append(key)
+        if len(keys) == batch_size:
+            corrected += await _recount(redis_client, keys, count_unread)
+            keys = []
+    if keys:
+        corrected += await _recount(redis_client, keys, count_unread)
+    return corrected
+
+
+async def _recount(
+    redis_client: Redis,
+    keys: List[str],
+    count_unread: Callable[[List[int]], Awaitable[Dict[int, int]]],
+) -> int:
+    cached = await redis_client.mget(keys)
+    user_ids = [int(key.split("/")[1]) for key in keys]
+    counts = await count_unread(user_ids)
+
+    stale_keys, args = [], []
+    for key, user_id, value in zip(keys, user_ids, cached):
+        count = counts.get(user_id, 0)
+        if value is not None and int(value) != count:
+            stale_keys.append(key)
+            args += [value, count]
+    if not stale_keys:
+        return 0
+    return await redis_client.eval(_RECOUNT, len(stale_keys), *stale_keys, *args)
@@ -0,0 +1,58 @@
+import base64
+import hashlib
+import json
+from typing import Optional
+
+import structlog
+from fastapi import Depends
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from lcfs.services.redis.dependency import get_redis_client
+
+logger = structlog.get_logger(__name__)
+
+# Seconds a rendered document stays in the cache
+RENDER_CACHE_TTL = 60 * 60
+
+# Larger documents are rendered every time rather than cached
+RENDER_CACHE_MAX_BYTES = 2 * 1024 * 1024
+
+
+class RenderCache:
+    """
+    Caches rendered documents in Redis, keyed by a hash of the template and
+    the context it was rendered with, so identical exports from any worker
+    are served without rendering again.
+
+    The shared Redis client decodes responses to str, so content is stored
+    base64 encoded. A cache that cannot be reached never fails an export.
+    """
+
+    def __init__(self, redis_client: Redis = Depends(get_redis_client)):
+        self.redis_client = redis_client
+
+    @staticmethod
+    def key(template: str, context: dict) -> str:
+        fingerprint = json.dumps(
+            {"template": template, "context": context}, sort_keys=True, default=str
+        )
+        return f"render_cache/{hashlib.sha256(fingerprint.encode()).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            cached = await self.redis_client.get(key)
+        except RedisError as e:
+            logger.warning("Render cache unavailable", error=str(e))
+            return None
+        return base64.b64decode(cached) if cached else None
+
+    async def set(self, key: str, content: bytes) -> None:
+        if len(content) > RENDER_CACHE_MAX_BYTES:
+            return
+        try:
+            await self.redis_client.set(
+                key, base64.b64encode(content).decode(), ex=RENDER_CACHE_TTL
+            )
+        except RedisError as e:
+            logger.warning("Render cache unavailable", error=str(e))
@@ -0,0 +1,80 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+import structlog
+
+from lcfs.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _warm_worker() -> None:
+    """
+    Import the application and rendering libraries once per worker process so
+    the first render a worker handles does not pay for them. Importing the
+    application first also loads the API packages in the same order as the
+    server does, which their circular imports rely on.
+    """
+    import docx  # noqa: F401
+    import openpyxl  # noqa: F401
+
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError) as e:
+        # WeasyPrint needs Pango at runtime; without it PDF renders fail on
+        # their own while every other render keeps working.
+        logger.warning("WeasyPrint unavailable in render worker", error=str(e))
+
+    import lcfs.web.application  # noqa: F401
+
+
+def get_render_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the process-wide render pool, creating it on first use.
+
+    Returns None when ``render_pool_workers`` is 0, in which case renders run
+    on a thread instead (used by tests and single-process tooling).
+    """
+    global _executor
+    if settings.render_pool_workers <= 0:
+        return None
+    if _executor is None:
+        # spawn keeps workers free of the parent's event loop, sockets and locks.
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.render_pool_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        logger.info("Render pool started", workers=settings.render_pool_workers)
+    return _executor
+
+
+async def run_in_render_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a CPU-bound, picklable callable outside the event loop.
+
+    ``func`` must be a module-level function and its arguments and result
+    must be picklable.
+    """
+    loop = asyncio.get_running_loop()
+    call = partial(func, *args, **kwargs)
+    executor = get_render_executor()
+    if executor is None:
+        return await asyncio.to_thread(call)
+    return await loop.run_in_executor(executor, call)
+
+
+def shutdown_render_pool() -> None:
+    """Stop the render pool's worker processes, if it was started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        logger.info("Render pool stopped")
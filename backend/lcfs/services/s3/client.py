@@ -1,6 +1,8 @@
+import asyncio
 from fastapi import Depends, HTTPException
 from io import UnsupportedOperation
 import os
+import structlog
 import uuid
 
 from lcfs.utils.constants import ALLOWED_MIME_TYPES, ALLOWED_FILE_TYPES
@@ -15,9 +17,16 @@ from lcfs.db.models.user.Role import RoleEnum
 from lcfs.web.api.admin_adjustment.services import AdminAdjustmentServices
 from lcfs.web.api.compliance_report.repo import ComplianceReportRepository
 from lcfs.web.api.fuel_supply.repo import FuelSupplyRepository
-from sqlalchemy import select, delete, and_
+from sqlalchemy import select, delete, and_, literal
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from lcfs.services.s3.dependency import get_s3_client
+from lcfs.services.s3.transfer import (
+    BYTE_RANGE,
+    FileView,
+    run_s3,
+    transfer_config,
+)
 from lcfs.db.dependencies import get_async_db_session
 from lcfs.db.models.compliance import ComplianceReport
 from lcfs.db.models.compliance.ComplianceReport import (
@@ -39,6 +48,8 @@ from lcfs.web.core.decorators import repo_handler
 from lcfs.web.exception.exceptions import ServiceException
 from botocore.exceptions import ClientError
 
+logger = structlog.get_logger(__name__)
+
 BUCKET_NAME = settings.s3_bucket
 MAX_FILE_SIZE_MB = 50
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
@@ -105,7 +116,10 @@ class DocumentService:
             )
 
         # Scan file size
-        file_size = os.fstat(file.file.fileno()).st_size
+        fileno = file.file.fileno()
+        # Upload views read the file descriptor, past Python's write buffer
+        file.file.flush()
+        file_size = os.fstat(fileno).st_size
 
         if file_size > MAX_FILE_SIZE_BYTES:
             raise HTTPException(
@@ -113,33 +127,22 @@ class DocumentService:
                 detail=f"File size exceeds the maximum limit of {MAX_FILE_SIZE_MB} MB.",
             )
 
-        if settings.clamav_enabled:
-            self.clamav_service.scan_file(file)
-
-        # Upload file to S3
-        file.file.seek(0)
+        # Upload file to S3 while it is scanned; the object is removed again
+        # if the scan does not pass
+        body = FileView(fileno, file_size)
+        upload = asyncio.ensure_future(
+            self._upload_object(body, file_key, file.content_type)
+        )
         try:
-            self.s3_client.upload_fileobj(
-                Fileobj=file.file,
-                Bucket=BUCKET_NAME,
-                Key=file_key,
-                ExtraArgs={"ContentType": file.content_type},
-            )
-        except ClientError as exc:
-            error_code = exc.response.get("Error", {}).get("Code")
-            if error_code != "XAmzContentSHA256Mismatch":
-                raise
-            # Some S3-compatible stores struggle with signed streaming uploads.
-            file.file.seek(0)
-            file_bytes = file.file.read()
-            self.s3_client.put_object(
-                Body=file_bytes,
-                Bucket=BUCKET_NAME,
-                Key=file_key,
-                ContentType=file.content_type,
-            )
-        except Exception as exc:
-            raise ServiceException(f"Error uploading file to S3: {exc}")
+            if settings.clamav_enabled:
+                await self.clamav_service.scan_file(file)
+        except BaseException:
+            body.abort()
+            await asyncio.gather(upload, return_exceptions=True)
+            await self._discard_object(file_key)
+            raise
+        try:
+            await upload
         finally:
             try:
                 file.file.seek(0)
@@ -240,6 +243,40 @@ class DocumentService:
 
         return document
 
+    async def _upload_object(self, body: FileView, file_key: str, content_type):
+        try:
+            await run_s3(
+                self.s3_client.upload_fileobj,
+                Fileobj=body,
+                Bucket=BUCKET_NAME,
+                Key=file_key,
+                ExtraArgs={"ContentType": content_type},
+                Config=transfer_config(),
+            )
+        except ClientError as exc:
+            error_code = exc.response.get("Error", {}).get("Code")
+            if error_code != "XAmzContentSHA256Mismatch":
+                raise
+            # Some S3-compatible stores struggle with signed streaming uploads.
+            body.seek(0)
+            await run_s3(
+                self.s3_client.put_object,
+                Body=body,
+                Bucket=BUCKET_NAME,
+                Key=file_key,
+                ContentType=content_type,
+            )
+        except Exception as exc:
+            raise ServiceException(f"Error uploading file to S3: {exc}")
+
+    async def _discard_object(self, file_key: str):
+        try:
+            await run_s3(self.s3_client.delete_object, Bucket=BUCKET_NAME, Key=file_key)
+        except Exception as exc:
+            logger.error(
+                "Failed to remove unscanned upload", file_key=file_key, error=str(exc)
+            )
+
     async def _verify_compliance_report_access(self, parent_id, user):
         compliance_report = (
             await self.compliance_report_repo.get_compliance_report_by_id(parent_id)
@@ -318,7 +355,8 @@ class DocumentService:
         if not document:
             raise Exception("Document not found")
 
-        presigned_url = self.s3_client.generate_presigned_url(
+        presigned_url = await run_s3(
+            self.s3_client.generate_presigned_url,
             "get_object",
             Params={"Bucket": BUCKET_NAME, "Key": document.file_key},
             ExpiresIn=60,  # URL expiration in seconds
@@ -376,7 +414,9 @@ class DocumentService:
         # If last link, delete the whole document
         if len(links) == 1:
             # Delete the file from S3
-            self.s3_client.delete_object(Bucket=BUCKET_NAME, Key=document.file_key)
+            await run_s3(
+                self.s3_client.delete_object, Bucket=BUCKET_NAME, Key=document.file_key
+            )
 
             # Delete the entry from the database
             await self.db.delete(document)
@@ -475,26 +515,48 @@ class DocumentService:
         return result.scalars().all()
 
     @repo_handler
-    async def get_object(self, document_id: int):
+    async def get_object(self, document_id: int, byte_range: str | None = None):
+        """
+        Returns the S3 response for a document, limited to ``byte_range``
+        (an HTTP ``Range`` header value) when given, and the document.
+        """
         document = await self.db.get_one(Document, document_id)
 
         if not document:
             raise Exception("Document not found")
 
-        response = self.s3_client.get_object(Bucket=BUCKET_NAME, Key=document.file_key)
+        params = {"Bucket": BUCKET_NAME, "Key": document.file_key}
+        if byte_range and BYTE_RANGE.match(byte_range):
+            params["Range"] = byte_range
+        try:
+            response = await run_s3(self.s3_client.get_object, **params)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") != "InvalidRange":
+                raise
+            raise HTTPException(
+                status_code=416,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{document.file_size}"},
+            )
         return response, document
 
-    async def copy_documents(self, copy_from_id: int, copy_to_id: int):
-        documents = await self.db.execute(
-            select(compliance_report_document_association).where(
-                copy_from_id
-                == compliance_report_document_association.c.compliance_report_id
+    async def copy_documents(self, copy_from_id: int, copy_to_id: int) -> int:
+        """
+        Links every document of one compliance report to another in a single
+        statement. The reports share the stored objects: delete_file only
+        removes an object from S3 once its last link is gone, so nothing is
+        copied in the bucket. Returns the number of documents linked.
+        """
+        association = compliance_report_document_association
+        stmt = (
+            insert(association)
+            .from_select(
+                ["compliance_report_id", "document_id"],
+                select(literal(copy_to_id), association.c.document_id).where(
+                    association.c.compliance_report_id == copy_from_id
+                ),
             )
+            .on_conflict_do_nothing()
         )
-
-        for document in documents.all():
-            stmt = compliance_report_document_association.insert().values(
-                compliance_report_id=copy_to_id,
-                document_id=document.document_id,
-            )
-            await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
+        return result.rowcount
@@ -4,19 +4,13 @@ from lcfs.settings import settings
 from botocore.config import Config
 
 
-def get_s3_client() -> Generator:
+def create_s3_client():
     """
-    Dependency function to provide a synchronous S3 client using boto3.
-
-    This function creates a new S3 client session for each request that requires it.
-    The client is properly configured with the necessary AWS credentials and
-    endpoint settings.
+    Creates a synchronous boto3 S3 client configured from settings.
 
-    Usage:
-        >>> def some_endpoint(s3_client = Depends(get_s3_client)):
-        >>>     # Use the s3_client here
+    Use this where no request scope exists (e.g. background jobs); request
+    handlers should depend on `get_s3_client` instead.
     """
-    # Initialize the S3 client with the required configurations
     cfg = Config(
         signature_version="s3v4",
         # Turn OFF flexible checksums unless the API requires them
@@ -27,7 +21,7 @@ def get_s3_client() -> Generator:
             "payload_signing": True,  # sign the actual bytes
         },
     )
-    client = boto3.client(
+    return boto3.client(
         "s3",
         aws_access_key_id=settings.s3_access_key,  # Your AWS access key
         aws_secret_access_key=settings.s3_secret_key,  # Your AWS secret key
@@ -37,6 +31,21 @@ def get_s3_client() -> Generator:
         config=cfg,
     )
 
+
+def get_s3_client() -> Generator:
+    """
+    Dependency function to provide a synchronous S3 client using boto3.
+
+    This function creates a new S3 client session for each request that requires it.
+    The client is properly configured with the necessary AWS credentials and
+    endpoint settings.
+
+    Usage:
+        >>> def some_endpoint(s3_client = Depends(get_s3_client)):
+        >>>     # Use the s3_client here
+    """
+    client = create_s3_client()
+
     try:
         # Yield the S3 client to be used within the request scope
         yield client
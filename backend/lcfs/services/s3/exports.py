@@ -0,0 +1,65 @@
+from typing import Optional
+from urllib.parse import quote, unquote
+
+from botocore.exceptions import ClientError
+from fastapi import Depends
+
+from lcfs.services.s3.dependency import get_s3_client
+from lcfs.services.s3.transfer import run_s3
+from lcfs.settings import settings
+
+BUCKET_NAME = settings.s3_bucket
+
+
+class ExportArtifactStorage:
+    """
+    Stores generated export files in the documents bucket.
+
+    Artifacts are keyed by a hash of the export request and the data version
+    it was built from, so a key never points at stale content and identical
+    requests can share one object. Objects live under the `exports/` prefix,
+    which should carry a bucket lifecycle rule to expire old artifacts.
+    """
+
+    def __init__(self, s3_client=Depends(get_s3_client)):
+        self.s3_client = s3_client
+
+    @staticmethod
+    def artifact_key(export_type: str, cache_key: str) -> str:
+        return f"{settings.s3_docs_path}/exports/{export_type}/{cache_key}"
+
+    async def get_metadata(self, key: str) -> Optional[dict]:
+        """
+        Returns the file name and media type of a stored artifact, or None
+        when nothing has been stored under the key yet.
+        """
+        try:
+            response = await run_s3(
+                self.s3_client.head_object, Bucket=BUCKET_NAME, Key=key
+            )
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+
+        return {
+            "file_name": unquote(response.get("Metadata", {}).get("file-name", "")),
+            "media_type": response.get("ContentType"),
+            "size": response.get("ContentLength"),
+        }
+
+    async def put(
+        self, key: str, content: bytes, file_name: str, media_type: str
+    ) -> None:
+        # S3 user metadata must be ASCII; organization names may not be
+        await run_s3(
+            self.s3_client.put_object,
+            Body=content,
+            Bucket=BUCKET_NAME,
+            Key=key,
+            ContentType=media_type,
+            Metadata={"file-name": quote(file_name)},
+        )
+
+    async def get_object(self, key: str) -> dict:
+        return await run_s3(self.s3_client.get_object, Bucket=BUCKET_NAME, Key=key)
@@ -0,0 +1,125 @@
+"""
+Runs boto3 calls off the event loop.
+
+boto3 clients are synchronous, so every S3 request made from a coroutine
+goes through a dedicated thread pool sized by ``s3_io_workers``. Keeping S3
+off the default executor means slow transfers cannot starve the other work
+that uses ``asyncio.to_thread``.
+"""
+
+import asyncio
+import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar
+
+import structlog
+from boto3.s3.transfer import TransferConfig
+
+from lcfs.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# A single byte range; S3 does not serve several ranges in one response
+BYTE_RANGE = re.compile(r"^bytes=(\d+-\d*|-\d+)$")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class UploadAborted(Exception):
+    """The upload was stopped because the file failed its virus scan."""
+
+
+def get_s3_executor() -> ThreadPoolExecutor:
+    """Return the process-wide S3 thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.s3_io_workers, thread_name_prefix="s3-io"
+        )
+    return _executor
+
+
+async def run_s3(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking boto3 call on the S3 thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_s3_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_s3_executor() -> None:
+    """Stop the S3 thread pool, if it was started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def transfer_config() -> TransferConfig:
+    """
+    Uploads above ``s3_multipart_threshold`` are sent as multipart uploads
+    of ``s3_multipart_chunk_size`` parts, so no single request carries the
+    whole file and a failed part is retried on its own.
+    """
+    return TransferConfig(
+        multipart_threshold=settings.s3_multipart_threshold,
+        multipart_chunksize=settings.s3_multipart_chunk_size,
+        max_concurrency=settings.s3_multipart_concurrency,
+    )
+
+
+async def stream_body(body, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Yield an S3 response body in chunks, reading each on the S3 thread pool."""
+    chunk_size = chunk_size or settings.s3_download_chunk_size
+    try:
+        while chunk := await run_s3(body.read, chunk_size):
+            yield chunk
+    finally:
+        body.close()
+
+
+class FileView(io.RawIOBase):
+    """
+    Reads an open file by offset, leaving the file's own position to other
+    readers. An upload reads the file through a view while the virus scan
+    reads it through the file object, so both can run at once.
+    """
+
+    def __init__(self, fileno: int, size: int) -> None:
+        super().__init__()
+        self._fileno = fileno
+        self._size = size
+        self._position = 0
+        self._aborted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._aborted:
+            raise UploadAborted("Upload stopped after a failed virus scan")
+        data = os.pread(self._fileno, len(buffer), self._position)
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def abort(self) -> None:
+        """Makes the next read fail, ending an upload in progress."""
+        self._aborted = True
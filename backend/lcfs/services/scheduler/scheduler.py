@@ -9,6 +9,7 @@ from zoneinfo import ZoneInfo
 
 from lcfs.services.jobs.jobs import (
     check_overdue_supplemental_reports,
+    reconcile_unread_notification_counts,
     reindex_compliance_report_tables,
 )
 from lcfs.settings import settings
@@ -87,6 +88,16 @@ def start_scheduler(app: FastAPI):
                 "Added one-time startup job: 'reindex_compliance_report_tables_startup'"
             )
 
+        scheduler.add_job(
+            reconcile_unread_notification_counts,
+            "interval",
+            seconds=settings.notification_unread_count_reconcile_interval,
+            id="reconcile_unread_notification_counts",
+            replace_existing=True,
+            args=[app],
+        )
+        logger.info("Added job: 'reconcile_unread_notification_counts'")
+
 def shutdown_scheduler():
     """
     Shuts down the scheduler.
@@ -78,11 +78,28 @@ class Settings(BaseSettings):
     s3_access_key: str = "s3_access_key"
     s3_secret_key: str = "development_only"
     s3_docs_path: str = "lcfs-docs"
+    # Threads running boto3 calls for the event loop
+    s3_io_workers: int = 8
+    # Uploads above this size are sent in parts of s3_multipart_chunk_size
+    s3_multipart_threshold: int = 8 * 1024 * 1024
+    s3_multipart_chunk_size: int = 8 * 1024 * 1024
+    s3_multipart_concurrency: int = 4
+    # Bytes read from S3 per chunk of a streamed download
+    s3_download_chunk_size: int = 256 * 1024
+    # Memory each API process may use for cached login background images
+    login_bg_image_cache_bytes: int = 64 * 1024 * 1024
 
     # Variables for ClamAV
     clamav_enabled: bool = False
     clamav_host: str = "clamav"
     clamav_port: int = 3310
+    # clamd sessions kept open by each event loop
+    clamav_pool_size: int = 4
+    # Bytes sent to clamd per INSTREAM chunk
+    clamav_chunk_size: int = 64 * 1024
+    clamav_timeout: float = 60
+    # Seconds a scan verdict is reused for the same file and signature version
+    clamav_cache_ttl: int = 24 * 60 * 60
 
     ches_enabled: bool = False
     ches_auth_url: str = ""
@@ -91,6 +108,35 @@ class Settings(BaseSettings):
     ches_client_secret: str = ""
     ches_sender_email: str = "noreply@gov.bc.ca"
     ches_sender_name: str = "LCFS Notification System"
+    ches_timeout: float = 15
+    # HTTP connections to CHES kept open by each event loop
+    ches_max_connections: int = 10
+    # Emails sent per second by each process, after bursts of up to
+    # ches_rate_burst; 0 turns the limit off
+    ches_rate_limit: float = 10
+    ches_rate_burst: int = 20
+
+    # Requests per second sent to the BC Geocoder by each process, after
+    # bursts of up to geocoder_rate_burst; 0 turns the limit off
+    geocoder_rate_limit: float = 10
+    geocoder_rate_burst: int = 10
+
+    # Worker processes for CPU-heavy document rendering (0 renders on a thread)
+    render_pool_workers: int = 2
+
+    # Database sessions one process opens at once to load export sheets
+    export_sheet_sessions: int = 3
+
+    # Seconds a user's cached unread notification count lives, and between
+    # the recounts that correct cached counts which drifted
+    notification_unread_count_ttl: int = 24 * 60 * 60
+    notification_unread_count_reconcile_interval: int = 15 * 60
+
+    # Background jobs (imports, exports) run at once by each job worker
+    job_worker_concurrency: int = 2
+    # Run a job worker inside each API process. Turn off where dedicated
+    # workers (python -m lcfs.services.job_queue) run the queue.
+    job_worker_embedded: bool = True
 
     # Feature flags
     feature_credit_market_notifications: bool = True
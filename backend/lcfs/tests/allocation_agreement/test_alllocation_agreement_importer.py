@@ -1,13 +1,12 @@
 import pytest
 import asyncio
 from unittest.mock import MagicMock, AsyncMock, patch
-import concurrent.futures
 
 from lcfs.web.api.allocation_agreement.importer import AllocationAgreementImporter
 from lcfs.web.api.allocation_agreement.repo import AllocationAgreementRepository
 from lcfs.web.api.allocation_agreement.services import AllocationAgreementServices
 from lcfs.web.api.compliance_report.services import ComplianceReportServices
-from lcfs.services.clamav.client import ClamAVService
+from lcfs.services.job_queue.queue import JobQueue
 from redis.asyncio import Redis
 
 
@@ -29,25 +28,23 @@ def mock_compliance_service() -> ComplianceReportServices:
     return service
 
 
-@pytest.fixture
-def mock_clamav() -> ClamAVService:
-    clamav = MagicMock(spec=ClamAVService)
-    return clamav
-
-
 @pytest.fixture
 def mock_redis() -> Redis:
     redis_client = MagicMock(spec=Redis)
     redis_client.set = AsyncMock()
     redis_client.get = AsyncMock()
+    pipeline = MagicMock()
+    pipeline.__aenter__.return_value = pipeline
+    pipeline.execute = AsyncMock()
+    redis_client.pipeline.return_value = pipeline
     return redis_client
 
 
 @pytest.fixture
-def mock_executor():
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-    yield executor
-    executor.shutdown(wait=False)
+def mock_queue() -> JobQueue:
+    queue = MagicMock(spec=JobQueue)
+    queue.enqueue = AsyncMock(return_value=("job-1", True))
+    return queue
 
 
 @pytest.fixture
@@ -55,9 +52,8 @@ def importer_instance(
     mock_repo,
     mock_allocation_services,
     mock_compliance_service,
-    mock_clamav,
     mock_redis,
-    mock_executor,
+    mock_queue,
 ):
     """
     Creates an AllocationAgreementImporter with mocked dependencies.
@@ -66,14 +62,13 @@ def importer_instance(
         repo=mock_repo,
         fuel_code_repo=mock_allocation_services,
         compliance_report_services=mock_compliance_service,
-        clamav_service=mock_clamav,
         redis_client=mock_redis,
-        executor=mock_executor,
+        queue=mock_queue,
     )
 
 
 @pytest.mark.anyio
-async def test_import_data_success(importer_instance, mock_redis):
+async def test_import_data_success(importer_instance, mock_redis, mock_queue):
     file_mock = MagicMock()
     file_mock.filename = "test.xlsx"
     file_mock.content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
@@ -81,51 +76,52 @@ async def test_import_data_success(importer_instance, mock_redis):
 
     user_mock = MagicMock()
     user_mock.organization.organization_code = "TEST-ORG"
-    org_code = "TEST-ORG"
+    user_mock.organization_id = 5
 
-    with patch(
-        "lcfs.web.api.allocation_agreement.importer.import_async",
-        new=AsyncMock(return_value=None),
-    ) as mock_import_task:
-
-        job_id = await importer_instance.import_data(
-            compliance_report_id=123,
-            user=user_mock,
-            file=file_mock,
-            overwrite=False,
-        )
+    job_id = await importer_instance.import_data(
+        compliance_report_id=123,
+        user=user_mock,
+        file=file_mock,
+        overwrite=False,
+    )
 
-        assert isinstance(job_id, str)
-        assert len(job_id) > 0
+    assert job_id == "job-1"
 
-        # Check Redis progress was initialized
-        mock_redis.set.assert_called()
-        # Check our background task was scheduled
-        mock_import_task.assert_called()
+    # Check Redis progress was initialized
+    mock_redis.pipeline.return_value.set.assert_called()
+    # Check the import was queued with the upload attached
+    args, kwargs = mock_queue.enqueue.await_args
+    assert args[0] == "import.allocation_agreement"
+    assert args[1] == {
+        "compliance_report_id": 123,
+        "overwrite": False,
+        "dry_run": False,
+    }
+    assert kwargs["organization_id"] == 5
+    assert kwargs["input_file"] == b"fake-excel-contents"
+    assert kwargs["input_file_name"] == "test.xlsx"
 
 
 @pytest.mark.anyio
-async def test_import_data_with_clamav(importer_instance, mock_clamav, mock_redis):
-    with patch("lcfs.settings.settings.clamav_enabled", True):
-        file_mock = MagicMock()
-        file_mock.filename = "test.xlsx"
-        file_mock.content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        file_mock.read = AsyncMock(return_value=b"excel-data")
-        user_mock = MagicMock()
-        org_code = "TEST-ORG"
-
-        with patch(
-            "lcfs.web.api.allocation_agreement.importer.import_async", new=AsyncMock()
-        ) as mock_import_task:
-            job_id = await importer_instance.import_data(
-                compliance_report_id=999,
-                user=user_mock,
-                file=file_mock,
-                overwrite=True,
-            )
-
-            assert job_id
-            mock_import_task.assert_called()
+async def test_import_data_returns_import_in_progress(
+    importer_instance, mock_redis, mock_queue
+):
+    mock_queue.enqueue.return_value = ("job-running", False)
+    file_mock = MagicMock()
+    file_mock.filename = "test.xlsx"
+    file_mock.content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    file_mock.read = AsyncMock(return_value=b"excel-data")
+
+    job_id = await importer_instance.import_data(
+        compliance_report_id=999,
+        user=MagicMock(),
+        file=file_mock,
+        overwrite=True,
+    )
+
+    assert job_id == "job-running"
+    # The running import's progress is left alone
+    mock_redis.pipeline.return_value.set.assert_not_called()
 
 
 @pytest.mark.anyio
@@ -0,0 +1,74 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import update
+
+from lcfs.db.models.tasks import BackgroundJob, BackgroundJobStatusEnum
+from lcfs.services.job_queue.queue import JobQueue
+from lcfs.services.job_queue.registry import register_job
+from lcfs.web.api.background_job.services import BackgroundJobService
+from lcfs.web.exception.exceptions import DataNotFoundException
+
+
+@register_job("test.status")
+async def _status_job(job):
+    return None
+
+
+@pytest.mark.anyio
+async def test_get_job_combines_queue_state_and_progress(dbsession, fake_redis_client):
+    queue = JobQueue(dbsession)
+    user = MagicMock(user_profile_id=7)
+    job_id, _ = await queue.enqueue("test.status", user=user)
+    await fake_redis_client.set(
+        f"jobs/{job_id}",
+        json.dumps({"progress": 40, "status": "Importing row 10...", "errors": []}),
+    )
+    service = BackgroundJobService(queue=queue, redis_client=fake_redis_client)
+
+    job = await service.get_job(job_id, user)
+
+    assert job.state == BackgroundJobStatusEnum.QUEUED
+    assert job.attempts == 0
+    assert job.max_attempts == 1
+    assert job.progress == 40
+    assert job.status == "Importing row 10..."
+
+    with pytest.raises(DataNotFoundException):
+        await service.get_job(job_id, MagicMock(user_profile_id=8))
+    with pytest.raises(DataNotFoundException):
+        await service.get_job("missing", user)
+
+
+@pytest.mark.anyio
+async def test_get_report_returns_the_dry_run_error_workbook(
+    dbsession, fake_redis_client
+):
+    queue = JobQueue(dbsession)
+    user = MagicMock(user_profile_id=7)
+    job_id, _ = await queue.enqueue("test.status", user=user)
+    storage = MagicMock()
+    storage.get_metadata = AsyncMock(
+        return_value={"file_name": "fse_errors.xlsx", "media_type": "xlsx"}
+    )
+    storage.get_object = AsyncMock(return_value={"Body": b"", "ContentLength": 0})
+    service = BackgroundJobService(
+        queue=queue, redis_client=fake_redis_client, storage=storage
+    )
+
+    # Not a dry run, or one without errors
+    with pytest.raises(DataNotFoundException):
+        await service.get_report(job_id, user)
+
+    await dbsession.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.job_id == job_id)
+        .values(result={"dry_run": True, "report_key": "exports/report"})
+    )
+    file, metadata = await service.get_report(job_id, user)
+
+    storage.get_object.assert_awaited_once_with("exports/report")
+    assert metadata["file_name"] == "fse_errors.xlsx"
+    with pytest.raises(DataNotFoundException):
+        await service.get_report(job_id, MagicMock(user_profile_id=8))
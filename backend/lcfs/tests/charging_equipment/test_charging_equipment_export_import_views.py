@@ -47,7 +47,9 @@ class FakeChargingEquipmentExporter:
 
 
 class FakeChargingEquipmentImporter:
-    async def import_data(self, organization_id, user, org_code, file, overwrite):
+    async def import_data(
+        self, organization_id, user, org_code, file, overwrite, dry_run=False
+    ):
         return "job-123"
 
     async def get_status(self, job_id: str) -> dict:
@@ -59,6 +61,13 @@ class FakeChargingEquipmentImporter:
             "errors": ["Row 5: Invalid level"],
         }
 
+    def stream_status(self, job_id: str, last_event_id=None) -> StreamingResponse:
+        event = {"progress": 100, "status": "Done", "resumed_after": last_event_id}
+        return StreamingResponse(
+            iter([f"id: 2-0\ndata: {json.dumps(event)}\n\n"]),
+            media_type="text/event-stream",
+        )
+
 
 @pytest.fixture(autouse=True)
 def override_dependencies(fastapi_app: FastAPI):
@@ -249,3 +258,20 @@ async def test_get_import_job_status_success(
     assert data["created"] == 10
     assert data["rejected"] == 2
     assert isinstance(data["errors"], list)
+
+
+@pytest.mark.anyio
+async def test_stream_import_job_status_success(
+    client: AsyncClient, fastapi_app: FastAPI, set_mock_user
+):
+    set_mock_user(fastapi_app, [RoleEnum.SUPPLIER])
+
+    url = "/api/charging-equipment/status/job-123/events"
+    response = await client.get(url, headers={"Last-Event-ID": "1-0"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Type"].startswith("text/event-stream")
+    data_line = response.text.splitlines()[1]
+    event = json.loads(data_line[len("data: ") :])
+    assert event["progress"] == 100
+    assert event["resumed_after"] == "1-0"
@@ -13,7 +13,7 @@ from lcfs.web.api.charging_site.repo import ChargingSiteRepository
 from lcfs.web.api.charging_site.services import ChargingSiteService
 from lcfs.web.api.charging_site.schema import ChargingSiteCreateSchema
 from lcfs.db.models.user.UserProfile import UserProfile
-from lcfs.services.clamav.client import ClamAVService
+from lcfs.services.job_queue.queue import JobQueue
 
 
 @pytest.fixture
@@ -26,24 +26,18 @@ def mock_service():
     return AsyncMock(spec=ChargingSiteService)
 
 
-@pytest.fixture
-def mock_clamav():
-    return MagicMock(spec=ClamAVService)
-
-
 @pytest.fixture
 def mock_redis():
     redis = AsyncMock()
     redis.get.return_value = None
     redis.set.return_value = None
+    pipeline = MagicMock()
+    pipeline.__aenter__.return_value = pipeline
+    pipeline.execute = AsyncMock()
+    redis.pipeline = MagicMock(return_value=pipeline)
     return redis
 
 
-@pytest.fixture
-def mock_executor():
-    return MagicMock()
-
-
 @pytest.fixture
 def mock_user():
     user = MagicMock(spec=UserProfile)
@@ -79,45 +73,40 @@ def mock_upload_file():
 
 
 @pytest.fixture
-def importer(mock_repo, mock_service, mock_clamav, mock_redis, mock_executor):
+def mock_queue():
+    queue = MagicMock(spec=JobQueue)
+    queue.enqueue = AsyncMock(return_value=("test-job-id", True))
+    return queue
+
+
+@pytest.fixture
+def importer(mock_repo, mock_service, mock_redis, mock_queue):
     return ChargingSiteImporter(
         repo=mock_repo,
         cs_service=mock_service,
-        clamav_service=mock_clamav,
         redis_client=mock_redis,
-        executor=mock_executor,
+        queue=mock_queue,
     )
 
 
 class TestChargingSiteImporter:
 
     @pytest.mark.anyio
-    async def test_import_data_success(self, importer, mock_user, mock_upload_file):
+    async def test_import_data_success(
+        self, importer, mock_user, mock_upload_file, mock_queue
+    ):
         """Test successful import data initiation"""
-        with patch(
-            "lcfs.web.api.charging_site.importer.uuid.uuid4"
-        ) as mock_uuid, patch(
-            "lcfs.web.api.charging_site.importer.asyncio.create_task"
-        ) as mock_create_task:
-
-            mock_uuid.return_value = MagicMock()
-            mock_uuid.return_value.__str__ = MagicMock(return_value="test-job-id")
-
-            # Mock create_task to prevent actual background task from running
-            # Close the coroutine to prevent "never awaited" warning
-            def close_coroutine(coro):
-                coro.close()
-                return MagicMock()
-
-            mock_create_task.side_effect = close_coroutine
-
-            job_id = await importer.import_data(
-                1, mock_user, "ORG001", mock_upload_file, False
-            )
+        job_id = await importer.import_data(
+            1, mock_user, "ORG001", mock_upload_file, False
+        )
 
-            assert job_id == "test-job-id"
-            importer.redis_client.set.assert_called()
-            mock_create_task.assert_called_once()
+        assert job_id == "test-job-id"
+        importer.redis_client.pipeline.return_value.set.assert_called()
+        mock_queue.enqueue.assert_awaited_once()
+        args, kwargs = mock_queue.enqueue.await_args
+        assert args[0] == "import.charging_site"
+        assert kwargs["organization_id"] == 1
+        assert kwargs["input_file"] == b"test file content"
 
     @pytest.mark.anyio
     async def test_import_data_file_too_large(self, importer, mock_user):
@@ -239,6 +228,26 @@ class TestValidateRow:
         assert result is not None
         assert "Invalid postal code" in result
 
+    def test_validate_row_rejects_locations_outside_bc(self):
+        """Rows placed outside BC, or far from their postal code, are rejected."""
+        row = (
+            "Test Site",
+            "123 Main St",
+            "Vancouver",
+            "V6B 1A1",
+            47.6062,  # Seattle
+            -122.3321,
+            None,
+            "Notes",
+        )
+
+        result = _validate_row(row, 2, set())
+        assert "outside British Columbia" in result
+
+        # Prince George
+        result = _validate_row(row[:4] + (53.9171, -122.7497) + row[6:], 2, set())
+        assert "not near postal code V6B 1A1" in result
+
     def test_validate_row_rejects_own_org_as_allocating_org(self):
         """Row is rejected when the allocating org name matches the uploading org's name."""
         row = (
@@ -367,12 +376,10 @@ class TestParseRow:
 class TestUpdateProgress:
 
     @pytest.mark.anyio
-    async def test_update_progress_success(self):
+    async def test_update_progress_success(self, fake_redis_client):
         """Test successful progress update"""
-        mock_redis = AsyncMock()
-
         await _update_progress(
-            mock_redis,
+            fake_redis_client,
             "test-job-id",
             50.0,
             "Processing...",
@@ -381,33 +388,43 @@ class TestUpdateProgress:
             errors=["Error 1"],
         )
 
-        mock_redis.set.assert_called_once()
-        call_args = mock_redis.set.call_args
-
-        # Verify the key
-        assert call_args[0][0] == "jobs/test-job-id"
-
-        # Verify the data structure
-        data = json.loads(call_args[0][1])
+        # Errors are kept apart from the status so updates only append them
+        data = json.loads(await fake_redis_client.get("jobs/test-job-id"))
         assert data["progress"] == 50.0
         assert data["status"] == "Processing..."
         assert data["created"] == 10
         assert data["rejected"] == 2
-        assert data["errors"] == ["Error 1"]
+        assert await fake_redis_client.lrange("jobs/test-job-id/errors", 0, -1) == [
+            "Error 1"
+        ]
 
     @pytest.mark.anyio
-    async def test_update_progress_with_defaults(self):
-        """Test progress update with default values"""
-        mock_redis = AsyncMock()
+    async def test_update_progress_appends_errors(self, fake_redis_client):
+        """Test that each update only adds its new errors"""
+        await _update_progress(
+            fake_redis_client, "test-job-id", 50.0, "Processing...", errors=["Error 1"]
+        )
+        await _update_progress(
+            fake_redis_client, "test-job-id", 60.0, "Processing...", errors=["Error 2"]
+        )
 
-        await _update_progress(mock_redis, "test-job-id", 25.0, "Starting...")
+        importer = ChargingSiteImporter(
+            repo=MagicMock(),
+            cs_service=MagicMock(),
+            redis_client=fake_redis_client,
+        )
+        result = await importer.get_status("test-job-id")
+        assert result["progress"] == 60.0
+        assert result["errors"] == ["Error 1", "Error 2"]
 
-        mock_redis.set.assert_called_once()
-        call_args = mock_redis.set.call_args
+    @pytest.mark.anyio
+    async def test_update_progress_with_defaults(self, fake_redis_client):
+        """Test progress update with default values"""
+        await _update_progress(fake_redis_client, "test-job-id", 25.0, "Starting...")
 
-        data = json.loads(call_args[0][1])
+        data = json.loads(await fake_redis_client.get("jobs/test-job-id"))
         assert data["progress"] == 25.0
         assert data["status"] == "Starting..."
         assert data["created"] == 0
         assert data["rejected"] == 0
-        assert data["errors"] == []
+        assert await fake_redis_client.lrange("jobs/test-job-id/errors", 0, -1) == []
@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 import io
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 from openpyxl import load_workbook
 from starlette.responses import StreamingResponse
 
@@ -8,6 +9,8 @@ from lcfs.db.models.compliance.ComplianceReport import ReportingFrequency
 from lcfs.db.models.compliance.ComplianceReportStatus import ComplianceReportStatus
 from lcfs.db.models import Organization, CompliancePeriod
 from lcfs.web.api.compliance_report.export import ComplianceReportExporter
+from lcfs.web.api.compliance_report.sheet_exporters import ExportSheet, ReportRef
+from lcfs.settings import settings
 from lcfs.web.api.compliance_report.schema import (
     FUEL_SUPPLY_COLUMNS,
     FUEL_SUPPLY_QUARTERLY_COLUMNS,
@@ -257,6 +260,7 @@ def compliance_report_exporter(
         ef_repo=mock_ef_repo,
         aa_repo=mock_aa_repo,
         summary_service=mock_summary_service,
+        session_factory=None,
     )
     return exporter
 
@@ -499,27 +503,85 @@ class TestComplianceReportExporter:
         exporter = compliance_report_exporter
         exporter.cr_repo.get_compliance_report_by_id.return_value = mock_annual_report
 
-        summary_exporter = Mock()
-        summary_exporter.export_to_workbook = AsyncMock()
-        exporter.summary_exporter = summary_exporter
-
         active_sheet_exporter = Mock()
         active_sheet_exporter.supports.return_value = True
-        active_sheet_exporter.export_to_workbook = AsyncMock()
+        active_sheet_exporter.load_sheet = AsyncMock(
+            return_value=ExportSheet("Active", [["Header"], ["value"]])
+        )
 
         skipped_sheet_exporter = Mock()
         skipped_sheet_exporter.supports.return_value = False
-        skipped_sheet_exporter.export_to_workbook = AsyncMock()
+        skipped_sheet_exporter.load_sheet = AsyncMock()
 
         exporter.sheet_exporters = [active_sheet_exporter, skipped_sheet_exporter]
 
-        await exporter.export(1)
+        response = await exporter.export(1)
+        workbook = await self._response_workbook(response)
 
-        summary_exporter.export_to_workbook.assert_awaited_once()
         active_sheet_exporter.supports.assert_called_once_with(2024)
-        active_sheet_exporter.export_to_workbook.assert_awaited_once()
+        active_sheet_exporter.load_sheet.assert_awaited_once()
         skipped_sheet_exporter.supports.assert_called_once_with(2024)
-        skipped_sheet_exporter.export_to_workbook.assert_not_awaited()
+        skipped_sheet_exporter.load_sheet.assert_not_awaited()
+        assert "Active" in workbook.sheetnames
+
+    @pytest.mark.anyio
+    async def test_export_loads_sheets_on_separate_sessions(
+        self,
+        compliance_report_exporter,
+        mock_annual_report,
+    ):
+        exporter = compliance_report_exporter
+        exporter.cr_repo.get_compliance_report_by_id.return_value = mock_annual_report
+
+        sessions = []
+        open_sessions = []
+
+        class _SessionContext:
+            async def __aenter__(self):
+                session = Mock()
+                sessions.append(session)
+                open_sessions.append(session)
+                # Lets the other sheets try to open their sessions
+                await asyncio.sleep(0)
+                return session
+
+            async def __aexit__(self, *args):
+                concurrency.append(len(open_sessions))
+                open_sessions.pop()
+                return False
+
+        concurrency = []
+
+        exporter.session_factory = Mock(side_effect=_SessionContext)
+
+        session_exporters = {}
+
+        def build_for_session(session):
+            sheet_exporter = Mock()
+            sheet_exporter.load_sheet = AsyncMock(
+                return_value=ExportSheet(f"Sheet {len(session_exporters)}", [])
+            )
+            session_exporters[id(session)] = sheet_exporter
+            return {name: sheet_exporter for name in exporter.sheet_exporters_by_name}
+
+        with patch.object(
+            ComplianceReportExporter,
+            "_build_sheet_exporters_for_session",
+            side_effect=build_for_session,
+        ):
+            await exporter.export(1)
+
+        supported = [e for e in exporter.sheet_exporters if e.supports(2024)]
+        assert len(sessions) == len(supported)
+        assert len(session_exporters) == len(supported)
+        for sheet_exporter in session_exporters.values():
+            sheet_exporter.load_sheet.assert_awaited_once()
+            # Other sessions get the report's fields, not the ORM instance
+            report_ref = sheet_exporter.load_sheet.await_args.args[0]
+            assert report_ref == ReportRef.of(mock_annual_report)
+        assert max(concurrency) == settings.export_sheet_sessions
+        # The request-scoped repositories are not used for sheet data.
+        exporter.fs_repo.get_effective_fuel_supplies.assert_not_called()
 
     @pytest.mark.anyio
     async def test_load_fuel_supply_data_annual(
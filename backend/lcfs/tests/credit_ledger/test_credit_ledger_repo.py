@@ -108,3 +108,24 @@ async def test_get_distinct_years_filters_nulls(
 
     assert years == expected_years
     mock_session.execute.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_stream_rows_reads_in_partitions(
+    repo: CreditLedgerRepository, mock_session: MagicMock
+):
+    fake_rows = [MagicMock(), MagicMock(), MagicMock()]
+
+    async def partitions():
+        yield fake_rows[:2]
+        yield fake_rows[2:]
+
+    stream_result = MagicMock()
+    stream_result.partitions.return_value = partitions()
+    mock_session.stream = AsyncMock(return_value=stream_result)
+
+    rows = [row async for row in repo.stream_rows(conditions=[], batch_size=2)]
+
+    assert rows == fake_rows
+    stmt = mock_session.stream.call_args.args[0]
+    assert stmt.get_execution_options()["yield_per"] == 2
@@ -21,7 +21,7 @@ def mock_repo():
 
 @pytest.fixture
 def credit_ledger_service(mock_repo):
-    return CreditLedgerService(repo=mock_repo)
+    return CreditLedgerService(repo=mock_repo, session_factory=None)
 
 
 @pytest.mark.anyio
@@ -54,6 +54,37 @@ async def test_get_ledger_paginated_success(credit_ledger_service, mock_repo):
 
 @pytest.mark.anyio
 async def test_export_transactions_generates_stream(credit_ledger_service, mock_repo):
+    ledger_view = SimpleNamespace(
+        transaction_type="ComplianceReport",
+        compliance_period="2023",
+        organization_id=1,
+        compliance_units=10,
+        available_balance=10,
+        update_date=datetime(2024, 1, 1),
+    )
+
+    async def stream_rows(conditions):
+        yield (ledger_view, 1)
+
+    mock_repo.stream_rows = MagicMock(side_effect=stream_rows)
+
+    resp = await credit_ledger_service.export_transactions(
+        organization_id=1, compliance_year=None, export_format="csv"
+    )
+
+    assert isinstance(resp, StreamingResponse)
+    assert resp.media_type == "text/csv"
+    assert resp.headers["Content-Disposition"].startswith("attachment;")
+    # Rows are only read from the cursor while the body is sent
+    mock_repo.get_rows_paginated.assert_not_called()
+    content = b"".join([chunk async for chunk in resp.body_iterator]).decode()
+    assert "2023,10,10,Compliance Report – Supplemental 1,2024-01-01" in content
+
+
+@pytest.mark.anyio
+async def test_export_transactions_builds_xls_in_memory(
+    credit_ledger_service, mock_repo
+):
     with patch(
         "lcfs.web.api.credit_ledger.services.SpreadsheetBuilder.build_spreadsheet",
         return_value=b"dummy-bytes",
@@ -71,12 +102,10 @@ async def test_export_transactions_generates_stream(credit_ledger_service, mock_
         mock_repo.get_rows_paginated.return_value = ([(ledger_view, 1)], 1)
 
         resp = await credit_ledger_service.export_transactions(
-            organization_id=1, compliance_year=None, export_format="csv"
+            organization_id=1, compliance_year=None, export_format="xls"
         )
 
         assert isinstance(resp, StreamingResponse)
-        assert resp.media_type == "text/csv"
-        assert resp.headers["Content-Disposition"].startswith("attachment;")
         assert mock_add_sheet.called
         _, kwargs = mock_add_sheet.call_args
         assert kwargs["rows"][0][3] == "Compliance Report – Supplemental 1"
@@ -49,13 +49,18 @@ class FakeDocumentService:
             "create_user": "tester",
         }
 
-    async def get_object(self, document_id: int):
+    async def get_object(self, document_id: int, byte_range=None):
         file = {
             "ContentLength": 789,
-            # Wrap the bytes in a list so that iteration yields a bytes chunk.
-            "Body": [b"streamed content"],
+            "Body": io.BytesIO(b"streamed content"),
             "ContentType": "application/pdf",
         }
+        if byte_range == "bytes=0-7":
+            file.update(
+                ContentLength=8,
+                Body=io.BytesIO(b"streamed"),
+                ContentRange="bytes 0-7/789",
+            )
         document = DummyDocument("document.pdf", document_id=10, file_size=789)
         return file, document
 
@@ -165,6 +170,18 @@ async def test_stream_document_compliance_report(fastapi_app, client):
     assert body == b"streamed content"
 
 
+@pytest.mark.anyio
+async def test_stream_document_byte_range(fastapi_app, client):
+    url = fastapi_app.url_path_for(
+        "stream_document", parent_type="compliance_report", parent_id=1, document_id=10
+    )
+    response = await client.get(url, headers={"Range": "bytes=0-7"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.headers.get("Content-Range") == "bytes 0-7/789"
+    assert response.headers.get("Accept-Ranges") == "bytes"
+    assert await response.aread() == b"streamed"
+
+
 @pytest.mark.anyio
 async def test_stream_document_initiative_agreement(fastapi_app, client):
     url = fastapi_app.url_path_for(
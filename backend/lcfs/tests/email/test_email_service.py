@@ -2,7 +2,12 @@ from lcfs.web.api.base import AudienceType, NotificationTypeEnum
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from lcfs.web.api.email.repo import CHESEmailRepository
-from lcfs.web.api.email.services import CHESEmailService
+from lcfs.web.api.email.services import (
+    CHES_MAX_RECIPIENTS,
+    CHESEmailService,
+    EmailMessage,
+)
+from lcfs.web.exception.exceptions import ServiceException
 import os
 
 
@@ -89,28 +94,6 @@ async def test_send_notification_email_no_recipients(
     )
 
 
-@pytest.mark.anyio
-async def test_get_ches_token_success(mock_environment_vars):
-    # Arrange
-    mock_token = "mock_access_token"
-    with patch("requests.post") as mock_post:
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "access_token": mock_token,
-            "expires_in": 3600,
-        }
-        mock_post.return_value = mock_response
-
-        service = CHESEmailService()
-
-        # Act
-        token = await service._get_ches_token()
-
-        # Assert
-        assert token == mock_token
-        mock_post.assert_called_once()
-
-
 @pytest.mark.anyio
 async def test_send_fuel_code_expiry_notifications_success(mock_email_repo, mock_environment_vars):
     # Arrange
@@ -140,27 +123,95 @@ async def test_send_fuel_code_expiry_notifications_success(mock_email_repo, mock
 
 
 @pytest.mark.anyio
-async def test_get_ches_token_cached(mock_environment_vars):
-    # Arrange
-    with patch("requests.post") as mock_post:
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "access_token": "initial_token",
-            "expires_in": 3600,
-        }
-        mock_post.return_value = mock_response
+async def test_send_email_raises_on_failure_when_asked(mock_environment_vars):
+    service = CHESEmailService()
+    ches_client = MagicMock()
+    ches_client.send = AsyncMock(side_effect=Exception("502"))
+    with patch("lcfs.web.api.email.services.get_ches_client", return_value=ches_client):
+        # Callers that cannot retry only learn that nothing was sent
+        assert await service.send_email({"subject": "Test"}) is False
+        # Queued sends raise so that their job is retried
+        with pytest.raises(ServiceException):
+            await service.send_email({"subject": "Test"}, raise_on_failure=True)
 
-        service = CHESEmailService()
 
-        # First call to get token
-        first_token = await service._get_ches_token()
+@pytest.mark.anyio
+async def test_types_sharing_a_template_are_sent_as_one_email(
+    mock_email_repo, mock_environment_vars
+):
+    recipients = {
+        "BCEID__GOVERNMENT_NOTIFICATION": ["a@example.com", "b@example.com"],
+        "IDIR_ANALYST__GOVERNMENT_NOTIFICATION": ["b@example.com", "c@gov.bc.ca"],
+        "IDIR_DIRECTOR__GOVERNMENT_NOTIFICATION": [],
+    }
+    mock_email_repo.get_subscribed_user_emails.side_effect = (
+        lambda notification_type, *args: recipients[notification_type]
+    )
+    service = CHESEmailService(repo=mock_email_repo)
+    service.send_email = AsyncMock(return_value=True)
+
+    sent = await service.send_notification_emails(
+        [
+            NotificationTypeEnum.BCEID__GOVERNMENT_NOTIFICATION,
+            NotificationTypeEnum.IDIR_ANALYST__GOVERNMENT_NOTIFICATION,
+            NotificationTypeEnum.IDIR_DIRECTOR__GOVERNMENT_NOTIFICATION,
+        ],
+        {"subject": "Notice", "notification_title": "Maintenance"},
+    )
 
-        # Reset mock to ensure no second call is made
-        mock_post.reset_mock()
+    assert sent is True
+    payload = service.send_email.await_args.args[0]
+    service.send_email.assert_awaited_once()
+    assert payload["bcc"] == ["a@example.com", "b@example.com", "c@gov.bc.ca"]
+    assert "Maintenance" in payload["body"]
 
-        # Act: Second call should return cached token
-        second_token = await service._get_ches_token()
 
-        # Assert
-        assert first_token == second_token
-        mock_post.assert_not_called()
+@pytest.mark.anyio
+async def test_batches_split_large_audiences_and_keep_contexts_apart(
+    mock_email_repo, mock_environment_vars
+):
+    service = CHESEmailService(repo=mock_email_repo)
+    service.send_email = AsyncMock(side_effect=[True, True, False])
+    messages = [
+        EmailMessage(
+            "BCEID__GOVERNMENT_NOTIFICATION",
+            {"subject": "Notice"},
+            [f"user{index}@example.com" for index in range(CHES_MAX_RECIPIENTS + 1)],
+        ),
+        EmailMessage(
+            "BCEID__GOVERNMENT_NOTIFICATION",
+            {"subject": "Another notice"},
+            ["user0@example.com"],
+        ),
+    ]
+
+    assert await service.send_batch(messages) == [True, False]
+    sizes = [len(c.args[0]["bcc"]) for c in service.send_email.await_args_list]
+    assert sizes == [CHES_MAX_RECIPIENTS, 1, 1]
+
+
+@pytest.mark.anyio
+async def test_a_failing_email_only_fails_its_recipients(
+    mock_email_repo, mock_environment_vars
+):
+    service = CHESEmailService(repo=mock_email_repo)
+    service.send_email = AsyncMock(return_value=True)
+    original_render = service._render_email_template
+
+    def render(template_name, context):
+        if context["company"] == "Broken":
+            raise ValueError("Failed to render email template")
+        return original_render(template_name, context)
+
+    service._render_email_template = render
+
+    sent = await service.send_fuel_code_expiry_batch(
+        NotificationTypeEnum.IDIR_ANALYST__FUEL_CODE__EXPIRY_NOTIFICATION,
+        [
+            ("a@example.com", {"company": "Broken", "fuel_codes": []}),
+            ("b@example.com", {"company": "Working", "fuel_codes": []}),
+        ],
+    )
+
+    assert sent == [False, True]
+    service.send_email.assert_awaited_once()
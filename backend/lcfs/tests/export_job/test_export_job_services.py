@@ -0,0 +1,254 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import ValidationError
+from starlette.responses import StreamingResponse
+
+from lcfs.services.job_queue.queue import JobFailed, JobQueue, QueuedJob
+from lcfs.services.job_queue.worker import JobResources
+from lcfs.web.api.export_job.builders import build_export
+from lcfs.web.api.export_job.schema import ExportJobCreateSchema, ExportJobTypeEnum
+from lcfs.web.api.export_job.services import (
+    EXPORT_SOURCE_TABLES,
+    ExportJobService,
+    _cache_key,
+    _export_params,
+    export_async,
+    run_export_job,
+)
+from lcfs.web.exception.exceptions import DataNotFoundException
+
+
+@pytest.fixture
+def user():
+    user = MagicMock()
+    user.user_profile_id = 7
+    user.is_government = True
+    return user
+
+
+@pytest.fixture
+def mock_repo():
+    repo = MagicMock()
+    repo.get_data_version = AsyncMock(return_value=42)
+    return repo
+
+
+@pytest.fixture
+def mock_storage():
+    storage = MagicMock()
+    storage.get_metadata = AsyncMock(return_value=None)
+    storage.get_object = AsyncMock()
+    return storage
+
+
+@pytest.fixture
+def mock_queue():
+    queue = MagicMock(spec=JobQueue)
+    queue.enqueue = AsyncMock(return_value=("job-1", True))
+    return queue
+
+
+@pytest.fixture
+def service(mock_repo, mock_storage, fake_redis_client, mock_queue):
+    return ExportJobService(
+        repo=mock_repo,
+        storage=mock_storage,
+        redis_client=fake_redis_client,
+        queue=mock_queue,
+    )
+
+
+def ledger_payload(**overrides):
+    return ExportJobCreateSchema(
+        export_type=ExportJobTypeEnum.CREDIT_LEDGER,
+        organization_id=1,
+        **overrides,
+    )
+
+
+def test_create_schema_requires_type_params():
+    with pytest.raises(ValidationError):
+        ExportJobCreateSchema(export_type=ExportJobTypeEnum.COMPLIANCE_REPORT)
+
+    with pytest.raises(ValidationError):
+        ledger_payload(format="pdf")
+
+
+def test_cache_key_tracks_params_and_data_version(user):
+    params = _export_params(ledger_payload(), user)
+
+    assert _cache_key(params, 1) == _cache_key(dict(params), 1)
+    assert _cache_key(params, 1) != _cache_key(params, 2)
+    assert _cache_key(params, 1) != _cache_key(
+        _export_params(ledger_payload(compliance_year=2024), user), 1
+    )
+
+
+def test_xlsx_only_exports_ignore_format(user):
+    payload = ExportJobCreateSchema(
+        export_type=ExportJobTypeEnum.COMPLIANCE_REPORT,
+        compliance_report_id=3,
+        format="csv",
+    )
+    assert _export_params(payload, user)["format"] == "xlsx"
+
+
+@pytest.mark.anyio
+async def test_create_job_reuses_stored_artifact(
+    service, mock_repo, mock_storage, mock_queue, user
+):
+    mock_storage.get_metadata.return_value = {
+        "file_name": "ledger.xlsx",
+        "media_type": "application/vnd.ms-excel",
+        "size": 10,
+    }
+
+    job_id = await service.create_job(ledger_payload(), user)
+
+    mock_queue.enqueue.assert_not_called()
+    mock_repo.get_data_version.assert_awaited_once_with(
+        EXPORT_SOURCE_TABLES[ExportJobTypeEnum.CREDIT_LEDGER]
+    )
+    job_status = await service.get_status(job_id, user)
+    assert job_status.ready is True
+    assert job_status.progress == 100
+    assert job_status.file_name == "ledger.xlsx"
+
+
+@pytest.mark.anyio
+async def test_create_job_queues_missing_artifact(
+    service, mock_queue, fake_redis_client, user
+):
+    job_id = await service.create_job(ledger_payload(), user)
+
+    assert job_id == "job-1"
+    args, kwargs = mock_queue.enqueue.await_args
+    assert args[0] == "export"
+    params, artifact_key = args[1]["params"], args[1]["artifact_key"]
+    assert params["organization_id"] == 1
+    assert "/exports/credit_ledger/" in artifact_key
+    # Repeating the request while it builds returns the same job
+    assert kwargs["idempotency_key"] == f"7:{artifact_key}"
+
+    job = json.loads(await fake_redis_client.get(f"export_jobs/{job_id}"))
+    assert job["artifact_key"] == artifact_key
+
+    job_status = await service.get_status(job_id, user)
+    assert job_status.ready is False
+    assert job_status.progress == 0
+
+
+@pytest.mark.anyio
+async def test_repeated_request_keeps_running_export_progress(
+    service, mock_queue, fake_redis_client, user
+):
+    job_id = await service.create_job(ledger_payload(), user)
+    await fake_redis_client.set(
+        f"jobs/{job_id}", json.dumps({"progress": 80, "status": "Storing..."})
+    )
+    mock_queue.enqueue.return_value = (job_id, False)
+
+    assert await service.create_job(ledger_payload(), user) == job_id
+    assert (await service.get_status(job_id, user)).progress == 80
+
+
+@pytest.mark.anyio
+async def test_failed_export_fails_the_job(user):
+    job = QueuedJob(
+        job_id="job-1",
+        job_type="export",
+        payload={"params": {}, "artifact_key": "exports/key"},
+        attempt=1,
+        user=user,
+    )
+    with patch(
+        "lcfs.web.api.export_job.services.export_async",
+        new=AsyncMock(return_value=False),
+    ):
+        with pytest.raises(JobFailed):
+            await run_export_job(job)
+
+
+@pytest.mark.anyio
+async def test_jobs_are_private_to_requesting_user(service, mock_storage, user):
+    mock_storage.get_metadata.return_value = {
+        "file_name": "ledger.xlsx",
+        "media_type": "application/vnd.ms-excel",
+        "size": 10,
+    }
+    job_id = await service.create_job(ledger_payload(), user)
+
+    other_user = MagicMock()
+    other_user.user_profile_id = 8
+    with pytest.raises(DataNotFoundException):
+        await service.get_status(job_id, other_user)
+    with pytest.raises(DataNotFoundException):
+        await service.get_artifact(job_id, other_user)
+    with pytest.raises(DataNotFoundException):
+        await service.stream_status(job_id, other_user)
+
+    file, metadata = await service.get_artifact(job_id, user)
+    assert metadata["file_name"] == "ledger.xlsx"
+    mock_storage.get_object.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_export_async_stores_artifact(fake_redis_client, user):
+    response = StreamingResponse(
+        iter([b"abc", b"def"]),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="ledger.csv"'},
+    )
+    s3_client = MagicMock()
+
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    session.begin.return_value = session
+    session_factory = MagicMock(return_value=session)
+    resources = JobResources(
+        session_factory=session_factory, redis_client=fake_redis_client
+    )
+
+    with patch(
+        "lcfs.web.api.export_job.services.get_job_resources", return_value=resources
+    ), patch(
+        "lcfs.web.api.export_job.services.set_user_context", new_callable=AsyncMock
+    ), patch(
+        "lcfs.web.api.export_job.services.create_s3_client", return_value=s3_client
+    ), patch(
+        "lcfs.web.api.export_job.services.build_export",
+        new_callable=AsyncMock,
+        return_value=response,
+    ) as mock_build:
+        await export_async(
+            {"export_type": "credit_ledger"}, user, "job-1", "exports/key"
+        )
+
+    assert mock_build.await_args.args[:2] == (session, session_factory)
+    put_kwargs = s3_client.put_object.call_args.kwargs
+    assert put_kwargs["Body"] == b"abcdef"
+    assert put_kwargs["Key"] == "exports/key"
+    assert put_kwargs["ContentType"] == "text/csv"
+    assert put_kwargs["Metadata"] == {"file-name": "ledger.csv"}
+
+    progress = json.loads(await fake_redis_client.get("jobs/job-1"))
+    assert progress["ready"] is True
+    assert progress["file_name"] == "ledger.csv"
+
+
+@pytest.mark.anyio
+async def test_build_export_uses_given_session(dbsession, user):
+    response = await build_export(
+        dbsession,
+        None,
+        {"export_type": "charging_equipment", "organization_id": 1},
+        user,
+    )
+
+    assert response.media_type == (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    assert "attachment" in response.headers["content-disposition"]
@@ -1,13 +1,35 @@
 import pytest
 import asyncio
+import uuid
+from datetime import date
 from unittest.mock import MagicMock, AsyncMock, patch
-import concurrent.futures
 
-from lcfs.web.api.final_supply_equipment.importer import FinalSupplyEquipmentImporter
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from lcfs.db.models import Organization
+from lcfs.db.models.compliance import (
+    CompliancePeriod,
+    ComplianceReport,
+    ComplianceReportStatus,
+    FinalSupplyEquipment,
+)
+from lcfs.db.models.compliance.FinalSupplyEquipmentRegNumber import (
+    FinalSupplyEquipmentRegNumber,
+)
+from lcfs.web.api.final_supply_equipment.importer import (
+    FinalSupplyEquipmentImporter,
+    _EquipmentIntervals,
+    _ImportLookups,
+    _import_chunk,
+)
+from lcfs.web.api.final_supply_equipment.schema import (
+    FinalSupplyEquipmentCreateSchema,
+)
 from lcfs.web.api.final_supply_equipment.repo import FinalSupplyEquipmentRepository
 from lcfs.web.api.final_supply_equipment.services import FinalSupplyEquipmentServices
 from lcfs.web.api.compliance_report.repo import ComplianceReportRepository
-from lcfs.services.clamav.client import ClamAVService
+from lcfs.services.job_queue.queue import JobQueue
 from redis.asyncio import Redis
 
 
@@ -26,29 +48,29 @@ def mock_fse_service() -> FinalSupplyEquipmentServices:
 @pytest.fixture
 def mock_compliance_repo() -> ComplianceReportRepository:
     repo = MagicMock(spec=ComplianceReportRepository)
-    repo.get_compliance_report_by_id = AsyncMock(return_value=MagicMock())
+    repo.get_compliance_report_by_id = AsyncMock(
+        return_value=MagicMock(organization_id=5)
+    )
     return repo
 
 
-@pytest.fixture
-def mock_clamav() -> ClamAVService:
-    clamav = MagicMock(spec=ClamAVService)
-    return clamav
-
-
 @pytest.fixture
 def mock_redis() -> Redis:
     redis_client = MagicMock(spec=Redis)
     redis_client.set = AsyncMock()
     redis_client.get = AsyncMock()
+    pipeline = MagicMock()
+    pipeline.__aenter__.return_value = pipeline
+    pipeline.execute = AsyncMock()
+    redis_client.pipeline.return_value = pipeline
     return redis_client
 
 
 @pytest.fixture
-def mock_executor():
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-    yield executor
-    executor.shutdown(wait=False)
+def mock_queue() -> JobQueue:
+    queue = MagicMock(spec=JobQueue)
+    queue.enqueue = AsyncMock(return_value=("job-1", True))
+    return queue
 
 
 @pytest.fixture
@@ -56,9 +78,8 @@ def importer_instance(
     mock_repo,
     mock_fse_service,
     mock_compliance_repo,
-    mock_clamav,
     mock_redis,
-    mock_executor,
+    mock_queue,
 ):
     """
     Creates a FinalSupplyEquipmentImporter with mocked dependencies.
@@ -67,14 +88,13 @@ def importer_instance(
         repo=mock_repo,
         fse_service=mock_fse_service,
         compliance_report_repo=mock_compliance_repo,
-        clamav_service=mock_clamav,
         redis_client=mock_redis,
-        executor=mock_executor,
+        queue=mock_queue,
     )
 
 
 @pytest.mark.anyio
-async def test_import_data_success(importer_instance, mock_redis):
+async def test_import_data_success(importer_instance, mock_redis, mock_queue):
     file_mock = MagicMock()
     file_mock.filename = "test.xlsx"
     file_mock.content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
@@ -84,51 +104,29 @@ async def test_import_data_success(importer_instance, mock_redis):
     user_mock.organization.organization_code = "TEST-ORG"
     org_code = "TEST-ORG"
 
-    with patch(
-        "lcfs.web.api.final_supply_equipment.importer.import_async",
-        new=AsyncMock(return_value=None),
-    ) as mock_import_task:
-
-        job_id = await importer_instance.import_data(
-            compliance_report_id=123,
-            user=user_mock,
-            org_code=org_code,
-            file=file_mock,
-            overwrite=False,
-        )
-
-        assert isinstance(job_id, str)
-        assert len(job_id) > 0
-
-        # Check Redis progress was initialized
-        mock_redis.set.assert_called()
-        # Check our background task was scheduled
-        mock_import_task.assert_called()
+    job_id = await importer_instance.import_data(
+        compliance_report_id=123,
+        user=user_mock,
+        org_code=org_code,
+        file=file_mock,
+        overwrite=False,
+    )
 
+    assert job_id == "job-1"
 
-@pytest.mark.anyio
-async def test_import_data_with_clamav(importer_instance, mock_clamav, mock_redis):
-    with patch("lcfs.settings.settings.clamav_enabled", True):
-        file_mock = MagicMock()
-        file_mock.filename = "test.xlsx"
-        file_mock.content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        file_mock.read = AsyncMock(return_value=b"excel-data")
-        user_mock = MagicMock()
-        org_code = "TEST-ORG"
-
-        with patch(
-            "lcfs.web.api.final_supply_equipment.importer.import_async", new=AsyncMock()
-        ) as mock_import_task:
-            job_id = await importer_instance.import_data(
-                compliance_report_id=999,
-                user=user_mock,
-                org_code=org_code,
-                file=file_mock,
-                overwrite=True,
-            )
-
-            assert job_id
-            mock_import_task.assert_called()
+    # Check Redis progress was initialized
+    mock_redis.pipeline.return_value.set.assert_called()
+    # Check the import was queued for the report's organization
+    args, kwargs = mock_queue.enqueue.await_args
+    assert args[0] == "import.final_supply_equipment"
+    assert args[1] == {
+        "compliance_report_id": 123,
+        "org_code": "TEST-ORG",
+        "overwrite": False,
+        "dry_run": False,
+    }
+    assert kwargs["organization_id"] == 5
+    assert kwargs["input_file"] == b"fake-excel-contents"
 
 
 @pytest.mark.anyio
@@ -228,3 +226,222 @@ async def test_import_data_file_too_large(importer_instance):
     
     assert exc_info.value.status_code == 400
     assert "exceeds the maximum limit" in str(exc_info.value.detail)
+
+
+@pytest.fixture
+async def import_target(dbsession):
+    """
+    A compliance report and import lookups backed by the test database.
+    """
+    organization = await dbsession.scalar(select(Organization).limit(1))
+    period = await dbsession.scalar(select(CompliancePeriod).limit(1))
+    report_status = await dbsession.scalar(select(ComplianceReportStatus).limit(1))
+    report = ComplianceReport(
+        compliance_period_id=period.compliance_period_id,
+        organization_id=organization.organization_id,
+        current_status_id=report_status.compliance_report_status_id,
+        compliance_report_group_uuid=str(uuid.uuid4()),
+        version=0,
+    )
+    dbsession.add(report)
+    await dbsession.flush()
+
+    fse_repo = FinalSupplyEquipmentRepository(dbsession)
+    use_type = (await fse_repo.get_intended_use_types())[0]
+    user_type = (await fse_repo.get_intended_user_types())[0]
+    level = (await fse_repo.get_levels_of_equipment())[0]
+    lookups = _ImportLookups(
+        use_type_ids={use_type.type: use_type.end_use_type_id},
+        user_type_ids={user_type.type_name: user_type.end_user_type_id},
+        level_ids={level.name: level.level_of_equipment_id},
+        organization_code="TST9",
+        username="test_user",
+    )
+
+    def make_row(serial, postal_code):
+        return FinalSupplyEquipmentCreateSchema(
+            compliance_report_id=report.compliance_report_id,
+            organization_name="Test Org",
+            supply_from_date=date(2024, 1, 1),
+            supply_to_date=date(2024, 12, 31),
+            serial_nbr=serial,
+            manufacturer="Maker",
+            level_of_equipment=level.name,
+            intended_use_types=[use_type.type],
+            intended_user_types=[user_type.type_name],
+            street_address="1 Main St",
+            city="Victoria",
+            postal_code=postal_code,
+            latitude=48.4,
+            longitude=-123.3,
+        )
+
+    return fse_repo, lookups, make_row, report
+
+
+async def _registration_numbers(dbsession, report):
+    result = await dbsession.execute(
+        select(FinalSupplyEquipment.registration_nbr)
+        .where(FinalSupplyEquipment.compliance_report_id == report.compliance_report_id)
+        .order_by(FinalSupplyEquipment.final_supply_equipment_id)
+    )
+    return result.scalars().all()
+
+
+@pytest.mark.anyio
+async def test_import_chunk_allocates_registration_numbers(dbsession, import_target):
+    fse_repo, lookups, make_row, report = import_target
+    dbsession.add(
+        FinalSupplyEquipmentRegNumber(
+            organization_code="TST9", postal_code="V8W 1A1", current_sequence_number=4
+        )
+    )
+    await dbsession.flush()
+
+    created, errors = await _import_chunk(
+        dbsession,
+        fse_repo,
+        lookups,
+        [
+            (2, make_row("S1", "V8W 1A1")),
+            (3, make_row("S2", "V9A 2B2")),
+            (4, make_row("S3", "V8W 1A1")),
+        ],
+    )
+
+    assert (created, errors) == (3, [])
+    assert await _registration_numbers(dbsession, report) == [
+        "TST9-V8W1A1-005",
+        "TST9-V9A2B2-001",
+        "TST9-V8W1A1-006",
+    ]
+    assert await fse_repo.get_current_seq_by_org_and_postal_code(
+        "TST9", "V8W 1A1"
+    ) == 6
+    assert await fse_repo.get_current_seq_by_org_and_postal_code(
+        "TST9", "V9A 2B2"
+    ) == 1
+
+    fse = await dbsession.scalar(
+        select(FinalSupplyEquipment)
+        .options(selectinload(FinalSupplyEquipment.intended_use_types))
+        .where(FinalSupplyEquipment.registration_nbr == "TST9-V9A2B2-001")
+    )
+    assert [t.end_use_type_id for t in fse.intended_use_types] == list(
+        lookups.use_type_ids.values()
+    )
+
+
+@pytest.mark.anyio
+async def test_import_chunk_rejects_rows_past_sequence_limit(dbsession, import_target):
+    fse_repo, lookups, make_row, report = import_target
+    dbsession.add(
+        FinalSupplyEquipmentRegNumber(
+            organization_code="TST9", postal_code="V8W 1A1", current_sequence_number=998
+        )
+    )
+    await dbsession.flush()
+
+    created, errors = await _import_chunk(
+        dbsession,
+        fse_repo,
+        lookups,
+        [(row_idx, make_row(f"S{row_idx}", "V8W 1A1")) for row_idx in (2, 3, 4)],
+    )
+
+    assert created == 1
+    assert [row_idx for row_idx, _ in errors] == [3, 4]
+    assert "Exceeded maximum registration numbers" in errors[0][1]
+    assert await _registration_numbers(dbsession, report) == ["TST9-V8W1A1-999"]
+    assert await fse_repo.get_current_seq_by_org_and_postal_code(
+        "TST9", "V8W 1A1"
+    ) == 999
+
+
+@pytest.mark.anyio
+async def test_import_chunk_rolls_back_failed_chunk(dbsession, import_target):
+    fse_repo, lookups, make_row, report = import_target
+    rows = [(2, make_row("S1", "V8W 1A1")), (3, make_row("S2", "V8W 1A1"))]
+
+    with patch.object(
+        fse_repo,
+        "bulk_create_final_supply_equipment",
+        AsyncMock(side_effect=Exception("insert failed")),
+    ):
+        created, errors = await _import_chunk(dbsession, fse_repo, lookups, rows)
+
+    assert created == 0
+    assert errors == [(2, "Row 2: insert failed"), (3, "Row 3: insert failed")]
+    # The reserved registration numbers were released with the savepoint
+    assert await fse_repo.get_current_seq_by_org_and_postal_code(
+        "TST9", "V8W 1A1"
+    ) == 0
+
+
+@pytest.mark.anyio
+async def test_import_chunk_reports_each_failed_row_once(dbsession, import_target):
+    fse_repo, lookups, make_row, report = import_target
+    dbsession.add(
+        FinalSupplyEquipmentRegNumber(
+            organization_code="TST9", postal_code="V8W 1A1", current_sequence_number=998
+        )
+    )
+    await dbsession.flush()
+
+    with patch.object(
+        fse_repo,
+        "bulk_create_final_supply_equipment",
+        AsyncMock(side_effect=Exception("insert failed")),
+    ):
+        created, errors = await _import_chunk(
+            dbsession,
+            fse_repo,
+            lookups,
+            [(row_idx, make_row(f"S{row_idx}", "V8W 1A1")) for row_idx in (2, 3)],
+        )
+
+    assert created == 0
+    assert [row_idx for row_idx, _ in errors] == [3, 2]
+    assert "Exceeded maximum registration numbers" in errors[0][1]
+    assert errors[1] == (2, "Row 2: insert failed")
+
+
+@pytest.mark.anyio
+async def test_equipment_intervals_find_duplicates_and_overlaps(
+    dbsession, import_target
+):
+    fse_repo, lookups, make_row, report = import_target
+    await _import_chunk(dbsession, fse_repo, lookups, [(2, make_row("S1", "V8W 1A1"))])
+
+    intervals = _EquipmentIntervals(
+        await fse_repo.get_supply_date_ranges(report.compliance_report_id)
+    )
+
+    def row(serial, start, end, postal_code="V8W 1A1"):
+        return make_row(serial, postal_code).model_copy(
+            update={"supply_from_date": start, "supply_to_date": end}
+        )
+
+    duplicate = intervals.check(2, row("S1", date(2024, 1, 1), date(2024, 12, 31)))
+    assert duplicate.startswith("Row 2: Duplicate equipment found.")
+    overlap = intervals.check(3, row("S1", date(2024, 12, 31), date(2025, 6, 30)))
+    assert overlap == (
+        "Row 3: Date range overlap found for equipment with serial number S1 "
+        "at the same Charging site."
+    )
+    # Other equipment, locations and later ranges are accepted
+    assert intervals.check(4, row("S2", date(2024, 1, 1), date(2024, 12, 31))) is None
+    assert (
+        intervals.check(
+            5, row("S1", date(2024, 1, 1), date(2024, 12, 31), postal_code="V9A 2B2")
+        )
+        is None
+    )
+    assert intervals.check(6, row("S1", date(2025, 1, 1), date(2025, 6, 30))) is None
+    # Accepted rows are checked against later rows in the same file
+    in_file_overlap = intervals.check(7, row("S1", date(2025, 3, 1), date(2025, 3, 31)))
+    assert in_file_overlap.startswith("Row 7: Date range overlap")
+    in_file_duplicate = intervals.check(
+        8, row("S2", date(2024, 1, 1), date(2024, 12, 31))
+    )
+    assert in_file_duplicate.startswith("Row 8: Duplicate equipment found.")
@@ -21,10 +21,10 @@ Covers:
 """
 
 import asyncio
-import concurrent.futures
 import datetime
 import io
 import json
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -32,7 +32,7 @@ from fastapi import HTTPException
 from openpyxl import Workbook
 from redis.asyncio import Redis
 
-from lcfs.services.clamav.client import ClamAVService
+from lcfs.services.job_queue.queue import JobQueue
 from lcfs.web.api.compliance_report.repo import ComplianceReportRepository
 from lcfs.web.api.final_supply_equipment.fse_reporting_importer import (
     FSE_UPDATE_SHEETNAME,
@@ -72,24 +72,29 @@ def mock_redis():
     client = MagicMock(spec=Redis)
     client.set = AsyncMock()
     client.get = AsyncMock(return_value=None)
+    pipeline = MagicMock()
+    pipeline.__aenter__.return_value = pipeline
+    pipeline.execute = AsyncMock()
+    client.pipeline.return_value = pipeline
     return client
 
 
 @pytest.fixture
-def mock_executor():
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-    yield executor
-    executor.shutdown(wait=False)
+def mock_queue():
+    queue = MagicMock(spec=JobQueue)
+    queue.enqueue = AsyncMock(
+        return_value=("3f2b9c1e-6d4a-4f7e-9a8b-1c2d3e4f5a6b", True)
+    )
+    return queue
 
 
 @pytest.fixture
-def importer(mock_fse_repo, mock_compliance_repo, mock_redis, mock_executor):
+def importer(mock_fse_repo, mock_compliance_repo, mock_redis, mock_queue):
     return FSEReportingImporter(
         repo=mock_fse_repo,
         compliance_report_repo=mock_compliance_repo,
-        clamav_service=MagicMock(spec=ClamAVService),
         redis_client=mock_redis,
-        executor=mock_executor,
+        queue=mock_queue,
     )
 
 
@@ -110,24 +115,28 @@ def _xlsx_file(filename: str = "update.xlsx"):
 
 
 @pytest.mark.anyio
-async def test_import_data_returns_job_id(importer, mock_redis):
-    """Successful dispatch → a non-empty UUID string is returned."""
+async def test_import_data_returns_job_id(importer, mock_redis, mock_queue):
+    """Successful dispatch → the queued job's UUID is returned."""
     user = MagicMock()
     user.keycloak_username = "testuser"
 
-    with patch(
-        "lcfs.web.api.final_supply_equipment.fse_reporting_importer._import_async",
-        new=AsyncMock(return_value=None),
-    ):
-        job_id = await importer.import_data(
-            compliance_report_id=1,
-            user=user,
-            file=_xlsx_file(),
-        )
+    job_id = await importer.import_data(
+        compliance_report_id=1,
+        user=user,
+        file=_xlsx_file(),
+    )
 
     assert isinstance(job_id, str)
     assert len(job_id) == 36  # standard UUID format
-    mock_redis.set.assert_called()
+    mock_redis.pipeline.return_value.set.assert_called()
+    args, kwargs = mock_queue.enqueue.await_args
+    assert args[1] == {
+        "compliance_report_id": 1,
+        "compliance_report_group_uuid": "group-uuid-123",
+        "report_organization_id": 42,
+        "dry_run": False,
+    }
+    assert kwargs["organization_id"] == 42
 
 
 @pytest.mark.anyio
@@ -358,16 +367,8 @@ async def _run_import(rows: list, fse_repo_override=None):
 
     progress_records = []
 
-    async def fake_update(redis_client, job_id, progress, status_msg,
-                          updated=0, skipped=0, rejected=0, errors=None):
-        progress_records.append({
-            "progress": progress,
-            "status": status_msg,
-            "updated": updated,
-            "skipped": skipped,
-            "rejected": rejected,
-            "errors": errors or [],
-        })
+    async def fake_write(redis_client, job_id, data, reset=False):
+        progress_records.append(data)
 
     if fse_repo_override is None:
         fse_repo = MagicMock(spec=FinalSupplyEquipmentRepository)
@@ -379,52 +380,31 @@ async def _run_import(rows: list, fse_repo_override=None):
     else:
         fse_repo = fse_repo_override
 
-    engine = MagicMock()
     session = AsyncMock()
+    session.begin_nested = MagicMock(return_value=session)
     session.__aenter__ = AsyncMock(return_value=session)
     session.__aexit__ = AsyncMock(return_value=False)
-    session.begin = MagicMock(return_value=session)
+
+    @asynccontextmanager
+    async def fake_session(user, commit=True):
+        yield session
 
     redis = MagicMock(spec=Redis)
     redis.set = AsyncMock()
 
     with (
-        patch(
-            "lcfs.web.api.final_supply_equipment.fse_reporting_importer.create_async_engine",
-            return_value=engine,
-        ),
-        patch(
-            "lcfs.web.api.final_supply_equipment.fse_reporting_importer.AsyncSession",
-            return_value=session,
-        ),
-        patch(
-            "lcfs.web.api.final_supply_equipment.fse_reporting_importer.Redis",
-            return_value=redis,
-        ),
-        patch(
-            "lcfs.web.api.final_supply_equipment.fse_reporting_importer.FuelSupplyRepository",
-        ),
+        patch("lcfs.services.imports.job.import_session", new=fake_session),
+        patch("lcfs.services.imports.job.get_job_redis", return_value=redis),
         patch(
             "lcfs.web.api.final_supply_equipment.fse_reporting_importer.FinalSupplyEquipmentRepository",
             return_value=fse_repo,
         ),
-        patch(
-            "lcfs.web.api.final_supply_equipment.fse_reporting_importer.ComplianceReportRepository",
-        ),
-        patch(
-            "lcfs.web.api.final_supply_equipment.fse_reporting_importer.set_user_context",
-            new=AsyncMock(),
-        ),
-        patch(
-            "lcfs.web.api.final_supply_equipment.fse_reporting_importer._update_progress",
-            new=fake_update,
-        ),
+        patch("lcfs.services.imports.job.write_job_progress", new=fake_write),
         patch(
             "lcfs.web.api.final_supply_equipment.fse_reporting_importer._load_sheet",
             return_value=wb[FSE_UPDATE_SHEETNAME],
         ),
     ):
-        engine.dispose = AsyncMock()
         user = MagicMock()
         user.keycloak_username = "testuser"
 
@@ -0,0 +1,143 @@
+import io
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from docx import Document
+
+from lcfs.services.rendering.cache import RenderCache
+from lcfs.web.api.forms.export import (
+    FuelSupplierDeclarationDocxExporter,
+    FuelSupplierDeclarationPdfExporter,
+    _render,
+    _source_fingerprint,
+    render_pdf,
+)
+from lcfs.web.api.forms.schema import DeclarationExportRequest
+
+
+@pytest.fixture
+def payload():
+    return DeclarationExportRequest(
+        organization_name="Test Org",
+        reporting_period="2025",
+        declaration_type="Full",
+        contact_name="Jane Doe",
+        contact_email="jane@example.com",
+        fuel_type="Diesel",
+        quantity=1000,
+        units="L",
+        certified=True,
+    )
+
+
+async def _body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+@pytest.mark.anyio
+async def test_docx_export_renders_document(payload):
+    response = await FuelSupplierDeclarationDocxExporter().export(payload)
+
+    doc = Document(io.BytesIO(await _body(response)))
+    text = "\n".join(p.text for p in doc.paragraphs)
+    assert "Fuel Supplier Declaration" in text
+    assert (
+        response.headers["content-disposition"]
+        == 'attachment; filename="LCFS-Declaration-Test_Org-2025.docx"'
+    )
+
+
+@pytest.mark.anyio
+async def test_docx_export_served_from_cache(payload, fake_redis_client):
+    cache = RenderCache(fake_redis_client)
+    exporter = FuelSupplierDeclarationDocxExporter()
+
+    first = await _body(await exporter.export(payload, cache=cache))
+    with patch(
+        "lcfs.web.api.forms.export.run_in_render_pool", new_callable=AsyncMock
+    ) as mock_render:
+        second = await _body(await exporter.export(payload, cache=cache))
+
+    mock_render.assert_not_called()
+    assert second == first
+
+
+@pytest.mark.anyio
+async def test_pdf_export_renders_in_pool(payload, fake_redis_client):
+    cache = RenderCache(fake_redis_client)
+    with patch(
+        "lcfs.web.api.forms.export.run_in_render_pool",
+        new_callable=AsyncMock,
+        return_value=b"%PDF-1.7",
+    ) as mock_render:
+        response = await FuelSupplierDeclarationPdfExporter().export(
+            payload, form_name="Declaration", cache=cache
+        )
+
+    func, template_file, ctx = mock_render.call_args.args
+    assert func is render_pdf
+    assert template_file == "fuel-supplier-declaration.html"
+    assert ctx["form_name"] == "Declaration"
+    assert await _body(response) == b"%PDF-1.7"
+    assert response.media_type == "application/pdf"
+
+
+@pytest.mark.anyio
+async def test_render_cache_key_changes_with_template_and_context(
+    fake_redis_client,
+):
+    cache = RenderCache(fake_redis_client)
+    key = RenderCache.key("<p>{{ name }}</p>", {"name": "a"})
+
+    assert key == RenderCache.key("<p>{{ name }}</p>", {"name": "a"})
+    assert key != RenderCache.key("<p>{{ name }}</p>", {"name": "b"})
+    assert key != RenderCache.key("<b>{{ name }}</b>", {"name": "a"})
+
+    assert await cache.get(key) is None
+    await cache.set(key, b"\x00binary\xff")
+    assert await cache.get(key) == b"\x00binary\xff"
+
+
+@pytest.mark.anyio
+async def test_generation_stamp_is_not_part_of_the_cache_key(fake_redis_client):
+    cache = RenderCache(fake_redis_client)
+    render = AsyncMock(side_effect=[b"first", b"next day"])
+    ctx = {
+        "name": "a",
+        "generated": "June 01, 2025 at 09:00 UTC",
+        "generated_date": "2025-06-01",
+    }
+
+    with patch("lcfs.web.api.forms.export.run_in_render_pool", render):
+        await _render(cache, "template", ctx, render_pdf)
+        cached = await _render(
+            cache,
+            "template",
+            {**ctx, "generated": "June 01, 2025 at 17:30 UTC"},
+            render_pdf,
+        )
+        next_day = await _render(
+            cache,
+            "template",
+            {
+                **ctx,
+                "generated": "June 02, 2025 at 09:00 UTC",
+                "generated_date": "2025-06-02",
+            },
+            render_pdf,
+        )
+
+    assert cached == b"first"
+    # A document stamped with another day is rendered again
+    assert next_day == b"next day"
+    assert render.await_count == 2
+
+
+def test_source_fingerprint_covers_included_files(tmp_path):
+    (tmp_path / "form.html").write_text('{% include "part.html" %}')
+    (tmp_path / "part.html").write_text("<p>one</p>")
+    before = _source_fingerprint.__wrapped__(str(tmp_path))
+
+    (tmp_path / "part.html").write_text("<p>two</p>")
+
+    assert _source_fingerprint.__wrapped__(str(tmp_path)) != before
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock, AsyncMock
 
 from lcfs.db.models.login_bg_image.LoginBgImage import LoginBgImage
+from lcfs.web.api.login_bg_image.cache import login_bg_image_cache
 from lcfs.web.api.login_bg_image.repo import LoginBgImageRepository
 from lcfs.web.api.login_bg_image.services import LoginBgImageService
 
@@ -41,8 +42,16 @@ def active_image():
 
 
 @pytest.fixture
-def login_bg_image_service(mock_login_bg_image_repo):
+def login_bg_image_service(mock_login_bg_image_repo, fake_redis_client):
     service = LoginBgImageService.__new__(LoginBgImageService)
     service.repo = mock_login_bg_image_repo
     service.s3_client = MagicMock()
+    service.redis_client = fake_redis_client
     return service
+
+
+@pytest.fixture(autouse=True)
+def clear_login_bg_image_cache():
+    login_bg_image_cache.clear()
+    yield
+    login_bg_image_cache.clear()
@@ -2,10 +2,23 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from io import BytesIO
 
+from botocore.exceptions import ClientError
 from fastapi import HTTPException, UploadFile
+from PIL import Image
 
 from lcfs.db.models.login_bg_image.LoginBgImage import LoginBgImage
 from lcfs.web.api.login_bg_image.schema import LoginBgImageUpdateSchema
+from lcfs.web.api.login_bg_image.services import CACHE_VERSION_KEY, build_variants
+
+
+def _png(width, height):
+    output = BytesIO()
+    Image.new("RGB", (width, height), "steelblue").save(output, format="PNG")
+    return output.getvalue()
+
+
+async def _run_inline(func, *args):
+    return func(*args)
 
 
 # ---------------------------------------------------------------------------
@@ -81,9 +94,18 @@ async def test_upload_success(
     mock_file.file.fileno.return_value = 0
     mock_file.file.seek = MagicMock()
 
+    mock_file.read = AsyncMock(return_value=_png(3000, 1500))
+
     mock_login_bg_image_repo.create = AsyncMock(return_value=sample_image)
 
-    with patch("os.fstat") as mock_fstat:
+    with (
+        patch("os.fstat") as mock_fstat,
+        patch(
+            "lcfs.web.api.login_bg_image.services.run_in_render_pool",
+            new=_run_inline,
+        ),
+        patch("uuid.uuid4", return_value="abc-uuid"),
+    ):
         mock_fstat.return_value.st_size = 1024  # 1 KB — well under limit
         result = await login_bg_image_service.upload(
             mock_file, "Mountain Sunrise", "Rockies, BC"
@@ -93,6 +115,55 @@ async def test_upload_success(
     mock_login_bg_image_repo.create.assert_called_once()
     assert result.display_name == sample_image.display_name
 
+    # Each upload gets WebP copies for smaller screens
+    variants = {
+        call.kwargs["Key"]: Image.open(BytesIO(call.kwargs["Body"]))
+        for call in login_bg_image_service.s3_client.put_object.call_args_list
+    }
+    assert {key: (v.format, v.size) for key, v in variants.items()} == {
+        "login-backgrounds/abc-uuid-w1280.webp": ("WEBP", (1280, 640)),
+        "login-backgrounds/abc-uuid-w1920.webp": ("WEBP", (1920, 960)),
+        "login-backgrounds/abc-uuid-w2560.webp": ("WEBP", (2560, 1280)),
+    }
+    # The image list changed, so every process drops its cached copy
+    assert await login_bg_image_service.redis_client.get(CACHE_VERSION_KEY) == "1"
+
+
+def test_variants_are_only_made_narrower_than_the_original():
+    variants = build_variants(_png(1600, 900))
+
+    assert {
+        width: Image.open(BytesIO(content)).size for width, content in variants.items()
+    } == {1280: (1280, 720)}
+    assert build_variants(_png(800, 600)) == {}
+
+
+@pytest.mark.anyio
+async def test_upload_keeps_the_original_when_variants_fail(
+    login_bg_image_service, mock_login_bg_image_repo, sample_image
+):
+    mock_file = MagicMock(spec=UploadFile)
+    mock_file.content_type = "image/jpeg"
+    mock_file.filename = "photo.jpg"
+    mock_file.file = MagicMock()
+    mock_file.file.fileno.return_value = 0
+    mock_file.read = AsyncMock(return_value=b"not an image")
+    mock_login_bg_image_repo.create = AsyncMock(return_value=sample_image)
+
+    with (
+        patch("os.fstat") as mock_fstat,
+        patch(
+            "lcfs.web.api.login_bg_image.services.run_in_render_pool",
+            new=_run_inline,
+        ),
+    ):
+        mock_fstat.return_value.st_size = 1024
+        await login_bg_image_service.upload(mock_file, "Name", None)
+
+    login_bg_image_service.s3_client.upload_fileobj.assert_called_once()
+    login_bg_image_service.s3_client.put_object.assert_not_called()
+    mock_login_bg_image_repo.create.assert_called_once()
+
 
 @pytest.mark.anyio
 async def test_upload_rejects_invalid_content_type(login_bg_image_service):
@@ -173,10 +244,16 @@ async def test_delete_success(
 
     await login_bg_image_service.delete(1)
 
-    login_bg_image_service.s3_client.delete_object.assert_called_once_with(
-        Bucket=login_bg_image_service.s3_client.delete_object.call_args[1]["Bucket"],
-        Key=sample_image.image_key,
-    )
+    deleted = [
+        call.kwargs["Key"]
+        for call in login_bg_image_service.s3_client.delete_object.call_args_list
+    ]
+    assert deleted == [
+        sample_image.image_key,
+        "login-backgrounds/abc-uuid-w1280.webp",
+        "login-backgrounds/abc-uuid-w1920.webp",
+        "login-backgrounds/abc-uuid-w2560.webp",
+    ]
     mock_login_bg_image_repo.delete.assert_called_once_with(sample_image)
 
 
@@ -245,7 +322,7 @@ async def test_activate_raises_404_when_not_found(
 
 
 @pytest.mark.anyio
-async def test_stream_image_returns_s3_response(
+async def test_stream_image_returns_the_original(
     login_bg_image_service, mock_login_bg_image_repo, sample_image
 ):
     mock_login_bg_image_repo.get_by_id = AsyncMock(return_value=sample_image)
@@ -256,14 +333,87 @@ async def test_stream_image_returns_s3_response(
     }
     login_bg_image_service.s3_client.get_object.return_value = fake_s3_response
 
-    s3_resp, image = await login_bg_image_service.stream_image(1)
+    image = await login_bg_image_service.stream_image(1)
 
     login_bg_image_service.s3_client.get_object.assert_called_once_with(
         Bucket=login_bg_image_service.s3_client.get_object.call_args[1]["Bucket"],
         Key=sample_image.image_key,
     )
-    assert s3_resp["ContentType"] == "image/jpeg"
-    assert image == sample_image
+    assert image.content == b"image-bytes"
+    assert image.media_type == "image/jpeg"
+    assert image.file_name == sample_image.file_name
+    assert image.etag == '"abc-uuid-original"'
+
+
+@pytest.mark.anyio
+async def test_stream_image_serves_a_cached_variant(
+    login_bg_image_service, mock_login_bg_image_repo, sample_image
+):
+    mock_login_bg_image_repo.get_by_id = AsyncMock(return_value=sample_image)
+    login_bg_image_service.s3_client.get_object.side_effect = lambda **kwargs: {
+        "Body": BytesIO(b"webp-bytes"),
+        "ContentType": "image/webp",
+    }
+
+    first = await login_bg_image_service.stream_image(1, width=1600)
+    second = await login_bg_image_service.stream_image(1, width=1920)
+
+    assert first is second
+    assert first.etag == '"abc-uuid-1920"'
+    login_bg_image_service.s3_client.get_object.assert_called_once()
+    assert (
+        login_bg_image_service.s3_client.get_object.call_args.kwargs["Key"]
+        == "login-backgrounds/abc-uuid-w1920.webp"
+    )
+    mock_login_bg_image_repo.get_by_id.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_stream_image_falls_back_to_the_original_without_variants(
+    login_bg_image_service, mock_login_bg_image_repo, sample_image
+):
+    mock_login_bg_image_repo.get_by_id = AsyncMock(return_value=sample_image)
+    login_bg_image_service.s3_client.get_object.side_effect = [
+        ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject"),
+        {"Body": BytesIO(b"image-bytes"), "ContentType": "image/jpeg"},
+    ]
+
+    image = await login_bg_image_service.stream_image(1, width=1280)
+
+    assert image.content == b"image-bytes"
+    assert image.etag == '"abc-uuid-original"'
+
+
+@pytest.mark.anyio
+async def test_active_image_is_cached_until_images_change(
+    login_bg_image_service, mock_login_bg_image_repo, active_image
+):
+    mock_login_bg_image_repo.get_active = AsyncMock(return_value=active_image)
+    mock_login_bg_image_repo.get_by_id = AsyncMock(return_value=active_image)
+    mock_login_bg_image_repo.update = AsyncMock(return_value=active_image)
+
+    await login_bg_image_service.get_active()
+    await login_bg_image_service.get_active()
+    assert mock_login_bg_image_repo.get_active.await_count == 1
+
+    data = LoginBgImageUpdateSchema(display_name="Renamed", caption=None)
+    await login_bg_image_service.update(2, data)
+    result = await login_bg_image_service.get_active()
+    assert mock_login_bg_image_repo.get_active.await_count == 2
+    assert result.display_name == "Renamed"
+
+
+@pytest.mark.anyio
+async def test_cache_is_dropped_when_another_process_changes_images(
+    login_bg_image_service, mock_login_bg_image_repo, active_image, fake_redis_client
+):
+    mock_login_bg_image_repo.get_active = AsyncMock(return_value=active_image)
+
+    await login_bg_image_service.get_active()
+    await fake_redis_client.incr(CACHE_VERSION_KEY)
+    await login_bg_image_service.get_active()
+
+    assert mock_login_bg_image_repo.get_active.await_count == 2
 
 
 @pytest.mark.anyio
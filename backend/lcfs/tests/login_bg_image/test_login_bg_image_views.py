@@ -6,6 +6,7 @@ from httpx import AsyncClient
 from fastapi import FastAPI
 
 from lcfs.db.models.user.Role import RoleEnum
+from lcfs.web.api.login_bg_image.cache import StoredImage
 from lcfs.web.api.login_bg_image.services import LoginBgImageService
 from lcfs.web.api.login_bg_image.schema import LoginBgImageSchema
 
@@ -76,6 +77,47 @@ async def test_get_active_image_returns_null_when_none(
     assert response.json() is None
 
 
+# ---------------------------------------------------------------------------
+# GET /login-bg-images/{id}/stream  (public endpoint)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+async def test_stream_image_is_cacheable_and_revalidated(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    mock_login_bg_image_service,
+):
+    mock_login_bg_image_service.stream_image = AsyncMock(
+        return_value=StoredImage(
+            content=b"webp-bytes",
+            media_type="image/webp",
+            file_name="photo.jpg",
+            etag='"abc-uuid-1920"',
+        )
+    )
+    fastapi_app.dependency_overrides[LoginBgImageService] = (
+        lambda: mock_login_bg_image_service
+    )
+
+    url = fastapi_app.url_path_for("stream_image", image_id=1)
+    response = await client.get(url, params={"width": 1920})
+
+    assert response.status_code == 200
+    assert response.content == b"webp-bytes"
+    assert response.headers["content-type"] == "image/webp"
+    assert response.headers["etag"] == '"abc-uuid-1920"'
+    assert "immutable" in response.headers["cache-control"]
+    mock_login_bg_image_service.stream_image.assert_awaited_with(1, 1920)
+
+    response = await client.get(
+        url, params={"width": 1920}, headers={"If-None-Match": '"abc-uuid-1920"'}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == '"abc-uuid-1920"'
+
+
 # ---------------------------------------------------------------------------
 # GET /login-bg-images/  (admin only)
 # ---------------------------------------------------------------------------
@@ -1,8 +1,9 @@
+import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete
-from lcfs.web.api.base import NotificationTypeEnum
+from sqlalchemy import delete, select
+from lcfs.web.api.base import AudienceType, NotificationTypeEnum
 from lcfs.web.exception.exceptions import DataNotFoundException
 from lcfs.db.models.user.Role import Role, RoleEnum
 from lcfs.db.models.notification.NotificationChannel import ChannelEnum
@@ -11,6 +12,10 @@ from lcfs.db.models.notification import (
     NotificationMessage,
     NotificationChannelSubscription,
 )
+from lcfs.services.redis.unread_counts import (
+    unread_count_key,
+    wait_for_unread_updates,
+)
 from lcfs.web.api.notification.repo import NotificationRepository
 
 
@@ -38,7 +43,7 @@ def mock_db_session():
 
 @pytest.fixture
 def notification_repo(mock_db_session):
-    return NotificationRepository(db=mock_db_session)
+    return NotificationRepository(db=mock_db_session, redis_client=None)
 
 
 @pytest.mark.anyio
@@ -137,7 +142,7 @@ async def test_get_unread_notification_message_count_by_user_id(
 async def test_delete_notification_message(notification_repo, mock_db_session):
     notification_id = 123
 
-    mock_db_session.execute = AsyncMock()
+    mock_db_session.execute = AsyncMock(return_value=MagicMock())
     mock_db_session.flush = AsyncMock()
 
     await notification_repo.delete_notification_message(notification_id)
@@ -145,8 +150,13 @@ async def test_delete_notification_message(notification_repo, mock_db_session):
     assert mock_db_session.execute.call_count == 1
     executed_query = mock_db_session.execute.call_args[0][0]
 
-    expected_query = delete(NotificationMessage).where(
-        NotificationMessage.notification_message_id == notification_id
+    expected_query = (
+        delete(NotificationMessage)
+        .where(NotificationMessage.notification_message_id == notification_id)
+        .returning(
+            NotificationMessage.related_user_profile_id,
+            NotificationMessage.is_read,
+        )
     )
     assert str(executed_query) == str(expected_query)
     mock_db_session.execute.assert_called_once()
@@ -288,7 +298,7 @@ async def test_mark_notifications_as_read(notification_repo, mock_db_session):
     user_id = 1
     notification_ids = [1, 2, 3]
 
-    mock_db_session.execute = AsyncMock()
+    mock_db_session.execute = AsyncMock(return_value=MagicMock())
     mock_db_session.flush = AsyncMock()
 
     result = await notification_repo.mark_notifications_as_read(
@@ -484,7 +494,7 @@ async def test_delete_subscriptions_for_user(mock_db_session):
     mock_result.scalars.return_value.all.return_value = [fake_sub1, fake_sub2]
     mock_db_session.execute = AsyncMock(return_value=mock_result)
 
-    repo = NotificationRepository(db=mock_db_session)
+    repo = NotificationRepository(db=mock_db_session, redis_client=None)
 
     user_profile_id = 42
     await repo.delete_subscriptions_for_user(user_profile_id)
@@ -497,3 +507,111 @@ async def test_delete_subscriptions_for_user(mock_db_session):
     assert str(actual_query) == str(expected_query)
 
     mock_db_session.flush.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_create_subscribed_notification_messages(dbsession):
+    repo = NotificationRepository(db=dbsession, redis_client=None)
+    notification_type = NotificationTypeEnum.BCEID__TRANSFER__DIRECTOR_DECISION
+    # Seeded users: 1 is a government analyst, 2 a government user without
+    # the analyst role and 5 belongs to organization 1
+    for user_profile_id in (1, 2, 5):
+        await repo.add_subscriptions_for_notification_types(
+            user_profile_id, [notification_type]
+        )
+    message = {
+        "type": "Transfer",
+        "message": "{}",
+        "related_organization_id": 1,
+        "related_transaction_id": "CT1",
+    }
+
+    async def recipients():
+        result = await dbsession.execute(
+            select(NotificationMessage.related_user_profile_id).order_by(
+                NotificationMessage.related_user_profile_id
+            )
+        )
+        await dbsession.execute(delete(NotificationMessage))
+        return result.scalars().all()
+
+    created = await repo.create_subscribed_notification_messages(
+        notification_type, message, 1
+    )
+    assert created == 3
+    assert await recipients() == [1, 2, 5]
+
+    created = await repo.create_subscribed_notification_messages(
+        notification_type, message, 1, exclude_analysts=True
+    )
+    assert created == 2
+    assert await recipients() == [2, 5]
+
+    created = await repo.create_subscribed_notification_messages(
+        notification_type, message, 2, AudienceType.OTHER_ORGANIZATIONS
+    )
+    assert created == 1
+    row = (await dbsession.execute(select(NotificationMessage))).scalar_one()
+    assert row.related_user_profile_id == 5
+    assert row.type == "Transfer"
+    assert row.is_read is False
+
+
+@pytest.mark.anyio
+async def test_unread_counts_follow_committed_writes(dbsession, fake_redis_client):
+    repo = NotificationRepository(db=dbsession, redis_client=fake_redis_client)
+    notification_type = NotificationTypeEnum.BCEID__TRANSFER__DIRECTOR_DECISION
+    for user_profile_id in (2, 5):
+        await repo.add_subscriptions_for_notification_types(
+            user_profile_id, [notification_type]
+        )
+    message = {
+        "type": "Transfer",
+        "message": "{}",
+        "related_organization_id": 1,
+        "related_transaction_id": "CT1",
+    }
+
+    async def cached_counts():
+        await wait_for_unread_updates()
+        return [
+            await fake_redis_client.get(unread_count_key(user_id)) for user_id in (2, 5)
+        ]
+
+    # Counting caches the count; only user 5 is counted so far
+    assert await repo.get_unread_notification_message_count_by_user_id(5) == 0
+    await repo.create_subscribed_notification_messages(notification_type, message, 1)
+    await repo.create_subscribed_notification_messages(notification_type, message, 1)
+    assert await cached_counts() == [None, "0"]
+    await dbsession.commit()
+    assert await cached_counts() == [None, "2"]
+    # The recipients' connections are sent the messages and the count change
+    events = [
+        json.loads(fields["data"])
+        for _, fields in await fake_redis_client.xrange("notifications/5/events")
+    ]
+    assert [event["type"] for event in events] == ["notification"] * 2 + ["unread"]
+    assert events[0]["notification"]["relatedTransactionId"] == "CT1"
+
+    read_id, deleted_id = (
+        await dbsession.execute(
+            select(NotificationMessage.notification_message_id).where(
+                NotificationMessage.related_user_profile_id == 5
+            )
+        )
+    ).scalars()
+    await repo.mark_notifications_as_read(5, [read_id])
+    # Marking a message read twice counts once
+    await repo.mark_notifications_as_read(5, [read_id])
+    await dbsession.commit()
+    assert await cached_counts() == [None, "1"]
+
+    await repo.delete_notification_message(deleted_id)
+    await dbsession.commit()
+    assert await cached_counts() == [None, "0"]
+    assert await repo.get_unread_notification_message_count_by_user_id(2) == 2
+
+    await repo.mark_all_notifications_as_read_for_user(2)
+    await dbsession.commit()
+    assert await cached_counts() == [None, "0"]
+    assert await repo.get_unread_notification_message_count_by_user_id(2) == 0
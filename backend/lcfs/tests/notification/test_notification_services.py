@@ -1,13 +1,25 @@
 import pytest
 import json
 from unittest.mock import AsyncMock, MagicMock
-from lcfs.web.api.base import NotificationTypeEnum
+from lcfs.web.api.base import AudienceType, NotificationTypeEnum
 from lcfs.db.models.user.Role import RoleEnum
 from lcfs.db.models.notification import (
     NotificationChannelSubscription,
     NotificationMessage,
 )
-from lcfs.web.api.notification.services import NotificationService
+from sqlalchemy import select
+
+from lcfs.db.models.tasks import BackgroundJob, BackgroundJobStatusEnum
+from lcfs.services.job_queue.queue import JobQueue
+from lcfs.services.job_queue import worker as job_worker
+from lcfs.services.job_queue.worker import JobResources, JobWorker
+from lcfs.web.api.notification.services import (
+    NOTIFICATION_EMAIL_JOB_TYPE,
+    NOTIFICATION_JOB_TYPE,
+    NotificationService,
+    UnreadNotificationCountService,
+)
+from lcfs.services.redis.unread_counts import unread_count_key
 from lcfs.web.api.notification.repo import NotificationRepository
 from lcfs.web.api.notification.schema import (
     NotificationRequestSchema,
@@ -15,6 +27,7 @@ from lcfs.web.api.notification.schema import (
     NotificationMessageSchema,
 )
 from lcfs.web.api.email.services import CHESEmailService
+from lcfs.settings import settings
 
 
 # Mock common data for reuse
@@ -43,7 +56,12 @@ def notification_service():
     mock_email_service = MagicMock(spec=CHESEmailService)
     mock_email_service.send_notification_email = AsyncMock()
 
-    service = NotificationService(repo=mock_repo, email_service=mock_email_service)
+    mock_job_queue = MagicMock(spec=JobQueue)
+    mock_job_queue.enqueue = AsyncMock(return_value=("job-1", True))
+
+    service = NotificationService(
+        repo=mock_repo, email_service=mock_email_service, job_queue=mock_job_queue
+    )
     return service, mock_repo, mock_email_service
 
 
@@ -463,8 +481,9 @@ async def test_service_add_subscriptions_for_notification_types(
 
 
 @pytest.mark.anyio
-async def test_send_notification_skip_analyst(notification_service):
+async def test_send_notification_skip_analyst(notification_service, monkeypatch):
     service, mock_repo, mock_email_service = notification_service
+    monkeypatch.setattr(settings, "ches_enabled", True)
 
     # Create the notification request
     message_data = {
@@ -484,34 +503,185 @@ async def test_send_notification_skip_analyst(notification_service):
         notification_data=notif_msg_schema,
     )
 
-    # Analyst
-    mock_analyst_sub = MagicMock(spec=NotificationChannelSubscription)
-    mock_analyst_sub.user_profile_id = 2
-    mock_analyst_sub.user_profile = MagicMock()
-    mock_analyst_sub.user_profile.user_roles = [MagicMock(name=RoleEnum.ANALYST)]
+    mock_repo.create_subscribed_notification_messages = AsyncMock(return_value=1)
 
-    # Non-analyst
-    mock_non_analyst_sub = MagicMock(spec=NotificationChannelSubscription)
-    mock_non_analyst_sub.user_profile_id = 101
-    mock_non_analyst_sub.user_profile = MagicMock()
-    mock_non_analyst_sub.user_profile.user_roles = [MagicMock(name=RoleEnum.TRANSFER)]
+    # Call the method
+    assert await service.deliver_notification(notification_req) == 2
+
+    # Each type fans out in the database, leaving analysts out because the
+    # notified org is not the receiving org
+    calls = mock_repo.create_subscribed_notification_messages.await_args_list
+    assert [c.args[0] for c in calls] == notification_req.notification_types
+    for c in calls:
+        assert c.args[1] == {
+            "related_organization_id": 1,
+            "message": json.dumps(message_data),
+        }
+        assert c.args[2] == 1
+        assert c.args[3] == AudienceType.SAME_ORGANIZATION
+        assert c.kwargs == {"exclude_analysts": True}
+
+    # Emails are sent by their own jobs, one per type
+    email_jobs = service.job_queue.enqueue.await_args_list
+    assert [c.args[0] for c in email_jobs] == [NOTIFICATION_EMAIL_JOB_TYPE] * 2
+    assert email_jobs[1].args[1] == {
+        "notification_type": "IDIR_ANALYST__TRANSFER__DIRECTOR_RECORDED",
+        "notification_context": {"organization_id": 1, "message": message_data},
+        "organization_id": 1,
+        "audience_type": "same_organization",
+    }
+    mock_email_service.send_notification_email.assert_not_called()
 
-    # Configure the repo mock
-    mock_repo.get_subscribed_users_by_channel = AsyncMock(
-        return_value=[mock_analyst_sub, mock_non_analyst_sub]
+
+@pytest.mark.anyio
+async def test_deliver_notification_skips_emails_when_ches_is_disabled(
+    notification_service, monkeypatch
+):
+    service, mock_repo, _ = notification_service
+    monkeypatch.setattr(settings, "ches_enabled", False)
+    mock_repo.create_subscribed_notification_messages = AsyncMock(return_value=3)
+    notification_req = NotificationRequestSchema(
+        notification_types=[NotificationTypeEnum.BCEID__TRANSFER__DIRECTOR_DECISION],
+        notification_data=NotificationMessageSchema(
+            related_organization_id=1, message=json.dumps({"status": "Recorded"})
+        ),
     )
-    mock_repo.create_notification_messages = AsyncMock()
 
-    # Call the method
+    assert await service.deliver_notification(notification_req) == 3
+
+    service.job_queue.enqueue.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_send_notification_queues_delivery(notification_service):
+    service, mock_repo, mock_email_service = notification_service
+    notification_req = NotificationRequestSchema(
+        notification_types=[NotificationTypeEnum.BCEID__TRANSFER__DIRECTOR_DECISION],
+        notification_data=NotificationMessageSchema(
+            related_organization_id=1, message=json.dumps({"status": "Recorded"})
+        ),
+    )
+
+    assert await service.send_notification(notification_req) == "job-1"
     await service.send_notification(notification_req)
 
-    # Verify that the email service was not called
-    called_args, _ = mock_repo.create_notification_messages.await_args
-    created_notifications = called_args[0]
+    # Nothing is delivered within the caller's request
+    mock_repo.create_subscribed_notification_messages.assert_not_called()
+    mock_email_service.send_notification_email.assert_not_called()
+    first, second = service.job_queue.enqueue.await_args_list
+    assert first.args == (
+        NOTIFICATION_JOB_TYPE,
+        notification_req.model_dump(mode="json", exclude_unset=True),
+    )
+    assert first.kwargs["organization_id"] == 1
+    # The same notification queued twice is delivered once
+    assert first.kwargs["idempotency_key"] == second.kwargs["idempotency_key"]
+
+
+class _NestedSession:
+    """Runs a job's transaction as a savepoint of the test's session."""
+
+    def __init__(self, session):
+        self._session = session
+
+    def begin(self):
+        return self._session.begin_nested()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
 
-    # Ensure that the analyst was skipped
-    assert len(created_notifications) == 2
-    assert created_notifications[0].related_user_profile_id == 2
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+@pytest.mark.anyio
+async def test_queued_notification_is_delivered_by_a_worker(
+    dbsession, fake_redis_client, monkeypatch
+):
+    resources = JobResources(
+        session_factory=lambda: _NestedSession(dbsession),
+        redis_client=fake_redis_client,
+    )
+    monkeypatch.setattr(job_worker, "get_job_resources", lambda: resources)
+    worker = JobWorker(
+        resources,
+        job_types=[NOTIFICATION_JOB_TYPE, NOTIFICATION_EMAIL_JOB_TYPE],
+        worker_id="worker-1",
+    )
+    notification_type = NotificationTypeEnum.BCEID__TRANSFER__DIRECTOR_DECISION
+    repo = NotificationRepository(db=dbsession, redis_client=None)
+    await repo.add_subscriptions_for_notification_types(5, [notification_type])
+
+    service = NotificationService(
+        repo=repo,
+        email_service=CHESEmailService(repo=MagicMock()),
+        job_queue=JobQueue(dbsession),
+    )
+    await service.send_notification(
+        NotificationRequestSchema(
+            notification_types=[notification_type],
+            notification_data=NotificationMessageSchema(
+                type="Transfer",
+                related_organization_id=1,
+                related_transaction_id="CT1",
+                message=json.dumps({"status": "Recorded"}),
+            ),
+        )
+    )
+    assert await repo.get_unread_notification_message_count_by_user_id(5) == 0
+
+    # The notification job creates the in-app message and queues the email
+    monkeypatch.setattr(settings, "ches_enabled", True)
+    assert await worker.run_once() is True
+    assert await repo.get_unread_notification_message_count_by_user_id(5) == 1
+    # CHES is disabled again by the time the email job runs, so it sends nothing
+    monkeypatch.setattr(settings, "ches_enabled", False)
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+
+    jobs = (
+        await dbsession.execute(
+            select(BackgroundJob.job_type, BackgroundJob.status, BackgroundJob.result)
+            .where(BackgroundJob.job_type.like("notification%"))
+            .order_by(BackgroundJob.job_type)
+        )
+    ).all()
+    assert jobs == [
+        (NOTIFICATION_JOB_TYPE, BackgroundJobStatusEnum.SUCCEEDED, {"created": 1}),
+        (
+            NOTIFICATION_EMAIL_JOB_TYPE,
+            BackgroundJobStatusEnum.SUCCEEDED,
+            {"sent": False},
+        ),
+    ]
+
+
+@pytest.mark.anyio
+async def test_unread_count_is_served_from_redis(dbsession, fake_redis_client):
+    await fake_redis_client.set(unread_count_key(5), 4)
+    # A cached count needs no database session
+    service = UnreadNotificationCountService(fake_redis_client, session_factory=None)
+    assert await service.count_unread_notifications(5) == 4
+
+    await fake_redis_client.delete(unread_count_key(5))
+    dbsession.add(
+        NotificationMessage(
+            type="Transfer",
+            message="{}",
+            related_transaction_id="CT1",
+            related_user_profile_id=5,
+        )
+    )
+    await dbsession.flush()
+    service = UnreadNotificationCountService(
+        fake_redis_client, session_factory=lambda: _NestedSession(dbsession)
+    )
+    assert await service.count_unread_notifications(5) == 1
+    # The rebuilt count is cached for the next poll
+    assert await fake_redis_client.get(unread_count_key(5)) == "1"
 
 
 @pytest.mark.anyio
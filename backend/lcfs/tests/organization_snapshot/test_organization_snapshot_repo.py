@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import func, select
 from lcfs.db.models import ComplianceReportOrganizationSnapshot, Organization
 from lcfs.db.models.user.Role import RoleEnum
 from lcfs.web.api.organization_snapshot.repo import OrganizationSnapshotRepository
@@ -100,3 +101,48 @@ async def test_save_snapshot(setup_repo):
     db_session.add.assert_called_once_with(org_snapshot)
     db_session.flush.assert_awaited_once()
     db_session.refresh.assert_awaited_once_with(org_snapshot)
+
+
+@pytest.mark.anyio
+async def test_coordinates_are_shared_by_identical_addresses(dbsession):
+    repo = OrganizationSnapshotRepository(db=dbsession)
+    first_snapshot_id = (
+        await dbsession.scalar(
+            select(
+                func.max(ComplianceReportOrganizationSnapshot.organization_snapshot_id)
+            )
+        )
+        or 0
+    )
+    records_address = "1 Test Geocoding Way, Victoria, BC"
+    snapshots = [
+        ComplianceReportOrganizationSnapshot(records_address=records_address),
+        ComplianceReportOrganizationSnapshot(records_address=records_address),
+        ComplianceReportOrganizationSnapshot(
+            records_address=records_address, service_address="PO Box 1"
+        ),
+        ComplianceReportOrganizationSnapshot(records_address=""),
+    ]
+    dbsession.add_all(snapshots)
+    await dbsession.flush()
+
+    pending = await repo.get_ungeocoded_addresses(first_snapshot_id)
+    assert [
+        (row["organization_snapshot_id"], row["service_address"]) for row in pending
+    ] == [
+        (snapshots[0].organization_snapshot_id, None),
+        (snapshots[2].organization_snapshot_id, "PO Box 1"),
+    ]
+    assert await repo.get_coordinates_for_addresses(records_address, None, None) is None
+
+    updated = await repo.set_coordinates_for_addresses(
+        records_address, None, None, 48.42, -123.37
+    )
+
+    assert updated == 2
+    assert await repo.get_coordinates_for_addresses(records_address, None, None) == (
+        48.42,
+        -123.37,
+    )
+    pending = await repo.get_ungeocoded_addresses(first_snapshot_id)
+    assert [row["service_address"] for row in pending] == ["PO Box 1"]
@@ -4,16 +4,28 @@ from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lcfs.db.models import ComplianceReportOrganizationSnapshot
+from lcfs.services.job_queue.queue import JobQueue
 from lcfs.web.api.organization_snapshot.repo import OrganizationSnapshotRepository
-from lcfs.web.api.organization_snapshot.services import OrganizationSnapshotService
+from lcfs.web.api.organization_snapshot.services import (
+    GEOCODE_JOB_TYPE,
+    OrganizationSnapshotService,
+)
 
 
 @pytest.fixture
 def mock_repo():
     repo = AsyncMock(spec=OrganizationSnapshotRepository)
+    repo.get_coordinates_for_addresses.return_value = None
     return repo
 
 
+@pytest.fixture
+def mock_job_queue():
+    job_queue = AsyncMock(spec=JobQueue)
+    job_queue.enqueue.return_value = ("job-id", True)
+    return job_queue
+
+
 @pytest.fixture
 def mock_session():
     session = MagicMock(spec=AsyncSession)
@@ -21,8 +33,10 @@ def mock_session():
 
 
 @pytest.fixture
-def service(mock_repo, mock_session):
-    return OrganizationSnapshotService(repo=mock_repo, session=mock_session)
+def service(mock_repo, mock_session, mock_job_queue):
+    return OrganizationSnapshotService(
+        repo=mock_repo, session=mock_session, job_queue=mock_job_queue
+    )
 
 
 @pytest.mark.anyio
@@ -51,6 +65,7 @@ async def test_create_organization_snapshot_success(service, mock_repo):
         postalCode_zipCode="12345",
     )
     organization.org_attorney_address = None
+    organization.records_address = "123 Main St, Anytown"
     mock_repo.get_organization.return_value = organization
     expected_snapshot = ComplianceReportOrganizationSnapshot()
     mock_repo.save_snapshot.return_value = expected_snapshot
@@ -79,7 +94,11 @@ async def test_create_organization_snapshot_no_organization(service, mock_repo):
 @pytest.mark.anyio
 async def test_update_success(service, mock_repo):
     compliance_report_id = 1
-    request_data = MagicMock()
+    request_data = MagicMock(
+        records_address="123 Main St",
+        service_address=None,
+        head_office_address=None,
+    )
     snapshot = ComplianceReportOrganizationSnapshot()
     mock_repo.get_by_compliance_report_id.return_value = snapshot
     updated_snapshot = ComplianceReportOrganizationSnapshot()
@@ -130,6 +149,7 @@ async def test_create_organization_snapshot_prev_report_not_found(service, mock_
     attorney_address_mock.country = "Canada"
     attorney_address_mock.postalCode_zipCode = "V6B 2N2"
     org_mock.org_attorney_address = attorney_address_mock
+    org_mock.records_address = "123 Fake St, Victoria, BC"
 
     mock_repo.get_organization.return_value = org_mock
     mock_repo.save_snapshot.return_value = ComplianceReportOrganizationSnapshot()
@@ -142,3 +162,67 @@ async def test_create_organization_snapshot_prev_report_not_found(service, mock_
     mock_repo.get_by_compliance_report_id.assert_awaited_once_with(prev_report_id)
     mock_repo.get_organization.assert_awaited_once_with(organization_id)
     mock_repo.save_snapshot.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_create_organization_snapshot_queues_geocoding(
+    service, mock_repo, mock_job_queue
+):
+    organization = MagicMock(records_address="1 Main St, Victoria, BC")
+    organization.org_address = None
+    organization.org_attorney_address = None
+    mock_repo.get_organization.return_value = organization
+    mock_repo.save_snapshot.side_effect = lambda snapshot: snapshot
+
+    result = await service.create_organization_snapshot(1, 1)
+
+    assert result.latitude is None and result.longitude is None
+    mock_job_queue.enqueue.assert_awaited_once()
+    job_type, payload = mock_job_queue.enqueue.await_args.args
+    assert job_type == GEOCODE_JOB_TYPE
+    assert payload == {
+        "records_address": "1 Main St, Victoria, BC",
+        "service_address": None,
+        "head_office_address": None,
+    }
+    assert mock_job_queue.enqueue.await_args.kwargs["idempotency_key"]
+
+
+@pytest.mark.anyio
+async def test_create_organization_snapshot_reuses_known_coordinates(
+    service, mock_repo, mock_job_queue
+):
+    prev_snapshot = ComplianceReportOrganizationSnapshot(
+        name="Org", records_address="1 Main St, Victoria, BC"
+    )
+    mock_repo.get_by_compliance_report_id.return_value = prev_snapshot
+    mock_repo.get_coordinates_for_addresses.return_value = (48.42, -123.37)
+    mock_repo.save_snapshot.side_effect = lambda snapshot: snapshot
+
+    result = await service.create_organization_snapshot(2, 1, prev_report_id=1)
+
+    assert (result.latitude, result.longitude) == (48.42, -123.37)
+    mock_repo.get_coordinates_for_addresses.assert_awaited_once_with(
+        "1 Main St, Victoria, BC", None, None
+    )
+    mock_job_queue.enqueue.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_update_with_new_address_queues_geocoding(
+    service, mock_repo, mock_job_queue
+):
+    snapshot = ComplianceReportOrganizationSnapshot(
+        records_address="1 Main St", latitude=48.42, longitude=-123.37
+    )
+    mock_repo.get_by_compliance_report_id.return_value = snapshot
+    mock_repo.save_snapshot.side_effect = lambda snapshot: snapshot
+    request_data = MagicMock(
+        records_address="2 Main St", service_address=None, head_office_address=None
+    )
+
+    result = await service.update(request_data, 1)
+
+    assert result.latitude is None and result.longitude is None
+    mock_job_queue.enqueue.assert_awaited_once()
+    assert mock_job_queue.enqueue.await_args.args[1]["records_address"] == "2 Main St"
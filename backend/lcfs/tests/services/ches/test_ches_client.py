@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+
+from lcfs.services.ches import client as ches
+from lcfs.services.ches.client import TokenBucket, close_ches_client, get_ches_client
+from lcfs.settings import settings
+
+
+class StubCHES:
+    """An HTTP/1.1 CHES stub serving the token and email endpoints."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.token_requests = 0
+        self.emails = []
+        # Rejects the next emails' tokens, as CHES does once they are revoked
+        self.reject_tokens = 0
+
+    async def handle(self, reader, writer) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode().split("\r\n")
+                headers = {
+                    name.lower(): value
+                    for name, _, value in (
+                        line.partition(": ") for line in header_lines if line
+                    )
+                }
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, reply = self.respond(request_line.split()[1], headers, body)
+                content = json.dumps(reply).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n".encode() + content
+                )
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, path, headers, body):
+        if path == "/token":
+            self.token_requests += 1
+            return "200 OK", {
+                "access_token": f"token-{self.token_requests}",
+                "expires_in": 300,
+            }
+        if self.reject_tokens:
+            self.reject_tokens -= 1
+            return "401 Unauthorized", {}
+        self.emails.append((headers["authorization"], json.loads(body)))
+        return "201 Created", {"txId": str(len(self.emails))}
+
+
+@pytest.fixture
+async def stub_ches(monkeypatch):
+    server = StubCHES()
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{listener.sockets[0].getsockname()[1]}"
+    monkeypatch.setattr(settings, "ches_auth_url", f"{url}/token")
+    monkeypatch.setattr(settings, "ches_email_url", f"{url}/email")
+    monkeypatch.setattr(ches, "rate_limiter", TokenBucket(0, 1))
+    ches.clear_token_cache()
+    yield server
+    await close_ches_client()
+    ches.clear_token_cache()
+    listener.close()
+
+
+@pytest.mark.anyio
+async def test_sends_share_a_token_and_connections(stub_ches):
+    for index in range(3):
+        await get_ches_client().send({"subject": f"Email {index}"})
+    await asyncio.gather(
+        *(get_ches_client().send({"subject": "Concurrent"}) for _ in range(3))
+    )
+
+    assert stub_ches.token_requests == 1
+    assert [auth for auth, _ in stub_ches.emails] == ["Bearer token-1"] * 6
+    # Sequential sends reuse one connection; concurrent ones open a few more
+    assert stub_ches.connections <= 3
+
+
+@pytest.mark.anyio
+async def test_revoked_token_is_replaced_once(stub_ches):
+    await get_ches_client().send({"subject": "First"})
+    stub_ches.reject_tokens = 1
+
+    await get_ches_client().send({"subject": "Second"})
+
+    assert stub_ches.token_requests == 2
+    assert stub_ches.emails[-1] == ("Bearer token-2", {"subject": "Second"})
+
+
+@pytest.mark.anyio
+async def test_rejected_email_raises(stub_ches):
+    stub_ches.reject_tokens = 2
+
+    with pytest.raises(Exception, match="401"):
+        await get_ches_client().send({"subject": "Rejected"})
+    assert stub_ches.emails == []
+
+
+def test_token_bucket_spaces_calls_after_a_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0, 0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+    # A rate of 0 leaves sends unlimited
+    assert TokenBucket(rate=0, burst=1).reserve() == 0
@@ -0,0 +1,119 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from lcfs.services.clamav import clamd
+from lcfs.services.clamav.clamd import close_clamd_pool
+from lcfs.services.clamav.client import ClamAVService, VirusScanException
+from lcfs.settings import settings
+
+
+class FakeClamd:
+    """A clamd speaking the session protocol, flagging files containing EICAR."""
+
+    def __init__(self) -> None:
+        self.version = "ClamAV 1.0.5/27431/Tue Oct 15 08:00:00 2026"
+        self.connections = 0
+        self.scans = 0
+        self.chunk_sizes = []
+        # Ends the session after each reply, like clamd's IdleTimeout
+        self.close_after_reply = False
+
+    async def handle(self, reader, writer) -> None:
+        self.connections += 1
+        request_id = 0
+        try:
+            while True:
+                command = (await reader.readuntil(b"\0"))[:-1]
+                if command == b"zIDSESSION":
+                    continue
+                if command == b"zEND":
+                    break
+                request_id += 1
+                if command == b"zVERSION":
+                    reply = self.version
+                else:
+                    data = b""
+                    while size := int.from_bytes(await reader.readexactly(4), "big"):
+                        self.chunk_sizes.append(size)
+                        data += await reader.readexactly(size)
+                    self.scans += 1
+                    reply = (
+                        "stream: Eicar-Test-Signature FOUND"
+                        if b"EICAR" in data
+                        else "stream: OK"
+                    )
+                writer.write(f"{request_id}: {reply}\0".encode())
+                await writer.drain()
+                if self.close_after_reply and command == b"zINSTREAM":
+                    break
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def fake_clamd(monkeypatch):
+    server = FakeClamd()
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    monkeypatch.setattr(settings, "clamav_host", "127.0.0.1")
+    monkeypatch.setattr(settings, "clamav_port", listener.sockets[0].getsockname()[1])
+    yield server
+    await close_clamd_pool()
+    listener.close()
+
+
+def _upload(content: bytes) -> UploadFile:
+    return UploadFile(filename="report.pdf", file=io.BytesIO(content))
+
+
+@pytest.mark.anyio
+async def test_files_are_streamed_in_chunks_over_one_session(
+    fake_clamd, fake_redis_client
+):
+    service = ClamAVService(fake_redis_client)
+    upload = _upload(b"a" * (200 * 1024))
+
+    assert await service.scan_file(upload) == "stream: OK"
+    assert await service.scan_file(_upload(b"other file")) == "stream: OK"
+
+    assert fake_clamd.chunk_sizes == [65536, 65536, 65536, 8192, 10]
+    assert fake_clamd.connections == 1
+    assert upload.file.tell() == 0
+
+
+@pytest.mark.anyio
+async def test_verdicts_are_cached_until_the_signatures_change(
+    fake_clamd, fake_redis_client, monkeypatch
+):
+    service = ClamAVService(fake_redis_client)
+
+    with pytest.raises(VirusScanException, match="Eicar-Test-Signature FOUND"):
+        await service.scan_file(_upload(b"EICAR test"))
+    # The same file is rejected again without another scan
+    with pytest.raises(VirusScanException):
+        await service.scan_file(_upload(b"EICAR test"))
+    await service.scan_file(_upload(b"clean"))
+    await service.scan_file(_upload(b"clean"))
+    assert fake_clamd.scans == 2
+
+    fake_clamd.version = "ClamAV 1.0.5/27432/Wed Oct 16 08:00:00 2026"
+    monkeypatch.setattr(clamd, "CLAMD_VERSION_REFRESH_SECONDS", -1)
+    await service.scan_file(_upload(b"clean"))
+    assert fake_clamd.scans == 3
+
+
+@pytest.mark.anyio
+async def test_closed_session_is_replaced(fake_clamd, fake_redis_client):
+    fake_clamd.close_after_reply = True
+    service = ClamAVService(fake_redis_client)
+
+    await service.scan_file(_upload(b"first"))
+    await asyncio.sleep(0.01)
+    assert await service.scan_file(_upload(b"second")) == "stream: OK"
+
+    assert fake_clamd.scans == 2
+    assert fake_clamd.connections == 2
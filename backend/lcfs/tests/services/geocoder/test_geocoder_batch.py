@@ -0,0 +1,193 @@
+"""
+Tests for batch geocoding against a local fake geocoder.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from lcfs.services.geocoder import client
+from lcfs.services.geocoder.client import BCGeocoderService, GeocodingResult
+from lcfs.services.geocoder.executor import AdaptiveLimit
+from lcfs.utils.rate_limit import TokenBucket
+
+
+class FakeGeocoder:
+    """An HTTP/1.1 geocoder stub that places every address it is asked for."""
+
+    def __init__(self) -> None:
+        self.requests = []
+        # Addresses answered only once the test ends
+        self.stalled = set()
+        # Addresses answered with 503 Service Unavailable
+        self.unavailable = set()
+        self.release = asyncio.Event()
+
+    async def handle(self, reader, writer) -> None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            target = head.decode().split("\r\n")[0].split()[1]
+            query = parse_qs(urlsplit(target).query)
+            # BC Geocoder and Nominatim requests respectively
+            address = (query.get("addressString") or query["q"])[0]
+            self.requests.append(address)
+            if address in self.stalled:
+                await self.release.wait()
+            if address in self.unavailable:
+                writer.write(
+                    b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n"
+                )
+                await writer.drain()
+                return
+            content = json.dumps(
+                {
+                    "features": [
+                        {
+                            "geometry": {"coordinates": [-123.0, 49.0]},
+                            "properties": {"fullAddress": address, "score": 99},
+                        }
+                    ]
+                }
+            ).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(content)}\r\n\r\n".encode()
+                + content
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def fake_geocoder(monkeypatch):
+    server = FakeGeocoder()
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    monkeypatch.setattr(client, "rate_limiter", TokenBucket(0, 1))
+    yield server, f"http://127.0.0.1:{listener.sockets[0].getsockname()[1]}"
+    server.release.set()
+    listener.close()
+    await listener.wait_closed()
+
+
+@pytest.fixture
+def geocoder_service(fake_redis_client, fake_geocoder):
+    _, url = fake_geocoder
+    return BCGeocoderService(
+        redis_client=fake_redis_client,
+        bc_geocoder_url=url,
+        nominatim_url=url,
+        timeout=5,
+        max_retries=1,
+    )
+
+
+@pytest.mark.anyio
+async def test_slow_address_does_not_hold_up_the_batch(fake_geocoder, geocoder_service):
+    server, _ = fake_geocoder
+    server.stalled.add("Stalled Rd")
+    addresses = [f"{number} Main St" for number in range(1, 4)]
+
+    started = time.monotonic()
+    results = await geocoder_service.batch_geocode(
+        addresses[:1] + ["Stalled Rd"] + addresses[1:], batch_size=2, timeout=0.5
+    )
+
+    assert time.monotonic() - started < 2
+    assert [result.success for result in results] == [True, False, True, True]
+    assert results[1].error == "Geocoding timed out"
+    assert [results[index].address.full_address for index in (0, 2, 3)] == addresses
+
+
+@pytest.mark.anyio
+async def test_only_upstream_requests_are_rate_limited(fake_geocoder, geocoder_service):
+    server, _ = fake_geocoder
+    await geocoder_service.batch_geocode(["1 Main St", "2 Main St"])
+
+    with patch.object(
+        client.rate_limiter, "acquire", wraps=client.rate_limiter.acquire
+    ) as mock_acquire:
+        results = [
+            result
+            async for result in geocoder_service.iter_batch_geocode(
+                ["3 Main St", "1 MAIN ST.", "2 Main St", "4 Main St"]
+            )
+        ]
+
+    assert [result.address.full_address for result in results] == [
+        "3 Main St",
+        "1 Main St",
+        "2 Main St",
+        "4 Main St",
+    ]
+    assert mock_acquire.call_count == 2
+    assert len(server.requests) == 4
+
+
+def test_adaptive_limit_backs_off_and_recovers():
+    limit = AdaptiveLimit(initial=8, maximum=8)
+
+    limit.failed()
+    limit.failed()
+    assert limit.limit == 2
+
+    # Each success adds a fraction of a slot
+    for _ in range(6):
+        limit.succeeded()
+    assert limit.limit == 4
+    for _ in range(100):
+        limit.succeeded()
+    assert limit.limit == 8
+
+    for _ in range(10):
+        limit.failed()
+    assert limit.limit == 1
+
+
+@pytest.mark.anyio
+async def test_upstream_errors_shrink_the_window(
+    fake_geocoder, geocoder_service, monkeypatch
+):
+    server, _ = fake_geocoder
+    addresses = [f"{number} Main St" for number in range(6)]
+    server.unavailable.update(addresses)
+    limits = []
+
+    def adaptive_limit(*args):
+        limits.append(AdaptiveLimit(*args))
+        return limits[-1]
+
+    monkeypatch.setattr(client, "AdaptiveLimit", adaptive_limit)
+    results = await geocoder_service.batch_geocode(addresses, batch_size=4)
+
+    assert not any(result.success for result in results)
+    assert "503" in results[0].error
+    assert limits[0].limit == 1
+    # Failures to reach the geocoder are retried on the next request
+    server.unavailable.clear()
+    results = await geocoder_service.batch_geocode(addresses[:1])
+    assert results[0].success is True
+
+
+@pytest.mark.anyio
+async def test_stopping_early_cancels_running_requests(fake_geocoder, geocoder_service):
+    server, _ = fake_geocoder
+    server.stalled.update({"1 Main St", "2 Main St"})
+
+    batch = geocoder_service.iter_batch_geocode(
+        ["0 Main St", "1 Main St", "2 Main St", "3 Main St"], batch_size=3
+    )
+    first = await batch.__anext__()
+    await batch.aclose()
+
+    assert first == GeocodingResult(
+        success=True, address=first.address, source="bc_geocoder"
+    )
+    # The fourth address never started
+    assert "3 Main St" not in server.requests
@@ -7,7 +7,13 @@ import asyncio
 import json
 from unittest.mock import patch
 
-from lcfs.services.geocoder.cache import GeocoderCache, CacheEntry, CacheDecorator
+from lcfs.services.geocoder.cache import (
+    GeocoderCache,
+    CacheEntry,
+    CacheDecorator,
+    LocalCacheTier,
+    normalize_address,
+)
 from lcfs.services.geocoder.client import Address, GeocodingResult
 
 
@@ -204,6 +210,69 @@ class TestGeocoderCache:
         assert result[0].full_address == "123 Main St"
         assert result[1].full_address == "456 Oak Ave"
 
+    @pytest.mark.anyio
+    async def test_local_tier_answers_before_redis(self, geocoder_cache):
+        """Test that a process reads its own entries without Redis."""
+        cache = geocoder_cache
+
+        await cache.set("key1", "value1")
+        with patch.object(cache.redis_client, "mget") as mock_mget:
+            assert await cache.get("key1") == "value1"
+            mock_mget.assert_not_called()
+
+        # Another process finds the entry in Redis and keeps it locally
+        cache.local.clear()
+        assert await cache.get("key1") == "value1"
+        assert await cache.get("key1") == "value1"
+
+        tiers = (await cache.get_stats())["tiers"]
+        assert tiers["local"]["hits"] == 2
+        assert tiers["local"]["misses"] == 1
+        assert tiers["redis"]["hits"] == 1
+        assert tiers["local"]["hit_rate"] == pytest.approx(2 / 3)
+
+    @pytest.mark.anyio
+    async def test_get_many_reads_redis_once(self, geocoder_cache):
+        """Test that batched lookups read the missing keys in one MGET."""
+        cache = geocoder_cache
+
+        await cache.set("key1", "value1")
+        await cache.set("key2", "value2")
+        cache.local.clear()
+        await cache.get("key1")
+
+        with patch.object(
+            cache.redis_client, "mget", wraps=cache.redis_client.mget
+        ) as mock_mget:
+            values = await cache.get_many(["key1", "key2", "key3"])
+
+        assert values == ["value1", "value2", None]
+        mock_mget.assert_called_once_with(["geocoder:key2", "geocoder:key3"])
+
+    def test_local_tier_evicts_least_recently_used(self):
+        """Test that the local tier keeps its size and entries' lifetimes."""
+        tier = LocalCacheTier(max_entries=2, ttl=60)
+
+        tier.set("a", "1")
+        tier.set("b", "2")
+        tier.get("a")
+        tier.set("c", "3")
+        tier.set("d", "4", ttl=0)
+
+        assert tier.get("a") == "1"
+        assert tier.get("b") is None
+        assert tier.get("c") == "3"
+        assert tier.get("d") is None
+
+    def test_normalize_address(self):
+        """Test that trivially different spellings share a normalised form."""
+        assert (
+            normalize_address("123  Main St., Vancouver, BC")
+            == normalize_address("123 MAIN ST VANCOUVER BC")
+            == "123 main st vancouver bc"
+        )
+        assert normalize_address("101-1234 Main St") == "101-1234 main st"
+
     @pytest.mark.anyio
     async def test_cache_shutdown(self, geocoder_cache):
         """Test cache shutdown."""
@@ -202,6 +202,56 @@ class TestBCGeocoderService:
                 assert result.source == "nominatim"
                 mock_nominatim.assert_called_once()
 
+    @pytest.mark.anyio
+    async def test_forward_geocode_caches_not_found_briefly(
+        self, geocoder_service, fake_redis_client
+    ):
+        """Test that addresses found nowhere are cached with the negative TTL."""
+        with patch.object(
+            geocoder_service, "_make_request", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.side_effect = [{"features": []}, []]
+
+            result = await geocoder_service.forward_geocode("1 Nowhere Rd")
+            # A different spelling of the same address is answered from cache
+            cached = await geocoder_service.forward_geocode("1 NOWHERE RD.")
+
+            assert result.success is False
+            assert cached.success is False
+            assert mock_request.call_count == 2
+
+        key = geocoder_service._cache._redis_key(
+            geocoder_service._forward_cache_key("1 Nowhere Rd")
+        )
+        assert 0 < await fake_redis_client.ttl(key) <= 300
+
+    @pytest.mark.anyio
+    async def test_batch_geocode_geocodes_only_uncached(self, geocoder_service):
+        """Test that batch geocoding answers cached addresses in input order."""
+        cached = GeocodingResult(
+            success=True,
+            address=Address(full_address="Cached", latitude=49.0, longitude=-123.0),
+        )
+        await geocoder_service._cache.set(
+            geocoder_service._forward_cache_key("Address 2"), cached
+        )
+
+        with patch.object(
+            geocoder_service, "forward_geocode", new_callable=AsyncMock
+        ) as mock_forward:
+            mock_forward.return_value = GeocodingResult(success=False)
+
+            results = await geocoder_service.batch_geocode(
+                ["Address 1", "address 2", "Address 3"]
+            )
+
+        assert [result.success for result in results] == [False, True, False]
+        assert results[1].address.full_address == "Cached"
+        assert [call.args[0] for call in mock_forward.call_args_list] == [
+            "Address 1",
+            "Address 3",
+        ]
+
     @pytest.mark.anyio
     async def test_reverse_geocode_success(self, geocoder_service):
         """Test successful reverse geocoding."""
@@ -266,6 +316,29 @@ class TestBCGeocoderService:
 
             assert is_in_bc is True
 
+    @pytest.mark.anyio
+    async def test_check_bc_boundary_geocodes_only_near_the_border(
+        self, geocoder_service
+    ):
+        """Test that the local index answers away from the border."""
+        with patch.object(
+            geocoder_service, "reverse_geocode", new_callable=AsyncMock
+        ) as mock_reverse:
+            mock_reverse.return_value = GeocodingResult(
+                success=True,
+                address=Address(
+                    full_address="Stewart, BC, Canada", province="British Columbia"
+                ),
+            )
+
+            assert await geocoder_service.check_bc_boundary(53.9171, -122.7497)
+            assert not await geocoder_service.check_bc_boundary(51.1784, -115.5708)
+            mock_reverse.assert_not_called()
+
+            # Stewart is beside Hyder, Alaska
+            assert await geocoder_service.check_bc_boundary(55.94, -129.99)
+            mock_reverse.assert_called_once_with(55.94, -129.99)
+
     @pytest.mark.anyio
     async def test_check_bc_boundary_fallback(self, geocoder_service):
         """Test BC boundary check with fallback to coordinate bounds."""
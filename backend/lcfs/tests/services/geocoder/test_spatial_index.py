@@ -0,0 +1,99 @@
+"""
+Tests for the bundled BC spatial index.
+"""
+
+import pytest
+
+from lcfs.services.geocoder.spatial_index import (
+    STRtree,
+    get_bc_spatial_index,
+)
+
+
+@pytest.mark.parametrize(
+    "latitude, longitude, in_bc",
+    [
+        (49.2827, -123.1207, True),  # Vancouver
+        (48.4284, -123.3656, True),  # Victoria
+        (54.3150, -130.3208, True),  # Prince Rupert
+        (58.8050, -122.6972, True),  # Fort Nelson
+        (49.5097, -115.0631, True),  # Fernie
+        (48.9854, -123.0779, False),  # Point Roberts, WA
+        (48.5343, -123.0171, False),  # Friday Harbor, WA
+        (51.1784, -115.5708, False),  # Banff, AB
+        (60.7212, -135.0568, False),  # Whitehorse, YT
+        (40.7128, -74.0060, False),  # New York
+        (55.9400, -129.9900, None),  # Stewart, beside Hyder, AK
+    ],
+)
+def test_locate(latitude, longitude, in_bc):
+    assert get_bc_spatial_index().locate(latitude, longitude) is in_bc
+
+
+def test_postal_code_plausible():
+    index = get_bc_spatial_index()
+
+    assert index.postal_code_plausible("V6B 1A1", 49.2827, -123.1207) is True
+    # A Vancouver postal code in Prince George
+    assert index.postal_code_plausible("V6B 1A1", 53.9171, -122.7497) is False
+    # Rural postal codes can be anywhere in BC
+    assert index.postal_code_plausible("V0N 1A0", 53.9171, -122.7497) is True
+    # A Calgary postal code in Vancouver, and one in Calgary
+    assert index.postal_code_plausible("T2P 1J9", 49.2827, -123.1207) is False
+    assert index.postal_code_plausible("T2P 1J9", 51.0447, -114.0719) is None
+
+
+def test_site_location_error():
+    index = get_bc_spatial_index()
+
+    assert index.site_location_error("V8W 1A1", 48.4, -123.3) is None
+    assert "outside British Columbia" in index.site_location_error(
+        "V8W 1A1", 47.6062, -122.3321
+    )
+    assert "not near postal code V8W 1A1" in index.site_location_error(
+        "V8W 1A1", 53.9171, -122.7497
+    )
+
+
+@pytest.mark.parametrize(
+    "postal_code, latitude, longitude",
+    [
+        ("V4T 1A1", 49.8625, -119.5833),  # West Kelowna
+        ("V4V 1A1", 50.0500, -119.4100),  # Lake Country
+        ("V8A 1A1", 49.8350, -124.5200),  # Powell River
+        ("V8B 1A1", 49.7016, -123.1558),  # Squamish
+        ("V8C 1A1", 54.0200, -128.7000),  # Kitimat
+        ("V8G 1A1", 54.5182, -128.6032),  # Terrace
+        ("V8J 1A1", 54.3150, -130.3208),  # Prince Rupert
+        ("V8K 1A1", 48.8500, -123.5000),  # Salt Spring Island
+        ("V8L 1A1", 48.6500, -123.4000),  # Sidney
+        ("V8M 1A1", 48.5900, -123.4200),  # Central Saanich
+    ],
+)
+def test_site_location_error_edge_fsas(postal_code, latitude, longitude):
+    assert (
+        get_bc_spatial_index().site_location_error(postal_code, latitude, longitude)
+        is None
+    )
+
+
+@pytest.mark.parametrize("postal_code", ["", "123 456", "D1A 1A1"])
+def test_postal_code_plausible_unknown_codes(postal_code):
+    index = get_bc_spatial_index()
+
+    assert index.postal_code_plausible(postal_code, 49.2827, -123.1207) is None
+    assert index.site_location_error(postal_code, 49.2827, -123.1207) is None
+
+
+def test_strtree_query():
+    boxes = [((x, y, x + 1, y + 1), (x, y)) for x in range(20) for y in range(20)]
+    tree = STRtree(boxes, node_capacity=4)
+
+    assert sorted(tree.query((4.5, 4.5, 5.5, 5.2))) == [
+        (4, 4),
+        (4, 5),
+        (5, 4),
+        (5, 5),
+    ]
+    assert len(list(tree.query((-1, -1, 30, 30)))) == 400
+    assert list(STRtree([]).query((0, 0, 1, 1))) == []
@@ -0,0 +1,361 @@
+import io
+import json
+import tracemalloc
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from openpyxl import Workbook, load_workbook
+
+from lcfs.services.imports.job import (
+    ImportColumn,
+    RowRejected,
+    SpreadsheetImportJob,
+    check_rows,
+)
+from lcfs.services.imports.runtime import (
+    import_result,
+    queue_import,
+    read_job_status,
+    read_upload,
+)
+from lcfs.services.job_queue.queue import JobFailed
+
+
+class _NumbersJob(SpreadsheetImportJob):
+    sheet_name = "Numbers"
+    columns = (ImportColumn("Name", required=True), ImportColumn("Value"))
+    chunk_size = 2
+    description = "numbers"
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.written = []
+        self.chunks = 0
+
+    def parse_row(self, row_idx, row):
+        name, value = row
+        if value == "skip":
+            raise RowRejected()
+        if value == "warn":
+            self.warn(row_idx, f"Row {row_idx}: Value ignored")
+            value = None
+        return name, value
+
+    async def write_chunk(self, chunk):
+        self.chunks += 1
+        return await super().write_chunk(chunk)
+
+    async def write_row(self, row_idx, parsed):
+        if parsed[1] == "boom":
+            raise ValueError("cannot store")
+        if parsed[1] == "taken":
+            raise HTTPException(status_code=422, detail="Name is taken")
+        self.written.append(parsed)
+        return True
+
+
+def _upload(rows, sheet_name="Numbers"):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(["Name", "Value"])
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return UploadFile(filename="numbers.xlsx", file=buffer)
+
+
+async def _run(job_cls, rows, redis_client, dry_run=False, **kwargs):
+    session = MagicMock()
+    session.begin_nested = MagicMock(
+        return_value=MagicMock(
+            __aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=False)
+        )
+    )
+    session.committed = None
+
+    @asynccontextmanager
+    async def fake_session(user, commit=True):
+        yield session
+        session.committed = commit
+
+    with (
+        patch("lcfs.services.imports.job.import_session", new=fake_session),
+        patch("lcfs.services.imports.job.get_job_redis", return_value=redis_client),
+    ):
+        job = job_cls("job-1", MagicMock(), _upload(rows, **kwargs), dry_run)
+        result = await job.run()
+    job.session_committed = session.committed
+    return job, result
+
+
+def _check_number(row_idx, row):
+    name, value = row
+    if value == "skip":
+        raise RowRejected(f"Row {row_idx}: Value skipped")
+    return name, int(value)
+
+
+@pytest.mark.anyio
+async def test_rows_are_validated_parsed_and_written_in_chunks(fake_redis_client):
+    rows = [
+        ["a", 1],
+        [None, 2],
+        ["b", "skip"],
+        [None, None],
+        ["c", "warn"],
+        ["d", "boom"],
+        ["e", "taken"],
+        ["f", 6],
+    ]
+
+    job, result = await _run(_NumbersJob, rows, fake_redis_client)
+
+    assert job.written == [("a", 1), ("c", None), ("f", 6)]
+    assert job.chunks == 3
+    assert result["created"] == 3
+    assert result["rejected"] == 4
+    assert result["errors"] == [
+        "Row 3: Missing required fields: Name",
+        "Row 6: Value ignored",
+        "Row 7: cannot store",
+        "Row 8: Name is taken",
+    ]
+
+    status = await read_job_status(fake_redis_client, "job-1")
+    assert status["progress"] == 100
+    assert status["status"] == "Import process completed."
+    assert status["created"] == 3
+    assert status["rejected"] == 4
+
+
+@pytest.mark.anyio
+async def test_dry_run_validates_rows_and_stores_an_error_report(fake_redis_client):
+    storage = MagicMock()
+    storage.put = AsyncMock()
+    rows = [["a", 1], [None, 2], ["b", "skip"], ["d", "boom"], ["f", 6]]
+
+    with (
+        patch("lcfs.services.imports.job.ExportArtifactStorage") as storage_cls,
+        patch("lcfs.services.imports.job.create_s3_client"),
+    ):
+        storage_cls.return_value = storage
+        storage_cls.artifact_key.return_value = "exports/import_validation/job-1"
+        job, result = await _run(_NumbersJob, rows, fake_redis_client, dry_run=True)
+
+    # Rows go through the write path in a transaction that is rolled back
+    assert job.session_committed is False
+    assert result["dry_run"] is True
+    assert result["created"] == 2
+    assert result["rejected"] == 3
+    assert result["report_key"] == "exports/import_validation/job-1"
+
+    key, content, file_name, _ = storage.put.await_args.args
+    assert key == "exports/import_validation/job-1"
+    assert file_name == "numbers_errors.xlsx"
+    sheet = load_workbook(io.BytesIO(content))["Errors"]
+    assert [list(row) for row in sheet.iter_rows(values_only=True)] == [
+        ["Row", "Error"],
+        [3, "Missing required fields: Name"],
+        [5, "cannot store"],
+    ]
+
+    status = await read_job_status(fake_redis_client, "job-1")
+    assert status["status"] == "Validation completed."
+
+
+@pytest.mark.anyio
+async def test_dry_run_without_errors_stores_no_report(fake_redis_client):
+    with patch("lcfs.services.imports.job.ExportArtifactStorage") as storage_cls:
+        job, result = await _run(
+            _NumbersJob, [["a", 1]], fake_redis_client, dry_run=True
+        )
+
+    assert result["report_key"] is None
+    storage_cls.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_row_checker_checks_slices_of_a_batch_on_the_pool(fake_redis_client):
+    class CheckedJob(_NumbersJob):
+        chunk_size = 5
+
+        def row_checker(self):
+            return _check_number
+
+    pool_calls = []
+
+    async def fake_pool(func, *args):
+        pool_calls.append(args[1])
+        return func(*args)
+
+    rows = [[f"n{i}", "skip" if i == 3 else i] for i in range(7)]
+    with (
+        patch("lcfs.services.imports.job.IMPORT_VALIDATION_SLICE", 2),
+        patch("lcfs.services.imports.job.run_in_render_pool", new=fake_pool),
+    ):
+        job, result = await _run(CheckedJob, rows, fake_redis_client)
+
+    assert [len(rows) for rows in pool_calls] == [2, 2, 1, 2]
+    assert job.written == [
+        ("n0", 0),
+        ("n1", 1),
+        ("n2", 2),
+        ("n4", 4),
+        ("n5", 5),
+        ("n6", 6),
+    ]
+    assert result["errors"] == ["Row 5: Value skipped"]
+
+
+def test_check_rows_reports_rejected_and_failed_rows():
+    assert check_rows(
+        _check_number, [(2, ["a", "1"]), (3, ["b", "skip"]), (4, ["c", "x"])]
+    ) == [
+        (2, True, None, ("a", 1)),
+        (3, False, "Row 3: Value skipped", None),
+        (4, False, "Row 4: invalid literal for int() with base 10: 'x'", None),
+    ]
+
+
+@pytest.mark.anyio
+async def test_blank_row_ends_data_when_configured(fake_redis_client):
+    class StopAtBlankJob(_NumbersJob):
+        stop_at_blank_row = True
+
+    job, result = await _run(
+        StopAtBlankJob, [["a", 1], [None, None], ["b", 2]], fake_redis_client
+    )
+
+    assert job.written == [("a", 1)]
+    assert result["created"] == 1
+
+
+@pytest.mark.anyio
+async def test_failed_import_reports_reason(fake_redis_client):
+    _, result = await _run(
+        _NumbersJob, [["a", 1]], fake_redis_client, sheet_name="Other"
+    )
+
+    assert result["success"] is False
+    status = await read_job_status(fake_redis_client, "job-1")
+    assert status["status"] == "Import process failed."
+    assert status["created"] == 0
+    assert status["errors"] == ["Uploaded Excel does not contain a 'Numbers' sheet."]
+
+
+@pytest.mark.anyio
+async def test_progress_sends_new_errors_and_reset_on_failure(fake_redis_client):
+    class FailingJob(_NumbersJob):
+        async def finish(self):
+            raise ValueError("disk full")
+
+    await _run(
+        FailingJob, [[None, 1], [None, 2], ["c", 3], ["d", 4]], fake_redis_client
+    )
+
+    events = [
+        json.loads(fields["data"])
+        for _, fields in await fake_redis_client.xrange("jobs/job-1/events")
+    ]
+    # Each row error is sent once; the failure replaces them with its reason
+    assert [event["errors"] for event in events if event["errors"]] == [
+        [
+            "Row 2: Missing required fields: Name",
+            "Row 3: Missing required fields: Name",
+        ],
+        ["disk full"],
+    ]
+    assert events[-1]["reset"] is True
+    status = await read_job_status(fake_redis_client, "job-1")
+    assert status["errors"] == ["disk full"]
+
+
+@pytest.mark.anyio
+async def test_large_sheet_is_streamed_in_bounded_memory(fake_redis_client):
+    class CountingJob(_NumbersJob):
+        chunk_size = 1000
+
+        async def write_chunk(self, chunk):
+            self.chunks += 1
+            return len(chunk), []
+
+    rows = ([f"name {i}", i] for i in range(50_000))
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        job, result = await _run(CountingJob, rows, fake_redis_client)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert result["created"] == 50_000
+    assert job.chunks == 50
+    # Loading the whole sheet peaks at over 40 MB here; streaming holds one
+    # batch of rows plus the shared strings table
+    assert peak < 20 * 1024 * 1024
+
+
+@pytest.mark.anyio
+async def test_read_upload_validates_and_copies_file():
+    upload = MagicMock()
+    upload.filename = "data.xlsx"
+    upload.content_type = (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    upload.read = AsyncMock(return_value=b"contents")
+
+    copied = await read_upload(upload)
+    assert copied.filename == "data.xlsx"
+    assert copied.file.read() == b"contents"
+
+    upload.content_type = "text/html"
+    with pytest.raises(HTTPException) as exc:
+        await read_upload(upload)
+    assert exc.value.status_code == 400
+
+
+def _xlsx_upload(contents):
+    upload = MagicMock()
+    upload.filename = "data.xlsx"
+    upload.content_type = (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    upload.read = AsyncMock(return_value=contents)
+    return upload
+
+
+@pytest.mark.anyio
+async def test_repeated_uploads_share_an_idempotency_key():
+    queue = MagicMock()
+    queue.enqueue = AsyncMock(return_value=("job-1", True))
+    user = MagicMock(user_profile_id=7)
+
+    async def key(contents, payload):
+        await queue_import(
+            queue, "import.numbers", user, _xlsx_upload(contents), payload, 3
+        )
+        return queue.enqueue.await_args.kwargs["idempotency_key"]
+
+    first = await key(b"contents", {"report": 1})
+    assert await key(b"contents", {"report": 1}) == first
+    assert await key(b"other", {"report": 1}) != first
+    assert await key(b"contents", {"report": 2}) != first
+    assert first.startswith("7:")
+    assert queue.enqueue.await_args.kwargs["input_file"] == b"contents"
+    assert queue.enqueue.await_args.kwargs["organization_id"] == 3
+
+
+def test_failed_import_fails_its_job_without_errors_in_the_result():
+    assert import_result(
+        {"success": True, "created": 2, "rejected": 1, "errors": ["Row 3"]}
+    ) == {"success": True, "created": 2, "rejected": 1}
+
+    with pytest.raises(JobFailed, match="bad sheet"):
+        import_result(
+            {"success": False, "created": 0, "rejected": 0, "errors": ["bad sheet"]}
+        )
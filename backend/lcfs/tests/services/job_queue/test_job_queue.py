@@ -0,0 +1,202 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import func, update
+
+from lcfs.db.models.tasks import BackgroundJob, BackgroundJobStatusEnum
+from lcfs.services.job_queue.queue import JobFailed, JobQueue
+from lcfs.services.job_queue.registry import register_job
+from lcfs.services.job_queue.worker import JobResources, JobWorker
+
+handled = []
+
+
+@register_job("test.report", priority=5, max_attempts=2, per_organization=1)
+async def _report_job(job):
+    handled.append(job)
+    if job.payload.get("fail"):
+        raise JobFailed("bad input")
+    if job.payload.get("crash"):
+        raise RuntimeError("worker crashed")
+    return {"rows": len(job.input_file or b"")}
+
+
+@register_job("test.background")
+async def _background_job(job):
+    handled.append(job)
+
+
+TEST_TYPES = ["test.report", "test.background"]
+
+
+async def _job(dbsession, job_id) -> BackgroundJob:
+    job = await JobQueue(dbsession).get(job_id)
+    await dbsession.refresh(job)
+    return job
+
+
+async def _make_due(dbsession):
+    await dbsession.execute(update(BackgroundJob).values(run_after=func.now()))
+
+
+@pytest.mark.anyio
+async def test_idempotency_key_returns_the_active_job(dbsession):
+    queue = JobQueue(dbsession)
+
+    job_id, created = await queue.enqueue("test.report", {"a": 1}, idempotency_key="k")
+    assert created is True
+    assert await queue.enqueue("test.report", {"a": 1}, idempotency_key="k") == (
+        job_id,
+        False,
+    )
+
+    claimed = await queue.claim("worker-1", TEST_TYPES)
+    await queue.complete(claimed.job_id, "worker-1")
+
+    # A finished job no longer absorbs new requests
+    new_job_id, created = await queue.enqueue(
+        "test.report", {"a": 1}, idempotency_key="k"
+    )
+    assert created is True
+    assert new_job_id != job_id
+
+
+@pytest.mark.anyio
+async def test_claims_follow_priority_and_per_organization_limits(dbsession):
+    queue = JobQueue(dbsession)
+    background, _ = await queue.enqueue("test.background")
+    first, _ = await queue.enqueue("test.report", organization_id=1)
+    second, _ = await queue.enqueue("test.report", organization_id=1)
+    other_org, _ = await queue.enqueue("test.report", organization_id=2)
+
+    claimed = [(await queue.claim("worker-1", TEST_TYPES)).job_id for _ in range(3)]
+
+    # Reports outrank background jobs, and organization 1 runs one at a time
+    assert claimed == [first, other_org, background]
+    assert await queue.claim("worker-1", TEST_TYPES) is None
+
+    await queue.complete(first, "worker-1")
+    assert (await queue.claim("worker-1", TEST_TYPES)).job_id == second
+
+
+@pytest.mark.anyio
+async def test_failed_attempts_back_off_then_give_up(dbsession):
+    queue = JobQueue(dbsession)
+    job_id, _ = await queue.enqueue(
+        "test.report", input_file=b"data", input_file_name="data.xlsx"
+    )
+
+    await queue.claim("worker-1", TEST_TYPES)
+    assert await queue.fail(job_id, "worker-1", "timeout") is True
+    job = await _job(dbsession, job_id)
+    assert job.status == BackgroundJobStatusEnum.QUEUED
+    assert job.last_error == "timeout"
+    # Not due again until the backoff has passed
+    assert await queue.claim("worker-1", TEST_TYPES) is None
+
+    await _make_due(dbsession)
+    claimed = await queue.claim("worker-1", TEST_TYPES)
+    assert claimed.attempt == 2
+    assert await queue.fail(job_id, "worker-1", "timeout") is False
+
+    job = await _job(dbsession, job_id)
+    assert job.status == BackgroundJobStatusEnum.FAILED
+    assert job.finished_at is not None
+    assert await queue.read_input_file(job_id) is None
+
+
+@pytest.mark.anyio
+async def test_expired_lease_is_taken_over(dbsession):
+    queue = JobQueue(dbsession)
+    job_id, _ = await queue.enqueue("test.report")
+    await queue.claim("worker-1", TEST_TYPES)
+
+    assert await queue.heartbeat(job_id, "worker-1") is True
+    await dbsession.execute(
+        update(BackgroundJob).values(locked_until=func.now() - timedelta(seconds=1))
+    )
+
+    # The job is put back in the queue and retried after the usual backoff
+    assert await queue.claim("worker-2", TEST_TYPES) is None
+    assert (await _job(dbsession, job_id)).status == BackgroundJobStatusEnum.QUEUED
+
+    await _make_due(dbsession)
+    claimed = await queue.claim("worker-2", TEST_TYPES)
+    assert claimed.job_id == job_id
+    assert claimed.attempt == 2
+    # The first worker has lost the job
+    assert await queue.heartbeat(job_id, "worker-1") is False
+
+
+class _SavepointSession:
+    """Runs a worker's transactions as savepoints of the test's session."""
+
+    def __init__(self, session):
+        self._session = session
+
+    def begin(self):
+        return self._session.begin_nested()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+@pytest.fixture
+def worker(dbsession, fake_redis_client):
+    handled.clear()
+    resources = JobResources(
+        session_factory=lambda: _SavepointSession(dbsession),
+        redis_client=fake_redis_client,
+    )
+    return JobWorker(resources, job_types=TEST_TYPES, worker_id="worker-1")
+
+
+@pytest.mark.anyio
+async def test_worker_runs_handler_with_its_upload(dbsession, worker):
+    job_id, _ = await JobQueue(dbsession).enqueue(
+        "test.report", {"a": 1}, input_file=b"12345", input_file_name="data.xlsx"
+    )
+
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+
+    assert handled[0].payload == {"a": 1}
+    assert handled[0].input_file == b"12345"
+    job = await _job(dbsession, job_id)
+    assert job.status == BackgroundJobStatusEnum.SUCCEEDED
+    assert job.result == {"rows": 5}
+    assert await JobQueue(dbsession).read_input_file(job_id) is None
+
+
+@pytest.mark.anyio
+async def test_worker_retries_errors_but_not_failed_jobs(dbsession, worker):
+    queue = JobQueue(dbsession)
+    crashed, _ = await queue.enqueue("test.report", {"crash": True})
+    failed, _ = await queue.enqueue("test.report", {"fail": True}, organization_id=2)
+
+    await worker.run_once()
+    await worker.run_once()
+
+    crashed_job = await _job(dbsession, crashed)
+    assert crashed_job.status == BackgroundJobStatusEnum.QUEUED
+    assert crashed_job.last_error == "worker crashed"
+    failed_job = await _job(dbsession, failed)
+    assert failed_job.status == BackgroundJobStatusEnum.FAILED
+    assert failed_job.last_error == "bad input"
+
+
+@pytest.mark.anyio
+async def test_worker_loads_the_requesting_user(dbsession, worker):
+    user = MagicMock(user_profile_id=1)
+    await JobQueue(dbsession).enqueue("test.background", user=user)
+
+    await worker.run_once()
+
+    assert handled[0].user.user_profile_id == 1
@@ -0,0 +1,124 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from lcfs.services.redis.job_progress import (
+    JOB_RESULT_TTL,
+    job_progress_events,
+    publish_job_progress,
+    read_job_progress,
+)
+
+
+def _event_data(frames):
+    return [
+        json.loads(line[len("data: ") :])
+        for frame in frames
+        for line in frame.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+async def _collect(events):
+    return [frame async for frame in events]
+
+
+@pytest.mark.anyio
+async def test_updates_append_errors_and_reset_clears_them(fake_redis_client):
+    await publish_job_progress(
+        fake_redis_client, "job-1", {"progress": 10, "errors": ["Row 2"]}, ttl=60
+    )
+    await publish_job_progress(
+        fake_redis_client, "job-1", {"progress": 20, "errors": ["Row 3"]}, ttl=60
+    )
+
+    status = await read_job_progress(fake_redis_client, "job-1")
+    assert status == {"progress": 20, "errors": ["Row 2", "Row 3"]}
+    # The status itself never carries the accumulated errors
+    assert "errors" not in json.loads(await fake_redis_client.get("jobs/job-1"))
+
+    await publish_job_progress(
+        fake_redis_client,
+        "job-1",
+        {"progress": 100, "errors": ["Import failed"]},
+        ttl=60,
+        reset=True,
+    )
+    status = await read_job_progress(fake_redis_client, "job-1")
+    assert status["errors"] == ["Import failed"]
+    assert await fake_redis_client.ttl("jobs/job-1") > JOB_RESULT_TTL - 5
+    assert await fake_redis_client.ttl("jobs/job-1/events") > JOB_RESULT_TTL - 5
+
+
+@pytest.mark.anyio
+async def test_read_job_progress_handles_missing_and_inline_errors(
+    fake_redis_client,
+):
+    assert await read_job_progress(fake_redis_client, "missing") is None
+
+    await fake_redis_client.set(
+        "jobs/old", json.dumps({"progress": 50, "errors": ["Row 4"]})
+    )
+    assert (await read_job_progress(fake_redis_client, "old"))["errors"] == ["Row 4"]
+
+
+@pytest.mark.anyio
+async def test_events_replay_deltas_and_resume_after_last_event(fake_redis_client):
+    await publish_job_progress(
+        fake_redis_client, "job-1", {"progress": 50, "errors": ["Row 2"]}, ttl=60
+    )
+    await publish_job_progress(
+        fake_redis_client, "job-1", {"progress": 100, "errors": []}, ttl=60
+    )
+
+    frames = await _collect(job_progress_events(fake_redis_client, "job-1"))
+    assert _event_data(frames) == [
+        {"progress": 50, "errors": ["Row 2"]},
+        {"progress": 100, "errors": []},
+    ]
+
+    first_id = frames[0].splitlines()[0][len("id: ") :]
+    resumed = await _collect(
+        job_progress_events(fake_redis_client, "job-1", last_event_id=first_id)
+    )
+    assert _event_data(resumed) == [{"progress": 100, "errors": []}]
+
+    # Reconnecting after the final event ends the stream straight away
+    last_id = frames[-1].splitlines()[0][len("id: ") :]
+    assert (
+        await _collect(
+            job_progress_events(fake_redis_client, "job-1", last_event_id=last_id)
+        )
+        == []
+    )
+
+
+@pytest.mark.anyio
+async def test_events_follow_a_running_job(fake_redis_client):
+    await publish_job_progress(fake_redis_client, "job-1", {"progress": 0}, ttl=60)
+
+    with patch("lcfs.services.redis.job_progress.EVENT_POLL_INTERVAL", 0.01):
+        consumer = asyncio.create_task(
+            _collect(job_progress_events(fake_redis_client, "job-1"))
+        )
+        await asyncio.sleep(0.05)
+        await publish_job_progress(
+            fake_redis_client, "job-1", {"progress": 100, "errors": ["Row 9"]}, ttl=60
+        )
+        frames = await asyncio.wait_for(consumer, timeout=5)
+
+    assert _event_data(frames) == [
+        {"progress": 0, "errors": []},
+        {"progress": 100, "errors": ["Row 9"]},
+    ]
+
+
+@pytest.mark.anyio
+async def test_events_for_unknown_job(fake_redis_client):
+    frames = await _collect(job_progress_events(fake_redis_client, "missing"))
+
+    assert _event_data(frames) == [
+        {"progress": 0, "status": "No job found with this ID."}
+    ]
@@ -0,0 +1,88 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from lcfs.services.redis import notification_events as events_module
+from lcfs.services.redis.notification_events import (
+    close_notification_event_hub,
+    notification_events,
+    publish_notification_events,
+)
+
+
+@pytest.fixture
+async def follow(fake_redis_client):
+    """Follows a user's events, counting unread messages with ``counts``."""
+    streams = []
+
+    def _follow(user_id, counts, last_event_id=None):
+        async def count_unread():
+            return counts.pop(0)
+
+        stream = notification_events(
+            fake_redis_client, user_id, count_unread, last_event_id
+        )
+        streams.append(stream)
+        return stream
+
+    yield _follow
+    for stream in streams:
+        await stream.aclose()
+    await close_notification_event_hub()
+
+
+async def _next(stream):
+    frame = await asyncio.wait_for(stream.__anext__(), 2)
+    if frame.startswith(":"):
+        return frame
+    fields = dict(line.split(": ", 1) for line in frame.strip().splitlines())
+    return fields.get("id"), json.loads(fields["data"])
+
+
+def _notification(message_id):
+    return {"type": "notification", "notification": {"id": message_id}}
+
+
+@pytest.mark.anyio
+async def test_connected_user_receives_new_notifications(fake_redis_client, follow):
+    stream = follow(5, [0, 1])
+    _, event = await _next(stream)
+    assert event == {"type": "unread", "unread": 0}
+
+    await publish_notification_events(
+        fake_redis_client,
+        {5: [_notification(1), {"type": "unread"}], 6: [_notification(2)]},
+    )
+
+    event_id, event = await _next(stream)
+    assert event == _notification(1)
+    # The count follows the changes, carrying the id of the last one
+    last_id, event = await _next(stream)
+    assert event == {"type": "unread", "unread": 1}
+    assert last_id > event_id
+
+
+@pytest.mark.anyio
+async def test_reconnecting_client_resumes_after_its_last_event(
+    fake_redis_client, follow
+):
+    await publish_notification_events(
+        fake_redis_client, {5: [_notification(1), _notification(2)]}
+    )
+    first_id = (await fake_redis_client.xrange("notifications/5/events"))[0][0]
+
+    stream = follow(5, [2], last_event_id=first_id)
+
+    assert (await _next(stream))[1] == _notification(2)
+    assert (await _next(stream))[1] == {"type": "unread", "unread": 2}
+
+
+@pytest.mark.anyio
+async def test_idle_stream_sends_keepalives(follow):
+    with patch.object(events_module, "EVENT_KEEPALIVE_INTERVAL", 0.05):
+        stream = follow(5, [0])
+        await _next(stream)
+
+        assert await _next(stream) == ": keepalive\n\n"
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import text
+
+from lcfs.services.redis.unread_counts import (
+    apply_unread_changes,
+    get_unread_count,
+    reconcile_unread_counts,
+    record_unread_changes,
+    store_unread_count,
+    unread_count_key,
+    wait_for_unread_updates,
+)
+
+
+@pytest.mark.anyio
+async def test_changes_only_reach_cached_counters(fake_redis_client):
+    for user_id, count in ((1, 3), (3, 2), (4, 1)):
+        await fake_redis_client.set(unread_count_key(user_id), count)
+
+    await apply_unread_changes(
+        fake_redis_client, {1: 2, 2: 1, 3: 1, 4: -2}, invalidated=[3]
+    )
+
+    assert await get_unread_count(fake_redis_client, 1) == 5
+    # A delta never creates a counter, and one that would go negative is dropped
+    assert await get_unread_count(fake_redis_client, 2) is None
+    assert await get_unread_count(fake_redis_client, 3) is None
+    assert await get_unread_count(fake_redis_client, 4) is None
+
+
+@pytest.mark.anyio
+async def test_rebuilt_count_does_not_replace_a_cached_one(fake_redis_client):
+    await store_unread_count(fake_redis_client, 1, 4)
+    await store_unread_count(fake_redis_client, 1, 7)
+
+    assert await get_unread_count(fake_redis_client, 1) == 4
+    assert await fake_redis_client.ttl(unread_count_key(1)) > 0
+
+
+@pytest.mark.anyio
+async def test_changes_wait_for_the_session_to_commit(
+    dbsession_factory, fake_redis_client
+):
+    await fake_redis_client.set(unread_count_key(1), 2)
+
+    async with dbsession_factory() as session:
+        await session.execute(text("SELECT 1"))
+        record_unread_changes(session, fake_redis_client, {1: 1})
+        await wait_for_unread_updates()
+        assert await get_unread_count(fake_redis_client, 1) == 2
+
+        await session.commit()
+        await wait_for_unread_updates()
+        assert await get_unread_count(fake_redis_client, 1) == 3
+
+        await session.execute(text("SELECT 1"))
+        record_unread_changes(session, fake_redis_client, invalidated=[1])
+        await session.rollback()
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+        await wait_for_unread_updates()
+        assert await get_unread_count(fake_redis_client, 1) == 3
+
+
+@pytest.mark.anyio
+async def test_reconcile_corrects_drifted_counters(fake_redis_client):
+    for user_id, count in ((1, 4), (2, 1), (3, 7)):
+        await fake_redis_client.set(unread_count_key(user_id), count, ex=60)
+
+    async def count_unread(user_ids):
+        assert sorted(user_ids) == [1, 2, 3]
+        # A message for user 3 is created while the counts are read
+        await apply_unread_changes(fake_redis_client, {3: 1})
+        return {1: 2, 3: 6}
+
+    corrected = await reconcile_unread_counts(
+        fake_redis_client, count_unread, batch_size=10
+    )
+
+    assert corrected == 2
+    assert await get_unread_count(fake_redis_client, 1) == 2
+    assert await get_unread_count(fake_redis_client, 2) == 0
+    # User 3's counter changed during the recount, so the next run corrects it
+    assert await get_unread_count(fake_redis_client, 3) == 8
+    assert await fake_redis_client.ttl(unread_count_key(1)) > 0
@@ -1,3 +1,5 @@
+import asyncio
+import tempfile
 from datetime import datetime
 from unittest.mock import AsyncMock, patch, MagicMock
 import os
@@ -8,6 +10,7 @@ import pytest
 from fastapi import UploadFile, HTTPException
 from starlette.responses import StreamingResponse
 from botocore.exceptions import ClientError
+from sqlalchemy.dialects import postgresql
 
 from lcfs.db.models.admin_adjustment.AdminAdjustment import (
     admin_adjustment_document_association,
@@ -25,7 +28,8 @@ from lcfs.db.models.compliance.ComplianceReport import (
     compliance_report_document_association,
 )
 from lcfs.services.s3.client import DocumentService, MAX_FILE_SIZE_BYTES, BUCKET_NAME
-from lcfs.services.clamav.client import ClamAVService
+from lcfs.services.clamav.client import ClamAVService, VirusScanException
+from lcfs.services.s3.transfer import FileView, UploadAborted
 
 
 @pytest.fixture
@@ -118,12 +122,20 @@ def document_service(
 
 
 @pytest.fixture
-def mock_file():
+def spooled_file():
+    with tempfile.TemporaryFile() as spooled:
+        spooled.write(b"file-bytes")
+        spooled.flush()
+        yield spooled
+
+
+@pytest.fixture
+def mock_file(spooled_file):
     file = MagicMock(spec=UploadFile)
     file.filename = "test.pdf"
     file.content_type = "application/pdf"
     file.file = MagicMock()
-    file.file.fileno = MagicMock(return_value=0)
+    file.file.fileno = MagicMock(return_value=spooled_file.fileno())
     file.file.seek = MagicMock()
     file.file.read = MagicMock(return_value=b"file-bytes")
     return file
@@ -245,14 +257,14 @@ async def test_upload_file_closed_seek_is_ignored(
     db_mock.get.return_value = compliance_report_mock
     db_mock.refresh = AsyncMock(side_effect=lambda x: x)
 
-    mock_file.file.seek.side_effect = [None, ValueError("seek of closed file")]
+    mock_file.file.seek.side_effect = ValueError("seek of closed file")
 
     result = await document_service.upload_file(
         mock_file, 1, "compliance_report", user_supplier
     )
 
     assert result.file_name == mock_file.filename
-    assert mock_file.file.seek.call_count == 2
+    assert mock_file.file.seek.call_count == 1
 
 
 @pytest.mark.anyio
@@ -290,11 +302,66 @@ async def test_upload_file_sha256_mismatch_fallback(
     assert result.file_name == mock_file.filename
     document_service.s3_client.put_object.assert_called_once()
     kwargs = document_service.s3_client.put_object.call_args.kwargs
-    assert kwargs["Body"] == b"file-bytes"
+    # The body is streamed from the file rather than read into memory
+    assert kwargs["Body"].read() == b"file-bytes"
     assert kwargs["Bucket"] == BUCKET_NAME
     assert kwargs["ContentType"] == mock_file.content_type
     document_service.s3_client.upload_fileobj.assert_called_once()
-    assert mock_file.file.seek.call_count >= 2
+    mock_file.file.read.assert_not_called()
+
+
+@pytest.mark.anyio
+@patch("uuid.uuid4")
+async def test_upload_file_is_removed_when_the_scan_fails(
+    mock_uuid,
+    document_service,
+    mock_file,
+    user_supplier,
+    compliance_report_mock,
+    db_mock,
+):
+    mock_uuid.return_value = "test-uuid"
+    document_service.compliance_report_repo.get_compliance_report_by_id.return_value = (
+        compliance_report_mock
+    )
+    uploaded = []
+
+    def upload_fileobj(Fileobj, **kwargs):
+        uploaded.append(Fileobj.read())
+
+    async def scan_file(file):
+        # The upload runs while the file is being scanned
+        await asyncio.sleep(0.05)
+        assert uploaded == [b"file-bytes"]
+        raise VirusScanException("Virus detected: stream: Eicar FOUND")
+
+    document_service.s3_client.upload_fileobj.side_effect = upload_fileobj
+    document_service.clamav_service.scan_file = scan_file
+
+    with patch("lcfs.services.s3.client.settings.clamav_enabled", True):
+        with pytest.raises(VirusScanException):
+            await document_service.upload_file(
+                mock_file, 1, "compliance_report", user_supplier
+            )
+
+    document_service.s3_client.delete_object.assert_called_once_with(
+        Bucket=BUCKET_NAME, Key="lcfs-docs/compliance_report/1/test-uuid"
+    )
+    db_mock.add.assert_not_called()
+
+
+def test_file_view_reads_independently_of_the_file_position(spooled_file):
+    spooled_file.seek(4)
+    view = FileView(spooled_file.fileno(), 10)
+
+    assert view.read(4) == b"file"
+    assert view.read() == b"-bytes"
+    assert spooled_file.tell() == 4
+
+    view.seek(0)
+    view.abort()
+    with pytest.raises(UploadAborted):
+        view.read(4)
 
 
 @pytest.mark.anyio
@@ -540,6 +607,35 @@ async def test_get_object_success(document_service, document_mock, db_mock):
     document_service.s3_client.get_object.assert_called_once()
 
 
+@pytest.mark.anyio
+async def test_get_object_requests_a_byte_range(
+    document_service, document_mock, db_mock
+):
+    db_mock.get_one.return_value = document_mock
+
+    await document_service.get_object(1, "bytes=0-99")
+    await document_service.get_object(1, "bytes=0-9,20-29")
+
+    calls = document_service.s3_client.get_object.call_args_list
+    assert calls[0].kwargs["Range"] == "bytes=0-99"
+    # S3 serves one range per request, so other ranges get the whole file
+    assert "Range" not in calls[1].kwargs
+
+
+@pytest.mark.anyio
+async def test_get_object_unsatisfiable_range(document_service, document_mock, db_mock):
+    db_mock.get_one.return_value = document_mock
+    document_service.s3_client.get_object.side_effect = ClientError(
+        {"Error": {"Code": "InvalidRange"}}, "GetObject"
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await document_service.get_object(1, "bytes=5000-")
+
+    assert exc_info.value.status_code == 416
+    assert exc_info.value.headers["Content-Range"] == "bytes */1024"
+
+
 @pytest.mark.anyio
 async def test_get_object_document_not_found(document_service, db_mock):
     # Setup
@@ -554,22 +650,14 @@ async def test_get_object_document_not_found(document_service, db_mock):
 
 @pytest.mark.anyio
 async def test_copy_documents(document_service, db_mock):
-    # Setup
-    doc1 = MagicMock()
-    doc1.document_id = 1
-    doc2 = MagicMock()
-    doc2.document_id = 2
+    db_mock.execute = AsyncMock(return_value=MagicMock(rowcount=2))
 
-    # Create a mock result object that can be iterated over
-    result_mock = MagicMock()
-    result_mock.all.return_value = [doc1, doc2]
-
-    # Make db_mock.execute return our result_mock
-    db_mock.execute = AsyncMock(return_value=result_mock)
+    assert await document_service.copy_documents(1, 2) == 2
 
-    # Execute
-    await document_service.copy_documents(1, 2)
-
-    # Assert
-    # We expect at least two calls (once for select, and at least once for insert)
-    assert db_mock.execute.call_count >= 2
+    # The links are copied by one INSERT ... SELECT, without reading them
+    db_mock.execute.assert_awaited_once()
+    sql = str(db_mock.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO compliance_report_document_association" in sql
+    assert "SELECT" in sql
+    assert "ON CONFLICT DO NOTHING" in sql
+    document_service.s3_client.copy_object.assert_not_called()
@@ -47,8 +47,10 @@ async def test_scheduler_lifecycle(mock_app):
         start_scheduler(mock_app)
         assert scheduler.running, "Scheduler should be running after start"
 
-        mock_add_job.assert_called_once()
-        assert mock_add_job.call_args.kwargs["id"] == "reindex_compliance_report_tables"
+        assert [call.kwargs["id"] for call in mock_add_job.call_args_list] == [
+            "reindex_compliance_report_tables",
+            "reconcile_unread_notification_counts",
+        ]
 
         safe_shutdown_scheduler()
 
@@ -151,11 +153,10 @@ async def test_scheduler_adds_startup_job(mock_app):
             # Verify start was called
             mock_start.assert_called_once()
 
-            mock_add_job.assert_called_once()
-            assert (
-                mock_add_job.call_args.kwargs["id"]
-                == "reindex_compliance_report_tables"
-            )
+            assert [call.kwargs["id"] for call in mock_add_job.call_args_list] == [
+                "reindex_compliance_report_tables",
+                "reconcile_unread_notification_counts",
+            ]
 
             # # Verify the job was added
             # mock_add_job.assert_called_once()
@@ -220,11 +221,12 @@ async def test_scheduler_startup_job_essentials(mock_app):
         # Verify scheduler.start was called
         mock_scheduler_instance.start.assert_called_once()
 
-        mock_scheduler_instance.add_job.assert_called_once()
-        assert (
-            mock_scheduler_instance.add_job.call_args.kwargs["id"]
-            == "reindex_compliance_report_tables"
-        )
+        assert [
+            call.kwargs["id"] for call in mock_scheduler_instance.add_job.call_args_list
+        ] == [
+            "reindex_compliance_report_tables",
+            "reconcile_unread_notification_counts",
+        ]
 
         # # Verify add_job was called with correct parameters
         # mock_scheduler_instance.add_job.assert_called_once()
@@ -254,7 +256,7 @@ async def test_scheduler_adds_one_time_startup_reindex_job_when_enabled(mock_app
         try:
             start_scheduler(mock_app)
 
-            assert mock_add_job.call_count == 2
+            assert mock_add_job.call_count == 3
             added_job_ids = [call.kwargs["id"] for call in mock_add_job.call_args_list]
             assert "reindex_compliance_report_tables" in added_job_ids
             assert "reindex_compliance_report_tables_startup" in added_job_ids
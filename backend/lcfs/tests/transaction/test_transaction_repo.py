@@ -976,6 +976,28 @@ async def test_transactions_in_have_correct_visibilities(
     assert total_count_gov == 12  # Total includes 2 standalone Adjustment transactions
 
 
+@pytest.mark.anyio
+async def test_stream_transactions_matches_paginated(
+    dbsession, transaction_repo, mock_transactions
+):
+    sort_orders = [SortOrder(field="transaction_id", direction="asc")]
+
+    for organization_id in (test_org_id, None):
+        expected, _ = await transaction_repo.get_transactions_paginated(
+            0, None, [], sort_orders, organization_id
+        )
+        streamed = [
+            transaction
+            async for transaction in transaction_repo.stream_transactions(
+                [], sort_orders, organization_id, batch_size=2
+            )
+        ]
+
+        assert [t.transaction_id for t in streamed] == [
+            t.transaction_id for t in expected
+        ]
+
+
 @pytest.mark.anyio
 async def test_get_visible_statuses_invalid_entity_type(transaction_repo):
     with pytest.raises(DatabaseException):
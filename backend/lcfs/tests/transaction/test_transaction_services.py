@@ -21,9 +21,17 @@ def mock_repo():
     return repo
 
 
+def stream_of(rows):
+    async def stream(*args, **kwargs):
+        for row in rows:
+            yield row
+
+    return MagicMock(side_effect=stream)
+
+
 @pytest.fixture
 def transactions_service(mock_repo):
-    return TransactionsService(repo=mock_repo)
+    return TransactionsService(repo=mock_repo, session_factory=None)
 
 
 # Test retrieving transactions with filters, sorting, and pagination
@@ -93,10 +101,7 @@ async def test_export_transactions(transactions_service):
             government_comment="Government Comment",
         )
     ]
-    transactions_service.repo.get_transactions_paginated.return_value = (
-        mock_transactions,
-        1,
-    )
+    transactions_service.repo.stream_transactions = stream_of(mock_transactions)
 
     response = await transactions_service.export_transactions(export_format="csv")
 
@@ -196,10 +201,7 @@ async def test_export_recorded_date_utc_midnight(transactions_service):
             government_comment=None,
         )
     ]
-    transactions_service.repo.get_transactions_paginated.return_value = (
-        mock_transactions,
-        1,
-    )
+    transactions_service.repo.stream_transactions = stream_of(mock_transactions)
 
     response = await transactions_service.export_transactions(export_format="csv")
 
@@ -0,0 +1,177 @@
+from datetime import date
+from io import BytesIO
+
+import pytest
+from openpyxl import load_workbook
+from openpyxl.worksheet.datavalidation import DataValidation
+
+from lcfs.utils.spreadsheet_builder import (
+    RawSpreadsheet,
+    SpreadsheetBuilder,
+    SpreadsheetColumn,
+)
+
+COLUMNS = [
+    SpreadsheetColumn("ID", "int"),
+    SpreadsheetColumn("Organization name", "text"),
+    SpreadsheetColumn("Transaction date", "date"),
+    SpreadsheetColumn("Value per unit", "float"),
+]
+
+
+def _rows(count):
+    for i in range(count):
+        yield [i, f"Org {i}", date(2024, 1, 1), i * 1.5]
+
+
+def _load(content: bytes):
+    return load_workbook(BytesIO(content))
+
+
+def test_streaming_rejects_xls():
+    with pytest.raises(ValueError):
+        SpreadsheetBuilder(file_format="xls", streaming=True)
+
+
+def test_streaming_xlsx_matches_in_memory_output():
+    outputs = []
+    for streaming in (False, True):
+        builder = SpreadsheetBuilder(file_format="xlsx", streaming=streaming)
+        rows = _rows(5) if streaming else list(_rows(5))
+        builder.add_sheet(
+            sheet_name="Export",
+            columns=COLUMNS,
+            rows=rows,
+            styles={"bold_headers": True},
+        )
+        outputs.append(_load(builder.build_spreadsheet())["Export"])
+
+    in_memory, streamed = outputs
+    # The in-memory writer pre-formats blank rows up to format_max_row.
+    assert [[c.value for c in row] for row in streamed.iter_rows()] == [
+        [c.value for c in row] for row in in_memory.iter_rows(max_row=6)
+    ]
+    assert streamed["A1"].font.b is True
+    assert streamed["A2"].number_format == in_memory["A2"].number_format
+    assert streamed["C2"].number_format == "yyyy-mm-dd"
+    assert streamed["D2"].number_format == "#,##0.00"
+    assert streamed["D2"].alignment.horizontal == "right"
+    for letter in "ABCD":
+        assert (
+            streamed.column_dimensions[letter].width
+            == in_memory.column_dimensions[letter].width
+        )
+
+
+def test_streaming_xlsx_applies_formulas_and_validators():
+    validator = DataValidation(type="list", formula1='"Yes,No"', sqref="B2:B20")
+    builder = SpreadsheetBuilder(file_format="xlsx", streaming=True)
+    builder.add_sheet(
+        sheet_name="Template",
+        columns=COLUMNS,
+        rows=iter([[1, "Org", None, None]]),
+        validators=[validator],
+        column_formulas={4: "=A{row}*2"},
+        formula_end_row=4,
+    )
+
+    workbook = _load(builder.build_spreadsheet())
+    sheet = workbook["Template"]
+
+    assert [sheet.cell(row=r, column=4).value for r in range(2, 6)] == [
+        "=A2*2",
+        "=A3*2",
+        "=A4*2",
+        None,
+    ]
+    assert len(sheet.data_validations.dataValidation) == 1
+    assert workbook.calculation.fullCalcOnLoad is True
+
+
+def test_streaming_xlsx_writes_raw_sheets():
+    builder = SpreadsheetBuilder(file_format="xlsx", streaming=True)
+    builder.add_raw_sheet(
+        RawSpreadsheet(
+            label="Summary",
+            data=[["Line", "Value"], [1, 10]],
+            styles=[[{}, {}], [{"type": "int"}, {"type": "int"}]],
+        )
+    )
+
+    sheet = _load(builder.build_spreadsheet())["Summary"]
+
+    assert [[c.value for c in row] for row in sheet.iter_rows()] == [
+        ["Line", "Value"],
+        [1, 10],
+    ]
+    assert sheet["B2"].number_format == "#,##0"
+
+
+def test_streaming_csv_writes_rows_from_iterator():
+    builder = SpreadsheetBuilder(file_format="csv", streaming=True)
+    builder.add_sheet(sheet_name="Export", columns=COLUMNS, rows=_rows(2))
+
+    content = builder.build_spreadsheet().decode("utf-8").splitlines()
+
+    assert content == [
+        "ID,Organization name,Transaction date,Value per unit",
+        "0,Org 0,2024-01-01,0.0",
+        "1,Org 1,2024-01-01,1.5",
+    ]
+
+
+async def _async_rows(count):
+    for row in _rows(count):
+        yield row
+
+
+async def _collect(builder):
+    return b"".join([chunk async for chunk in builder.stream()])
+
+
+@pytest.mark.anyio
+async def test_stream_requires_streaming_builder():
+    builder = SpreadsheetBuilder(file_format="xlsx")
+    with pytest.raises(ValueError):
+        await _collect(builder)
+
+
+@pytest.mark.anyio
+async def test_stream_csv_from_async_rows_in_chunks(monkeypatch):
+    monkeypatch.setattr("lcfs.utils.spreadsheet_builder.STREAM_CHUNK_SIZE", 64)
+    builder = SpreadsheetBuilder(file_format="csv", streaming=True)
+    builder.add_sheet(sheet_name="Export", columns=COLUMNS, rows=_async_rows(10))
+
+    chunks = [chunk async for chunk in builder.stream()]
+
+    assert len(chunks) > 1
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert lines[0] == "ID,Organization name,Transaction date,Value per unit"
+    assert lines[-1] == "9,Org 9,2024-01-01,13.5"
+    assert len(lines) == 11
+
+
+@pytest.mark.anyio
+async def test_stream_xlsx_from_async_rows_matches_sync_output(monkeypatch):
+    # Force the width sample to end before the data does
+    monkeypatch.setattr("lcfs.utils.spreadsheet_builder.STREAMING_WIDTH_SAMPLE_ROWS", 3)
+
+    def builder_for(rows):
+        builder = SpreadsheetBuilder(file_format="xlsx", streaming=True)
+        builder.add_sheet(
+            sheet_name="Export",
+            columns=COLUMNS,
+            rows=rows,
+            styles={"bold_headers": True},
+        )
+        return builder
+
+    written = _load(builder_for(_rows(7)).build_spreadsheet())["Export"]
+    streamed = _load(await _collect(builder_for(_async_rows(7))))["Export"]
+
+    assert [[c.value for c in row] for row in streamed.iter_rows()] == [
+        [c.value for c in row] for row in written.iter_rows()
+    ]
+    assert streamed.max_row == 8
+    assert streamed["A1"].font.b is True
+    assert streamed["D2"].number_format == written["D2"].number_format
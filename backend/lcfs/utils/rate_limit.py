@@ -0,0 +1,38 @@
+"""Rate limiting for calls to external services."""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Lets ``burst`` calls through at once and then ``rate`` per second. The
+    API loop and the job worker's loop share one bucket, so it is guarded
+    by a thread lock rather than an asyncio one.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns the seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate, 0.0)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
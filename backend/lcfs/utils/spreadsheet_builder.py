@@ -1,15 +1,41 @@
+import asyncio
+import csv
+import io
+import tempfile
 import pandas as pd
 import structlog
 import xlwt
 from io import BytesIO
-from openpyxl import styles
+from itertools import chain, islice
+from openpyxl import Workbook, styles
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.worksheet.worksheet import Worksheet
-from typing import Literal, TypedDict, List, Dict, Any, Optional
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    TypedDict,
+    Union,
+)
 
 logger = structlog.get_logger(__name__)
 MAX_XLS_WIDTH = 65535
+# Number of leading rows inspected to size columns when streaming.
+STREAMING_WIDTH_SAMPLE_ROWS = 500
+# Size of the chunks handed to a StreamingResponse by SpreadsheetBuilder.stream.
+STREAM_CHUNK_SIZE = 64 * 1024
+# Streamed xlsx files larger than this spill from memory to disk.
+STREAM_SPOOL_SIZE = 8 * 1024 * 1024
+# Rows fetched per round trip when exports read from a server-side cursor.
+EXPORT_STREAM_BATCH_SIZE = 1000
 
 
 class SpreadsheetColumn:
@@ -23,7 +49,7 @@ class SpreadsheetColumn:
 
 
 class RawSpreadsheet:
-    def __init__(self, label: str, data: List[List[Any]], styles: List[List[Any]]):
+    def __init__(self, label: str, data: Iterable[List[Any]], styles: List[List[Any]]):
         self.label = label
         self.data = data
         self.styles = styles
@@ -32,7 +58,7 @@ class RawSpreadsheet:
 class SheetData(TypedDict):
     sheet_name: str
     columns: List[SpreadsheetColumn]
-    rows: List[Any]
+    rows: Iterable[Any]
     styles: Dict[str, Any]
     validators: List[DataValidation]
     column_formulas: Dict[int, str]
@@ -45,13 +71,23 @@ class SpreadsheetBuilder:
     """
     A class to build spreadsheets in xlsx, xls, or csv format.
     Allows adding multiple sheets with custom styling and exporting them as a byte stream.
+
+    With ``streaming=True`` (xlsx and csv only) rows may be any iterable,
+    including generators. Rows are written straight to the output without
+    pandas or an in-memory worksheet, column formats are applied once per
+    column and widths are estimated from the first
+    ``STREAMING_WIDTH_SAMPLE_ROWS`` rows, so memory stays flat regardless of
+    row count.
     """
 
-    def __init__(self, file_format: str = "xls"):
+    def __init__(self, file_format: str = "xls", streaming: bool = False):
         if file_format not in ["xlsx", "xls", "csv"]:
             raise ValueError(f"Unsupported file format: {file_format}")
+        if streaming and file_format == "xls":
+            raise ValueError("Streaming is not supported for xls exports")
 
         self.file_format = file_format
+        self.streaming = streaming
         self.sheets_data: List[SheetData] = []
         self.raw_sheets: List[RawSpreadsheet] = []
 
@@ -59,7 +95,7 @@ class SpreadsheetBuilder:
         self,
         sheet_name: str,
         columns: List[SpreadsheetColumn],
-        rows: list,
+        rows: Iterable,
         styles: Optional[Dict] = None,
         validators: Optional[List[DataValidation]] = None,
         position: int = 0,
@@ -90,17 +126,30 @@ class SpreadsheetBuilder:
         self.raw_sheets.append(data)
 
     def build_spreadsheet(self) -> bytes:
+        output = BytesIO()
+        self.write_to(output)
+        output.seek(0)
+        return output.getvalue()
+
+    def write_to(self, output: BinaryIO) -> None:
+        """
+        Write the spreadsheet to a binary stream, e.g. a file or a
+        SpooledTemporaryFile, without holding the encoded bytes in memory.
+        """
         try:
-            output = BytesIO()
             # Map file formats to the corresponding writer methods
-            writer_func = {
-                "xlsx": self._write_xlsx,
-                "xls": self._write_xls,
-                "csv": self._write_csv,
-            }[self.file_format]
+            if self.streaming:
+                writer_func = {
+                    "xlsx": self._write_xlsx_streaming,
+                    "csv": self._write_csv_streaming,
+                }[self.file_format]
+            else:
+                writer_func = {
+                    "xlsx": self._write_xlsx,
+                    "xls": self._write_xls,
+                    "csv": self._write_csv,
+                }[self.file_format]
             writer_func(output)
-            output.seek(0)
-            return output.getvalue()
         except Exception as e:
             logger.error("Failed to build spreadsheet", error=str(e), exc_info=e)
             raise
@@ -275,71 +324,77 @@ class SpreadsheetBuilder:
                 default=0,
             )
 
-            # Get header length for comparison
-            header_cell = column[0]
-            header_length = len(str(header_cell.value)) if header_cell.value else 0
-
-            # Use the maximum of content length and header length
-            content_width = max(max_length, header_length)
-
-            # Set minimum width based on content type and typical requirements
-            # Default minimum width for readability
-            min_width = 12
-
-            # Adjust minimum width based on header content to handle different column types
-            header_text = str(header_cell.value).lower() if header_cell.value else ""
-
-            if any(
-                keyword in header_text
-                for keyword in [
-                    "name",
-                    "description",
-                    "address",
-                    "organization",
-                    "notes",
-                ]
-            ):
-                min_width = 25  # Wide columns for text content
-            elif any(
-                keyword in header_text
-                for keyword in ["fuel type", "fuel code", "manufacturer", "model"]
-            ):
-                min_width = 18  # Medium-wide for categorical data
-            elif any(keyword in header_text for keyword in ["email", "phone"]):
-                min_width = 20  # Contact information
-            elif any(
-                keyword in header_text for keyword in ["date", "serial", "registration"]
-            ):
-                min_width = 15  # Date and ID columns
-            elif any(
-                keyword in header_text
-                for keyword in [
-                    "quantity",
-                    "units",
-                    "compliance",
-                    "value",
-                    "ci",
-                    "density",
-                    "eer",
-                    "energy",
-                ]
-            ):
-                min_width = 14  # Numeric columns
-            elif any(keyword in header_text for keyword in ["line"]):
-                min_width = 8  # Short line number columns
+            column_letter = get_column_letter(column[0].column)
+            worksheet.column_dimensions[column_letter].width = (
+                self._calculate_column_width(column[0].value, max_length)
+            )
 
-            # Calculate final width with padding
-            # Add extra padding for better readability (minimum 4 characters)
-            padding = max(4, int(content_width * 0.1))  # 10% padding, minimum 4 chars
-            calculated_width = content_width + padding
+    @staticmethod
+    def _calculate_column_width(header_value: Any, max_length: int) -> int:
+        """
+        Width for an xlsx column given its header and the longest cell value.
+        """
+        # Get header length for comparison
+        header_length = len(str(header_value)) if header_value else 0
+
+        # Use the maximum of content length and header length
+        content_width = max(max_length, header_length)
+
+        # Set minimum width based on content type and typical requirements
+        # Default minimum width for readability
+        min_width = 12
+
+        # Adjust minimum width based on header content to handle different column types
+        header_text = str(header_value).lower() if header_value else ""
+
+        if any(
+            keyword in header_text
+            for keyword in [
+                "name",
+                "description",
+                "address",
+                "organization",
+                "notes",
+            ]
+        ):
+            min_width = 25  # Wide columns for text content
+        elif any(
+            keyword in header_text
+            for keyword in ["fuel type", "fuel code", "manufacturer", "model"]
+        ):
+            min_width = 18  # Medium-wide for categorical data
+        elif any(keyword in header_text for keyword in ["email", "phone"]):
+            min_width = 20  # Contact information
+        elif any(
+            keyword in header_text for keyword in ["date", "serial", "registration"]
+        ):
+            min_width = 15  # Date and ID columns
+        elif any(
+            keyword in header_text
+            for keyword in [
+                "quantity",
+                "units",
+                "compliance",
+                "value",
+                "ci",
+                "density",
+                "eer",
+                "energy",
+            ]
+        ):
+            min_width = 14  # Numeric columns
+        elif any(keyword in header_text for keyword in ["line"]):
+            min_width = 8  # Short line number columns
 
-            # Apply minimum and maximum constraints
-            final_width = max(min_width, calculated_width)
-            # Set reasonable maximum to prevent extremely wide columns
-            final_width = min(final_width, 50)
+        # Calculate final width with padding
+        # Add extra padding for better readability (minimum 4 characters)
+        padding = max(4, int(content_width * 0.1))  # 10% padding, minimum 4 chars
+        calculated_width = content_width + padding
 
-            column_letter = get_column_letter(column[0].column)
-            worksheet.column_dimensions[column_letter].width = final_width
+        # Apply minimum and maximum constraints
+        final_width = max(min_width, calculated_width)
+        # Set reasonable maximum to prevent extremely wide columns
+        return min(final_width, 50)
 
     def _auto_adjust_column_width_xls(self, sheet, sheet_data):
         # Calculate the maximum width for each column using header and row values.
@@ -360,3 +415,279 @@ class SpreadsheetBuilder:
             columns = [col.label for col in self.sheets_data[0]["columns"]]
             df = pd.DataFrame(self.sheets_data[0]["rows"], columns=columns)
             df.to_csv(output, index=False)
+
+    # ------------------------------------------------------------------
+    # Streaming writers
+    # ------------------------------------------------------------------
+
+    def _write_xlsx_streaming(self, output: BinaryIO) -> None:
+        workbook = Workbook(write_only=True)
+
+        for sheet in self.sheets_data:
+            self._stream_sheet_to_xlsx(workbook, sheet)
+
+        for sheet in self.raw_sheets:
+            self._stream_raw_sheet_to_xlsx(workbook, sheet)
+
+        # Force Excel to recalculate all cross-sheet references (including data
+        # validation sources) on first open, preventing blank dropdowns.
+        workbook.calculation.fullCalcOnLoad = True
+        workbook.save(output)
+
+    def _stream_sheet_to_xlsx(self, workbook: Workbook, sheet: SheetData) -> None:
+        rows = iter(sheet["rows"])
+        sample = list(islice(rows, STREAMING_WIDTH_SAMPLE_ROWS))
+
+        sheet_writer = self._open_streaming_sheet(workbook, sheet, sample)
+        for row in chain(sample, rows):
+            sheet_writer.append(row)
+        sheet_writer.finish()
+
+    def _open_streaming_sheet(
+        self, workbook: Workbook, sheet: SheetData, sample: List[Any]
+    ) -> "_StreamingSheetWriter":
+        """
+        Create the worksheet, size and format its columns from the sample rows
+        and write the header. Rows are then added through the returned writer.
+        """
+        worksheet = workbook.create_sheet(sheet["sheet_name"])
+        columns = sheet["columns"]
+        column_formulas = sheet.get("column_formulas") or {}
+
+        # Column widths and formats must be set before the first row is written.
+        # The column style also formats blank rows users fill in later, which
+        # replaces the format_max_row loop of the in-memory writer.
+        for col_idx, column in enumerate(columns, start=1):
+            max_length = max(
+                (
+                    len(str(row[col_idx - 1]))
+                    for row in sample
+                    if len(row) >= col_idx and row[col_idx - 1] is not None
+                ),
+                default=0,
+            )
+            if col_idx in column_formulas:
+                max_length = 0
+            dimension = worksheet.column_dimensions[get_column_letter(col_idx)]
+            dimension.width = self._calculate_column_width(column.label, max_length)
+            self._set_cell_format(dimension, column.column_type)
+
+        for validator in sheet["validators"]:
+            worksheet.data_validations.append(validator)
+
+        header_font = styles.Font(bold=bool(sheet["styles"].get("bold_headers")))
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(worksheet, value=column.label)
+            cell.font = header_font
+            header.append(cell)
+        worksheet.append(header)
+
+        # One prototype cell per column carries the style; data cells share its
+        # style array instead of rebuilding formats cell by cell.
+        column_styles = []
+        for column in columns:
+            prototype = WriteOnlyCell(worksheet)
+            self._set_cell_format(prototype, column.column_type)
+            column_styles.append(prototype._style)
+
+        return _StreamingSheetWriter(worksheet, sheet, column_styles)
+
+    @staticmethod
+    def _fill_row_formulas(
+        values: List[Any],
+        column_formulas: Dict[int, str],
+        row_number: int,
+        start_row: int,
+        end_row: int,
+    ) -> None:
+        if not column_formulas or row_number < start_row:
+            return
+        if end_row and row_number > end_row:
+            return
+        for col_idx, template in column_formulas.items():
+            if len(values) < col_idx:
+                values.extend([None] * (col_idx - len(values)))
+            values[col_idx - 1] = template.format(row=row_number)
+
+    @staticmethod
+    def _styled_row(worksheet, values: List[Any], column_styles: List[Any]):
+        cells = []
+        for col_idx, value in enumerate(values):
+            cell = WriteOnlyCell(worksheet, value=value)
+            if col_idx < len(column_styles):
+                cell._style = column_styles[col_idx]
+            cells.append(cell)
+        return cells
+
+    def _stream_raw_sheet_to_xlsx(
+        self, workbook: Workbook, sheet: RawSpreadsheet
+    ) -> None:
+        worksheet = workbook.create_sheet(sheet.label)
+
+        rows = iter(sheet.data)
+        sample = list(islice(rows, STREAMING_WIDTH_SAMPLE_ROWS))
+        header = sample[0] if sample else []
+        for col_idx, header_value in enumerate(header, start=1):
+            max_length = max(
+                (
+                    len(str(row[col_idx - 1]))
+                    for row in sample
+                    if len(row) >= col_idx and row[col_idx - 1] is not None
+                ),
+                default=0,
+            )
+            worksheet.column_dimensions[get_column_letter(col_idx)].width = (
+                self._calculate_column_width(header_value, max_length)
+            )
+
+        for row_idx, row in enumerate(chain(sample, rows)):
+            row_styles = sheet.styles[row_idx] if row_idx < len(sheet.styles) else []
+            cells = []
+            for col_idx, value in enumerate(row):
+                cell = WriteOnlyCell(worksheet, value=value)
+                if col_idx < len(row_styles):
+                    cell_style = row_styles[col_idx]
+                    if cell_style.get("font"):
+                        cell.font = cell_style["font"]
+                    if cell_style.get("border"):
+                        cell.border = cell_style["border"]
+                    self._set_cell_format(cell, cell_style.get("type"))
+                cells.append(cell)
+            worksheet.append(cells)
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        Yield the encoded spreadsheet in chunks for a ``StreamingResponse``.
+
+        Requires ``streaming=True``. Sheet rows may also be async iterables,
+        e.g. rows read from a server-side cursor, so a large export never
+        sits in memory. CSV chunks go out as rows are read; xlsx is assembled
+        in a spooled temporary file because the zip container can only be
+        finished once every row is written.
+        """
+        if not self.streaming:
+            raise ValueError("stream() requires a streaming SpreadsheetBuilder")
+
+        if self.file_format == "csv":
+            chunks = self._stream_csv_chunks()
+        else:
+            chunks = self._stream_xlsx_chunks()
+        async for chunk in chunks:
+            yield chunk
+
+    async def _stream_csv_chunks(self) -> AsyncIterator[bytes]:
+        if not self.sheets_data:
+            return
+        sheet = self.sheets_data[0]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([column.label for column in sheet["columns"]])
+        async for row in _aiter_rows(sheet["rows"]):
+            writer.writerow(row)
+            if buffer.tell() >= STREAM_CHUNK_SIZE:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    async def _stream_xlsx_chunks(self) -> AsyncIterator[bytes]:
+        workbook = Workbook(write_only=True)
+
+        for sheet in self.sheets_data:
+            rows = _aiter_rows(sheet["rows"])
+            sample = []
+            async for row in rows:
+                sample.append(row)
+                if len(sample) >= STREAMING_WIDTH_SAMPLE_ROWS:
+                    break
+
+            sheet_writer = self._open_streaming_sheet(workbook, sheet, sample)
+            for row in sample:
+                sheet_writer.append(row)
+            async for row in rows:
+                sheet_writer.append(row)
+            sheet_writer.finish()
+
+        for sheet in self.raw_sheets:
+            self._stream_raw_sheet_to_xlsx(workbook, sheet)
+
+        workbook.calculation.fullCalcOnLoad = True
+        with tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_SIZE) as output:
+            # Compressing the finished sheets is CPU bound; keep it off the loop.
+            await asyncio.to_thread(workbook.save, output)
+            output.seek(0)
+            while chunk := output.read(STREAM_CHUNK_SIZE):
+                yield chunk
+
+    def _write_csv_streaming(self, output: BinaryIO) -> None:
+        if not self.sheets_data:
+            return
+        sheet = self.sheets_data[0]
+        text_output = io.TextIOWrapper(output, encoding="utf-8", newline="")
+        try:
+            writer = csv.writer(text_output)
+            writer.writerow([column.label for column in sheet["columns"]])
+            writer.writerows(sheet["rows"])
+        finally:
+            # Detach so closing the wrapper does not close the caller's stream.
+            text_output.flush()
+            text_output.detach()
+
+
+class _StreamingSheetWriter:
+    """Appends data rows, with column formulas, to a write-only worksheet."""
+
+    def __init__(self, worksheet, sheet: SheetData, column_styles: List[Any]):
+        self.worksheet = worksheet
+        self.columns = sheet["columns"]
+        self.column_formulas = sheet.get("column_formulas") or {}
+        self.formula_start_row = sheet.get("formula_start_row") or 2
+        self.formula_end_row = sheet.get("formula_end_row") or 0
+        self.column_styles = column_styles
+        self.row_number = 1
+
+    def append(self, row: Iterable[Any]) -> None:
+        self.row_number += 1
+        values = list(row)
+        SpreadsheetBuilder._fill_row_formulas(
+            values,
+            self.column_formulas,
+            self.row_number,
+            self.formula_start_row,
+            self.formula_end_row,
+        )
+        self.worksheet.append(
+            SpreadsheetBuilder._styled_row(self.worksheet, values, self.column_styles)
+        )
+
+    def finish(self) -> None:
+        if not self.column_formulas:
+            return
+        # Mirror the in-memory writer: formulas extend past the data to
+        # formula_end_row, or at least to formula_start_row.
+        last_row = self.formula_end_row or max(self.formula_start_row, self.row_number)
+        for extra_row in range(self.row_number + 1, last_row + 1):
+            values = [None] * len(self.columns)
+            SpreadsheetBuilder._fill_row_formulas(
+                values,
+                self.column_formulas,
+                extra_row,
+                self.formula_start_row,
+                self.formula_end_row or last_row,
+            )
+            self.worksheet.append(
+                SpreadsheetBuilder._styled_row(
+                    self.worksheet, values, self.column_styles
+                )
+            )
+
+
+async def _aiter_rows(rows: Union[Iterable, AsyncIterable]) -> AsyncIterator[Any]:
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
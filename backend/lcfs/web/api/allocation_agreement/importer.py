@@ -1,24 +1,25 @@
-import asyncio
-import concurrent.futures
-import io
-import json
 import re
 import structlog
-import uuid
-from fastapi import Depends, HTTPException, status, UploadFile
-from openpyxl import load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
+from functools import partial
+from fastapi import Depends, UploadFile
+from fastapi.responses import StreamingResponse
 from redis.asyncio import Redis
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from typing import List
+from typing import List, Optional
 
-from lcfs.db.base import current_user_var
-from lcfs.db.dependencies import db_url, set_user_context
 from lcfs.db.models import UserProfile
-from lcfs.services.clamav.client import ClamAVService
+from lcfs.services.imports.job import ImportColumn, RowRejected, SpreadsheetImportJob
+from lcfs.services.imports.runtime import (
+    IMPORT_JOB_ATTEMPTS,
+    import_file,
+    import_result,
+    queue_import,
+    read_job_status,
+    write_job_progress,
+)
+from lcfs.services.job_queue.queue import JobQueue, QueuedJob
+from lcfs.services.job_queue.registry import register_job
 from lcfs.services.redis.dependency import get_redis_client
-from lcfs.settings import settings
-from lcfs.utils.constants import POSTAL_REGEX, ALLOWED_MIME_TYPES, ALLOWED_FILE_TYPES, MAX_FILE_SIZE_BYTES, MAX_FILE_SIZE_MB
+from lcfs.services.redis.job_progress import job_progress_response
 from lcfs.web.api.compliance_report.services import ComplianceReportServices
 from lcfs.web.api.allocation_agreement.repo import AllocationAgreementRepository
 from lcfs.web.api.allocation_agreement.schema import AllocationAgreementCreateSchema
@@ -32,6 +33,8 @@ from lcfs.web.api.fuel_supply.repo import FuelSupplyRepository
 
 logger = structlog.get_logger(__name__)
 
+IMPORT_JOB_TYPE = "import.allocation_agreement"
+
 
 class AllocationAgreementImporter:
 
@@ -40,16 +43,14 @@ class AllocationAgreementImporter:
         repo: AllocationAgreementRepository = Depends(),
         fuel_code_repo: FuelCodeRepository = Depends(),
         compliance_report_services: ComplianceReportServices = Depends(),
-        clamav_service: ClamAVService = Depends(),
         redis_client: Redis = Depends(get_redis_client),
-        executor: concurrent.futures.ThreadPoolExecutor = Depends(),
+        queue: JobQueue = Depends(),
     ) -> None:
         self.repo = repo
         self.fuel_code_repo = fuel_code_repo
         self.compliance_report_services = compliance_report_services
-        self.clamav_service = clamav_service
         self.redis_client = redis_client
-        self.executor = executor
+        self.queue = queue
 
     @service_handler
     async def import_data(
@@ -58,76 +59,58 @@ class AllocationAgreementImporter:
         user: UserProfile,
         file: UploadFile,
         overwrite: bool,
+        dry_run: bool = False,
     ) -> str:
         """
-        Initiates the import job in a separate thread executor.
+        Queues the import job for the job workers, or with ``dry_run`` a job
+        that only validates the file.
         Returns a job_id that can be used to track progress via get_status.
         """
-        job_id = str(uuid.uuid4())
-
-        # Initialize job status in Redis
-        await _update_progress(
-            self.redis_client, job_id, 0, "Starting import job...", 0, 0, []
+        job_id, created = await queue_import(
+            self.queue,
+            IMPORT_JOB_TYPE,
+            user,
+            file,
+            {
+                "compliance_report_id": compliance_report_id,
+                "overwrite": overwrite,
+                "dry_run": dry_run,
+            },
+            organization_id=user.organization_id,
         )
-
-        # Read file into memory once to enable scanning and openpyxl parsing
-        file_contents = await file.read()
-
-        # Validate MIME type
-        if file.content_type not in ALLOWED_MIME_TYPES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type '{file.content_type or 'unknown'}' is not allowed. Please upload files of the following types: {ALLOWED_FILE_TYPES}",
-            )
-
-        # Validate file size
-        file_size = len(file_contents)
-        if file_size > MAX_FILE_SIZE_BYTES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds the maximum limit of {MAX_FILE_SIZE_MB} MB.",
+        if created:
+            await _update_progress(
+                self.redis_client, job_id, 0, "Starting import job...", 0, 0, []
             )
 
-        # Create an in-memory buffer and attach it to a new UploadFile
-        buffer = io.BytesIO(file_contents)
-        buffer.seek(0)
-        copied_file = UploadFile(filename=file.filename, file=buffer)
-
-        loop = asyncio.get_running_loop()
-        loop.run_in_executor(
-            self.executor,
-            lambda: asyncio.run(
-                import_async(
-                    compliance_report_id,
-                    user,
-                    copied_file,
-                    job_id,
-                    overwrite,
-                )
-            ),
-        )
-
         return job_id
 
     async def get_status(self, job_id: str) -> dict:
         """
         Retrieves and returns the job's progress and status from Redis.
         """
-        progress_data_str = await self.redis_client.get(f"jobs/{job_id}")
-        if not progress_data_str:
-            return {"progress": 0, "status": "No job found with this ID."}
-
-        try:
-            progress_data = json.loads(progress_data_str)
-            return {
-                "progress": progress_data.get("progress", 0),
-                "status": progress_data.get("status", "No status available."),
-                "created": progress_data.get("created", 0),
-                "rejected": progress_data.get("rejected", 0),
-                "errors": progress_data.get("errors", []),
-            }
-        except json.JSONDecodeError:
-            return {"progress": 0, "status": "Invalid status data found."}
+        return await read_job_status(self.redis_client, job_id)
+
+    def stream_status(
+        self, job_id: str, last_event_id: Optional[str] = None
+    ) -> StreamingResponse:
+        """
+        Streams the job's progress as Server-Sent Events until it finishes.
+        """
+        return job_progress_response(self.redis_client, job_id, last_event_id)
+
+
+@register_job(IMPORT_JOB_TYPE, max_attempts=IMPORT_JOB_ATTEMPTS, per_organization=1)
+async def run_import_job(job: QueuedJob) -> dict:
+    result = await import_async(
+        job.payload["compliance_report_id"],
+        job.user,
+        import_file(job),
+        job.job_id,
+        job.payload["overwrite"],
+        job.payload.get("dry_run", False),
+    )
+    return import_result(result)
 
 
 async def import_async(
@@ -136,208 +119,127 @@ async def import_async(
     file: UploadFile,
     job_id: str,
     overwrite: bool,
+    dry_run: bool = False,
 ):
     """
-    Performs the actual allocation agreement import in an async context.
-    This is offloaded to a thread pool to avoid blocking.
+    Performs the actual allocation agreement import on a job worker.
     """
-    logger.debug("Importing Allocation Agreement Data...")
+    job = AllocationAgreementImportJob(
+        job_id, user, file, compliance_report_id, overwrite, dry_run
+    )
+    return await job.run()
 
-    engine = create_async_engine(db_url, future=True)
-    try:
-        async with AsyncSession(engine) as session:
-            async with session.begin():
-                await set_user_context(session, user.keycloak_username)
-
-                current_user_var.set(user)
-
-                fuel_code_repo = FuelCodeRepository(session)
-                compliance_report_repo = ComplianceReportRepository(session)
-                aa_repo = AllocationAgreementRepository(
-                    db=session, fuel_repo=fuel_code_repo
-                )
-
-                aa_service = AllocationAgreementServices(
-                    repo=aa_repo,
-                    fuel_repo=fuel_code_repo,
-                    fuel_supply_service=FuelSupplyServices(
-                        repo=FuelSupplyRepository(session),
-                        fuel_repo=fuel_code_repo,
-                        compliance_report_repo=compliance_report_repo,
-                    ),
-                    compliance_report_repo=compliance_report_repo,
-                )
-
-                redis_client = Redis(
-                    host=settings.redis_host,
-                    port=settings.redis_port,
-                    password=settings.redis_pass,
-                    db=settings.redis_base or 0,
-                    decode_responses=True,
-                    max_connections=10,
-                    socket_timeout=5,
-                    socket_connect_timeout=5,
-                )
-                clamav_service = ClamAVService()
-
-                await _update_progress(
-                    redis_client, job_id, 5, "Initializing services..."
-                )
-
-                if overwrite:
-                    await _update_progress(
-                        redis_client, job_id, 10, "Deleting old data..."
-                    )
-                    await aa_service.delete_all(
-                        compliance_report_id, user.keycloak_username
-                    )
-
-                # Optional: Scan the file with ClamAV if enabled
-                if settings.clamav_enabled:
-                    await _update_progress(
-                        redis_client, job_id, 15, "Scanning file with ClamAV..."
-                    )
-                    clamav_service.scan_file(file)
-
-                await _update_progress(
-                    redis_client, job_id, 20, "Loading Excel sheet..."
-                )
-
-                try:
-                    table_options = await aa_repo.get_table_options(
-                        # Use the actual compliance period from DB or a param
-                        (
-                            await compliance_report_repo.get_compliance_report_by_id(
-                                compliance_report_id
-                            )
-                        ).compliance_period.description
-                    )
-
-                    # Build sets for validation
-                    valid_fuel_types = {
-                        obj["fuel_type"] for obj in table_options.get("fuel_types", [])
-                    }
-                    valid_fuel_categories = {
-                        obj.category for obj in table_options.get("fuel_categories", [])
-                    }
-                    valid_provisions = {
-                        obj.name
-                        for obj in table_options.get("provisions_of_the_act", [])
-                    }
-
-                    sheet = _load_sheet(file)
-                    row_count = sheet.max_row
-
-                    created = 0
-                    rejected = 0
-                    errors = []
-
-                    await _update_progress(
-                        redis_client,
-                        job_id,
-                        20,
-                        "Beginning data import...",
-                        created=created,
-                        rejected=rejected,
-                        errors=errors,
-                    )
-
-                    # Iterate through data rows, skipping the header.
-                    for row_idx, row in enumerate(
-                        sheet.iter_rows(min_row=2, values_only=True), start=2
-                    ):
-                        # Only update progress in Redis every 10 rows for efficiency
-                        if (row_idx + 1) % 10 == 0:
-                            current_progress = 20 + ((row_idx / row_count) * 80)
-                            status_msg = (
-                                f"Importing row {row_idx - 1} of {row_count - 1}..."
-                            )
-                            await _update_progress(
-                                redis_client,
-                                job_id,
-                                current_progress,
-                                status_msg,
-                                created=created,
-                                rejected=rejected,
-                                errors=errors,
-                            )
-
-                        # Check if the entire row is empty
-                        if all(cell is None for cell in row):
-                            continue
-
-                        # Validate row
-                        error = _validate_row(
-                            row,
-                            row_idx,
-                            valid_fuel_types,
-                            valid_fuel_categories,
-                            valid_provisions,
-                        )
-                        if error:
-                            errors.append(error)
-                            rejected += 1
-                            continue
-
-                        # Parse row data and insert into DB
-                        try:
-                            aa_data = _parse_row(row, compliance_report_id)
-                            await aa_service.create_allocation_agreement(aa_data)
-                            created += 1
-                        except Exception as ex:
-                            logger.error(str(ex))
-                            errors.append(f"Row {row_idx}: {ex}")
-                            rejected += 1
-
-                    # Final update at 100%
-                    await _update_progress(
-                        redis_client,
-                        job_id,
-                        100,
-                        "Import process completed.",
-                        created=created,
-                        rejected=rejected,
-                        errors=errors,
-                    )
-                    logger.debug(
-                        f"Completed importing Allocation Agreement data, {created} rows created"
-                    )
-                    return {
-                        "success": True,
-                        "created": created,
-                        "errors": errors,
-                        "rejected": rejected,
-                    }
-
-                except DataNotFoundException as dnfe:
-                    await _update_progress(
-                        redis_client, job_id, 100, "Data not found error.", 0, 0
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND, detail=str(dnfe)
-                    )
-                except Exception as e:
-                    await _update_progress(
-                        redis_client, job_id, 100, "Import process failed.", 0, 0
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Could not import allocation agreement data: {str(e)}",
-                    )
-    finally:
-        await engine.dispose()
-
-
-def _load_sheet(file: UploadFile) -> Worksheet:
+
+class AllocationAgreementImportJob(SpreadsheetImportJob):
+    sheet_name = "Allocation Agreements"
+    columns = (
+        ImportColumn("Responsibility"),
+        ImportColumn("Legal name of transaction partner"),
+        ImportColumn("Address for service"),
+        ImportColumn("Email"),
+        ImportColumn("Phone"),
+        ImportColumn("Fuel type"),
+        ImportColumn("Fuel type other"),
+        ImportColumn("Fuel category"),
+        ImportColumn("Determining Carbon Intensity"),
+        ImportColumn("Fuel code"),
+        ImportColumn("Quantity"),
+    )
+    description = "allocation agreement data"
+
+    def __init__(
+        self,
+        job_id: str,
+        user: UserProfile,
+        file: UploadFile,
+        compliance_report_id: int,
+        overwrite: bool,
+        dry_run: bool = False,
+    ) -> None:
+        super().__init__(job_id, user, file, dry_run)
+        self.compliance_report_id = compliance_report_id
+        self.overwrite = overwrite
+
+    async def prepare(self) -> None:
+        fuel_code_repo = FuelCodeRepository(self.session)
+        compliance_report_repo = ComplianceReportRepository(self.session)
+        aa_repo = AllocationAgreementRepository(
+            db=self.session, fuel_repo=fuel_code_repo
+        )
+        self.aa_service = AllocationAgreementServices(
+            repo=aa_repo,
+            fuel_repo=fuel_code_repo,
+            fuel_supply_service=FuelSupplyServices(
+                repo=FuelSupplyRepository(self.session),
+                fuel_repo=fuel_code_repo,
+                compliance_report_repo=compliance_report_repo,
+            ),
+            compliance_report_repo=compliance_report_repo,
+        )
+
+        if self.overwrite:
+            await self.update_progress(15, "Deleting old data...")
+            await self.aa_service.delete_all(
+                self.compliance_report_id, self.user.keycloak_username
+            )
+
+        compliance_report = await compliance_report_repo.get_compliance_report_by_id(
+            self.compliance_report_id
+        )
+        if not compliance_report:
+            raise DataNotFoundException("Compliance report not found.")
+        table_options = await aa_repo.get_table_options(
+            compliance_report.compliance_period.description
+        )
+
+        # Build sets for validation
+        self.valid_fuel_types = {
+            obj["fuel_type"] for obj in table_options.get("fuel_types", [])
+        }
+        self.valid_fuel_categories = {
+            obj.category for obj in table_options.get("fuel_categories", [])
+        }
+        self.valid_provisions = {
+            obj.name for obj in table_options.get("provisions_of_the_act", [])
+        }
+
+    def row_checker(self):
+        return partial(
+            _check_row,
+            self.valid_fuel_types,
+            self.valid_fuel_categories,
+            self.valid_provisions,
+            self.compliance_report_id,
+        )
+
+    async def write_row(
+        self, row_idx: int, aa_data: AllocationAgreementCreateSchema
+    ) -> bool:
+        await self.aa_service.create_allocation_agreement(aa_data)
+        return True
+
+
+def _check_row(
+    valid_fuel_types: set,
+    valid_fuel_categories: set,
+    valid_provisions: set,
+    compliance_report_id: int,
+    row_idx: int,
+    row: list,
+) -> AllocationAgreementCreateSchema:
     """
-    Loads and returns the 'Allocation Agreement' worksheet from the provided Excel file.
-    Raises an exception if the sheet does not exist.
+    Validates and parses one row. Runs on the process pool.
     """
-    workbook = load_workbook(data_only=True, filename=file.file)
-    sheet_name = "Allocation Agreements"
-    if sheet_name not in workbook.sheetnames:
-        raise Exception(f"Uploaded Excel does not contain a '{sheet_name}' sheet.")
-    return workbook[sheet_name]
+    error = _validate_row(
+        tuple(row),
+        row_idx,
+        valid_fuel_types,
+        valid_fuel_categories,
+        valid_provisions,
+    )
+    if error:
+        raise RowRejected(error)
+    return _parse_row(tuple(row), compliance_report_id)
 
 
 def _validate_row(
@@ -475,13 +377,14 @@ async def _update_progress(
     """
     Persists the job status and progress in Redis.
     """
-    if errors is None:
-        errors = []
-    data = {
-        "progress": progress,
-        "status": status_msg,
-        "created": created,
-        "rejected": rejected,
-        "errors": errors,
-    }
-    await redis_client.set(f"jobs/{job_id}", json.dumps(data), ex=60)
+    await write_job_progress(
+        redis_client,
+        job_id,
+        {
+            "progress": progress,
+            "status": status_msg,
+            "created": created,
+            "rejected": rejected,
+            "errors": errors or [],
+        },
+    )
@@ -243,6 +243,7 @@ async def import_allocation_agreements(
     report_id: int,
     file: UploadFile = File(...),
     overwrite: bool = Form(...),
+    dry_run: bool = Form(False),
     importer: AllocationAgreementImporter = Depends(),
     compliance_report_services: ComplianceReportServices = Depends(),
     aa_repo: AllocationAgreementRepository = Depends(),
@@ -251,6 +252,7 @@ async def import_allocation_agreements(
     """
     Endpoint to import Allocation Agreement data from an uploaded Excel file.
     The Excel must have a sheet named 'Allocation Agreements' with the same columns as in the exporter.
+    With dry_run the file is only validated and nothing is saved.
 
     Columns:
         1. Responsibility
@@ -293,7 +295,7 @@ async def import_allocation_agreements(
 
     # Import data
     job_id = await importer.import_data(
-        compliance_report_id, request.user, file, overwrite
+        compliance_report_id, request.user, file, overwrite, dry_run
     )
     return {"jobId": job_id}
 
@@ -346,3 +348,22 @@ async def get_allocation_agreement_import_status(
     """
     status = await importer.get_status(job_id)
     return status
+
+
+@router.get(
+    "/status/{job_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+@view_handler(
+    [RoleEnum.COMPLIANCE_REPORTING, RoleEnum.SIGNING_AUTHORITY, RoleEnum.GOVERNMENT]
+)
+async def stream_allocation_agreement_import_status(
+    request: Request,
+    job_id: str,
+    importer: AllocationAgreementImporter = Depends(),
+):
+    """
+    Stream the progress of an Allocation Agreement import job as Server-Sent Events
+    """
+    return importer.stream_status(job_id, request.headers.get("last-event-id"))
@@ -0,0 +1,5 @@
+"""API for jobs in the background job queue."""
+
+from lcfs.web.api.background_job.views import router
+
+__all__ = ["router"]
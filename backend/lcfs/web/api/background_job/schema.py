@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import List, Optional
+
+from lcfs.db.models.tasks import BackgroundJobStatusEnum
+from lcfs.web.api.base import BaseSchema
+
+
+class BackgroundJobStatusSchema(BaseSchema):
+    job_id: str
+    job_type: str
+    state: BackgroundJobStatusEnum
+    attempts: int
+    max_attempts: int
+    queued_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    result: Optional[dict] = None
+    # Latest progress the job reported, while it is still kept
+    progress: float = 0
+    status: Optional[str] = None
+    errors: List[str] = []
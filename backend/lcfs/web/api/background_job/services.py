@@ -0,0 +1,78 @@
+import json
+
+from fastapi import Depends
+from redis.asyncio import Redis
+
+from lcfs.db.models import UserProfile
+from lcfs.services.job_queue.queue import JobQueue
+from lcfs.services.redis.dependency import get_redis_client
+from lcfs.services.redis.job_progress import read_job_progress
+from lcfs.services.s3.exports import ExportArtifactStorage
+from lcfs.web.api.background_job.schema import BackgroundJobStatusSchema
+from lcfs.web.core.decorators import service_handler
+from lcfs.web.exception.exceptions import DataNotFoundException
+
+
+class BackgroundJobService:
+    def __init__(
+        self,
+        queue: JobQueue = Depends(),
+        redis_client: Redis = Depends(get_redis_client),
+        storage: ExportArtifactStorage = Depends(),
+    ) -> None:
+        self.queue = queue
+        self.redis_client = redis_client
+        self.storage = storage
+
+    @service_handler
+    async def get_job(
+        self, job_id: str, user: UserProfile
+    ) -> BackgroundJobStatusSchema:
+        """
+        Returns the job's place in the queue with the latest progress it
+        reported. Jobs are only visible to the user who requested them.
+        """
+        job = await self._get_job(job_id, user)
+
+        try:
+            progress = await read_job_progress(self.redis_client, job_id) or {}
+        except json.JSONDecodeError:
+            progress = {}
+
+        return BackgroundJobStatusSchema(
+            job_id=job.job_id,
+            job_type=job.job_type,
+            state=job.status,
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+            queued_at=job.create_date,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            last_error=job.last_error,
+            result=job.result,
+            progress=progress.get("progress", 0),
+            status=progress.get("status"),
+            errors=progress.get("errors", []),
+        )
+
+    @service_handler
+    async def get_report(self, job_id: str, user: UserProfile):
+        """
+        Returns the stored S3 object and metadata of the error report a
+        finished dry-run import produced.
+        """
+        job = await self._get_job(job_id, user)
+        report_key = (job.result or {}).get("report_key")
+        metadata = await self.storage.get_metadata(report_key) if report_key else None
+        if not metadata:
+            raise DataNotFoundException("Job has no error report.")
+
+        file = await self.storage.get_object(report_key)
+        return file, metadata
+
+    async def _get_job(self, job_id: str, user: UserProfile):
+        job = await self.queue.get(job_id)
+        # Jobs are only visible to the user who requested them
+        if job is None or job.user_profile_id != user.user_profile_id:
+            raise DataNotFoundException("Job not found.")
+        return job
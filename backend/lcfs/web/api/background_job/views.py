@@ -0,0 +1,52 @@
+import structlog
+from fastapi import APIRouter, Depends, Request, status
+from starlette.responses import StreamingResponse
+
+from lcfs.web.api.background_job.schema import BackgroundJobStatusSchema
+from lcfs.web.api.background_job.services import BackgroundJobService
+from lcfs.web.core.decorators import view_handler
+
+router = APIRouter()
+logger = structlog.get_logger(__name__)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=BackgroundJobStatusSchema,
+    status_code=status.HTTP_200_OK,
+)
+@view_handler(["*"])
+async def get_background_job(
+    request: Request,
+    job_id: str,
+    service: BackgroundJobService = Depends(),
+) -> BackgroundJobStatusSchema:
+    """
+    Get a queued import or export job's state, attempts and latest progress
+    """
+    return await service.get_job(job_id, request.user)
+
+
+@router.get(
+    "/{job_id}/report",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+@view_handler(["*"])
+async def download_background_job_report(
+    request: Request,
+    job_id: str,
+    service: BackgroundJobService = Depends(),
+):
+    """
+    Download the error workbook of a finished dry-run import
+    """
+    file, metadata = await service.get_report(job_id, request.user)
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{metadata["file_name"]}"',
+        "content-length": str(file["ContentLength"]),
+    }
+    return StreamingResponse(
+        content=file["Body"], media_type=metadata["media_type"], headers=headers
+    )
@@ -45,7 +45,7 @@ class ChargingEquipmentServices:
             self.notification_service, "create_notification_messages_for_organization"
         ):
             self.notification_service = NotificationService(
-                repo=NotificationRepository(db=self.db)
+                repo=NotificationRepository(db=self.db, redis_client=None)
             )
 
     async def _create_notification(
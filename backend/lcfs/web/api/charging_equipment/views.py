@@ -465,9 +465,11 @@ async def import_charging_equipment(
     file: UploadFile = File(...),
     importer: ChargingEquipmentImporter = Depends(),
     overwrite: bool = Form(...),
+    dry_run: bool = Form(False),
 ):
     """
     Import charging equipment from an uploaded Excel file.
+    With dry_run the file is only validated and nothing is saved.
     """
     try:
         org_id = int(organization_id)
@@ -488,6 +490,7 @@ async def import_charging_equipment(
         organization.organization_code,
         file,
         overwrite,
+        dry_run,
     )
     return JSONResponse(content={"jobId": job_id})
 
@@ -509,3 +512,21 @@ async def get_import_job_status(
     """
     status_result = await importer.get_status(job_id)
     return JSONResponse(content=status_result)
+
+
+@router.get(
+    "/status/{job_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    name="stream_charging_equipment_import_job_status",
+)
+@view_handler([RoleEnum.SUPPLIER, RoleEnum.GOVERNMENT])
+async def stream_import_job_status(
+    request: Request,
+    job_id: str,
+    importer: ChargingEquipmentImporter = Depends(),
+):
+    """
+    Stream the progress of a charging equipment import job as Server-Sent Events.
+    """
+    return importer.stream_status(job_id, request.headers.get("last-event-id"))
@@ -1,52 +1,48 @@
-import asyncio
-import concurrent.futures
-import io
-import json
 import re
 import structlog
-import uuid
-from fastapi import Depends, HTTPException, status, UploadFile
-from openpyxl import load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
+from fastapi import Depends, UploadFile
+from fastapi.responses import StreamingResponse
 from redis.asyncio import Redis
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from typing import List
+from typing import List, Optional
 
-from lcfs.db.dependencies import db_url, set_user_context
 from lcfs.db.models import UserProfile
-from lcfs.services.clamav.client import ClamAVService
-from lcfs.services.redis.dependency import get_redis_client
-from lcfs.settings import settings
-from lcfs.utils.constants import (
-    POSTAL_REGEX,
-    ALLOWED_MIME_TYPES,
-    ALLOWED_FILE_TYPES,
-    MAX_FILE_SIZE_BYTES,
-    MAX_FILE_SIZE_MB,
+from lcfs.services.geocoder.spatial_index import get_bc_spatial_index
+from lcfs.services.imports.job import ImportColumn, SpreadsheetImportJob
+from lcfs.services.imports.runtime import (
+    IMPORT_JOB_ATTEMPTS,
+    import_file,
+    import_result,
+    queue_import,
+    read_job_status,
+    write_job_progress,
 )
+from lcfs.services.job_queue.queue import JobQueue, QueuedJob
+from lcfs.services.job_queue.registry import register_job
+from lcfs.services.redis.dependency import get_redis_client
+from lcfs.services.redis.job_progress import job_progress_response
+from lcfs.utils.constants import POSTAL_REGEX
 from lcfs.web.api.charging_site.repo import ChargingSiteRepository
 from lcfs.web.api.charging_site.schema import ChargingSiteCreateSchema
 from lcfs.web.api.charging_site.services import ChargingSiteService
 from lcfs.web.core.decorators import service_handler
-from lcfs.web.exception.exceptions import DataNotFoundException
 
 logger = structlog.get_logger(__name__)
 
+IMPORT_JOB_TYPE = "import.charging_site"
+
 
 class ChargingSiteImporter:
     def __init__(
         self,
         repo: ChargingSiteRepository = Depends(),
         cs_service: ChargingSiteService = Depends(),
-        clamav_service: ClamAVService = Depends(),
         redis_client: Redis = Depends(get_redis_client),
-        executor: concurrent.futures.ThreadPoolExecutor = Depends(),
+        queue: JobQueue = Depends(),
     ) -> None:
         self.repo = repo
         self.cs_service = cs_service
-        self.clamav_service = clamav_service
         self.redis_client = redis_client
-        self.executor = executor
+        self.queue = queue
 
     @service_handler
     async def import_data(
@@ -57,81 +53,62 @@ class ChargingSiteImporter:
         file: UploadFile,
         overwrite: bool = False,
         organization_name: str = "",
+        dry_run: bool = False,
     ) -> str:
         """
-        Initiates the import job in a separate thread executor.
+        Queues the import job for the job workers, or with ``dry_run`` a job
+        that only validates the file.
         Returns a job_id that can be used to track progress via get_status.
         """
-        job_id = str(uuid.uuid4())
-
-        # Initialize job status in Redis
-        await _update_progress(
-            self.redis_client, job_id, 0, "Starting import job...", 0, 0, []
+        job_id, created = await queue_import(
+            self.queue,
+            IMPORT_JOB_TYPE,
+            user,
+            file,
+            {
+                "organization_id": organization_id,
+                "org_code": org_code,
+                "overwrite": overwrite,
+                "organization_name": organization_name,
+                "dry_run": dry_run,
+            },
+            organization_id=organization_id,
         )
-
-        # Read file into memory once to enable scanning and openpyxl parsing
-        file_contents = await file.read()
-
-        # Validate MIME type
-        if file.content_type not in ALLOWED_MIME_TYPES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type '{file.content_type or 'unknown'}' is not allowed. Please upload files of the following types: {ALLOWED_FILE_TYPES}",
-            )
-
-        # Validate file size
-        file_size = len(file_contents)
-        if file_size > MAX_FILE_SIZE_BYTES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds the maximum limit of {MAX_FILE_SIZE_MB} MB.",
+        if created:
+            await _update_progress(
+                self.redis_client, job_id, 0, "Starting import job...", 0, 0, []
             )
 
-        # Create an in-memory buffer and attach it to a new UploadFile
-        buffer = io.BytesIO(file_contents)
-        buffer.seek(0)
-        copied_file = UploadFile(filename=file.filename, file=buffer)
-
-        # Start the import task without blocking
-        asyncio.create_task(
-            import_async(
-                organization_id,
-                user,
-                org_code,
-                copied_file,
-                job_id,
-                overwrite,
-                organization_name,
-            )
-        )
-
         return job_id
 
     async def get_status(self, job_id: str) -> dict:
         """
         Retrieves and returns the job's progress and status from Redis.
         """
-        logger.debug(f"Getting status for job_id: {job_id}")
-        progress_data_str = await self.redis_client.get(f"jobs/{job_id}")
-        logger.debug(f"Redis data for job {job_id}: {progress_data_str}")
-
-        if not progress_data_str:
-            logger.warning(f"No job found with ID: {job_id}")
-            return {"progress": 0, "status": "No job found with this ID."}
-
-        try:
-            progress_data = json.loads(progress_data_str)
-            logger.debug(f"Parsed progress data: {progress_data}")
-            return {
-                "progress": progress_data.get("progress", 0),
-                "status": progress_data.get("status", "No status available."),
-                "created": progress_data.get("created", 0),
-                "rejected": progress_data.get("rejected", 0),
-                "errors": progress_data.get("errors", []),
-            }
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error for job {job_id}: {e}")
-            return {"progress": 0, "status": "Invalid status data found."}
+        return await read_job_status(self.redis_client, job_id)
+
+    def stream_status(
+        self, job_id: str, last_event_id: Optional[str] = None
+    ) -> StreamingResponse:
+        """
+        Streams the job's progress as Server-Sent Events until it finishes.
+        """
+        return job_progress_response(self.redis_client, job_id, last_event_id)
+
+
+@register_job(IMPORT_JOB_TYPE, max_attempts=IMPORT_JOB_ATTEMPTS, per_organization=1)
+async def run_import_job(job: QueuedJob) -> dict:
+    result = await import_async(
+        job.payload["organization_id"],
+        job.user,
+        job.payload["org_code"],
+        import_file(job),
+        job.job_id,
+        job.payload["overwrite"],
+        job.payload["organization_name"],
+        job.payload.get("dry_run", False),
+    )
+    return import_result(result)
 
 
 async def import_async(
@@ -142,188 +119,68 @@ async def import_async(
     job_id: str,
     overwrite: bool = False,
     organization_name: str = "",
+    dry_run: bool = False,
 ):
     """
-    Performs the actual import in an async context.
+    Performs the actual charging site import on a job worker.
     """
-    logger.debug(f"Starting import_async for job_id: {job_id}")
+    job = ChargingSiteImportJob(
+        job_id, user, file, organization_id, organization_name, dry_run
+    )
+    return await job.run()
+
+
+class ChargingSiteImportJob(SpreadsheetImportJob):
+    sheet_name = "ChargingSites"
+    columns = (
+        ImportColumn("Site Name"),
+        ImportColumn("Street Address"),
+        ImportColumn("City"),
+        ImportColumn("Postal Code"),
+        ImportColumn("Latitude"),
+        ImportColumn("Longitude"),
+        ImportColumn("Allocating Organization"),
+        ImportColumn("Notes"),
+    )
+    # The template has no data after the first blank row
+    stop_at_blank_row = True
+    description = "charging site data"
 
-    engine = create_async_engine(db_url, future=True)
-    try:
-        async with AsyncSession(engine) as session:
-            async with session.begin():
-                await set_user_context(session, user.keycloak_username)
-
-                cs_repo = ChargingSiteRepository(session)
-                cs_service = ChargingSiteService(repo=cs_repo)
-                clamav_service = ClamAVService()
-                # Use a new Redis client for this async context
-                redis_client = Redis(
-                    host=settings.redis_host,
-                    port=settings.redis_port,
-                    password=settings.redis_pass,
-                    db=settings.redis_base or 0,
-                    decode_responses=True,
-                )
-
-                logger.debug(f"About to update progress for job {job_id}")
-                await _update_progress(
-                    redis_client, job_id, 5, "Initializing services..."
-                )
-                logger.debug(f"Progress updated for job {job_id}")
-
-                # Optional: Scan the file with ClamAV if enabled
-                if settings.clamav_enabled:
-                    await _update_progress(
-                        redis_client, job_id, 15, "Scanning file with ClamAV..."
-                    )
-                    clamav_service.scan_file(file)
-
-                await _update_progress(
-                    redis_client, job_id, 20, "Loading Excel sheet..."
-                )
-
-                try:
-                    sheet = _load_sheet(file)
-                    row_count = sheet.max_row
-
-                    created = 0
-                    rejected = 0
-                    errors = []
-
-                    await _update_progress(
-                        redis_client,
-                        job_id,
-                        20,
-                        "Beginning data import...",
-                        created=created,
-                        rejected=rejected,
-                        errors=errors,
-                    )
-
-                    # Get valid organizations for allocating_organization field
-                    valid_allocating_orgs = (
-                        await cs_repo.get_allocation_agreement_organizations(
-                            organization_id
-                        )
-                    )
-                    valid_org_names = {org.name for org in valid_allocating_orgs}
-                    # Create map from organization name to ID for efficient lookup
-                    allocating_org_map = {
-                        org.name: org.organization_id for org in valid_allocating_orgs
-                    }
-
-                    # Iterate through all data rows, skipping the header
-                    for row_idx, row in enumerate(
-                        sheet.iter_rows(min_row=2, values_only=True), start=2
-                    ):
-                        # Only update progress in Redis every 10 rows for efficiency
-                        if (row_idx + 1) % 10 == 0:
-                            current_progress = 20 + ((row_idx / row_count) * 80)
-                            status_msg = (
-                                f"Importing row {row_idx - 1} of {row_count - 1}..."
-                            )
-                            await _update_progress(
-                                redis_client,
-                                job_id,
-                                current_progress,
-                                status_msg,
-                                created=created,
-                                rejected=rejected,
-                                errors=errors,
-                            )
-
-                        # Check if all columns are None
-                        if all(col is None for col in row):
-                            break  # End of data
-
-                        row = list(row)
-                        # row[8] is now allocating_organization_name (optional string)
-
-                        # Validate row
-                        error = _validate_row(
-                            row, row_idx, valid_org_names, organization_name
-                        )
-                        if error:
-                            errors.append(error)
-                            rejected += 1
-                            continue
-
-                        # Parse row data and insert into DB
-                        try:
-                            cs_data = _parse_row(
-                                row, organization_id, allocating_org_map
-                            )
-                            await cs_service.create_charging_site(
-                                cs_data, organization_id
-                            )
-                            created += 1
-                        except HTTPException as http_ex:
-                            logger.warning(
-                                "Charging site import validation failed",
-                                error=str(http_ex.detail),
-                            )
-                            errors.append(f"Row {row_idx}: {http_ex.detail}")
-                            rejected += 1
-                        except Exception as ex:
-                            logger.error(str(ex))
-                            errors.append(f"Row {row_idx}: {ex}")
-                            rejected += 1
-
-                    # Final update at 100%
-                    await _update_progress(
-                        redis_client,
-                        job_id,
-                        100,
-                        "Import process completed.",
-                        created=created,
-                        rejected=rejected,
-                        errors=errors,
-                    )
-                    logger.debug(
-                        f"Completed importing charging site data, {created} rows created"
-                    )
-
-                    return {
-                        "success": True,
-                        "created": created,
-                        "errors": errors,
-                        "rejected": rejected,
-                    }
-                except DataNotFoundException as dnfe:
-                    await _update_progress(
-                        redis_client, job_id, 100, "Data not found error.", 0, 0
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND, detail=str(dnfe)
-                    )
-                except Exception as e:
-                    await _update_progress(
-                        redis_client, job_id, 100, "Import process failed.", 0, 0
-                    )
-                    # Don't raise from background task; record failure and return
-                    logger.error(f"Charging site import failed: {e}")
-                    return {
-                        "success": False,
-                        "created": 0,
-                        "errors": [str(e)],
-                        "rejected": 0,
-                    }
-                finally:
-                    await redis_client.close()
-    finally:
-        await engine.dispose()
-
-
-def _load_sheet(file: UploadFile) -> Worksheet:
-    """
-    Loads and returns the 'ChargingSites' worksheet from the provided Excel file.
-    Raises an exception if the sheet does not exist.
-    """
-    workbook = load_workbook(data_only=True, filename=file.file)
-    if "ChargingSites" not in workbook.sheetnames:
-        raise Exception("Uploaded Excel does not contain a 'ChargingSites' sheet.")
-    return workbook["ChargingSites"]
+    def __init__(
+        self,
+        job_id: str,
+        user: UserProfile,
+        file: UploadFile,
+        organization_id: int,
+        organization_name: str = "",
+        dry_run: bool = False,
+    ) -> None:
+        super().__init__(job_id, user, file, dry_run)
+        self.organization_id = organization_id
+        self.organization_name = organization_name
+
+    async def prepare(self) -> None:
+        cs_repo = ChargingSiteRepository(self.session)
+        self.cs_service = ChargingSiteService(repo=cs_repo)
+
+        # Valid organizations for the allocating_organization field
+        valid_allocating_orgs = await cs_repo.get_allocation_agreement_organizations(
+            self.organization_id
+        )
+        self.valid_org_names = {org.name for org in valid_allocating_orgs}
+        self.allocating_org_map = {
+            org.name: org.organization_id for org in valid_allocating_orgs
+        }
+
+    def validate_row(self, row_idx: int, row: list) -> str | None:
+        return _validate_row(row, row_idx, self.valid_org_names, self.organization_name)
+
+    def parse_row(self, row_idx: int, row: list) -> ChargingSiteCreateSchema:
+        return _parse_row(row, self.organization_id, self.allocating_org_map)
+
+    async def write_row(self, row_idx: int, cs_data: ChargingSiteCreateSchema) -> bool:
+        await self.cs_service.create_charging_site(cs_data, self.organization_id)
+        return True
 
 
 def _validate_row(
@@ -394,6 +251,11 @@ def _validate_row(
     except (ValueError, TypeError):
         return f"Row {row_idx}: Invalid longitude value '{longitude}'. Must be a valid number"
 
+    # Check the location against the bundled BC boundary, without the geocoder
+    location_error = get_bc_spatial_index().site_location_error(postal_code, lat, lng)
+    if location_error:
+        return f"Row {row_idx}: {location_error}"
+
     # Validate that the allocating organization is not the user's own organization
     if (
         allocating_org_name
@@ -474,20 +336,14 @@ async def _update_progress(
     """
     Persists the job status and progress in Redis.
     """
-    if errors is None:
-        errors = []
     data = {
         "progress": progress,
         "status": status_msg,
         "created": created,
         "rejected": rejected,
-        "errors": errors,
+        "errors": errors or [],
     }
-    logger.debug(f"Updating progress for job {job_id}: {data}")
     try:
-        result = await redis_client.set(
-            f"jobs/{job_id}", json.dumps(data), ex=300
-        )  # 5 minutes
-        logger.debug(f"Redis set result for job {job_id}: {result}")
+        await write_job_progress(redis_client, job_id, data)
     except Exception as e:
         logger.error(f"Failed to update progress for job {job_id}: {e}")
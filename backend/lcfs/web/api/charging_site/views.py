@@ -408,9 +408,11 @@ async def import_charging_sites(
     importer: ChargingSiteImporter = Depends(),
     overwrite: bool = Form(...),
     site_ids: str = Form(None),
+    dry_run: bool = Form(False),
 ):
     """
     Endpoint to import Charging Site data from an uploaded Excel file.
+    With dry_run the file is only validated and nothing is saved.
     """
     org_id = request.user.organization_id
     organization = request.user.organization
@@ -422,6 +424,7 @@ async def import_charging_sites(
         file,
         overwrite,
         organization_name=organization.name or "",
+        dry_run=dry_run,
     )
     return JSONResponse(content={"jobId": job_id})
 
@@ -481,3 +484,23 @@ async def get_import_job_status(
     """
     status_result = await importer.get_status(job_id)
     return JSONResponse(content=status_result)
+
+
+@router.get(
+    "/status/{job_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    name="stream_import_job_status",
+)
+@view_handler(
+    [RoleEnum.COMPLIANCE_REPORTING, RoleEnum.SIGNING_AUTHORITY, RoleEnum.GOVERNMENT]
+)
+async def stream_import_job_status(
+    request: Request,
+    job_id: str,
+    importer: ChargingSiteImporter = Depends(),
+):
+    """
+    Endpoint to stream the progress of a charging site import job as Server-Sent Events
+    """
+    return importer.stream_status(job_id, request.headers.get("last-event-id"))
@@ -1,8 +1,15 @@
+import asyncio
 import io
+import weakref
+from typing import Dict, List, Optional
+
 from fastapi import Depends
-from openpyxl import Workbook
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from starlette.responses import StreamingResponse
 
+from lcfs.db.dependencies import get_db_session_factory
+from lcfs.services.rendering.pool import run_in_render_pool
+from lcfs.settings import settings
 from lcfs.utils.constants import FILE_MEDIA_TYPE
 from lcfs.db.models.compliance.ComplianceReport import ReportingFrequency
 from lcfs.web.api.allocation_agreement.repo import AllocationAgreementRepository
@@ -17,23 +24,49 @@ from lcfs.web.api.compliance_report.schema import (
 )
 from lcfs.web.api.compliance_report.sheet_exporters import (
     AllocationAgreementSheetExporter,
+    ExportSheet,
     FSESheetExporter,
     FuelExportSheetExporter,
     FuelSupplySheetExporter,
     NotionalTransferSheetExporter,
     OtherUsesSheetExporter,
-    SummarySheetExporter,
+    ReportRef,
+    SheetExporter,
+    render_compliance_report_workbook,
+)
+from lcfs.web.api.compliance_report.summary_repo import (
+    ComplianceReportSummaryRepository,
 )
 from lcfs.web.api.compliance_report.summary_service import (
+    ComplianceDataService,
     ComplianceReportSummaryService,
 )
 from lcfs.web.api.final_supply_equipment.repo import FinalSupplyEquipmentRepository
+from lcfs.web.api.fuel_code.repo import FuelCodeRepository
 from lcfs.web.api.fuel_export.repo import FuelExportRepository
 from lcfs.web.api.fuel_supply.repo import FuelSupplyRepository
 from lcfs.web.api.notional_transfer.repo import NotionalTransferRepository
+from lcfs.web.api.notional_transfer.services import NotionalTransferServices
 from lcfs.web.api.other_uses.repo import OtherUsesRepository
+from lcfs.web.api.transaction.repo import TransactionRepository
 from lcfs.web.core.decorators import service_handler
 
+# The engine does not pool connections, so every sheet session opens its own.
+# Semaphores belong to one event loop, so the API loop and the job worker's
+# loop each get one.
+_sheet_sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _sheet_session_limit() -> asyncio.Semaphore:
+    """Caps the sheet sessions open at once across this loop's exports."""
+    loop = asyncio.get_running_loop()
+    limit = _sheet_sessions.get(loop)
+    if limit is None:
+        limit = _sheet_sessions[loop] = asyncio.Semaphore(
+            settings.export_sheet_sessions
+        )
+    return limit
+
 
 class ComplianceReportExporter:
     def __init__(
@@ -50,6 +83,7 @@ class ComplianceReportExporter:
         summary_service: ComplianceReportSummaryService = Depends(
             ComplianceReportSummaryService
         ),
+        session_factory: Optional[async_sessionmaker] = Depends(get_db_session_factory),
     ) -> None:
         self.summary_service = summary_service
         self.aa_repo = aa_repo
@@ -59,34 +93,18 @@ class ComplianceReportExporter:
         self.fs_repo = fs_repo
         self.cr_repo = cr_repo
         self.fse_repo = fse_repo
+        self.session_factory = session_factory
 
-        self.summary_exporter = SummarySheetExporter()
-        self.sheet_exporters_by_name = {
-            FUEL_SUPPLY_SHEET: FuelSupplySheetExporter(
-                fs_repo=self.fs_repo,
-                cr_repo=self.cr_repo,
-                summary_service=self.summary_service,
-            ),
-            NOTIONAL_TRANSFER_SHEET: NotionalTransferSheetExporter(
-                nt_repo=self.nt_repo
-            ),
-            OTHER_USES_SHEET: OtherUsesSheetExporter(
-                ou_repo=self.ou_repo,
-                cr_repo=self.cr_repo,
-            ),
-            EXPORT_FUEL_SHEET: FuelExportSheetExporter(
-                ef_repo=self.ef_repo,
-                cr_repo=self.cr_repo,
-                summary_service=self.summary_service,
-            ),
-            ALLOCATION_AGREEMENTS_SHEET: AllocationAgreementSheetExporter(
-                aa_repo=self.aa_repo
-            ),
-            FSE_EXPORT_SHEET: FSESheetExporter(
-                fse_repo=self.fse_repo,
-                cr_repo=self.cr_repo,
-            ),
-        }
+        self.sheet_exporters_by_name = self._build_sheet_exporters(
+            fse_repo=self.fse_repo,
+            fs_repo=self.fs_repo,
+            cr_repo=self.cr_repo,
+            nt_repo=self.nt_repo,
+            ou_repo=self.ou_repo,
+            ef_repo=self.ef_repo,
+            aa_repo=self.aa_repo,
+            summary_service=self.summary_service,
+        )
         self.sheet_exporters = list(self.sheet_exporters_by_name.values())
 
         self.data_loaders = {
@@ -106,49 +124,113 @@ class ComplianceReportExporter:
             for sheet_name, exporter in self.sheet_exporters_by_name.items()
         }
 
+    @staticmethod
+    def _build_sheet_exporters(
+        fse_repo: FinalSupplyEquipmentRepository,
+        fs_repo: FuelSupplyRepository,
+        cr_repo: ComplianceReportRepository,
+        nt_repo: NotionalTransferRepository,
+        ou_repo: OtherUsesRepository,
+        ef_repo: FuelExportRepository,
+        aa_repo: AllocationAgreementRepository,
+        summary_service: ComplianceReportSummaryService,
+    ) -> Dict[str, SheetExporter]:
+        return {
+            FUEL_SUPPLY_SHEET: FuelSupplySheetExporter(
+                fs_repo=fs_repo,
+                cr_repo=cr_repo,
+                summary_service=summary_service,
+            ),
+            NOTIONAL_TRANSFER_SHEET: NotionalTransferSheetExporter(nt_repo=nt_repo),
+            OTHER_USES_SHEET: OtherUsesSheetExporter(
+                ou_repo=ou_repo,
+                cr_repo=cr_repo,
+            ),
+            EXPORT_FUEL_SHEET: FuelExportSheetExporter(
+                ef_repo=ef_repo,
+                cr_repo=cr_repo,
+                summary_service=summary_service,
+            ),
+            ALLOCATION_AGREEMENTS_SHEET: AllocationAgreementSheetExporter(
+                aa_repo=aa_repo
+            ),
+            FSE_EXPORT_SHEET: FSESheetExporter(
+                fse_repo=fse_repo,
+                cr_repo=cr_repo,
+            ),
+        }
+
+    @classmethod
+    def for_session(
+        cls,
+        session: AsyncSession,
+        session_factory: Optional[async_sessionmaker] = None,
+    ) -> "ComplianceReportExporter":
+        """Build an exporter whose repositories all use the given session."""
+        fuel_code_repo = FuelCodeRepository(session)
+        fs_repo = FuelSupplyRepository(session)
+        ef_repo = FuelExportRepository(session)
+        cr_repo = ComplianceReportRepository(db=session, fuel_supply_repo=fs_repo)
+        nt_repo = NotionalTransferRepository(db=session, fuel_repo=fuel_code_repo)
+        ou_repo = OtherUsesRepository(db=session, fuel_code_repo=fuel_code_repo)
+        aa_repo = AllocationAgreementRepository(db=session, fuel_repo=fuel_code_repo)
+        summary_service = ComplianceReportSummaryService(
+            repo=ComplianceReportSummaryRepository(session),
+            cr_repo=cr_repo,
+            trxn_repo=TransactionRepository(session),
+            notional_transfer_service=NotionalTransferServices(
+                repo=nt_repo,
+                fuel_repo=fuel_code_repo,
+                compliance_report_repo=cr_repo,
+            ),
+            fuel_supply_repo=fs_repo,
+            fuel_export_repo=ef_repo,
+            allocation_agreement_repo=aa_repo,
+            other_uses_repo=ou_repo,
+            compliance_data_service=ComplianceDataService(),
+        )
+        return cls(
+            fse_repo=FinalSupplyEquipmentRepository(session),
+            fs_repo=fs_repo,
+            cr_repo=cr_repo,
+            nt_repo=nt_repo,
+            ou_repo=ou_repo,
+            ef_repo=ef_repo,
+            aa_repo=aa_repo,
+            summary_service=summary_service,
+            session_factory=session_factory,
+        )
+
+    @classmethod
+    def _build_sheet_exporters_for_session(
+        cls, session: AsyncSession
+    ) -> Dict[str, SheetExporter]:
+        """Sheet exporters whose repositories all use the given session."""
+        return cls.for_session(session).sheet_exporters_by_name
+
     @service_handler
     async def export(
         self, compliance_report_id: int, is_government: bool = True
     ) -> StreamingResponse:
-        wb = Workbook()
-        default_sheet = wb.active
-
         # Get report data
         report = await self.cr_repo.get_compliance_report_by_id(
             report_id=compliance_report_id
         )
         is_quarterly = report.reporting_frequency == ReportingFrequency.QUARTERLY
 
-        # Recalculate summary to ensure latest data and add summary sheet
+        # Recalculate summary to ensure latest data for the summary sheet
         summary_schema = await self.summary_service.calculate_compliance_report_summary(
             compliance_report_id
         )
-        await self.summary_exporter.export_to_workbook(
-            wb,
-            report,
-            is_government=is_government,
-            summary=summary_schema,
-        )
 
         compliance_year = int(report.compliance_period.description)
+        sheets = await self._load_sheets(report, compliance_year, is_government)
 
-        for exporter in self.sheet_exporters:
-            if not exporter.supports(compliance_year):
-                continue
-            await exporter.export_to_workbook(
-                wb,
-                report,
-                is_government=is_government,
-            )
-
-        # Remove the placeholder worksheet once at least one exporter has added a real sheet.
-        if len(wb.worksheets) > 1 and default_sheet in wb.worksheets:
-            wb.remove(default_sheet)
-
-        # Export to stream
-        stream = io.BytesIO()
-        wb.save(stream)
-        stream.seek(0)
+        # Rendering is CPU bound; keep it off the event loop.
+        content = await run_in_render_pool(
+            render_compliance_report_workbook, summary_schema, sheets
+        )
+        stream = io.BytesIO(content)
 
         # Generate filename - use EIR for early issuance reports, CR for annual reports
         prefix = "EIR" if is_quarterly else "CR"
@@ -159,15 +241,55 @@ class ComplianceReportExporter:
             stream, media_type=FILE_MEDIA_TYPE["XLSX"].value, headers=headers
         )
 
+    async def _load_sheets(
+        self, report, compliance_year: int, is_government: bool
+    ) -> List[ExportSheet]:
+        """
+        Load every supported sheet. With a session factory the sheets load
+        concurrently, each on its own session, up to ``export_sheet_sessions``
+        at once; otherwise they share the request session and load one after
+        another.
+        """
+        exporters = [
+            exporter
+            for exporter in self.sheet_exporters
+            if exporter.supports(compliance_year)
+        ]
+        if self.session_factory is None:
+            sheets = [
+                await exporter.load_sheet(report, is_government=is_government)
+                for exporter in exporters
+            ]
+        else:
+            # The report belongs to the request session, so the other
+            # sessions get its fields rather than the instance
+            report_ref = ReportRef.of(report)
+            sheets = await asyncio.gather(
+                *(
+                    self._load_sheet_in_own_session(
+                        exporter.sheet_name, report_ref, is_government
+                    )
+                    for exporter in exporters
+                )
+            )
+        return [sheet for sheet in sheets if sheet]
+
+    async def _load_sheet_in_own_session(
+        self, sheet_name: str, report: ReportRef, is_government: bool
+    ) -> Optional[ExportSheet]:
+        async with _sheet_session_limit(), self.session_factory() as session:
+            exporter = self._build_sheet_exporters_for_session(session)[sheet_name]
+            return await exporter.load_sheet(report, is_government=is_government)
+
     async def _load_fuel_supply_data(self, uuid, cid, version, is_quarterly):
         return await self.sheet_exporters_by_name[FUEL_SUPPLY_SHEET].load_legacy(
             uuid, cid, version, is_quarterly
         )
 
     async def _load_notional_transfer_data(self, uuid, cid, version, is_quarterly):
-        return await self.sheet_exporters_by_name[
-            NOTIONAL_TRANSFER_SHEET
-        ].load_legacy(uuid, cid, version, is_quarterly)
+        return await self.sheet_exporters_by_name[NOTIONAL_TRANSFER_SHEET].load_legacy(
+            uuid, cid, version, is_quarterly
+        )
 
     async def _load_fuels_for_other_use_data(self, uuid, cid, version, is_quarterly):
         return await self.sheet_exporters_by_name[OTHER_USES_SHEET].load_legacy(
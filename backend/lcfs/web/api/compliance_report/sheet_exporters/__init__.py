@@ -1,21 +1,31 @@
 from .allocation_agreement import AllocationAgreementSheetExporter
-from .base import SheetExporter, SheetExporterSupport, TabularSheetExporter
+from .base import (
+    ExportSheet,
+    ReportRef,
+    SheetExporter,
+    SheetExporterSupport,
+    TabularSheetExporter,
+)
 from .fse import FSESheetExporter
 from .fuel_export import FuelExportSheetExporter
 from .fuel_supply import FuelSupplySheetExporter
 from .notional_transfer import NotionalTransferSheetExporter
 from .other_uses import OtherUsesSheetExporter
 from .summary import SummarySheetExporter
+from .workbook import render_compliance_report_workbook
 
 __all__ = [
     "AllocationAgreementSheetExporter",
+    "ExportSheet",
     "FSESheetExporter",
     "FuelExportSheetExporter",
     "FuelSupplySheetExporter",
     "NotionalTransferSheetExporter",
     "OtherUsesSheetExporter",
+    "ReportRef",
     "SheetExporter",
     "SheetExporterSupport",
     "SummarySheetExporter",
     "TabularSheetExporter",
+    "render_compliance_report_workbook",
 ]
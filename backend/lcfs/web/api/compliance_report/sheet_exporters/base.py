@@ -2,7 +2,7 @@ import decimal
 import re
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, List, Union
+from typing import Any, List, NamedTuple, Optional, Union
 
 from openpyxl.styles import Alignment, Font, Protection
 from openpyxl.utils import get_column_letter
@@ -17,6 +17,35 @@ from lcfs.web.api.compliance_report.schema import (
 )
 
 
+class ExportSheet(NamedTuple):
+    """Loaded, picklable rows for one tabular sheet, ready to render."""
+
+    title: str
+    data: List[List[Any]]
+    locked_columns: Optional[set[int]] = None
+
+
+class ReportRef(NamedTuple):
+    """
+    The report fields sheet loaders read, copied out of the ORM instance so
+    sheets loading on their own sessions never share it.
+    """
+
+    compliance_report_id: int
+    compliance_report_group_uuid: str
+    version: int
+    reporting_frequency: Any
+
+    @classmethod
+    def of(cls, report) -> "ReportRef":
+        return cls(
+            report.compliance_report_id,
+            report.compliance_report_group_uuid,
+            report.version,
+            report.reporting_frequency,
+        )
+
+
 class SheetExporter(ABC):
     sheet_name: str
     min_compliance_year: int | None = None
@@ -210,15 +239,27 @@ class TabularSheetExporter(SheetExporter, SheetExporterSupport, ABC):
         is_government: bool = True,
         summary: ComplianceReportSummarySchema | None = None,
     ) -> None:
-        data = await self.load_data(report, is_government=is_government)
-        if data:
+        sheet = await self.load_sheet(report, is_government=is_government)
+        if sheet:
             self._add_sheet(
                 wb,
-                self.sheet_name,
-                data,
-                locked_columns=self.locked_columns,
+                sheet.title,
+                sheet.data,
+                locked_columns=sheet.locked_columns,
             )
 
+    async def load_sheet(
+        self, report, is_government: bool = True
+    ) -> Optional[ExportSheet]:
+        """
+        Load the sheet rows without touching a workbook, so rendering can
+        happen elsewhere (e.g. in the render pool).
+        """
+        data = await self.load_data(report, is_government=is_government)
+        if not data:
+            return None
+        return ExportSheet(self.sheet_name, data, self.locked_columns)
+
     def get_columns(self, is_quarterly: bool):
         return self.quarterly_columns if is_quarterly else self.annual_columns
 
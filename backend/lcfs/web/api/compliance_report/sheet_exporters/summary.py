@@ -27,7 +27,9 @@ class SummarySheetExporter(SheetExporter, SheetExporterSupport):
     ) -> None:
         if summary is None:
             return
+        self.render(wb, summary)
 
+    def render(self, wb: Workbook, summary: ComplianceReportSummarySchema) -> None:
         ws = wb.create_sheet(title=SUMMARY_SHEET)
         bold = Font(bold=True)
 
@@ -0,0 +1,40 @@
+import io
+from typing import List, Optional
+
+from openpyxl import Workbook
+
+from lcfs.web.api.compliance_report.schema import ComplianceReportSummarySchema
+
+from .base import ExportSheet, SheetExporterSupport
+from .summary import SummarySheetExporter
+
+
+def render_compliance_report_workbook(
+    summary: Optional[ComplianceReportSummarySchema],
+    sheets: List[ExportSheet],
+) -> bytes:
+    """
+    Build the compliance report workbook from already-loaded data.
+
+    Pure and picklable so it can run in the render pool instead of on the
+    event loop.
+    """
+    wb = Workbook()
+    default_sheet = wb.active
+
+    if summary is not None:
+        SummarySheetExporter().render(wb, summary)
+
+    support = SheetExporterSupport()
+    for sheet in sheets:
+        support._add_sheet(
+            wb, sheet.title, sheet.data, locked_columns=sheet.locked_columns
+        )
+
+    # Remove the placeholder worksheet once at least one real sheet was added.
+    if len(wb.worksheets) > 1 and default_sheet in wb.worksheets:
+        wb.remove(default_sheet)
+
+    stream = io.BytesIO()
+    wb.save(stream)
+    return stream.getvalue()
@@ -1,11 +1,12 @@
 import structlog
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 
 from fastapi import Depends
 from sqlalchemy import func, select, and_, desc, distinct
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lcfs.db.dependencies import get_async_db_session
+from lcfs.utils.spreadsheet_builder import EXPORT_STREAM_BATCH_SIZE
 from lcfs.web.core.decorators import repo_handler
 from lcfs.db.models.transaction.CreditLedgerView import CreditLedgerView
 from lcfs.db.models.compliance.ComplianceReport import ComplianceReport
@@ -30,8 +31,42 @@ class CreditLedgerRepository:
         conditions: List[any],
         sort_orders: List[any],
     ) -> tuple[List[tuple], int]:
-        # Base query - join with compliance_report to get version for ComplianceReport transactions
-        stmt = (
+        stmt = self._ledger_query(conditions)
+
+        # Count before pagination
+        count_stmt = select(func.count()).select_from(
+            select(CreditLedgerView).where(and_(*conditions)).subquery()
+        )
+        total = await self.db.scalar(count_stmt)
+
+        # Pagination
+        stmt = stmt.offset(offset).limit(limit)
+
+        result = await self.db.execute(stmt)
+        rows = result.all()
+        return rows, total or 0
+
+    async def stream_rows(
+        self,
+        *,
+        conditions: List[any],
+        batch_size: int = EXPORT_STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[tuple]:
+        """
+        Yield every ledger row matching the conditions, newest first, reading
+        through a server-side cursor so memory stays flat for long histories.
+        """
+        result = await self.db.stream(
+            self._ledger_query(conditions).execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            for row in partition:
+                yield row
+
+    @staticmethod
+    def _ledger_query(conditions: List[any]):
+        # Join with compliance_report to get version for ComplianceReport transactions
+        return (
             select(
                 CreditLedgerView,
                 ComplianceReport.version.label("compliance_report_version"),
@@ -45,24 +80,10 @@ class CreditLedgerRepository:
                 ),
             )
             .where(and_(*conditions))
+            # Always sort by update_date DESC - sorting is not allowed on credit ledger
+            .order_by(CreditLedgerView.update_date.desc())
         )
 
-        # Always sort by update_date DESC - sorting is not allowed on credit ledger
-        stmt = stmt.order_by(CreditLedgerView.update_date.desc())
-
-        # Count before pagination
-        count_stmt = select(func.count()).select_from(
-            select(CreditLedgerView).where(and_(*conditions)).subquery()
-        )
-        total = await self.db.scalar(count_stmt)
-
-        # Pagination
-        stmt = stmt.offset(offset).limit(limit)
-
-        result = await self.db.execute(stmt)
-        rows = result.all()
-        return rows, total or 0
-
     @repo_handler
     async def get_distinct_years(
         self,
@@ -5,6 +5,9 @@ from typing import Optional, List
 
 from fastapi import Depends
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from lcfs.db.dependencies import get_db_session_factory
 
 from lcfs.utils.constants import LCFS_Constants, FILE_MEDIA_TYPE
 from lcfs.utils.spreadsheet_builder import SpreadsheetBuilder
@@ -26,8 +29,13 @@ from lcfs.db.models.transaction.CreditLedgerView import CreditLedgerView
 
 
 class CreditLedgerService:
-    def __init__(self, repo: CreditLedgerRepository = Depends()) -> None:
+    def __init__(
+        self,
+        repo: CreditLedgerRepository = Depends(),
+        session_factory: Optional[async_sessionmaker] = Depends(get_db_session_factory),
+    ) -> None:
         self.repo = repo
+        self.session_factory = session_factory
 
     def _apply_filters(
         self, pagination: PaginationRequestSchema, conditions: List[any]
@@ -124,51 +132,32 @@ class CreditLedgerService:
                 CreditLedgerView.compliance_period == str(compliance_year)
             )
 
-        sort_orders = [SortOrder(field="update_date", direction="desc")]
-
-        rows, _ = await self.repo.get_rows_paginated(
-            offset=0,
-            limit=None,
-            conditions=conditions,
-            sort_orders=sort_orders,
-        )
-
-        sheet_rows = []
-        for row in rows:
-            ledger_view, version = row
-
-            # Format transaction type with version for compliance reports
-            transaction_type = ledger_view.transaction_type
-            if transaction_type == "ComplianceReport" and version is not None:
-                # Format as "Original", "Supplemental 1", etc.
-                description = "Original" if version == 0 else f"Supplemental {version}"
-                transaction_type = f"Compliance Report – {description}"
-            elif transaction_type == "StandaloneTransaction":
-                transaction_type = "Legacy Transaction"
-            else:
-                # Add spaces to camelCase
-                transaction_type = "".join(
-                    [" " + c if c.isupper() else c for c in transaction_type]
-                ).strip()
-
-            sheet_rows.append(
-                [
-                    int(ledger_view.compliance_period),
-                    int(ledger_view.available_balance or 0),
-                    int(ledger_view.compliance_units or 0),
-                    transaction_type,
-                    ledger_view.update_date.strftime("%Y-%m-%d"),
-                ]
+        if export_format == "xls":
+            # xls cannot be streamed; build it in memory as before
+            sort_orders = [SortOrder(field="update_date", direction="desc")]
+            rows, _ = await self.repo.get_rows_paginated(
+                offset=0,
+                limit=None,
+                conditions=conditions,
+                sort_orders=sort_orders,
             )
-
-        builder = SpreadsheetBuilder(file_format=export_format)
-        builder.add_sheet(
-            sheet_name=LCFS_Constants.CREDIT_LEDGER_EXPORT_SHEETNAME,
-            columns=LCFS_Constants.CREDIT_LEDGER_EXPORT_COLUMNS,
-            rows=sheet_rows,
-            styles={"bold_headers": True},
-        )
-        file_content: bytes = builder.build_spreadsheet()
+            builder = SpreadsheetBuilder(file_format=export_format)
+            builder.add_sheet(
+                sheet_name=LCFS_Constants.CREDIT_LEDGER_EXPORT_SHEETNAME,
+                columns=LCFS_Constants.CREDIT_LEDGER_EXPORT_COLUMNS,
+                rows=[self._export_row(row) for row in rows],
+                styles={"bold_headers": True},
+            )
+            content = io.BytesIO(builder.build_spreadsheet())
+        else:
+            builder = SpreadsheetBuilder(file_format=export_format, streaming=True)
+            builder.add_sheet(
+                sheet_name=LCFS_Constants.CREDIT_LEDGER_EXPORT_SHEETNAME,
+                columns=LCFS_Constants.CREDIT_LEDGER_EXPORT_COLUMNS,
+                rows=self._stream_export_rows(conditions),
+                styles={"bold_headers": True},
+            )
+            content = builder.stream()
 
         date_stamp = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         filename = (
@@ -177,7 +166,49 @@ class CreditLedgerService:
         )
 
         return StreamingResponse(
-            io.BytesIO(file_content),
+            content,
             media_type=FILE_MEDIA_TYPE[export_format.upper()].value,
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
+
+    async def _stream_export_rows(self, conditions: List[any]):
+        """
+        Read the ledger through a server-side cursor while the response is
+        sent. The request session is closed by then, so a session of our own
+        is used when the app provides a factory.
+        """
+        if self.session_factory is None:
+            async for row in self.repo.stream_rows(conditions=conditions):
+                yield self._export_row(row)
+            return
+
+        async with self.session_factory() as session:
+            repo = CreditLedgerRepository(session)
+            async for row in repo.stream_rows(conditions=conditions):
+                yield self._export_row(row)
+
+    @staticmethod
+    def _export_row(row) -> List[any]:
+        ledger_view, version = row
+
+        # Format transaction type with version for compliance reports
+        transaction_type = ledger_view.transaction_type
+        if transaction_type == "ComplianceReport" and version is not None:
+            # Format as "Original", "Supplemental 1", etc.
+            description = "Original" if version == 0 else f"Supplemental {version}"
+            transaction_type = f"Compliance Report – {description}"
+        elif transaction_type == "StandaloneTransaction":
+            transaction_type = "Legacy Transaction"
+        else:
+            # Add spaces to camelCase
+            transaction_type = "".join(
+                [" " + c if c.isupper() else c for c in transaction_type]
+            ).strip()
+
+        return [
+            int(ledger_view.compliance_period),
+            int(ledger_view.available_balance or 0),
+            int(ledger_view.compliance_units or 0),
+            transaction_type,
+            ledger_view.update_date.strftime("%Y-%m-%d"),
+        ]
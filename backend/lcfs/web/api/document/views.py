@@ -12,6 +12,7 @@ from lcfs.db.dependencies import get_async_db_session
 from lcfs.db.models.user.Role import RoleEnum
 from lcfs.services.s3.client import DocumentService
 from lcfs.services.s3.schema import FileResponseSchema
+from lcfs.services.s3.transfer import stream_body
 from lcfs.web.api.compliance_report.validation import ComplianceReportValidation
 from lcfs.web.api.initiative_agreement.validation import InitiativeAgreementValidation
 from lcfs.web.api.charging_site.validation import ChargingSiteValidation
@@ -145,15 +146,25 @@ async def stream_document(
     if parent_type == "ci_application":
         await ci_validate.validate_access(parent_id)
 
-    file, document = await document_service.get_object(document_id)
+    file, document = await document_service.get_object(
+        document_id, request.headers.get("range")
+    )
 
     headers = {
         "Content-Disposition": f'attachment; filename="{document.file_name}"',
         "content-length": str(file["ContentLength"]),
+        "Accept-Ranges": "bytes",
     }
+    status_code = status.HTTP_200_OK
+    if file.get("ContentRange"):
+        headers["Content-Range"] = file["ContentRange"]
+        status_code = status.HTTP_206_PARTIAL_CONTENT
 
     return StreamingResponse(
-        content=file["Body"], media_type=file["ContentType"], headers=headers
+        content=stream_body(file["Body"]),
+        status_code=status_code,
+        media_type=file["ContentType"],
+        headers=headers,
     )
 
 
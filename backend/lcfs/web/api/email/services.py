@@ -1,14 +1,16 @@
+import asyncio
+import json
 import os
+from dataclasses import dataclass, field
 
 from pydantic import EmailStr
 from lcfs.web.api.base import AudienceType, NotificationTypeEnum
-import requests
 import structlog
 from fastapi import Depends
 from jinja2 import Environment, FileSystemLoader
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
 
+from lcfs.services.ches.client import get_ches_client
 from lcfs.settings import settings
 from lcfs.web.api.email.repo import CHESEmailRepository
 from lcfs.web.core.decorators import service_handler
@@ -16,6 +18,33 @@ from lcfs.web.api.email.schema import TEMPLATE_MAPPING
 
 logger = structlog.get_logger(__name__)
 
+# Shared by every service instance, so each template is compiled once per
+# process. Templates are part of the image, so they are never reloaded.
+template_env = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(__file__), "templates")),
+    autoescape=True,  # Enable autoescaping for security
+    auto_reload=False,
+)
+
+# BCC recipients per email; larger audiences are split over several sends
+CHES_MAX_RECIPIENTS = 50
+
+
+def compile_templates() -> None:
+    """Compiles every email template, so that no send waits on it."""
+    for template_file in set(TEMPLATE_MAPPING.values()):
+        template_env.get_template(template_file)
+
+
+@dataclass
+class EmailMessage:
+    """An email rendered from a notification template for its recipients."""
+
+    template_name: str
+    context: Dict[str, Any]
+    recipients: List[str]
+    extra_bcc: List[str] = field(default_factory=list)
+
 
 class CHESEmailService:
     """
@@ -25,15 +54,7 @@ class CHESEmailService:
 
     def __init__(self, repo: CHESEmailRepository = Depends()):
         self.repo = repo
-        self._access_token = None
-        self._token_expiry = None
-
-        # Update template directory path to the root templates directory
-        template_dir = os.path.join(os.path.dirname(__file__), "templates")
-        self.template_env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=True,  # Enable autoescaping for security
-        )
+        self.template_env = template_env
 
     def determine_audience_type(self, notification_type: NotificationTypeEnum) -> AudienceType:
         """
@@ -56,42 +77,40 @@ class CHESEmailService:
         notification_context: Dict[str, Any] = None,
     ) -> bool:
         """
-        Send an email notification to users subscribed to the specified notification type.
+        Send a fuel code expiry email to a fuel code's contact.
+        """
+        sent = await self.send_fuel_code_expiry_batch(
+            notification_type, [(email, notification_context)]
+        )
+        return sent[0]
+
+    @service_handler
+    async def send_fuel_code_expiry_batch(
+        self,
+        notification_type: NotificationTypeEnum,
+        notifications: List[Tuple[EmailStr, Dict[str, Any]]],
+    ) -> List[bool]:
+        """
+        Send fuel code expiry emails, each to its contact, and return
+        whether each was sent.
         """
         if not settings.ches_enabled:
-            return False
+            return [False] * len(notifications)
 
         # Validate configuration before performing any operations
         if not self._validate_configuration():
-            return
-
-        # Retrieve subscribed user emails
-        recipient_emails = [email]
-        if not recipient_emails:
-            logger.info(
-                f"""No subscribers for notification type: {
-                        notification_type.value}"""
+            return [False] * len(notifications)
+
+        messages = [
+            EmailMessage(
+                notification_type.value,
+                notification_context,
+                [email],
+                extra_bcc=["lcfs@gov.bc.ca"],
             )
-            return False
-
-        # Include environment in the context
-        notification_context["environment"] = settings.environment.lower()
-
-        # Render the email content
-        email_body = self._render_email_template(
-            notification_type.value, notification_context
-        )
-
-        # Build email payload
-        email_payload = self._build_email_payload(
-            recipient_emails,
-            notification_context,
-            email_body,
-            extra_bcc=["lcfs@gov.bc.ca"],
-        )
-
-        # Send email
-        return await self.send_email(email_payload)
+            for email, notification_context in notifications
+        ]
+        return await self.send_batch(messages)
 
     @service_handler
     async def send_notification_email(
@@ -100,9 +119,11 @@ class CHESEmailService:
         notification_context: Dict[str, Any],
         organization_id: int = None,
         audience_type: Optional[AudienceType] = None,
+        raise_on_failure: bool = False,
     ) -> bool:
         """
         Send an email notification to users subscribed to the specified notification type.
+        With ``raise_on_failure`` a failed send raises, so the job sending it is retried.
         """
         if not settings.ches_enabled:
             return False
@@ -111,6 +132,50 @@ class CHESEmailService:
         if not self._validate_configuration():
             return
 
+        message = await self.notification_message(
+            notification_type, notification_context, organization_id, audience_type
+        )
+        if message is None:
+            return False
+        return (await self.send_batch([message], raise_on_failure))[0]
+
+    @service_handler
+    async def send_notification_emails(
+        self,
+        notification_types: List[NotificationTypeEnum],
+        notification_context: Dict[str, Any],
+        organization_id: int = None,
+        audience_type: Optional[AudienceType] = None,
+    ) -> bool:
+        """
+        Send the same notification for several types. Subscribers of types
+        that share a template receive a single email.
+        """
+        if not settings.ches_enabled:
+            return False
+
+        if not self._validate_configuration():
+            return False
+
+        messages = []
+        for notification_type in notification_types:
+            message = await self.notification_message(
+                notification_type, notification_context, organization_id, audience_type
+            )
+            if message is not None:
+                messages.append(message)
+        if not messages:
+            return False
+        return all(await self.send_batch(messages))
+
+    async def notification_message(
+        self,
+        notification_type: NotificationTypeEnum,
+        notification_context: Dict[str, Any],
+        organization_id: int = None,
+        audience_type: Optional[AudienceType] = None,
+    ) -> Optional[EmailMessage]:
+        """The email for a notification type's subscribers, or None if it has none."""
         # Determine audience type if not provided
         if audience_type is None:
             audience_type = self.determine_audience_type(notification_type)
@@ -124,26 +189,78 @@ class CHESEmailService:
                 f"""No subscribers for notification type: {
                         notification_type.value}"""
             )
-            return False
-
-        # Include environment in the context
-        notification_context["environment"] = settings.environment.lower()
-
-        # Render the email content
-        email_body = self._render_email_template(
-            notification_type.value, notification_context
+            return None
+        return EmailMessage(
+            notification_type.value, notification_context, recipient_emails
         )
 
-        # Build email payload
-        email_payload = self._build_email_payload(
-            recipient_emails, notification_context, email_body
+    async def send_batch(
+        self, messages: List[EmailMessage], raise_on_failure: bool = False
+    ) -> List[bool]:
+        """
+        Renders and sends the messages, returning whether each was sent.
+        Messages that render the same template from the same context are
+        merged into one email to all of their recipients.
+        """
+        groups: Dict[tuple, List[int]] = {}
+        for index, message in enumerate(messages):
+            # Include environment in the context
+            message.context["environment"] = settings.environment.lower()
+            groups.setdefault(self._batch_key(message), []).append(index)
+
+        async def send_group(indexes: List[int]) -> bool:
+            first = messages[indexes[0]]
+            # Render the email content once for every recipient
+            email_body = self._render_email_template(
+                first.template_name, first.context
+            )
+            recipients = list(
+                dict.fromkeys(
+                    email for index in indexes for email in messages[index].recipients
+                )
+            )
+            sends = [
+                self.send_email(
+                    self._build_email_payload(
+                        recipients[start : start + CHES_MAX_RECIPIENTS],
+                        first.context,
+                        email_body,
+                        extra_bcc=first.extra_bcc if start == 0 else None,
+                    ),
+                    raise_on_failure,
+                )
+                for start in range(0, max(len(recipients), 1), CHES_MAX_RECIPIENTS)
+            ]
+            return all(await asyncio.gather(*sends))
+
+        results = [False] * len(messages)
+        # A failing email only fails its own recipients unless the caller
+        # retries on failure
+        groups_sent = await asyncio.gather(
+            *(send_group(indexes) for indexes in groups.values()),
+            return_exceptions=not raise_on_failure,
+        )
+        for indexes, sent in zip(groups.values(), groups_sent):
+            if isinstance(sent, Exception):
+                logger.error(f"Email sending failed: {sent}")
+                continue
+            for index in indexes:
+                results[index] = sent
+        return results
+
+    @staticmethod
+    def _batch_key(message: EmailMessage) -> tuple:
+        # Contexts may hold model objects, which only match themselves
+        return (
+            TEMPLATE_MAPPING.get(message.template_name, message.template_name),
+            json.dumps(message.context, sort_keys=True, default=repr),
+            tuple(message.extra_bcc),
         )
-
-        # Send email
-        return await self.send_email(email_payload)
 
     @service_handler
-    async def send_email(self, payload: Dict[str, Any]) -> bool:
+    async def send_email(
+        self, payload: Dict[str, Any], raise_on_failure: bool = False
+    ) -> bool:
         """
         Send an email using CHES.
         """
@@ -157,28 +274,14 @@ class CHESEmailService:
             logger.info(f"Email configuration error: {e}")
             return False
 
-        token = await self._get_ches_token()
-        if not token:
-            logger.warn("Email sending skipped: failed to retrieve a valid CHES token.")
-            return False
-
         try:
-            response = requests.post(
-                settings.ches_email_url,
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json",
-                },
-                timeout=15,
-            )
-            response.raise_for_status()
+            await get_ches_client().send(payload)
             logger.info("Email sent successfully.")
             return True
         except Exception as e:
-            logger.error(
-                f"Email sending failed: {e}. Response: {response.text} Payload: {payload}"
-            )
+            logger.error(f"Email sending failed: {e}. Payload: {payload}")
+            if raise_on_failure:
+                raise
             return False
 
     def _render_email_template(
@@ -228,37 +331,6 @@ class CHESEmailService:
 
         return payload
 
-    async def _get_ches_token(self) -> Optional[str]:
-        """
-        Retrieve and cache the CHES access token.
-        """
-        try:
-            if not self._validate_configuration():
-                return None
-
-            if self._access_token and datetime.now().timestamp() < self._token_expiry:
-                return self._access_token
-
-            response = requests.post(
-                settings.ches_auth_url,
-                data={"grant_type": "client_credentials"},
-                auth=(settings.ches_client_id, settings.ches_client_secret),
-                timeout=10,
-            )
-            response.raise_for_status()
-
-            token_data = response.json()
-            self._access_token = token_data.get("access_token")
-            self._token_expiry = datetime.now().timestamp() + token_data.get(
-                "expires_in", 3600
-            )
-            logger.info("Retrieved new CHES token.")
-            return self._access_token
-
-        except Exception as e:
-            logger.error(f"Token retrieval failed: {e}")
-            return None
-
     def _validate_configuration(self):
         """
         Validate the CHES configuration to ensure all necessary environment variables are set.
@@ -0,0 +1,5 @@
+"""API for background export jobs."""
+
+from lcfs.web.api.export_job.views import router
+
+__all__ = ["router"]
@@ -0,0 +1,114 @@
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.responses import StreamingResponse
+
+from lcfs.db.models import UserProfile
+from lcfs.web.api.base import PaginationRequestSchema
+from lcfs.web.api.charging_equipment.export import ChargingEquipmentExporter
+from lcfs.web.api.charging_equipment.repo import ChargingEquipmentRepository
+from lcfs.web.api.compliance_report.export import ComplianceReportExporter
+from lcfs.web.api.compliance_report.repo import ComplianceReportRepository
+from lcfs.web.api.credit_ledger.repo import CreditLedgerRepository
+from lcfs.web.api.credit_ledger.services import CreditLedgerService
+from lcfs.web.api.export_job.schema import ExportJobTypeEnum
+from lcfs.web.api.final_supply_equipment.export import FinalSupplyEquipmentExporter
+from lcfs.web.api.final_supply_equipment.repo import FinalSupplyEquipmentRepository
+from lcfs.web.api.fuel_code.export import FuelCodeExporter
+from lcfs.web.api.fuel_code.repo import FuelCodeRepository
+from lcfs.web.api.fuel_supply.repo import FuelSupplyRepository
+from lcfs.web.api.organizations.repo import OrganizationsRepository
+from lcfs.web.api.transaction.repo import TransactionRepository
+from lcfs.web.api.transaction.services import TransactionsService
+from lcfs.web.exception.exceptions import DataNotFoundException
+
+ExportBuilder = Callable[
+    [AsyncSession, Optional[async_sessionmaker], dict, UserProfile],
+    Awaitable[StreamingResponse],
+]
+
+
+def _pagination(params: dict) -> Optional[PaginationRequestSchema]:
+    if params.get("pagination") is None:
+        return None
+    return PaginationRequestSchema.model_validate(params["pagination"])
+
+
+async def _build_compliance_report(session, session_factory, params, user):
+    exporter = ComplianceReportExporter.for_session(session, session_factory)
+    return await exporter.export(
+        params["compliance_report_id"], params["is_government"]
+    )
+
+
+async def _build_credit_ledger(session, session_factory, params, user):
+    service = CreditLedgerService(CreditLedgerRepository(session), session_factory=None)
+    return await service.export_transactions(
+        organization_id=params["organization_id"],
+        compliance_year=params["compliance_year"],
+        export_format=params["format"],
+    )
+
+
+async def _build_final_supply_equipment(session, session_factory, params, user):
+    cr_repo = ComplianceReportRepository(session, FuelSupplyRepository(session))
+    compliance_report = await cr_repo.get_compliance_report_by_id(
+        params["compliance_report_id"]
+    )
+    if not compliance_report:
+        raise DataNotFoundException("Compliance report not found.")
+
+    exporter = FinalSupplyEquipmentExporter(
+        repo=FinalSupplyEquipmentRepository(session),
+        compliance_report_repo=cr_repo,
+    )
+    return await exporter.export(
+        params["compliance_report_id"], user, compliance_report.organization, True
+    )
+
+
+async def _build_charging_equipment(session, session_factory, params, user):
+    organization = await OrganizationsRepository(session).get_organization(
+        params["organization_id"]
+    )
+    if not organization:
+        raise DataNotFoundException("Organization not found.")
+
+    exporter = ChargingEquipmentExporter(ChargingEquipmentRepository(session))
+    return await exporter.export(params["organization_id"], user, organization, True)
+
+
+async def _build_fuel_codes(session, session_factory, params, user):
+    exporter = FuelCodeExporter(FuelCodeRepository(session))
+    return await exporter.export(params["format"], _pagination(params))
+
+
+async def _build_transactions(session, session_factory, params, user):
+    service = TransactionsService(TransactionRepository(session), session_factory=None)
+    return await service.export_transactions(
+        params["format"], _pagination(params), params["organization_id"]
+    )
+
+
+EXPORT_BUILDERS: Dict[ExportJobTypeEnum, ExportBuilder] = {
+    ExportJobTypeEnum.COMPLIANCE_REPORT: _build_compliance_report,
+    ExportJobTypeEnum.CREDIT_LEDGER: _build_credit_ledger,
+    ExportJobTypeEnum.FINAL_SUPPLY_EQUIPMENT: _build_final_supply_equipment,
+    ExportJobTypeEnum.CHARGING_EQUIPMENT: _build_charging_equipment,
+    ExportJobTypeEnum.FUEL_CODES: _build_fuel_codes,
+    ExportJobTypeEnum.TRANSACTIONS: _build_transactions,
+}
+
+
+async def build_export(
+    session: AsyncSession,
+    session_factory: Optional[async_sessionmaker],
+    params: dict,
+    user: UserProfile,
+) -> StreamingResponse:
+    """
+    Builds an export with the same exporter the synchronous endpoint uses,
+    wired to the given session instead of request dependencies.
+    """
+    builder = EXPORT_BUILDERS[ExportJobTypeEnum(params["export_type"])]
+    return await builder(session, session_factory, params, user)
@@ -0,0 +1,26 @@
+from typing import Optional, Sequence
+
+from fastapi import Depends
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from lcfs.db.dependencies import get_async_db_session
+from lcfs.db.models.audit.AuditLog import AuditLog
+from lcfs.web.core.decorators import repo_handler
+
+
+class ExportJobRepository:
+    def __init__(self, db: AsyncSession = Depends(get_async_db_session)):
+        self.db = db
+
+    @repo_handler
+    async def get_data_version(self, table_names: Optional[Sequence[str]]) -> int:
+        """
+        Returns the latest audit log id touching the given tables, or any
+        table when none are given. Every public table is audited, so the value
+        changes whenever data an export reads from changes.
+        """
+        query = select(func.max(AuditLog.audit_log_id))
+        if table_names:
+            query = query.where(AuditLog.table_name.in_(table_names))
+        return await self.db.scalar(query) or 0
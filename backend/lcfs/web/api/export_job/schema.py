@@ -0,0 +1,62 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import model_validator
+
+from lcfs.web.api.base import BaseSchema, PaginationRequestSchema
+
+
+class ExportJobTypeEnum(str, Enum):
+    COMPLIANCE_REPORT = "compliance_report"
+    CREDIT_LEDGER = "credit_ledger"
+    FINAL_SUPPLY_EQUIPMENT = "final_supply_equipment"
+    CHARGING_EQUIPMENT = "charging_equipment"
+    FUEL_CODES = "fuel_codes"
+    TRANSACTIONS = "transactions"
+
+
+# Parameters each export type needs to build its file
+REQUIRED_EXPORT_PARAMS = {
+    ExportJobTypeEnum.COMPLIANCE_REPORT: ["compliance_report_id"],
+    ExportJobTypeEnum.CREDIT_LEDGER: ["organization_id"],
+    ExportJobTypeEnum.FINAL_SUPPLY_EQUIPMENT: ["compliance_report_id"],
+    ExportJobTypeEnum.CHARGING_EQUIPMENT: ["organization_id"],
+    ExportJobTypeEnum.FUEL_CODES: [],
+    ExportJobTypeEnum.TRANSACTIONS: [],
+}
+
+
+class ExportJobCreateSchema(BaseSchema):
+    export_type: ExportJobTypeEnum
+    format: str = "xlsx"
+    compliance_report_id: Optional[int] = None
+    organization_id: Optional[int] = None
+    compliance_year: Optional[int] = None
+    pagination: Optional[PaginationRequestSchema] = None
+
+    @model_validator(mode="after")
+    def check_required_params(self):
+        missing = [
+            param
+            for param in REQUIRED_EXPORT_PARAMS[self.export_type]
+            if getattr(self, param) is None
+        ]
+        if missing:
+            raise ValueError(
+                f"{self.export_type.value} exports require: {', '.join(missing)}"
+            )
+        if self.format not in ["xls", "xlsx", "csv"]:
+            raise ValueError("Export format not supported")
+        return self
+
+
+class ExportJobSchema(BaseSchema):
+    job_id: str
+
+
+class ExportJobStatusSchema(BaseSchema):
+    progress: float = 0
+    status: str
+    ready: bool = False
+    file_name: Optional[str] = None
+    errors: List[str] = []
@@ -0,0 +1,392 @@
+import hashlib
+import json
+import re
+import uuid
+from typing import List, Optional
+
+import structlog
+from fastapi import Depends, HTTPException, status
+from redis.asyncio import Redis
+from starlette.responses import StreamingResponse
+
+from lcfs.db.dependencies import set_user_context
+from lcfs.db.models import UserProfile
+from lcfs.services.job_queue.queue import JobFailed, JobQueue, QueuedJob
+from lcfs.services.job_queue.registry import register_job
+from lcfs.services.job_queue.worker import get_job_resources
+from lcfs.services.redis.dependency import get_redis_client
+from lcfs.services.redis.job_progress import (
+    job_progress_response,
+    publish_job_progress,
+    read_job_progress,
+)
+from lcfs.services.s3.dependency import create_s3_client
+from lcfs.services.s3.exports import ExportArtifactStorage
+from lcfs.web.api.export_job.builders import build_export
+from lcfs.web.api.export_job.repo import ExportJobRepository
+from lcfs.web.api.export_job.schema import (
+    ExportJobCreateSchema,
+    ExportJobStatusSchema,
+    ExportJobTypeEnum,
+)
+from lcfs.web.core.decorators import service_handler
+from lcfs.web.exception.exceptions import DataNotFoundException
+
+logger = structlog.get_logger(__name__)
+
+# Seconds a job's status and download link stay available
+EXPORT_JOB_TTL = 60 * 60
+
+EXPORT_JOB_TYPE = "export"
+
+# Tables whose changes invalidate a stored export. None means any audited
+# change, for exports that read too widely to list.
+EXPORT_SOURCE_TABLES = {
+    ExportJobTypeEnum.COMPLIANCE_REPORT: [
+        "compliance_report",
+        "compliance_report_status",
+        "compliance_report_history",
+        "compliance_report_summary",
+        "compliance_period",
+        "fuel_supply",
+        "notional_transfer",
+        "other_uses",
+        "fuel_export",
+        "allocation_agreement",
+        "allocation_transaction_type",
+        "final_supply_equipment",
+        "final_supply_equipment_reg_number",
+        "compliance_report_charging_equipment",
+        "charging_equipment",
+        "charging_site",
+        "level_of_equipment",
+        "end_use_type",
+        "end_user_type",
+        "fuel_type",
+        "fuel_category",
+        "fuel_code",
+        "fuel_code_prefix",
+        "provision_of_the_act",
+        "expected_use_type",
+        "unit_of_measure",
+        "energy_density",
+        "energy_effectiveness_ratio",
+        "target_carbon_intensity",
+        "additional_carbon_intensity",
+        "transaction",
+        "organization",
+    ],
+    ExportJobTypeEnum.CREDIT_LEDGER: [
+        "transaction",
+        "transfer",
+        "transfer_history",
+        "initiative_agreement",
+        "initiative_agreement_history",
+        "admin_adjustment",
+        "admin_adjustment_history",
+        "compliance_report",
+        "compliance_report_history",
+        "compliance_report_summary",
+        "compliance_period",
+        "organization",
+    ],
+    ExportJobTypeEnum.FINAL_SUPPLY_EQUIPMENT: [
+        "final_supply_equipment",
+        "final_supply_equipment_reg_number",
+        "compliance_report",
+        "compliance_report_charging_equipment",
+        "charging_equipment",
+        "charging_equipment_status",
+        "charging_site",
+        "charging_site_status",
+        "level_of_equipment",
+        "end_use_type",
+        "end_user_type",
+        "organization",
+        "organization_address",
+    ],
+    ExportJobTypeEnum.CHARGING_EQUIPMENT: [
+        "charging_equipment",
+        "charging_equipment_status",
+        "charging_site",
+        "charging_site_status",
+        "compliance_report_charging_equipment",
+        "level_of_equipment",
+        "end_use_type",
+        "end_user_type",
+        "organization",
+    ],
+    ExportJobTypeEnum.FUEL_CODES: [
+        "fuel_code",
+        "fuel_code_status",
+        "fuel_code_prefix",
+        "fuel_type",
+        "transport_mode",
+        "feedstock_fuel_transport_mode",
+        "finished_fuel_transport_mode",
+    ],
+    ExportJobTypeEnum.TRANSACTIONS: [
+        "transaction",
+        "transfer",
+        "transfer_history",
+        "transfer_status",
+        "transfer_category",
+        "initiative_agreement",
+        "initiative_agreement_history",
+        "initiative_agreement_status",
+        "admin_adjustment",
+        "admin_adjustment_history",
+        "admin_adjustment_status",
+        "compliance_report",
+        "compliance_report_status",
+        "compliance_report_history",
+        "compliance_period",
+        "organization",
+    ],
+}
+
+# These exporters use advanced Excel features and always produce xlsx
+XLSX_ONLY_EXPORTS = {
+    ExportJobTypeEnum.COMPLIANCE_REPORT,
+    ExportJobTypeEnum.FINAL_SUPPLY_EQUIPMENT,
+    ExportJobTypeEnum.CHARGING_EQUIPMENT,
+}
+
+
+class ExportJobService:
+    def __init__(
+        self,
+        repo: ExportJobRepository = Depends(),
+        storage: ExportArtifactStorage = Depends(),
+        redis_client: Redis = Depends(get_redis_client),
+        queue: JobQueue = Depends(),
+    ) -> None:
+        self.repo = repo
+        self.storage = storage
+        self.redis_client = redis_client
+        self.queue = queue
+
+    @service_handler
+    async def create_job(
+        self, payload: ExportJobCreateSchema, user: UserProfile
+    ) -> str:
+        """
+        Queues the requested export for the job workers. When an artifact
+        for the same request and data version is already stored the job
+        completes immediately and reuses it, and a repeated request while
+        the export is still being built returns the job building it.
+        Returns a job_id that can be used to track progress via get_status.
+        """
+        params = _export_params(payload, user)
+
+        data_version = await self.repo.get_data_version(
+            EXPORT_SOURCE_TABLES[payload.export_type]
+        )
+        artifact_key = ExportArtifactStorage.artifact_key(
+            payload.export_type.value, _cache_key(params, data_version)
+        )
+
+        artifact = await self.storage.get_metadata(artifact_key)
+        if artifact:
+            job_id = str(uuid.uuid4())
+            await self._save_job(job_id, user, artifact_key)
+            await _update_progress(
+                self.redis_client,
+                job_id,
+                100,
+                "Export ready.",
+                file_name=artifact["file_name"],
+            )
+            return job_id
+
+        job_id, created = await self.queue.enqueue(
+            EXPORT_JOB_TYPE,
+            {"params": params, "artifact_key": artifact_key},
+            user=user,
+            organization_id=user.organization_id,
+            idempotency_key=f"{user.user_profile_id}:{artifact_key}",
+        )
+        await self._save_job(job_id, user, artifact_key)
+        if created:
+            await _update_progress(
+                self.redis_client, job_id, 0, "Starting export job..."
+            )
+
+        return job_id
+
+    async def get_status(self, job_id: str, user: UserProfile) -> ExportJobStatusSchema:
+        """
+        Retrieves and returns the job's progress and status from Redis.
+        """
+        await self._get_job(job_id, user)
+
+        try:
+            progress_data = await read_job_progress(self.redis_client, job_id)
+        except json.JSONDecodeError:
+            return ExportJobStatusSchema(status="Invalid status data found.")
+        if progress_data is None:
+            return ExportJobStatusSchema(status="No job found with this ID.")
+
+        return ExportJobStatusSchema(
+            progress=progress_data.get("progress", 0),
+            status=progress_data.get("status", "No status available."),
+            ready=progress_data.get("ready", False),
+            file_name=progress_data.get("file_name"),
+            errors=progress_data.get("errors", []),
+        )
+
+    async def stream_status(
+        self, job_id: str, user: UserProfile, last_event_id: Optional[str] = None
+    ) -> StreamingResponse:
+        """
+        Streams the job's progress as Server-Sent Events until it finishes.
+        """
+        await self._get_job(job_id, user)
+        return job_progress_response(self.redis_client, job_id, last_event_id)
+
+    @service_handler
+    async def get_artifact(self, job_id: str, user: UserProfile):
+        """
+        Returns the stored S3 object and metadata for a finished job.
+        """
+        job = await self._get_job(job_id, user)
+
+        metadata = await self.storage.get_metadata(job["artifact_key"])
+        if not metadata:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Export is not ready yet.",
+            )
+
+        file = await self.storage.get_object(job["artifact_key"])
+        return file, metadata
+
+    async def _save_job(
+        self, job_id: str, user: UserProfile, artifact_key: str
+    ) -> None:
+        await self.redis_client.set(
+            f"export_jobs/{job_id}",
+            json.dumps(
+                {
+                    "user_profile_id": user.user_profile_id,
+                    "artifact_key": artifact_key,
+                }
+            ),
+            ex=EXPORT_JOB_TTL,
+        )
+
+    async def _get_job(self, job_id: str, user: UserProfile) -> dict:
+        job_str = await self.redis_client.get(f"export_jobs/{job_id}")
+        if not job_str:
+            raise DataNotFoundException("Export job not found.")
+
+        job = json.loads(job_str)
+        # Jobs are only visible to the user who requested them
+        if job["user_profile_id"] != user.user_profile_id:
+            raise DataNotFoundException("Export job not found.")
+        return job
+
+
+def _export_params(payload: ExportJobCreateSchema, user: UserProfile) -> dict:
+    """
+    The inputs that determine an export's content, in a JSON-safe form that
+    is both handed to the worker and hashed into the artifact key.
+    """
+    export_type = payload.export_type
+    return {
+        "export_type": export_type.value,
+        "format": "xlsx" if export_type in XLSX_ONLY_EXPORTS else payload.format,
+        "compliance_report_id": payload.compliance_report_id,
+        "organization_id": payload.organization_id,
+        "compliance_year": payload.compliance_year,
+        "pagination": (
+            payload.pagination.model_dump(mode="json", by_alias=True)
+            if payload.pagination
+            else None
+        ),
+        "is_government": user.is_government,
+    }
+
+
+def _cache_key(params: dict, data_version: int) -> str:
+    fingerprint = json.dumps(
+        {"params": params, "data_version": data_version}, sort_keys=True
+    )
+    return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+
+def _file_name(response) -> str:
+    disposition = response.headers.get("content-disposition", "")
+    match = re.search(r'filename="([^"]+)"', disposition)
+    return match.group(1) if match else "export"
+
+
+@register_job(EXPORT_JOB_TYPE, priority=10, per_organization=2)
+async def run_export_job(job: QueuedJob) -> None:
+    if not await export_async(
+        job.payload["params"], job.user, job.job_id, job.payload["artifact_key"]
+    ):
+        raise JobFailed("Export failed.")
+
+
+async def export_async(params: dict, user: UserProfile, job_id: str, artifact_key: str):
+    """
+    Builds the export and stores it in S3. Runs on a job worker and returns
+    whether the export was stored; failures are reported as its progress.
+    """
+    logger.debug("Building export", export_type=params["export_type"])
+
+    resources = get_job_resources()
+    redis_client = resources.redis_client
+    try:
+        async with resources.session_factory() as session:
+            async with session.begin():
+                await set_user_context(session, user.keycloak_username)
+
+                await _update_progress(
+                    redis_client, job_id, 10, "Loading export data..."
+                )
+                response = await build_export(
+                    session, resources.session_factory, params, user
+                )
+                content = b"".join([chunk async for chunk in response.body_iterator])
+                file_name = _file_name(response)
+
+                await _update_progress(
+                    redis_client, job_id, 80, "Storing export file..."
+                )
+                storage = ExportArtifactStorage(create_s3_client())
+                await storage.put(artifact_key, content, file_name, response.media_type)
+
+                await _update_progress(
+                    redis_client, job_id, 100, "Export ready.", file_name=file_name
+                )
+                logger.debug("Completed export", export_type=params["export_type"])
+        return True
+    except Exception as e:
+        logger.error("Export job failed", job_id=job_id, error=str(e))
+        await _update_progress(
+            redis_client, job_id, 100, "Export failed.", errors=[str(e)]
+        )
+        return False
+
+
+async def _update_progress(
+    redis_client: Redis,
+    job_id: str,
+    progress: float,
+    status_msg: str,
+    errors: List[str] = None,
+    file_name: Optional[str] = None,
+):
+    """
+    Persists the job status and progress in Redis.
+    """
+    data = {
+        "progress": progress,
+        "status": status_msg,
+        "errors": errors or [],
+        "ready": file_name is not None,
+        "file_name": file_name,
+    }
+    await publish_job_progress(redis_client, job_id, data, ttl=EXPORT_JOB_TTL)
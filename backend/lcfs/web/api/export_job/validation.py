@@ -0,0 +1,64 @@
+from fastapi import Depends, HTTPException, Request
+from starlette import status
+
+from lcfs.db.models.user.Role import RoleEnum
+from lcfs.web.api.compliance_report.validation import ComplianceReportValidation
+from lcfs.web.api.credit_ledger.validation import CreditLedgerValidation
+from lcfs.web.api.export_job.schema import ExportJobCreateSchema, ExportJobTypeEnum
+
+# Roles allowed to request each export, matching the synchronous endpoints
+EXPORT_ROLES = {
+    ExportJobTypeEnum.COMPLIANCE_REPORT: [
+        RoleEnum.COMPLIANCE_REPORTING,
+        RoleEnum.SIGNING_AUTHORITY,
+        RoleEnum.GOVERNMENT,
+    ],
+    ExportJobTypeEnum.CREDIT_LEDGER: [RoleEnum.SUPPLIER, RoleEnum.GOVERNMENT],
+    ExportJobTypeEnum.FINAL_SUPPLY_EQUIPMENT: [
+        RoleEnum.COMPLIANCE_REPORTING,
+        RoleEnum.SIGNING_AUTHORITY,
+        RoleEnum.GOVERNMENT,
+    ],
+    ExportJobTypeEnum.CHARGING_EQUIPMENT: [RoleEnum.SUPPLIER, RoleEnum.GOVERNMENT],
+    ExportJobTypeEnum.FUEL_CODES: [RoleEnum.GOVERNMENT],
+    ExportJobTypeEnum.TRANSACTIONS: [RoleEnum.GOVERNMENT],
+}
+
+
+class ExportJobValidation:
+    def __init__(
+        self,
+        request: Request,
+        report_validate: ComplianceReportValidation = Depends(),
+    ):
+        self.request = request
+        self.report_validate = report_validate
+
+    async def validate_export_access(self, payload: ExportJobCreateSchema):
+        """
+        Applies the same role and organization checks as the endpoint that
+        produces the export synchronously.
+        """
+        user = self.request.user
+        if not any(
+            role in user.role_names for role in EXPORT_ROLES[payload.export_type]
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions",
+            )
+
+        if payload.export_type in (
+            ExportJobTypeEnum.COMPLIANCE_REPORT,
+            ExportJobTypeEnum.FINAL_SUPPLY_EQUIPMENT,
+        ):
+            await self.report_validate.validate_organization_access(
+                payload.compliance_report_id
+            )
+        elif payload.export_type in (
+            ExportJobTypeEnum.CREDIT_LEDGER,
+            ExportJobTypeEnum.CHARGING_EQUIPMENT,
+        ):
+            await CreditLedgerValidation(self.request).validate_organization_access(
+                payload.organization_id
+            )
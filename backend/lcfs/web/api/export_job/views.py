@@ -0,0 +1,96 @@
+import structlog
+from fastapi import APIRouter, Body, Depends, Request, status
+from starlette.responses import StreamingResponse
+
+from lcfs.services.s3.transfer import stream_body
+from lcfs.web.api.export_job.schema import (
+    ExportJobCreateSchema,
+    ExportJobSchema,
+    ExportJobStatusSchema,
+)
+from lcfs.web.api.export_job.services import ExportJobService
+from lcfs.web.api.export_job.validation import ExportJobValidation
+from lcfs.web.core.decorators import view_handler
+
+router = APIRouter()
+logger = structlog.get_logger(__name__)
+
+
+@router.post("/", response_model=ExportJobSchema, status_code=status.HTTP_202_ACCEPTED)
+@view_handler(["*"])
+async def create_export_job(
+    request: Request,
+    payload: ExportJobCreateSchema = Body(...),
+    service: ExportJobService = Depends(),
+    validate: ExportJobValidation = Depends(),
+) -> ExportJobSchema:
+    """
+    Start building an export in the background. Follow the returned job's
+    progress and download the file once it is ready.
+    """
+    await validate.validate_export_access(payload)
+    job_id = await service.create_job(payload, request.user)
+    return ExportJobSchema(job_id=job_id)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=ExportJobStatusSchema,
+    status_code=status.HTTP_200_OK,
+)
+@view_handler(["*"])
+async def get_export_job_status(
+    request: Request,
+    job_id: str,
+    service: ExportJobService = Depends(),
+) -> ExportJobStatusSchema:
+    """
+    Get the current progress of an export job
+    """
+    return await service.get_status(job_id, request.user)
+
+
+@router.get(
+    "/{job_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+@view_handler(["*"])
+async def stream_export_job_status(
+    request: Request,
+    job_id: str,
+    service: ExportJobService = Depends(),
+):
+    """
+    Stream the progress of an export job as Server-Sent Events
+    """
+    return await service.stream_status(
+        job_id, request.user, request.headers.get("last-event-id")
+    )
+
+
+@router.get(
+    "/{job_id}/download",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+@view_handler(["*"])
+async def download_export(
+    request: Request,
+    job_id: str,
+    service: ExportJobService = Depends(),
+):
+    """
+    Stream the file produced by a finished export job
+    """
+    file, metadata = await service.get_artifact(job_id, request.user)
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{metadata["file_name"]}"',
+        "content-length": str(file["ContentLength"]),
+    }
+    return StreamingResponse(
+        content=stream_body(file["Body"]),
+        media_type=metadata["media_type"],
+        headers=headers,
+    )
@@ -1,35 +1,43 @@
-import asyncio
-import concurrent.futures
 import datetime
-import io
-import json
 import structlog
-import uuid
-from typing import List
+from dataclasses import dataclass
+from typing import List, Optional
 
-from fastapi import Depends, HTTPException, status, UploadFile
-from openpyxl import load_workbook
+from fastapi import Depends, UploadFile
+from fastapi.responses import StreamingResponse
 from redis.asyncio import Redis
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
-from lcfs.db.dependencies import db_url, set_user_context
 from lcfs.db.models import UserProfile
 from lcfs.db.models.compliance.ComplianceReportChargingEquipment import (
     ComplianceReportChargingEquipment,
 )
-from lcfs.services.clamav.client import ClamAVService
+from lcfs.services.imports.job import (
+    ImportColumn,
+    RowRejected,
+    SpreadsheetImportJob,
+    load_worksheet,
+)
+from lcfs.services.imports.runtime import (
+    IMPORT_JOB_ATTEMPTS,
+    import_file,
+    import_result,
+    queue_import,
+    read_job_status,
+    write_job_progress,
+)
+from lcfs.services.job_queue.queue import JobQueue, QueuedJob
+from lcfs.services.job_queue.registry import register_job
 from lcfs.services.redis.dependency import get_redis_client
-from lcfs.settings import settings
-from lcfs.utils.constants import ALLOWED_MIME_TYPES, ALLOWED_FILE_TYPES, MAX_FILE_SIZE_BYTES, MAX_FILE_SIZE_MB
+from lcfs.services.redis.job_progress import job_progress_response
 from lcfs.web.api.compliance_report.repo import ComplianceReportRepository
 from lcfs.web.api.final_supply_equipment.repo import FinalSupplyEquipmentRepository
-from lcfs.web.api.fuel_supply.repo import FuelSupplyRepository
-from lcfs.web.api.organizations.repo import OrganizationsRepository
 from lcfs.web.core.decorators import service_handler
 from lcfs.web.exception.exceptions import DataNotFoundException
 
 logger = structlog.get_logger(__name__)
 
+IMPORT_JOB_TYPE = "import.fse_reporting"
+
 FSE_UPDATE_SHEETNAME = "FSE"
 
 
@@ -38,15 +46,13 @@ class FSEReportingImporter:
         self,
         repo: FinalSupplyEquipmentRepository = Depends(),
         compliance_report_repo: ComplianceReportRepository = Depends(),
-        clamav_service: ClamAVService = Depends(),
         redis_client: Redis = Depends(get_redis_client),
-        executor: concurrent.futures.ThreadPoolExecutor = Depends(),
+        queue: JobQueue = Depends(),
     ) -> None:
         self.repo = repo
         self.compliance_report_repo = compliance_report_repo
-        self.clamav_service = clamav_service
         self.redis_client = redis_client
-        self.executor = executor
+        self.queue = queue
 
     @service_handler
     async def import_data(
@@ -54,9 +60,11 @@ class FSEReportingImporter:
         compliance_report_id: int,
         user: UserProfile,
         file: UploadFile,
+        dry_run: bool = False,
     ) -> str:
         """
-        Initiates the bulk-update import job in a thread executor.
+        Queues the bulk-update import job for the job workers, or with
+        ``dry_run`` a job that only validates the file.
         Returns a job_id for progress polling via get_status().
         """
         compliance_report = (
@@ -67,66 +75,54 @@ class FSEReportingImporter:
         if not compliance_report:
             raise DataNotFoundException("Compliance report not found.")
 
-        job_id = str(uuid.uuid4())
-        await _update_progress(
-            self.redis_client, job_id, 0, "Starting import job...", 0, 0, 0, []
-        )
-
-        file_contents = await file.read()
-
-        if file.content_type not in ALLOWED_MIME_TYPES:
-            raise HTTPException(
-                status_code=400,
-                detail=(
-                    f"File type '{file.content_type or 'unknown'}' is not allowed. "
-                    f"Please upload files of the following types: {ALLOWED_FILE_TYPES}"
+        job_id, created = await queue_import(
+            self.queue,
+            IMPORT_JOB_TYPE,
+            user,
+            file,
+            {
+                "compliance_report_id": compliance_report_id,
+                "compliance_report_group_uuid": (
+                    compliance_report.compliance_report_group_uuid
                 ),
+                "report_organization_id": compliance_report.organization_id,
+                "dry_run": dry_run,
+            },
+            organization_id=compliance_report.organization_id,
+        )
+        if created:
+            await _update_progress(
+                self.redis_client, job_id, 0, "Starting import job...", 0, 0, 0, []
             )
 
-        if len(file_contents) > MAX_FILE_SIZE_BYTES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds the maximum limit of {MAX_FILE_SIZE_MB} MB.",
-            )
+        return job_id
 
-        buffer = io.BytesIO(file_contents)
-        buffer.seek(0)
-        copied_file = UploadFile(filename=file.filename, file=buffer)
-
-        loop = asyncio.get_running_loop()
-        loop.run_in_executor(
-            self.executor,
-            lambda: asyncio.run(
-                _import_async(
-                    compliance_report_id,
-                    user,
-                    compliance_report.compliance_report_group_uuid,
-                    compliance_report.organization_id,
-                    copied_file,
-                    job_id,
-                )
-            ),
+    async def get_status(self, job_id: str) -> dict:
+        return await read_job_status(
+            self.redis_client, job_id, extra_fields=("skipped",)
         )
 
-        return job_id
+    def stream_status(
+        self, job_id: str, last_event_id: Optional[str] = None
+    ) -> StreamingResponse:
+        """
+        Streams the job's progress as Server-Sent Events until it finishes.
+        """
+        return job_progress_response(self.redis_client, job_id, last_event_id)
 
-    async def get_status(self, job_id: str) -> dict:
-        progress_data_str = await self.redis_client.get(f"jobs/{job_id}")
-        if not progress_data_str:
-            return {"progress": 0, "status": "No job found with this ID."}
 
-        try:
-            data = json.loads(progress_data_str)
-            return {
-                "progress": data.get("progress", 0),
-                "status": data.get("status", "No status available."),
-                "created": data.get("created", 0),
-                "rejected": data.get("rejected", 0),
-                "skipped": data.get("skipped", 0),
-                "errors": data.get("errors", []),
-            }
-        except json.JSONDecodeError:
-            return {"progress": 0, "status": "Invalid status data found."}
+@register_job(IMPORT_JOB_TYPE, max_attempts=IMPORT_JOB_ATTEMPTS, per_organization=1)
+async def run_import_job(job: QueuedJob) -> dict:
+    result = await _import_async(
+        job.payload["compliance_report_id"],
+        job.user,
+        job.payload["compliance_report_group_uuid"],
+        job.payload["report_organization_id"],
+        import_file(job),
+        job.job_id,
+        job.payload.get("dry_run", False),
+    )
+    return import_result(result)
 
 
 async def _import_async(
@@ -136,303 +132,235 @@ async def _import_async(
     report_organization_id: int,
     file: UploadFile,
     job_id: str,
+    dry_run: bool = False,
 ):
     """
-    Performs the actual bulk-update import in an async context offloaded to a thread pool.
+    Performs the actual bulk-update import on a job worker.
     """
-    logger.debug("Importing FSE reporting bulk update...")
-
-    engine = create_async_engine(db_url, future=True)
-    try:
-        async with AsyncSession(engine) as session:
-            async with session.begin():
-                await set_user_context(session, user.keycloak_username)
-
-                fs_repo = FuelSupplyRepository(session)
-                fse_repo = FinalSupplyEquipmentRepository(session)
-                cr_repo = ComplianceReportRepository(session, fs_repo)
-                redis_client = Redis(
-                    host=settings.redis_host,
-                    port=settings.redis_port,
-                    password=settings.redis_pass,
-                    db=settings.redis_base or 0,
-                    decode_responses=True,
-                    max_connections=10,
-                    socket_timeout=5,
-                    socket_connect_timeout=5,
+    job = FSEReportingImportJob(
+        job_id,
+        user,
+        file,
+        compliance_report_id,
+        compliance_report_group_uuid,
+        report_organization_id,
+        dry_run,
+    )
+    return await job.run()
+
+
+@dataclass(frozen=True)
+class _ReportingRow:
+    registration_number: str
+    supply_from_date: Optional[datetime.date]
+    supply_to_date: Optional[datetime.date]
+    kwh_usage: float
+    compliance_notes: Optional[str]
+    # False when every editable column was left blank
+    has_any_data: bool
+
+
+class FSEReportingImportJob(SpreadsheetImportJob):
+    sheet_name = FSE_UPDATE_SHEETNAME
+    # Site name and serial # are read-only identifiers and are not used
+    columns = (
+        ImportColumn("Site name"),
+        ImportColumn("FSE Registration Number"),
+        ImportColumn("Serial #"),
+        ImportColumn("Dates of supply from"),
+        ImportColumn("Dates of supply to"),
+        ImportColumn("kWh Usage"),
+        ImportColumn("Compliance notes"),
+    )
+    description = "FSE reporting bulk update"
+
+    def __init__(
+        self,
+        job_id: str,
+        user: UserProfile,
+        file: UploadFile,
+        compliance_report_id: int,
+        compliance_report_group_uuid: str,
+        report_organization_id: int,
+        dry_run: bool = False,
+    ) -> None:
+        super().__init__(job_id, user, file, dry_run)
+        self.compliance_report_id = compliance_report_id
+        self.compliance_report_group_uuid = compliance_report_group_uuid
+        self.report_organization_id = report_organization_id
+
+    def reset(self) -> None:
+        super().reset()
+        self.skipped = 0
+
+    def progress_data(self) -> dict:
+        # 'created' is reused so the frontend ImportDialog works
+        return {
+            "created": self.created,
+            "updated": self.created,
+            "skipped": self.skipped,
+            "rejected": self.rejected,
+        }
+
+    def load_sheet(self):
+        return _load_sheet(self.file)
+
+    async def prepare(self) -> None:
+        self.fse_repo = FinalSupplyEquipmentRepository(self.session)
+
+    def validate_row(self, row_idx: int, row: list) -> str | None:
+        if not row[1]:
+            return f"Row {row_idx}: FSE Registration Number is required."
+        return None
+
+    def parse_row(self, row_idx: int, row: list) -> _ReportingRow:
+        (
+            _site_name,
+            registration_number,
+            _serial_number,
+            supply_from_raw,
+            supply_to_raw,
+            kwh_usage_raw,
+            compliance_notes,
+        ) = row
+
+        # Dates are parsed only when provided; blank dates are skipped
+        supply_from_date = None
+        supply_to_date = None
+        if supply_from_raw is not None:
+            try:
+                supply_from_date = _parse_date(supply_from_raw)
+            except (ValueError, TypeError):
+                raise RowRejected(
+                    f"Row {row_idx}: Invalid 'Dates of supply from' "
+                    f"value: '{supply_from_raw}'."
+                )
+        if supply_to_raw is not None:
+            try:
+                supply_to_date = _parse_date(supply_to_raw)
+            except (ValueError, TypeError):
+                raise RowRejected(
+                    f"Row {row_idx}: Invalid 'Dates of supply to' "
+                    f"value: '{supply_to_raw}'."
                 )
+        if (
+            supply_from_date is not None
+            and supply_to_date is not None
+            and supply_from_date > supply_to_date
+        ):
+            raise RowRejected(
+                f"Row {row_idx}: 'Dates of supply from' must not be "
+                "after 'Dates of supply to'."
+            )
 
-                await _update_progress(
-                    redis_client, job_id, 5, "Initializing services..."
+        # Blank kWh defaults to 0 when other data is present
+        kwh_usage = 0
+        if kwh_usage_raw is not None:
+            try:
+                kwh_usage = float(kwh_usage_raw)
+                if kwh_usage < 0:
+                    raise ValueError("kWh must be non-negative")
+            except (ValueError, TypeError):
+                raise RowRejected(
+                    f"Row {row_idx}: Invalid kWh Usage value: "
+                    f"'{kwh_usage_raw}'. Must be a numeric value."
                 )
 
-                if settings.clamav_enabled:
-                    await _update_progress(
-                        redis_client, job_id, 10, "Scanning file with ClamAV..."
-                    )
-                    ClamAVService().scan_file(file)
+        notes_value = str(compliance_notes).strip() if compliance_notes else None
+        return _ReportingRow(
+            registration_number=str(registration_number).strip(),
+            supply_from_date=supply_from_date,
+            supply_to_date=supply_to_date,
+            kwh_usage=kwh_usage,
+            compliance_notes=notes_value,
+            has_any_data=bool(
+                supply_from_raw is not None
+                or supply_to_raw is not None
+                or kwh_usage_raw is not None
+                or notes_value
+            ),
+        )
 
-                await _update_progress(
-                    redis_client, job_id, 20, "Loading Excel sheet..."
-                )
+    async def write_row(self, row_idx: int, data: _ReportingRow) -> bool:
+        # Look up the ChargingEquipment by registration number
+        equipment = await self.fse_repo.get_charging_equipment_by_registration_number(
+            registration_number=data.registration_number,
+            organization_id=self.report_organization_id,
+        )
+        if equipment is None:
+            raise RowRejected(
+                f"Row {row_idx}: FSE Registration Number "
+                f"'{data.registration_number}' not found for this organization."
+            )
+
+        # Find existing ComplianceReportChargingEquipment record
+        existing_record = await self.fse_repo.get_fse_reporting_record_for_group(
+            charging_equipment_id=equipment.charging_equipment_id,
+            charging_equipment_version=equipment.charging_equipment_version,
+            compliance_report_group_uuid=self.compliance_report_group_uuid,
+        )
 
-                try:
-                    sheet = _load_sheet(file)
-                    row_count = sheet.max_row
-
-                    updated = 0
-                    skipped = 0
-                    rejected = 0
-                    errors: List[str] = []
-
-                    await _update_progress(
-                        redis_client,
-                        job_id,
-                        20,
-                        "Beginning data import...",
-                        updated=updated,
-                        skipped=skipped,
-                        rejected=rejected,
-                        errors=errors,
-                    )
-
-                    for row_idx, row in enumerate(
-                        sheet.iter_rows(min_row=2, values_only=True), start=2
-                    ):
-                        if (row_idx + 1) % 10 == 0:
-                            current_progress = 20 + ((row_idx / row_count) * 80)
-                            await _update_progress(
-                                redis_client,
-                                job_id,
-                                current_progress,
-                                f"Processing row {row_idx - 1} of {row_count - 1}...",
-                                updated=updated,
-                                skipped=skipped,
-                                rejected=rejected,
-                                errors=errors,
-                            )
-
-                        if all(cell is None for cell in row):
-                            continue
-
-                        # Column layout: A=Site name, B=Reg#, C=Serial#, D=From, E=To, F=kWh, G=Notes
-                        expanded = list(row) + [None] * max(0, 7 - len(list(row)))
-                        # col A (index 0) = site name — read-only identifier, not used
-                        registration_number = expanded[1]
-                        # col C (index 2) = serial # — read-only identifier, not used
-                        supply_from_raw = expanded[3]
-                        supply_to_raw = expanded[4]
-                        kwh_usage_raw = expanded[5]
-                        compliance_notes = expanded[6]
-
-                        # Registration number is required
-                        if not registration_number:
-                            errors.append(
-                                f"Row {row_idx}: FSE Registration Number is required."
-                            )
-                            rejected += 1
-                            continue
-
-                        registration_number = str(registration_number).strip()
-
-                        # Parse dates only when provided; blank dates are silently skipped
-                        supply_from_date = None
-                        supply_to_date = None
-                        dates_provided = (
-                            supply_from_raw is not None or supply_to_raw is not None
-                        )
-                        if dates_provided:
-                            if supply_from_raw is not None:
-                                try:
-                                    supply_from_date = _parse_date(supply_from_raw)
-                                except (ValueError, TypeError):
-                                    errors.append(
-                                        f"Row {row_idx}: Invalid 'Dates of supply from' "
-                                        f"value: '{supply_from_raw}'."
-                                    )
-                                    rejected += 1
-                                    continue
-
-                            if supply_to_raw is not None:
-                                try:
-                                    supply_to_date = _parse_date(supply_to_raw)
-                                except (ValueError, TypeError):
-                                    errors.append(
-                                        f"Row {row_idx}: Invalid 'Dates of supply to' "
-                                        f"value: '{supply_to_raw}'."
-                                    )
-                                    rejected += 1
-                                    continue
-
-                            if (
-                                supply_from_date is not None
-                                and supply_to_date is not None
-                                and supply_from_date > supply_to_date
-                            ):
-                                errors.append(
-                                    f"Row {row_idx}: 'Dates of supply from' must not be "
-                                    "after 'Dates of supply to'."
-                                )
-                                rejected += 1
-                                continue
-
-                        # Look up the ChargingEquipment by registration number
-                        equipment = (
-                            await fse_repo.get_charging_equipment_by_registration_number(
-                                registration_number=registration_number,
-                                organization_id=report_organization_id,
-                            )
-                        )
-
-                        if equipment is None:
-                            errors.append(
-                                f"Row {row_idx}: FSE Registration Number "
-                                f"'{registration_number}' not found for this organization."
-                            )
-                            rejected += 1
-                            continue
-
-                        charging_equipment_id = equipment.charging_equipment_id
-                        charging_equipment_version = equipment.charging_equipment_version
-
-                        # Find existing ComplianceReportChargingEquipment record
-                        existing_record = (
-                            await fse_repo.get_fse_reporting_record_for_group(
-                                charging_equipment_id=charging_equipment_id,
-                                charging_equipment_version=charging_equipment_version,
-                                compliance_report_group_uuid=compliance_report_group_uuid,
-                            )
-                        )
-
-                        notes_value = (
-                            str(compliance_notes).strip() if compliance_notes else None
-                        )
-
-                        # No editable data — deactivate existing active record and clear
-                        # its fields to match what the user left blank in Excel.
-                        has_any_data = (
-                            supply_from_raw is not None
-                            or supply_to_raw is not None
-                            or kwh_usage_raw is not None
-                            or notes_value
-                        )
-                        if not has_any_data:
-                            if existing_record is not None and existing_record.is_active is not False:
-                                await fse_repo.bulk_update_fse_reporting_record(
-                                    charging_equipment_compliance_id=(
-                                        existing_record.charging_equipment_compliance_id
-                                    ),
-                                    supply_from_date=None,
-                                    supply_to_date=None,
-                                    kwh_usage=None,
-                                    compliance_notes=None,
-                                    deactivate=True,
-                                )
-                                updated += 1
-                            else:
-                                skipped += 1
-                            continue
-
-                        # Blank kWh defaults to 0 when other data is present
-                        if kwh_usage_raw is None:
-                            kwh_usage = 0
-                        else:
-                            try:
-                                kwh_usage = float(kwh_usage_raw)
-                                if kwh_usage < 0:
-                                    raise ValueError("kWh must be non-negative")
-                            except (ValueError, TypeError):
-                                errors.append(
-                                    f"Row {row_idx}: Invalid kWh Usage value: "
-                                    f"'{kwh_usage_raw}'. Must be a numeric value."
-                                )
-                                rejected += 1
-                                continue
-
-                        if existing_record is None:
-                            # Create new record only when dates are supplied
-                            if supply_from_date is None or supply_to_date is None:
-                                errors.append(
-                                    f"Row {row_idx}: Registration number "
-                                    f"'{registration_number}' has no existing reporting "
-                                    "record. Provide both supply dates to create one."
-                                )
-                                rejected += 1
-                                continue
-                            new_record = ComplianceReportChargingEquipment(
-                                charging_equipment_id=charging_equipment_id,
-                                charging_equipment_version=charging_equipment_version,
-                                compliance_report_id=compliance_report_id,
-                                compliance_report_group_uuid=compliance_report_group_uuid,
-                                organization_id=report_organization_id,
-                                supply_from_date=supply_from_date,
-                                supply_to_date=supply_to_date,
-                                kwh_usage=kwh_usage,
-                                compliance_notes=notes_value,
-                                is_active=True,
-                            )
-                            session.add(new_record)
-                            await session.flush()
-                        else:
-                            # Update existing record; blank fields are skipped.
-                            # Always activate the row — the mere presence of the
-                            # registration number in the upload checks it in the report.
-                            await fse_repo.bulk_update_fse_reporting_record(
-                                charging_equipment_compliance_id=(
-                                    existing_record.charging_equipment_compliance_id
-                                ),
-                                supply_from_date=supply_from_date,
-                                supply_to_date=supply_to_date,
-                                kwh_usage=kwh_usage,
-                                compliance_notes=notes_value,
-                                activate=True,
-                            )
-
-                        updated += 1
-
-                    await _update_progress(
-                        redis_client,
-                        job_id,
-                        100,
-                        "Import process completed.",
-                        updated=updated,
-                        skipped=skipped,
-                        rejected=rejected,
-                        errors=errors,
-                    )
-                    logger.debug(
-                        f"FSE bulk update completed: {updated} updated, "
-                        f"{skipped} skipped, {rejected} rejected"
-                    )
-
-                except DataNotFoundException as dnfe:
-                    await _update_progress(
-                        redis_client, job_id, 100, "Data not found error.", 0, 0, 0
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND, detail=str(dnfe)
-                    )
-                except Exception as e:
-                    await _update_progress(
-                        redis_client, job_id, 100, "Import process failed.", 0, 0, 0
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Could not process FSE bulk update: {str(e)}",
-                    )
-    finally:
-        await engine.dispose()
+        # No editable data — deactivate existing active record and clear
+        # its fields to match what the user left blank in Excel.
+        if not data.has_any_data:
+            if existing_record is not None and existing_record.is_active is not False:
+                await self.fse_repo.bulk_update_fse_reporting_record(
+                    charging_equipment_compliance_id=(
+                        existing_record.charging_equipment_compliance_id
+                    ),
+                    supply_from_date=None,
+                    supply_to_date=None,
+                    kwh_usage=None,
+                    compliance_notes=None,
+                    deactivate=True,
+                )
+                return True
+            self.skipped += 1
+            return False
+
+        if existing_record is None:
+            # Create new record only when dates are supplied
+            if data.supply_from_date is None or data.supply_to_date is None:
+                raise RowRejected(
+                    f"Row {row_idx}: Registration number "
+                    f"'{data.registration_number}' has no existing reporting "
+                    "record. Provide both supply dates to create one."
+                )
+            self.session.add(
+                ComplianceReportChargingEquipment(
+                    charging_equipment_id=equipment.charging_equipment_id,
+                    charging_equipment_version=equipment.charging_equipment_version,
+                    compliance_report_id=self.compliance_report_id,
+                    compliance_report_group_uuid=self.compliance_report_group_uuid,
+                    organization_id=self.report_organization_id,
+                    supply_from_date=data.supply_from_date,
+                    supply_to_date=data.supply_to_date,
+                    kwh_usage=data.kwh_usage,
+                    compliance_notes=data.compliance_notes,
+                    is_active=True,
+                )
+            )
+            await self.session.flush()
+        else:
+            # Update existing record; blank fields are skipped.
+            # Always activate the row — the mere presence of the
+            # registration number in the upload checks it in the report.
+            await self.fse_repo.bulk_update_fse_reporting_record(
+                charging_equipment_compliance_id=(
+                    existing_record.charging_equipment_compliance_id
+                ),
+                supply_from_date=data.supply_from_date,
+                supply_to_date=data.supply_to_date,
+                kwh_usage=data.kwh_usage,
+                compliance_notes=data.compliance_notes,
+                activate=True,
+            )
+        return True
 
 
 def _load_sheet(file: UploadFile):
-    """Loads the FSE_Update worksheet from the uploaded Excel file."""
-    workbook = load_workbook(data_only=True, filename=file.file)
-    if FSE_UPDATE_SHEETNAME not in workbook.sheetnames:
-        raise Exception(
-            f"Uploaded Excel does not contain an '{FSE_UPDATE_SHEETNAME}' sheet. "
-            "Please use the template downloaded from this page."
-        )
-    return workbook[FSE_UPDATE_SHEETNAME]
+    """Loads the FSE worksheet from the uploaded Excel file."""
+    return load_worksheet(file, FSE_UPDATE_SHEETNAME)
 
 
 def _parse_date(value) -> datetime.date:
@@ -462,8 +390,6 @@ async def _update_progress(
     rejected: int = 0,
     errors: List[str] | None = None,
 ):
-    if errors is None:
-        errors = []
     data = {
         "progress": progress,
         "status": status_msg,
@@ -471,6 +397,6 @@ async def _update_progress(
         "updated": updated,
         "skipped": skipped,
         "rejected": rejected,
-        "errors": errors,
+        "errors": errors or [],
     }
-    await redis_client.set(f"jobs/{job_id}", json.dumps(data), ex=60)
+    await write_job_progress(redis_client, job_id, data)
@@ -1,24 +1,32 @@
-import asyncio
-import concurrent.futures
 import datetime
-import io
-import json
 import re
 import structlog
-import uuid
-from fastapi import Depends, HTTPException, status, UploadFile
-from openpyxl import load_workbook
-from openpyxl.worksheet.worksheet import Worksheet
+from bisect import bisect_right, insort
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
+from fastapi import Depends, UploadFile
+from fastapi.responses import StreamingResponse
 from redis.asyncio import Redis
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable, List, Optional, Tuple
 
-from lcfs.db.dependencies import db_url, set_user_context
 from lcfs.db.models import UserProfile
-from lcfs.services.clamav.client import ClamAVService
+from lcfs.services.geocoder.spatial_index import get_bc_spatial_index
+from lcfs.services.imports.job import ImportColumn, RowRejected, SpreadsheetImportJob
+from lcfs.services.imports.runtime import (
+    IMPORT_JOB_ATTEMPTS,
+    import_file,
+    import_result,
+    queue_import,
+    read_job_status,
+    write_job_progress,
+)
+from lcfs.services.job_queue.queue import JobQueue, QueuedJob
+from lcfs.services.job_queue.registry import register_job
 from lcfs.services.redis.dependency import get_redis_client
-from lcfs.settings import settings
-from lcfs.utils.constants import POSTAL_REGEX, ALLOWED_MIME_TYPES, ALLOWED_FILE_TYPES, MAX_FILE_SIZE_BYTES, MAX_FILE_SIZE_MB
+from lcfs.services.redis.job_progress import job_progress_response
+from lcfs.utils.constants import POSTAL_REGEX
 from lcfs.web.api.compliance_report.repo import ComplianceReportRepository
 from lcfs.web.api.final_supply_equipment.repo import FinalSupplyEquipmentRepository
 from lcfs.web.api.final_supply_equipment.schema import (
@@ -33,6 +41,14 @@ from lcfs.web.api.organizations.repo import OrganizationsRepository
 
 logger = structlog.get_logger(__name__)
 
+IMPORT_JOB_TYPE = "import.final_supply_equipment"
+
+# Rows validated and inserted together in one savepoint
+IMPORT_CHUNK_SIZE = 500
+
+# Registration numbers end in a three digit sequence per postal code
+MAX_REGISTRATION_SEQUENCE = 999
+
 
 class FinalSupplyEquipmentImporter:
     def __init__(
@@ -40,16 +56,14 @@ class FinalSupplyEquipmentImporter:
         repo: FinalSupplyEquipmentRepository = Depends(),
         fse_service: FinalSupplyEquipmentServices = Depends(),
         compliance_report_repo: ComplianceReportRepository = Depends(),
-        clamav_service: ClamAVService = Depends(),
         redis_client: Redis = Depends(get_redis_client),
-        executor: concurrent.futures.ThreadPoolExecutor = Depends(),
+        queue: JobQueue = Depends(),
     ) -> None:
         self.repo = repo
         self.fse_service = fse_service
         self.compliance_report_repo = compliance_report_repo
-        self.clamav_service = clamav_service
         self.redis_client = redis_client
-        self.executor = executor
+        self.queue = queue
 
     @service_handler
     async def import_data(
@@ -59,9 +73,11 @@ class FinalSupplyEquipmentImporter:
         org_code: str,
         file: UploadFile,
         overwrite: bool,
+        dry_run: bool = False,
     ) -> str:
         """
-        Initiates the import job in a separate thread executor.
+        Queues the import job for the job workers, or with ``dry_run`` a job
+        that only validates the file.
         Returns a job_id that can be used to track progress via get_status.
         """
         compliance_report = (
@@ -72,72 +88,53 @@ class FinalSupplyEquipmentImporter:
         if not compliance_report:
             raise DataNotFoundException("Compliance report not found.")
 
-        job_id = str(uuid.uuid4())
-
-        # Initialize job status in Redis
-        await _update_progress(
-            self.redis_client, job_id, 0, "Starting import job...", 0, 0, []
+        job_id, created = await queue_import(
+            self.queue,
+            IMPORT_JOB_TYPE,
+            user,
+            file,
+            {
+                "compliance_report_id": compliance_report_id,
+                "org_code": org_code,
+                "overwrite": overwrite,
+                "dry_run": dry_run,
+            },
+            organization_id=compliance_report.organization_id,
         )
-
-        # Read file into memory once to enable scanning and openpyxl parsing
-        file_contents = await file.read()
-
-        # Validate MIME type
-        if file.content_type not in ALLOWED_MIME_TYPES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type '{file.content_type or 'unknown'}' is not allowed. Please upload files of the following types: {ALLOWED_FILE_TYPES}",
+        if created:
+            await _update_progress(
+                self.redis_client, job_id, 0, "Starting import job...", 0, 0, []
             )
 
-        # Validate file size
-        file_size = len(file_contents)
-        if file_size > MAX_FILE_SIZE_BYTES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds the maximum limit of {MAX_FILE_SIZE_MB} MB.",
-            )
-
-        # Create an in-memory buffer and attach it to a new UploadFile
-        buffer = io.BytesIO(file_contents)
-        buffer.seek(0)
-        copied_file = UploadFile(filename=file.filename, file=buffer)
-
-        loop = asyncio.get_running_loop()
-        loop.run_in_executor(
-            self.executor,
-            lambda: asyncio.run(
-                import_async(
-                    compliance_report_id,
-                    user,
-                    org_code,
-                    copied_file,
-                    job_id,
-                    overwrite,
-                )
-            ),
-        )
-
         return job_id
 
     async def get_status(self, job_id: str) -> dict:
         """
         Retrieves and returns the job's progress and status from Redis.
         """
-        progress_data_str = await self.redis_client.get(f"jobs/{job_id}")
-        if not progress_data_str:
-            return {"progress": 0, "status": "No job found with this ID."}
-
-        try:
-            progress_data = json.loads(progress_data_str)
-            return {
-                "progress": progress_data.get("progress", 0),
-                "status": progress_data.get("status", "No status available."),
-                "created": progress_data.get("created", 0),
-                "rejected": progress_data.get("rejected", 0),
-                "errors": progress_data.get("errors", []),
-            }
-        except json.JSONDecodeError:
-            return {"progress": 0, "status": "Invalid status data found."}
+        return await read_job_status(self.redis_client, job_id)
+
+    def stream_status(
+        self, job_id: str, last_event_id: Optional[str] = None
+    ) -> StreamingResponse:
+        """
+        Streams the job's progress as Server-Sent Events until it finishes.
+        """
+        return job_progress_response(self.redis_client, job_id, last_event_id)
+
+
+@register_job(IMPORT_JOB_TYPE, max_attempts=IMPORT_JOB_ATTEMPTS, per_organization=1)
+async def run_import_job(job: QueuedJob) -> dict:
+    result = await import_async(
+        job.payload["compliance_report_id"],
+        job.user,
+        job.payload["org_code"],
+        import_file(job),
+        job.job_id,
+        job.payload["overwrite"],
+        job.payload.get("dry_run", False),
+    )
+    return import_result(result)
 
 
 async def import_async(
@@ -147,193 +144,164 @@ async def import_async(
     file: UploadFile,
     job_id: str,
     overwrite: bool,
+    dry_run: bool = False,
 ):
     """
-    Performs the actual import in an async context.
-    This is offloaded to a thread pool to avoid blocking.
+    Performs the actual FSE import on a job worker.
     """
-    logger.debug("Importing FSE Data...")
-
-    engine = create_async_engine(db_url, future=True)
-    try:
-        async with AsyncSession(engine) as session:
-            async with session.begin():
-                await set_user_context(session, user.keycloak_username)
-
-                fs_repo = FuelSupplyRepository(session)
-                fse_repo = FinalSupplyEquipmentRepository(session)
-                cr_repo = ComplianceReportRepository(session, fs_repo)
-
-                # Import OrganizationsRepository and initialize it
-                org_repo = OrganizationsRepository(session)
-
-                # Provide all three required repositories
-                fse_service = FinalSupplyEquipmentServices(
-                    repo=fse_repo,
-                    compliance_report_repo=cr_repo,
-                    organization_repo=org_repo,
-                )
-                clamav_service = ClamAVService()
-                redis_client = Redis(
-                    host=settings.redis_host,
-                    port=settings.redis_port,
-                    password=settings.redis_pass,
-                    db=settings.redis_base or 0,
-                    decode_responses=True,
-                    max_connections=10,
-                    socket_timeout=5,
-                    socket_connect_timeout=5,
-                )
-
-                await _update_progress(
-                    redis_client, job_id, 5, "Initializing services..."
-                )
-
-                if overwrite:
-                    await _update_progress(
-                        redis_client, job_id, 10, "Deleting old data..."
-                    )
-                    await fse_service.delete_all(compliance_report_id)
-                    await fse_repo.reset_seq_by_org(org_code)
-
-                # Optional: Scan the file with ClamAV if enabled
-                if settings.clamav_enabled:
-                    await _update_progress(
-                        redis_client, job_id, 15, "Scanning file with ClamAV..."
-                    )
-                    clamav_service.scan_file(file)
-
-                await _update_progress(
-                    redis_client, job_id, 20, "Loading Excel sheet..."
-                )
-
-                try:
-                    sheet = _load_sheet(file)
-                    row_count = sheet.max_row
-
-                    created = 0
-                    rejected = 0
-                    errors = []
-
-                    await _update_progress(
-                        redis_client,
-                        job_id,
-                        20,
-                        "Beginning data import...",
-                        created=created,
-                        rejected=rejected,
-                        errors=errors,
-                    )
-
-                    valid_intended_user_types = await fse_repo.get_intended_user_types()
-                    valid_use_types = await fse_repo.get_intended_use_types()
-                    valid_use_type_names = {obj.type for obj in valid_use_types}
-                    valid_user_type_names = {
-                        obj.type_name for obj in valid_intended_user_types
-                    }
-                    organization_id = await _get_organization_id(
-                        org_repo, cr_repo, org_code, compliance_report_id
-                    )
-
-                    # Iterate through all data rows, skipping the header
-                    for row_idx, row in enumerate(
-                        sheet.iter_rows(min_row=2, values_only=True), start=2
-                    ):
-                        # Only update progress in Redis every 10 rows for efficiency
-                        if (row_idx + 1) % 10 == 0:
-                            current_progress = 20 + ((row_idx / row_count) * 80)
-                            status_msg = (
-                                f"Importing row {row_idx - 1} of {row_count - 1}..."
-                            )
-                            await _update_progress(
-                                redis_client,
-                                job_id,
-                                current_progress,
-                                status_msg,
-                                created=created,
-                                rejected=rejected,
-                                errors=errors,
-                            )
-
-                        # Check if the entire row is empty
-                        if all(cell is None for cell in row):
-                            continue
-
-                        row = list(row)
-                        row[9] = [row[9]] if row[9] is not None else []
-                        row[10] = [row[10]] if row[10] is not None else []
-
-                        # Validate row
-                        error = _validate_row(
-                            row, row_idx, valid_use_type_names, valid_user_type_names
-                        )
-                        if error:
-                            errors.append(error)
-                            rejected += 1
-                            continue
-
-                        # Parse row data and insert into DB
-                        try:
-                            fse_data = _parse_row(row, compliance_report_id)
-
-                            await fse_service.create_final_supply_equipment(
-                                fse_data, organization_id
-                            )
-                            created += 1
-                        except Exception as ex:
-                            logger.error(str(ex))
-                            errors.append(f"Row {row_idx}: {ex}")
-                            rejected += 1
-
-                    # Final update at 100%
-                    await _update_progress(
-                        redis_client,
-                        job_id,
-                        100,
-                        "Import process completed.",
-                        created=created,
-                        rejected=rejected,
-                        errors=errors,
-                    )
-                    logger.debug(
-                        f"Completed importing FSE data, {created} rows created"
-                    )
-
-                    return {
-                        "success": True,
-                        "created": created,
-                        "errors": errors,
-                        "rejected": rejected,
-                    }
+    job = FinalSupplyEquipmentImportJob(
+        job_id, user, file, compliance_report_id, org_code, overwrite, dry_run
+    )
+    return await job.run()
+
+
+class FinalSupplyEquipmentImportJob(SpreadsheetImportJob):
+    sheet_name = "FSE"
+    columns = (
+        ImportColumn("Organization"),
+        ImportColumn("Supply from date"),
+        ImportColumn("Supply to date"),
+        ImportColumn("kWh usage"),
+        ImportColumn("Serial #"),
+        ImportColumn("Manufacturer"),
+        ImportColumn("Model"),
+        ImportColumn("Level of equipment"),
+        ImportColumn("Ports"),
+        ImportColumn("Intended use"),
+        ImportColumn("Intended users"),
+        ImportColumn("Street address"),
+        ImportColumn("City"),
+        ImportColumn("Postal code"),
+        ImportColumn("Latitude"),
+        ImportColumn("Longitude"),
+        ImportColumn("Notes"),
+    )
+    chunk_size = IMPORT_CHUNK_SIZE
+    description = "FSE data"
 
-                except DataNotFoundException as dnfe:
-                    await _update_progress(
-                        redis_client, job_id, 100, "Data not found error.", 0, 0
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND, detail=str(dnfe)
-                    )
-                except Exception as e:
-                    await _update_progress(
-                        redis_client, job_id, 100, "Import process failed.", 0, 0
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Could not import FSE data: {str(e)}",
-                    )
-    finally:
-        await engine.dispose()
+    def __init__(
+        self,
+        job_id: str,
+        user: UserProfile,
+        file: UploadFile,
+        compliance_report_id: int,
+        org_code: str,
+        overwrite: bool,
+        dry_run: bool = False,
+    ) -> None:
+        super().__init__(job_id, user, file, dry_run)
+        self.compliance_report_id = compliance_report_id
+        self.org_code = org_code
+        self.overwrite = overwrite
+
+    async def prepare(self) -> None:
+        self.fse_repo = FinalSupplyEquipmentRepository(self.session)
+        cr_repo = ComplianceReportRepository(
+            self.session, FuelSupplyRepository(self.session)
+        )
+        org_repo = OrganizationsRepository(self.session)
+
+        # A dry run checks the rows against an empty report instead
+        if self.overwrite and not self.dry_run:
+            await self.update_progress(15, "Deleting old data...")
+            fse_service = FinalSupplyEquipmentServices(
+                repo=self.fse_repo,
+                compliance_report_repo=cr_repo,
+                organization_repo=org_repo,
+            )
+            await fse_service.delete_all(self.compliance_report_id)
+            await self.fse_repo.reset_seq_by_org(self.org_code)
+
+        valid_intended_user_types = await self.fse_repo.get_intended_user_types()
+        valid_use_types = await self.fse_repo.get_intended_use_types()
+        self.valid_use_type_names = {obj.type for obj in valid_use_types}
+        self.valid_user_type_names = {
+            obj.type_name for obj in valid_intended_user_types
+        }
+        self.lookups = _ImportLookups(
+            use_type_ids={obj.type: obj.end_use_type_id for obj in valid_use_types},
+            user_type_ids={
+                obj.type_name: obj.end_user_type_id for obj in valid_intended_user_types
+            },
+            level_ids={
+                obj.name: obj.level_of_equipment_id
+                for obj in await self.fse_repo.get_levels_of_equipment()
+            },
+            organization_code=await _get_organization_code(
+                org_repo, cr_repo, self.org_code, self.compliance_report_id
+            ),
+            username=self.user.keycloak_username,
+        )
+        self.intervals = _EquipmentIntervals(
+            ()
+            if self.overwrite
+            else await self.fse_repo.get_supply_date_ranges(self.compliance_report_id)
+        )
 
+    def row_values(self, row: tuple) -> list:
+        row = super().row_values(row)
+        # Intended use and users are single values in the sheet
+        row[9] = [row[9]] if row[9] is not None else []
+        row[10] = [row[10]] if row[10] is not None else []
+        return row
+
+    def row_checker(self):
+        return partial(
+            _check_row,
+            self.valid_use_type_names,
+            self.valid_user_type_names,
+            self.compliance_report_id,
+        )
 
-def _load_sheet(file: UploadFile) -> Worksheet:
+    async def write_chunk(
+        self, chunk: List[Tuple[int, FinalSupplyEquipmentCreateSchema]]
+    ) -> Tuple[int, List[Tuple[int, str]]]:
+        pending, errors = self._check_chunk_rows(chunk)
+        created, insert_errors = await _import_chunk(
+            self.session, self.fse_repo, self.lookups, pending
+        )
+        return created, errors + insert_errors
+
+    async def check_chunk(
+        self, chunk: List[Tuple[int, FinalSupplyEquipmentCreateSchema]]
+    ) -> Tuple[int, List[Tuple[int, str]]]:
+        pending, errors = self._check_chunk_rows(chunk)
+        return len(pending), errors
+
+    def _check_chunk_rows(
+        self, chunk: List[Tuple[int, FinalSupplyEquipmentCreateSchema]]
+    ) -> Tuple[
+        List[Tuple[int, FinalSupplyEquipmentCreateSchema]], List[Tuple[int, str]]
+    ]:
+        """
+        Rejects rows with an unknown level of equipment and rows that repeat
+        or overlap equipment already in the report or earlier in the file.
+        """
+        valid, errors = _split_by_level(self.lookups, chunk)
+        pending = []
+        for row_idx, fse_data in valid:
+            error = self.intervals.check(row_idx, fse_data)
+            if error:
+                errors.append((row_idx, error))
+            else:
+                pending.append((row_idx, fse_data))
+        return pending, errors
+
+
+def _check_row(
+    valid_use_types: set[str],
+    valid_user_types: set[str],
+    compliance_report_id: int,
+    row_idx: int,
+    row: list,
+) -> FinalSupplyEquipmentCreateSchema:
     """
-    Loads and returns the 'FSE' worksheet from the provided Excel file.
-    Raises an exception if the sheet does not exist.
+    Validates and parses one row. Runs on the process pool.
     """
-    workbook = load_workbook(data_only=True, filename=file.file)
-    if "FSE" not in workbook.sheetnames:
-        raise Exception("Uploaded Excel does not contain a 'FSE' sheet.")
-    return workbook["FSE"]
+    error = _validate_row(row, row_idx, valid_use_types, valid_user_types)
+    if error:
+        raise RowRejected(error)
+    return _parse_row(row, compliance_report_id)
 
 
 def _validate_row(
@@ -400,6 +368,15 @@ def _validate_row(
     if not postal_code_pattern.match(postal_code):
         return f"Row {row_idx}: Invalid postal code"
 
+    # Check the location against the bundled BC boundary, without the geocoder
+    try:
+        lat, lng = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return f"Row {row_idx}: Invalid latitude or longitude"
+    location_error = get_bc_spatial_index().site_location_error(postal_code, lat, lng)
+    if location_error:
+        return f"Row {row_idx}: {location_error}"
+
     # Validate intended uses
     invalid_uses = [use for use in intended_use_types if use not in valid_use_types]
     if invalid_uses:
@@ -488,28 +465,209 @@ async def _update_progress(
     """
     Persists the job status and progress in Redis.
     """
-    if errors is None:
-        errors = []
-    data = {
-        "progress": progress,
-        "status": status_msg,
-        "created": created,
-        "rejected": rejected,
-        "errors": errors,
-    }
-    await redis_client.set(f"jobs/{job_id}", json.dumps(data), ex=60)
-
-
-async def _get_organization_id(
+    await write_job_progress(
+        redis_client,
+        job_id,
+        {
+            "progress": progress,
+            "status": status_msg,
+            "created": created,
+            "rejected": rejected,
+            "errors": errors or [],
+        },
+    )
+
+
+@dataclass(frozen=True)
+class _ImportLookups:
+    """Reference data loaded once per import and shared by every chunk."""
+
+    use_type_ids: dict[str, int]
+    user_type_ids: dict[str, int]
+    level_ids: dict[str, int]
+    organization_code: str
+    username: str
+
+
+class _EquipmentIntervals:
+    """
+    Supply date ranges by equipment serial number and location, loaded
+    once from the report and extended with each accepted row. Gives the
+    same answers as check_uniques_of_fse_row and check_overlap_of_fse_row
+    without a query per row.
+    """
+
+    def __init__(self, ranges: Iterable[tuple] = ()) -> None:
+        # Ranges of each piece of equipment, sorted by start date
+        self._ranges: dict[tuple, List[Tuple[datetime.date, datetime.date]]] = {}
+        for serial_nbr, postal_code, latitude, longitude, start, end in ranges:
+            self._add((serial_nbr, postal_code, latitude, longitude), start, end)
+
+    def check(
+        self, row_idx: int, fse_data: FinalSupplyEquipmentCreateSchema
+    ) -> str | None:
+        """
+        Returns an error if the row repeats or overlaps a known range, and
+        otherwise records its range.
+        """
+        key = (
+            fse_data.serial_nbr,
+            fse_data.postal_code,
+            fse_data.latitude,
+            fse_data.longitude,
+        )
+        start, end = fse_data.supply_from_date, fse_data.supply_to_date
+        ranges = self._ranges.get(key, [])
+        # Only ranges starting on or before this one ends can overlap it
+        candidates = ranges[: bisect_right(ranges, (end, datetime.date.max))]
+        if (start, end) in candidates:
+            return (
+                f"Row {row_idx}: Duplicate equipment found. Each equipment must be "
+                "unique based on serial number, supply date range and location."
+            )
+        if any(other_end >= start for _, other_end in candidates):
+            return (
+                f"Row {row_idx}: Date range overlap found for equipment with serial "
+                f"number {fse_data.serial_nbr} at the same Charging site."
+            )
+        self._add(key, start, end)
+        return None
+
+    def _add(self, key: tuple, start: datetime.date, end: datetime.date) -> None:
+        insort(self._ranges.setdefault(key, []), (start, end))
+
+
+def _split_by_level(
+    lookups: _ImportLookups,
+    chunk: List[Tuple[int, FinalSupplyEquipmentCreateSchema]],
+) -> Tuple[List[Tuple[int, FinalSupplyEquipmentCreateSchema]], List[Tuple[int, str]]]:
+    """Separates rows with a known level of equipment from the rest."""
+    errors = []
+    valid = []
+    for row_idx, fse_data in chunk:
+        if fse_data.level_of_equipment not in lookups.level_ids:
+            errors.append(
+                (
+                    row_idx,
+                    f"Row {row_idx}: Invalid level of equipment: "
+                    f"{fse_data.level_of_equipment}",
+                )
+            )
+        else:
+            valid.append((row_idx, fse_data))
+    return valid, errors
+
+
+async def _import_chunk(
+    session: AsyncSession,
+    fse_repo: FinalSupplyEquipmentRepository,
+    lookups: _ImportLookups,
+    chunk: List[Tuple[int, FinalSupplyEquipmentCreateSchema]],
+) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Inserts a chunk of rows that passed _check_chunk_rows. Registration
+    numbers for the whole chunk are reserved in one statement and the rows
+    are written with one multi-row INSERT. The chunk runs in a savepoint, so
+    a database error rejects only that chunk's rows. Returns the created
+    count and one (row, message) error per rejected row.
+    """
+    if not chunk:
+        return 0, []
+
+    errors = []
+    rejected = set()
+    counts = Counter(fse_data.postal_code for _, fse_data in chunk)
+    try:
+        async with session.begin_nested():
+            allocated = await fse_repo.allocate_seq_by_org_and_postal_codes(
+                lookups.organization_code, counts, MAX_REGISTRATION_SEQUENCE
+            )
+            next_numbers = {
+                postal_code: previous + 1
+                for postal_code, (previous, _) in allocated.items()
+            }
+
+            rows, use_ids, user_ids = [], [], []
+            for row_idx, fse_data in chunk:
+                postal_code = fse_data.postal_code
+                sequence_number = next_numbers[postal_code]
+                if sequence_number > allocated[postal_code][1]:
+                    rejected.add(row_idx)
+                    errors.append(
+                        (
+                            row_idx,
+                            f"Row {row_idx}: Exceeded maximum registration numbers "
+                            "for the given postal code",
+                        )
+                    )
+                    continue
+                next_numbers[postal_code] += 1
+
+                rows.append(
+                    _fse_values(
+                        fse_data,
+                        lookups,
+                        f"{lookups.organization_code}-{postal_code.replace(' ', '')}"
+                        f"-{sequence_number:03d}",
+                    )
+                )
+                use_ids.append(
+                    [lookups.use_type_ids[name] for name in fse_data.intended_use_types]
+                )
+                user_ids.append(
+                    [
+                        lookups.user_type_ids[name]
+                        for name in fse_data.intended_user_types
+                    ]
+                )
+
+            if rows:
+                await fse_repo.bulk_create_final_supply_equipment(
+                    rows, use_ids, user_ids
+                )
+            return len(rows), errors
+    except Exception as ex:
+        logger.error(str(ex))
+        return 0, errors + [
+            (row_idx, f"Row {row_idx}: {ex}")
+            for row_idx, _ in chunk
+            if row_idx not in rejected
+        ]
+
+
+def _fse_values(
+    fse_data: FinalSupplyEquipmentCreateSchema,
+    lookups: _ImportLookups,
+    registration_nbr: str,
+) -> dict:
+    values = fse_data.model_dump(
+        exclude={
+            "final_supply_equipment_id",
+            "level_of_equipment",
+            "intended_use_types",
+            "intended_user_types",
+            "deleted",
+        }
+    )
+    values["ports"] = fse_data.ports.value if fse_data.ports else None
+    values["level_of_equipment_id"] = lookups.level_ids[fse_data.level_of_equipment]
+    values["registration_nbr"] = registration_nbr
+    values["create_user"] = lookups.username
+    values["update_user"] = lookups.username
+    return values
+
+
+async def _get_organization_code(
     org_repo: OrganizationsRepository,
     cr_repo: ComplianceReportRepository,
     org_code: str,
     compliance_report_id: int,
-) -> int:
+) -> str:
     """
-    Helper function to get organization ID from either org code or compliance report
+    Helper function to get the code registration numbers are built from,
+    using either the org code or the compliance report's organization
     """
-    # Try to get the organization ID from the organization code
+    # Try to get the organization from the organization code
     organization = await org_repo.get_organization_by_code(org_code)
 
     # If we can't find by code, try to get using the compliance report's organization
@@ -518,8 +676,10 @@ async def _get_organization_id(
             compliance_report_id
         )
         if compliance_report and compliance_report.organization_id:
-            return compliance_report.organization_id
-        else:
-            raise ValueError(f"Organization with code {org_code} not found")
-    else:
-        return organization.organization_id
+            organization = await org_repo.get_organization(
+                compliance_report.organization_id
+            )
+
+    if not organization:
+        raise ValueError(f"Organization with code {org_code} not found")
+    return organization.organization_code
@@ -18,6 +18,7 @@ from sqlalchemy import (
     case,
 )
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, aliased
 
@@ -44,6 +45,10 @@ from lcfs.db.models.compliance.ChargingSite import (
     latest_charging_site_version_subquery,
 )
 from lcfs.web.api.base import apply_filter_conditions, get_field_for_filter
+from lcfs.db.models.compliance.FinalSupplyEquipment import (
+    final_supply_intended_use_association,
+    final_supply_intended_user_association,
+)
 from lcfs.db.models.compliance.FinalSupplyEquipmentRegNumber import (
     FinalSupplyEquipmentRegNumber,
 )
@@ -672,6 +677,117 @@ class FinalSupplyEquipmentRepository:
             .values(current_sequence_number=1)
         )
 
+    @repo_handler
+    async def allocate_seq_by_org_and_postal_codes(
+        self, organization_code: str, counts: dict[str, int], max_sequence: int
+    ) -> dict[str, tuple[int, int]]:
+        """
+        Reserve sequence numbers for several postal codes with one upsert.
+
+        ``counts`` maps each postal code to how many numbers it needs. Returns
+        the previous and new current sequence number for each postal code; the
+        numbers in between are reserved. Sequences never go past
+        ``max_sequence``, so fewer numbers than requested may be reserved.
+        """
+        insert_stmt = pg_insert(FinalSupplyEquipmentRegNumber).values(
+            [
+                {
+                    "organization_code": organization_code,
+                    "postal_code": postal_code,
+                    "current_sequence_number": count,
+                }
+                for postal_code, count in counts.items()
+            ]
+        )
+        result = await self.db.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=[
+                    FinalSupplyEquipmentRegNumber.organization_code,
+                    FinalSupplyEquipmentRegNumber.postal_code,
+                ],
+                set_={
+                    "current_sequence_number": FinalSupplyEquipmentRegNumber.current_sequence_number
+                    + insert_stmt.excluded.current_sequence_number,
+                    "update_date": func.now(),
+                },
+            ).returning(
+                FinalSupplyEquipmentRegNumber.postal_code,
+                FinalSupplyEquipmentRegNumber.current_sequence_number,
+            )
+        )
+
+        # The row lock taken by the upsert makes new - count exact even when
+        # another import reserves numbers for the same postal code.
+        allocated = {}
+        for postal_code, current_number in result.all():
+            previous_number = current_number - counts[postal_code]
+            allocated[postal_code] = (
+                min(previous_number, max_sequence),
+                min(current_number, max_sequence),
+            )
+
+        exceeded = [
+            postal_code
+            for postal_code, (_, current_number) in allocated.items()
+            if current_number == max_sequence
+        ]
+        if exceeded:
+            await self.db.execute(
+                update(FinalSupplyEquipmentRegNumber)
+                .where(
+                    FinalSupplyEquipmentRegNumber.organization_code
+                    == organization_code,
+                    FinalSupplyEquipmentRegNumber.postal_code.in_(exceeded),
+                    FinalSupplyEquipmentRegNumber.current_sequence_number
+                    > max_sequence,
+                )
+                .values(current_sequence_number=max_sequence)
+            )
+        return allocated
+
+    @repo_handler
+    async def bulk_create_final_supply_equipment(
+        self,
+        rows: list[dict],
+        intended_use_ids: list[list[int]],
+        intended_user_ids: list[list[int]],
+    ) -> list[int]:
+        """
+        Insert final supply equipment rows and their intended use and user
+        associations with one multi-row INSERT per table. Returns the new IDs
+        in the order of ``rows``.
+        """
+        result = await self.db.execute(
+            sa.insert(FinalSupplyEquipment).returning(
+                FinalSupplyEquipment.final_supply_equipment_id,
+                sort_by_parameter_order=True,
+            ),
+            rows,
+        )
+        fse_ids = list(result.scalars().all())
+
+        use_rows = [
+            {"final_supply_equipment_id": fse_id, "end_use_type_id": type_id}
+            for fse_id, type_ids in zip(fse_ids, intended_use_ids)
+            for type_id in type_ids
+        ]
+        if use_rows:
+            await self.db.execute(
+                sa.insert(final_supply_intended_use_association), use_rows
+            )
+
+        user_rows = [
+            {"final_supply_equipment_id": fse_id, "end_user_type_id": type_id}
+            for fse_id, type_ids in zip(fse_ids, intended_user_ids)
+            for type_id in type_ids
+        ]
+        if user_rows:
+            await self.db.execute(
+                sa.insert(final_supply_intended_user_association), user_rows
+            )
+
+        return fse_ids
+
     @repo_handler
     async def check_uniques_of_fse_row(
         self, row: FinalSupplyEquipmentCreateSchema
@@ -735,6 +851,25 @@ class FinalSupplyEquipmentRepository:
 
         return result.scalar()
 
+    @repo_handler
+    async def get_supply_date_ranges(self, compliance_report_id: int) -> Sequence:
+        """
+        Returns the serial number, location and supply dates of every final
+        supply equipment row in the compliance report, so imports can check
+        for duplicates and overlaps in memory instead of per row.
+        """
+        result = await self.db.execute(
+            select(
+                FinalSupplyEquipment.serial_nbr,
+                FinalSupplyEquipment.postal_code,
+                FinalSupplyEquipment.latitude,
+                FinalSupplyEquipment.longitude,
+                FinalSupplyEquipment.supply_from_date,
+                FinalSupplyEquipment.supply_to_date,
+            ).where(FinalSupplyEquipment.compliance_report_id == compliance_report_id)
+        )
+        return result.all()
+
     @repo_handler
     async def search_manufacturers(self, query: str) -> Sequence[str]:
         """
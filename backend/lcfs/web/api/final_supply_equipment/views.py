@@ -229,10 +229,12 @@ async def import_fse(
     fse_repo: FinalSupplyEquipmentRepository = Depends(),
     importer: FinalSupplyEquipmentImporter = Depends(),
     overwrite: bool = Form(...),
+    dry_run: bool = Form(False),
 ):
     """
     Endpoint to import Final Supply Equipment data from an uploaded Excel file.
     The Excel must have a sheet named 'FSE' with the same columns as in the exporter.
+    With dry_run the file is only validated and nothing is saved.
 
     Columns:
     1. Organization
@@ -288,6 +290,7 @@ async def import_fse(
         compliance_report.organization.organization_code,
         file,
         overwrite,
+        dry_run,
     )
     return JSONResponse(content={"jobId": job_id})
 
@@ -349,6 +352,25 @@ async def get_job_status(
     return JSONResponse(content=status)
 
 
+@router.get(
+    "/status/{job_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+@view_handler(
+    [RoleEnum.COMPLIANCE_REPORTING, RoleEnum.SIGNING_AUTHORITY, RoleEnum.GOVERNMENT]
+)
+async def stream_job_status(
+    request: Request,
+    job_id: str,
+    importer: FinalSupplyEquipmentImporter = Depends(),
+):
+    """
+    Endpoint to stream the progress of a running FSE job as Server-Sent Events
+    """
+    return importer.stream_status(job_id, request.headers.get("last-event-id"))
+
+
 @router.get(
     "/reporting/update-template/{report_id}",
     response_class=StreamingResponse,
@@ -398,10 +420,12 @@ async def bulk_update_fse_reporting(
     file: UploadFile = File(...),
     report_validate: ComplianceReportValidation = Depends(),
     importer: FSEReportingImporter = Depends(),
+    dry_run: bool = Form(False),
 ):
     """
     Upload an Excel file to bulk-update FSE reporting data (dates, kWh, compliance notes).
     Records are matched by FSE Registration Number. Returns a job_id for progress polling.
+    With dry_run the file is only validated and nothing is saved.
     """
     try:
         compliance_report_id = int(report_id)
@@ -422,6 +446,7 @@ async def bulk_update_fse_reporting(
         compliance_report_id=compliance_report_id,
         user=request.user,
         file=file,
+        dry_run=dry_run,
     )
     return JSONResponse(content={"jobId": job_id})
 
@@ -445,6 +470,25 @@ async def get_fse_bulk_update_job_status(
     return JSONResponse(content=job_status)
 
 
+@router.get(
+    "/reporting/bulk-update/status/{job_id}/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+@view_handler(
+    [RoleEnum.COMPLIANCE_REPORTING, RoleEnum.SIGNING_AUTHORITY, RoleEnum.GOVERNMENT]
+)
+async def stream_fse_bulk_update_job_status(
+    request: Request,
+    job_id: str,
+    importer: FSEReportingImporter = Depends(),
+):
+    """
+    Stream the progress of a running FSE bulk-update import job as Server-Sent Events.
+    """
+    return importer.stream_status(job_id, request.headers.get("last-event-id"))
+
+
 @router.post(
     "/reporting/list",
     response_model=dict,
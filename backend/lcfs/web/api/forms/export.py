@@ -1,8 +1,11 @@
 """Base PDF and DOCX exporters """
 
+import hashlib
+import inspect
 import io
 import os
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 
 from docx import Document
@@ -12,6 +15,8 @@ from jinja2 import Environment, FileSystemLoader
 from pydantic import BaseModel
 from starlette.responses import StreamingResponse
 
+from lcfs.services.rendering.cache import RenderCache
+from lcfs.services.rendering.pool import run_in_render_pool
 from lcfs.web.api.forms.schema import DeclarationExportRequest
 
 _TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
@@ -22,6 +27,69 @@ _DOCX_MEDIA_TYPE = (
 )
 
 
+# ── Rendering ─────────────────────────────────────────────────────────────────
+# Rendering is CPU bound, so it runs in the render pool. The render functions
+# are module level so they can be pickled into the pool's worker processes.
+
+
+def render_pdf(template_file: str, ctx: dict) -> bytes:
+    """Render a Jinja2 template to PDF bytes with WeasyPrint."""
+    from weasyprint import HTML  # heavy import — defer until needed
+
+    html_str = _JINJA_ENV.get_template(template_file).render(**ctx)
+    return HTML(string=html_str, base_url=_TEMPLATE_DIR).write_pdf()
+
+
+def render_docx(exporter_cls: type, ctx: dict) -> bytes:
+    """Build a Word document with the exporter's ``_build_doc`` and return its bytes."""
+    stream = io.BytesIO()
+    exporter_cls()._build_doc(ctx).save(stream)
+    return stream.getvalue()
+
+
+# Context entries left out of the cache key. ``generated`` stamps the time of
+# day a document was rendered, which a cached document keeps; the day itself
+# stays in the key through ``generated_date``, so a document is never served
+# on a later day than the one it was stamped with.
+_UNKEYED_CONTEXT = ("generated",)
+
+
+@lru_cache(maxsize=None)
+def _source_fingerprint(*paths: str) -> str:
+    """Hash the files a render reads, descending into directories."""
+    digest = hashlib.sha256()
+    for path in paths:
+        files = [path]
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+            )
+        for file in files:
+            digest.update(os.path.relpath(file, path).encode())
+            with open(file, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+async def _render(
+    cache: Optional[RenderCache], template: str, ctx: dict, render, *args
+) -> bytes:
+    """Serve a render from the cache, or render it in the pool and cache it."""
+    keyed = {k: v for k, v in ctx.items() if k not in _UNKEYED_CONTEXT}
+    key = RenderCache.key(template, keyed)
+    if cache:
+        content = await cache.get(key)
+        if content:
+            return content
+
+    content = await run_in_render_pool(render, *args)
+    if cache:
+        await cache.set(key, content)
+    return content
+
+
 # ── Base exporters ────────────────────────────────────────────────────────────
 
 
@@ -37,13 +105,17 @@ class BasePdfExporter:
         raise NotImplementedError
 
     async def export(
-        self, payload: BaseModel, form_name: Optional[str] = None
+        self,
+        payload: BaseModel,
+        form_name: Optional[str] = None,
+        cache: Optional[RenderCache] = None,
     ) -> StreamingResponse:
-        from weasyprint import HTML  # heavy import — defer until needed
-
         ctx      = self.build_context(payload, form_name)
-        html_str = _JINJA_ENV.get_template(self.template_file).render(**ctx)
-        pdf      = HTML(string=html_str, base_url=_TEMPLATE_DIR).write_pdf()
+        # The whole template directory, so includes and stylesheets count too
+        template = f"{self.template_file}@{_source_fingerprint(_TEMPLATE_DIR)}"
+        pdf      = await _render(
+            cache, template, ctx, render_pdf, self.template_file, ctx
+        )
         filename = self.safe_filename(payload, "pdf")
 
         return StreamingResponse(
@@ -66,17 +138,22 @@ class BaseDocxExporter:
         raise NotImplementedError
 
     async def export(
-        self, payload: BaseModel, form_name: Optional[str] = None
+        self,
+        payload: BaseModel,
+        form_name: Optional[str] = None,
+        cache: Optional[RenderCache] = None,
     ) -> StreamingResponse:
-        ctx    = self.build_context(payload, form_name)
-        doc    = self._build_doc(ctx)
-        stream = io.BytesIO()
-        doc.save(stream)
-        stream.seek(0)
+        cls      = type(self)
+        ctx      = self.build_context(payload, form_name)
+        template = (
+            f"{cls.__module__}.{cls.__qualname__}"
+            f"@{_source_fingerprint(inspect.getfile(cls))}"
+        )
+        content  = await _render(cache, template, ctx, render_docx, cls, ctx)
         filename = self.safe_filename(payload, "docx")
 
         return StreamingResponse(
-            stream,
+            io.BytesIO(content),
             media_type=_DOCX_MEDIA_TYPE,
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
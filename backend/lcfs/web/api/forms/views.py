@@ -10,6 +10,7 @@ from starlette.responses import StreamingResponse
 from lcfs.db.dependencies import get_async_db_session
 from lcfs.db.models.form.Form import Form
 from lcfs.db.models.user.Role import RoleEnum
+from lcfs.services.rendering.cache import RenderCache
 from lcfs.web.api.forms.registry import FORM_REGISTRY
 from lcfs.web.api.forms.schema import FormResponse
 from lcfs.web.core.link_key_auth import anonymous_form_handler
@@ -45,7 +46,9 @@ async def _get_form_or_404(db: AsyncSession, form_slug: str) -> Form:
     return form
 
 
-async def _export(form: Form, body: dict, fmt: str) -> StreamingResponse:
+async def _export(
+    form: Form, body: dict, fmt: str, cache: RenderCache
+) -> StreamingResponse:
     """Validate the request body against the form's registered schema and export."""
     handler = FORM_REGISTRY.get(form.slug)
     if not handler:
@@ -59,7 +62,7 @@ async def _export(form: Form, body: dict, fmt: str) -> StreamingResponse:
         raise HTTPException(status_code=422, detail=exc.errors()) from exc
 
     exporter_cls = handler.pdf_exporter if fmt == "pdf" else handler.docx_exporter
-    return await exporter_cls().export(payload, form_name=form.name)
+    return await exporter_cls().export(payload, form_name=form.name, cache=cache)
 
 
 def _form_response(form: Form, request: Request) -> FormResponse:
@@ -123,10 +126,11 @@ async def export_form_authenticated(
     body: dict[str, Any] = Body(...),
     format: Literal["docx", "pdf"] = Query(default="docx"),
     db: AsyncSession = Depends(get_async_db_session),
+    render_cache: RenderCache = Depends(),
 ) -> StreamingResponse:
     form = await _get_form_or_404(db, form_slug)
     logger.info("form export", form_slug=form_slug, format=format)
-    return await _export(form, body, format)
+    return await _export(form, body, format, render_cache)
 
 
 @router.post("/{form_slug}/{link_key}/export")
@@ -142,7 +146,8 @@ async def export_form_by_link_key(
     body: dict[str, Any] = Body(...),
     format: Literal["docx", "pdf"] = Query(default="docx"),
     db: AsyncSession = Depends(get_async_db_session),
+    render_cache: RenderCache = Depends(),
 ) -> StreamingResponse:
     form = await _get_form_or_404(db, form_slug)
     logger.info("form export via link key", form_slug=form_slug, format=format)
-    return await _export(form, body, format)
+    return await _export(form, body, format, render_cache)
@@ -637,10 +637,13 @@ class FuelSupplyRepository:
                     selectinload(FuelCategory.target_carbon_intensities),
                     selectinload(FuelCategory.energy_effectiveness_ratio),
                 ),
+                # The fuel type's collections are loaded once per fuel type;
+                # joining them repeats every fuel supply row for each of
+                # their combinations
                 joinedload(FuelSupply.fuel_type).options(
-                    joinedload(FuelType.energy_density),
-                    joinedload(FuelType.additional_carbon_intensity),
-                    joinedload(FuelType.energy_effectiveness_ratio),
+                    selectinload(FuelType.energy_density),
+                    selectinload(FuelType.additional_carbon_intensity),
+                    selectinload(FuelType.energy_effectiveness_ratio),
                 ),
                 joinedload(FuelSupply.provision_of_the_act),
                 selectinload(FuelSupply.end_use_type),
@@ -9,6 +9,7 @@ from fastapi.responses import JSONResponse
 
 from lcfs.services.geocoder.client import BCGeocoderService
 from lcfs.services.geocoder.dependency import get_geocoder_service_async
+from lcfs.services.geocoder.spatial_index import get_bc_spatial_index
 from lcfs.services.geocoder.schema import (
     AddressRequest,
     ForwardGeocodeRequest,
@@ -210,8 +211,17 @@ async def check_bc_boundary(
             boundary_request.latitude,
             boundary_request.longitude
         )
+        postal_code_plausible = None
+        if boundary_request.postal_code:
+            postal_code_plausible = get_bc_spatial_index().postal_code_plausible(
+                boundary_request.postal_code,
+                boundary_request.latitude,
+                boundary_request.longitude,
+            )
         
-        return BoundaryCheckResponse(is_in_bc=is_in_bc)
+        return BoundaryCheckResponse(
+            is_in_bc=is_in_bc, postal_code_plausible=postal_code_plausible
+        )
         
     except Exception as e:
         logger.error(f"BC boundary check failed: {e}")
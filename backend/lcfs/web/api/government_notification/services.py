@@ -91,19 +91,17 @@ class GovernmentNotificationService:
             BaseNotificationTypeEnum.IDIR_DIRECTOR__GOVERNMENT_NOTIFICATION,
         ]
 
-        for notification_type in notification_types:
-            try:
-                await self.email_service.send_notification_email(
-                    notification_type=notification_type,
-                    notification_context=notification_context,
-                    organization_id=None,
-                    audience_type=None,
-                )
-                logger.info(
-                    f"Government notification email sent for {notification_type.value}"
-                )
-            except Exception as e:
-                logger.error(f"Failed to send email for {notification_type.value}: {e}")
+        # The types share a template, so each subscriber gets one email
+        try:
+            await self.email_service.send_notification_emails(
+                notification_types=notification_types,
+                notification_context=notification_context,
+                organization_id=None,
+                audience_type=None,
+            )
+            logger.info("Government notification emails sent")
+        except Exception as e:
+            logger.error(f"Failed to send government notification emails: {e}")
 
     @service_handler
     async def delete_notification(self) -> bool:
@@ -0,0 +1,83 @@
+"""
+In-process cache for the public login background endpoints.
+
+The login page asks for the active image and its bytes on every visit, so
+both are kept in memory. Entries belong to a cache version stored in Redis;
+any change to the images bumps the version, which empties the cache of
+every API process the next time it is read.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from lcfs.settings import settings
+
+# Seconds the active image is kept without a version change. Bounds how
+# long a process can hold metadata read just before a change committed.
+ACTIVE_IMAGE_TTL = 60
+
+# Marks an active image that has not been loaded, as None means no image
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class StoredImage:
+    content: bytes
+    media_type: str
+    file_name: str
+    etag: str
+
+
+class LoginBgImageCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._version: Optional[str] = None
+        self._active: Any = MISSING
+        self._active_loaded = 0.0
+        self._images: "OrderedDict[Tuple[int, Optional[int]], StoredImage]" = (
+            OrderedDict()
+        )
+        self._size = 0
+
+    def sync(self, version: str) -> None:
+        """Drops every entry when the images changed since they were cached."""
+        if version != self._version:
+            self.clear()
+            self._version = version
+
+    def clear(self) -> None:
+        self._active = MISSING
+        self._images.clear()
+        self._size = 0
+
+    def get_active(self) -> Any:
+        """The cached active image, or ``MISSING`` if it must be loaded."""
+        if time.monotonic() - self._active_loaded > ACTIVE_IMAGE_TTL:
+            return MISSING
+        return self._active
+
+    def set_active(self, image: Any) -> None:
+        self._active = image
+        self._active_loaded = time.monotonic()
+
+    def get_image(self, key: Tuple[int, Optional[int]]) -> Optional[StoredImage]:
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+        return image
+
+    def put_image(self, key: Tuple[int, Optional[int]], image: StoredImage) -> None:
+        size = len(image.content)
+        if size > self.max_bytes or key in self._images:
+            return
+        self._images[key] = image
+        self._size += size
+        # Least recently served images go first
+        while self._size > self.max_bytes:
+            _, evicted = self._images.popitem(last=False)
+            self._size -= len(evicted.content)
+
+
+login_bg_image_cache = LoginBgImageCache(settings.login_bg_image_cache_bytes)
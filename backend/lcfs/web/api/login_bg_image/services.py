@@ -1,15 +1,26 @@
+import io
 import os
 import uuid
 import structlog
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from botocore.exceptions import ClientError
 from fastapi import Depends, HTTPException, UploadFile
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from lcfs.db.dependencies import get_async_db_session
 from lcfs.db.models.login_bg_image.LoginBgImage import LoginBgImage
+from lcfs.services.redis.dependency import get_redis_client
+from lcfs.services.rendering.pool import run_in_render_pool
 from lcfs.services.s3.dependency import get_s3_client
+from lcfs.services.s3.transfer import run_s3
 from lcfs.settings import settings
+from lcfs.web.api.login_bg_image.cache import (
+    MISSING,
+    StoredImage,
+    login_bg_image_cache,
+)
 from lcfs.web.api.login_bg_image.repo import LoginBgImageRepository
 from lcfs.web.api.login_bg_image.schema import LoginBgImageSchema, LoginBgImageUpdateSchema
 from lcfs.web.core.decorators import service_handler
@@ -20,6 +31,44 @@ BUCKET_NAME = settings.s3_bucket
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp"}
 MAX_FILE_SIZE_BYTES = 20 * 1024 * 1024  # 20 MB
 S3_PREFIX = "login-backgrounds"
+# Widths of the WebP copies made of each upload, served to smaller screens
+VARIANT_WIDTHS = (1280, 1920, 2560)
+VARIANT_MEDIA_TYPE = "image/webp"
+# Bumped on every change so each API process drops its cached images
+CACHE_VERSION_KEY = "login_bg_images/version"
+
+
+def variant_key(image_key: str, width: int) -> str:
+    return f"{image_key}-w{width}.webp"
+
+
+def variant_width(width: Optional[int]) -> Optional[int]:
+    """The smallest variant covering ``width``; None serves the original."""
+    if not width:
+        return None
+    return next((w for w in VARIANT_WIDTHS if w >= width), VARIANT_WIDTHS[-1])
+
+
+def build_variants(content: bytes) -> Dict[int, bytes]:
+    """
+    Encodes an image as WebP at each of ``VARIANT_WIDTHS`` narrower than the
+    image. Images are never enlarged; screens wider than every variant get
+    the original. Runs on the render pool.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(content)) as original:
+        image = ImageOps.exif_transpose(original)
+        variants = {}
+        for width in VARIANT_WIDTHS:
+            if width >= image.width:
+                break
+            copy = image.copy()
+            copy.thumbnail((width, width * 10))
+            output = io.BytesIO()
+            copy.save(output, format="WEBP", quality=80)
+            variants[width] = output.getvalue()
+        return variants
 
 
 class LoginBgImageService:
@@ -27,9 +76,11 @@ class LoginBgImageService:
         self,
         repo: LoginBgImageRepository = Depends(),
         s3_client=Depends(get_s3_client),
+        redis_client: Redis = Depends(get_redis_client),
     ):
         self.repo = repo
         self.s3_client = s3_client
+        self.redis_client = redis_client
 
     @service_handler
     async def get_all(self) -> List[LoginBgImageSchema]:
@@ -38,10 +89,15 @@ class LoginBgImageService:
 
     @service_handler
     async def get_active(self) -> Optional[LoginBgImageSchema]:
+        use_cache = await self._sync_cache()
+        if use_cache and login_bg_image_cache.get_active() is not MISSING:
+            return login_bg_image_cache.get_active()
+
         image = await self.repo.get_active()
-        if image:
-            return LoginBgImageSchema.model_validate(image)
-        return None
+        schema = LoginBgImageSchema.model_validate(image) if image else None
+        if use_cache:
+            login_bg_image_cache.set_active(schema)
+        return schema
 
     @service_handler
     async def upload(
@@ -67,12 +123,14 @@ class LoginBgImageService:
         image_key = f"{S3_PREFIX}/{file_id}"
 
         file.file.seek(0)
-        self.s3_client.upload_fileobj(
+        await run_s3(
+            self.s3_client.upload_fileobj,
             Fileobj=file.file,
             Bucket=BUCKET_NAME,
             Key=image_key,
             ExtraArgs={"ContentType": file.content_type},
         )
+        await self._upload_variants(file, image_key)
 
         image = LoginBgImage(
             image_key=image_key,
@@ -82,6 +140,7 @@ class LoginBgImageService:
             is_active=False,
         )
         image = await self.repo.create(image)
+        await self._bump_cache_version()
         return LoginBgImageSchema.model_validate(image)
 
     @service_handler
@@ -97,6 +156,7 @@ class LoginBgImageService:
         image.display_name = data.display_name
         image.caption = data.caption
         image = await self.repo.update(image)
+        await self._bump_cache_version()
         return LoginBgImageSchema.model_validate(image)
 
     @service_handler
@@ -105,12 +165,16 @@ class LoginBgImageService:
         if not image:
             raise HTTPException(status_code=404, detail="Image not found")
 
-        try:
-            self.s3_client.delete_object(Bucket=BUCKET_NAME, Key=image.image_key)
-        except Exception as e:
-            logger.warning(f"Could not delete S3 object {image.image_key}: {e}")
+        for key in [image.image_key] + [
+            variant_key(image.image_key, width) for width in VARIANT_WIDTHS
+        ]:
+            try:
+                await run_s3(self.s3_client.delete_object, Bucket=BUCKET_NAME, Key=key)
+            except Exception as e:
+                logger.warning(f"Could not delete S3 object {key}: {e}")
 
         await self.repo.delete(image)
+        await self._bump_cache_version()
 
     @service_handler
     async def activate(self, image_id: int) -> LoginBgImageSchema:
@@ -121,13 +185,96 @@ class LoginBgImageService:
         await self.repo.deactivate_all()
         image.is_active = True
         image = await self.repo.update(image)
+        await self._bump_cache_version()
         return LoginBgImageSchema.model_validate(image)
 
-    async def stream_image(self, image_id: int):
-        """Stream an image directly from S3. Used by the login page (no auth required)."""
+    async def stream_image(
+        self, image_id: int, width: Optional[int] = None
+    ) -> StoredImage:
+        """
+        Returns an image's bytes, as the WebP variant covering ``width`` when
+        given. Used by the login page (no auth required). An image's content
+        never changes, so it is cached by id and served with an ETag.
+        """
+        cache_key = (image_id, variant_width(width))
+        use_cache = await self._sync_cache()
+        if use_cache and (stored := login_bg_image_cache.get_image(cache_key)):
+            return stored
+
         image = await self.repo.get_by_id(image_id)
         if not image:
             raise HTTPException(status_code=404, detail="Image not found")
 
-        response = self.s3_client.get_object(Bucket=BUCKET_NAME, Key=image.image_key)
-        return response, image
+        variant = cache_key[1]
+        response = None
+        if variant:
+            try:
+                response = await run_s3(
+                    self.s3_client.get_object,
+                    Bucket=BUCKET_NAME,
+                    Key=variant_key(image.image_key, variant),
+                )
+            except ClientError as e:
+                # Images uploaded before variants existed only have the original
+                if e.response.get("Error", {}).get("Code") != "NoSuchKey":
+                    raise
+                variant = None
+        if response is None:
+            response = await run_s3(
+                self.s3_client.get_object, Bucket=BUCKET_NAME, Key=image.image_key
+            )
+
+        body = response["Body"]
+        try:
+            content = await run_s3(body.read)
+        finally:
+            body.close()
+        # Image keys are never reused, so they identify the content
+        version = image.image_key.rsplit("/", 1)[-1]
+        stored = StoredImage(
+            content=content,
+            media_type=response["ContentType"],
+            file_name=image.file_name,
+            etag=f'"{version}-{variant or "original"}"',
+        )
+        if use_cache:
+            login_bg_image_cache.put_image(cache_key, stored)
+        return stored
+
+    async def _upload_variants(self, file: UploadFile, image_key: str) -> None:
+        try:
+            await file.seek(0)
+            variants = await run_in_render_pool(build_variants, await file.read())
+        except Exception as e:
+            # The original is still served to every screen
+            logger.warning("Could not create login image variants", error=str(e))
+            return
+
+        for width, content in variants.items():
+            await run_s3(
+                self.s3_client.put_object,
+                Body=content,
+                Bucket=BUCKET_NAME,
+                Key=variant_key(image_key, width),
+                ContentType=VARIANT_MEDIA_TYPE,
+            )
+
+    async def _sync_cache(self) -> bool:
+        """
+        Empties the process cache if the images changed elsewhere. Returns
+        False when the version cannot be read, so the cache is bypassed.
+        """
+        try:
+            version = await self.redis_client.get(CACHE_VERSION_KEY)
+        except Exception as e:
+            logger.warning("Could not read login image cache version", error=str(e))
+            return False
+        login_bg_image_cache.sync(version or "0")
+        return True
+
+    async def _bump_cache_version(self) -> None:
+        try:
+            await self.redis_client.incr(CACHE_VERSION_KEY)
+        except Exception as e:
+            logger.warning("Could not invalidate login image cache", error=str(e))
+        login_bg_image_cache.clear()
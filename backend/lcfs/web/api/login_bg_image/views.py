@@ -1,9 +1,8 @@
 import structlog
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Form, Request, UploadFile, status
+from fastapi import APIRouter, Depends, Form, Query, Request, Response, UploadFile, status
 from fastapi.params import File
-from starlette.responses import StreamingResponse
 
 from lcfs.db.models.user.Role import RoleEnum
 from lcfs.web.api.login_bg_image.schema import LoginBgImageSchema, LoginBgImageUpdateSchema
@@ -32,21 +31,28 @@ async def get_active_image(
     status_code=status.HTTP_200_OK,
 )
 async def stream_image(
+    request: Request,
     image_id: int,
+    width: Optional[int] = Query(None, gt=0),
     service: LoginBgImageService = Depends(),
 ):
-    """Streams the image bytes from S3. No auth required (used by login page)."""
-    s3_response, image = await service.stream_image(image_id)
+    """
+    Returns the image bytes, as a WebP copy sized for ``width`` when given.
+    No auth required (used by login page). An image id always serves the
+    same content, so responses may be cached indefinitely.
+    """
+    image = await service.stream_image(image_id, width)
     headers = {
-        "Content-Disposition": f'inline; filename="{image.file_name}"',
-        "content-length": str(s3_response["ContentLength"]),
-        "Cache-Control": "public, max-age=3600",
+        "ETag": image.etag,
+        "Cache-Control": "public, max-age=31536000, immutable",
     }
-    return StreamingResponse(
-        content=s3_response["Body"],
-        media_type=s3_response["ContentType"],
-        headers=headers,
-    )
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if image.etag in tags or "*" in tags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers["Content-Disposition"] = f'inline; filename="{image.file_name}"'
+    return Response(content=image.content, media_type=image.media_type, headers=headers)
 
 
 @router.get(
@@ -18,12 +18,21 @@ from lcfs.web.api.base import (
 )
 import structlog
 
-from typing import List, Optional, Sequence
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 from fastapi import Depends
+from redis.asyncio import Redis
 from lcfs.db.dependencies import get_async_db_session
+from lcfs.services.redis.dependency import get_redis_client
+from lcfs.services.redis.unread_counts import (
+    get_unread_count,
+    record_unread_changes,
+    store_unread_count,
+)
+from lcfs.web.api.notification.schema import NotificationMessageSchema
 from lcfs.web.exception.exceptions import DataNotFoundException
 
-from sqlalchemy import asc, delete, desc, or_, select, func, update
+from sqlalchemy import asc, delete, desc, insert, literal, or_, select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload, aliased
 
@@ -33,9 +42,46 @@ from sqlalchemy import and_
 logger = structlog.get_logger(__name__)
 
 
+def _notification_event(values: Mapping) -> Tuple[int, dict]:
+    """A created message's recipient, and the message as pushed to them."""
+    notification = NotificationMessageSchema.model_validate(dict(values))
+    return notification.related_user_profile_id, notification.model_dump(
+        mode="json", by_alias=True
+    )
+
+
+def _column_values(message: NotificationMessage) -> dict:
+    return {
+        column.key: getattr(message, column.key)
+        for column in NotificationMessage.__table__.columns
+    }
+
+
 class NotificationRepository:
-    def __init__(self, db: AsyncSession = Depends(get_async_db_session)):
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_async_db_session),
+        redis_client: Optional[Redis] = Depends(get_redis_client),
+    ):
         self.db = db
+        # Keeps the users' unread counts in Redis; None leaves them to Postgres
+        self.redis_client = redis_client
+
+    def _record_unread_changes(
+        self,
+        deltas: Optional[Mapping[int, int]] = None,
+        invalidated: Iterable = (),
+        created: Iterable[Mapping] = (),
+    ) -> None:
+        if self.redis_client is None:
+            return
+        record_unread_changes(
+            self.db,
+            self.redis_client,
+            deltas,
+            invalidated,
+            [_notification_event(values) for values in created],
+        )
 
     @repo_handler
     async def create_notification_message(
@@ -56,6 +102,11 @@ class NotificationRepository:
             ],
         )
         # await self.db.refresh(notification_message)
+        recipient_id = notification_message.related_user_profile_id
+        self._record_unread_changes(
+            {recipient_id: 0 if notification_message.is_read else 1},
+            created=[_column_values(notification_message)],
+        )
         return notification_message
 
     @repo_handler
@@ -67,6 +118,14 @@ class NotificationRepository:
         """
         self.db.add_all(notification_messages)
         await self.db.flush()
+        self._record_unread_changes(
+            Counter(
+                message.related_user_profile_id
+                for message in notification_messages
+                if not message.is_read
+            ),
+            created=map(_column_values, notification_messages),
+        )
 
     @repo_handler
     async def get_active_user_profile_ids_by_organization(
@@ -284,8 +343,15 @@ class NotificationRepository:
         self, user_id: int
     ) -> int:
         """
-        Retrieve count of unread notification message by user id
+        Retrieve count of unread notification message by user id, from the
+        user's Redis counter if it is cached and otherwise from Postgres,
+        caching the count for the next call
         """
+        if self.redis_client is not None:
+            count = await get_unread_count(self.redis_client, user_id)
+            if count is not None:
+                return count
+
         query = select(func.count(NotificationMessage.notification_message_id)).where(
             NotificationMessage.related_user_profile_id == user_id,
             NotificationMessage.is_read.is_(False),
@@ -294,8 +360,32 @@ class NotificationRepository:
         result = await self.db.execute(query)
         count = result.scalar_one()
 
+        if self.redis_client is not None:
+            await store_unread_count(self.redis_client, user_id, count)
         return count
 
+    @repo_handler
+    async def get_unread_counts_by_user_ids(
+        self, user_ids: List[int]
+    ) -> Dict[int, int]:
+        """
+        Count unread notification messages in Postgres for each of the
+        users, leaving out users without any
+        """
+        query = (
+            select(
+                NotificationMessage.related_user_profile_id,
+                func.count(NotificationMessage.notification_message_id),
+            )
+            .where(
+                NotificationMessage.related_user_profile_id.in_(user_ids),
+                NotificationMessage.is_read.is_(False),
+            )
+            .group_by(NotificationMessage.related_user_profile_id)
+        )
+        result = await self.db.execute(query)
+        return dict(result.all())
+
     @repo_handler
     async def update_notification_message(self, notification) -> NotificationMessage:
         """
@@ -303,6 +393,13 @@ class NotificationRepository:
         """
         merged_notification = await self.db.merge(notification)
         await self.db.flush()
+        # The message may have changed read state or recipient
+        self._record_unread_changes(
+            invalidated={
+                notification.related_user_profile_id,
+                merged_notification.related_user_profile_id,
+            }
+        )
 
         return merged_notification
 
@@ -311,12 +408,21 @@ class NotificationRepository:
         """
         Delete a notification_message by id
         """
-        query = delete(NotificationMessage).where(
-            NotificationMessage.notification_message_id == notification_id
+        query = (
+            delete(NotificationMessage)
+            .where(NotificationMessage.notification_message_id == notification_id)
+            .returning(
+                NotificationMessage.related_user_profile_id,
+                NotificationMessage.is_read,
+            )
         )
-        await self.db.execute(query)
+        result = await self.db.execute(query)
         await self.db.flush()
 
+        deleted = result.first()
+        if deleted and not deleted.is_read:
+            self._record_unread_changes({deleted.related_user_profile_id: -1})
+
     @repo_handler
     async def delete_notification_messages(self, user_id, notification_ids: List[int]):
         """
@@ -328,13 +434,17 @@ class NotificationRepository:
                 NotificationMessage.notification_message_id.in_(notification_ids),
                 NotificationMessage.related_user_profile_id == user_id,
             )
-            .returning(NotificationMessage.notification_message_id)
+            .returning(
+                NotificationMessage.notification_message_id,
+                NotificationMessage.is_read,
+            )
         )
         result = await self.db.execute(stmt)
         await self.db.flush()
 
-        deleted_ids = result.scalars().all()
-        return deleted_ids or []
+        deleted = result.all()
+        self._record_unread_changes({user_id: -sum(not row.is_read for row in deleted)})
+        return [row.notification_message_id for row in deleted]
 
     @repo_handler
     async def delete_all_notifications_for_user(self, user_id: int) -> list[int]:
@@ -351,6 +461,7 @@ class NotificationRepository:
         await self.db.flush()
 
         deleted_ids = result.scalars().all()
+        self._record_unread_changes(invalidated=[user_id])
         return deleted_ids
 
     @repo_handler
@@ -367,6 +478,8 @@ class NotificationRepository:
         notification = result.scalar_one_or_none()
 
         if notification:
+            if not notification.is_read:
+                self._record_unread_changes({notification.related_user_profile_id: -1})
             notification.is_read = True
             await self.db.commit()
             await self.db.refresh(notification)
@@ -389,13 +502,17 @@ class NotificationRepository:
                 and_(
                     NotificationMessage.notification_message_id.in_(notification_ids),
                     NotificationMessage.related_user_profile_id == user_id,
+                    NotificationMessage.is_read.is_(False),
                 )
             )
             .values(is_read=True)
+            .returning(NotificationMessage.notification_message_id)
         )
-        await self.db.execute(stmt)
+        result = await self.db.execute(stmt)
         await self.db.flush()
 
+        self._record_unread_changes({user_id: -len(result.all())})
+
         return notification_ids
 
     @repo_handler
@@ -414,6 +531,7 @@ class NotificationRepository:
         await self.db.flush()
 
         updated_ids = result.scalars().all()
+        self._record_unread_changes(invalidated=[user_id])
         return updated_ids
 
     @repo_handler
@@ -513,28 +631,23 @@ class NotificationRepository:
         result = await self.db.execute(query)
         return result.scalars().first()
 
-    @repo_handler
-    async def get_subscribed_users_by_channel(
+    def _subscriptions_query(
         self,
+        query,
         notification_type: NotificationTypeEnum,
         channel: ChannelEnum,
-        organization_id: int = None,
-        audience_type: AudienceType = AudienceType.SAME_ORGANIZATION,
-    ) -> List[int]:
+        organization_id: Optional[int],
+        audience_type: AudienceType,
+    ):
         """
-        Retrieve a list of user ids subscribed to a notification type
+        Restricts ``query`` to the enabled subscriptions of a notification
+        type and channel whose users are in the audience.
         """
         # Import locally to avoid circular import
         from lcfs.db.models.user.UserProfile import UserProfile
 
         query = (
-            select(NotificationChannelSubscription)
-            .options(
-                selectinload(NotificationChannelSubscription.user_profile)
-                .selectinload(UserProfile.user_roles)
-                .joinedload(UserRole.role)
-            )
-            .join(
+            query.join(
                 NotificationType,
                 NotificationType.notification_type_id
                 == NotificationChannelSubscription.notification_type_id,
@@ -583,9 +696,96 @@ class NotificationRepository:
                         UserProfile.organization_id.is_(None),
                     )
                 )
+        return query
+
+    @repo_handler
+    async def get_subscribed_users_by_channel(
+        self,
+        notification_type: NotificationTypeEnum,
+        channel: ChannelEnum,
+        organization_id: int = None,
+        audience_type: AudienceType = AudienceType.SAME_ORGANIZATION,
+    ) -> List[int]:
+        """
+        Retrieve a list of user ids subscribed to a notification type
+        """
+        # Import locally to avoid circular import
+        from lcfs.db.models.user.UserProfile import UserProfile
+
+        query = self._subscriptions_query(
+            select(NotificationChannelSubscription).options(
+                selectinload(NotificationChannelSubscription.user_profile)
+                .selectinload(UserProfile.user_roles)
+                .joinedload(UserRole.role)
+            ),
+            notification_type,
+            channel,
+            organization_id,
+            audience_type,
+        )
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    @repo_handler
+    async def create_subscribed_notification_messages(
+        self,
+        notification_type: NotificationTypeEnum,
+        message: dict,
+        organization_id: Optional[int] = None,
+        audience_type: AudienceType = AudienceType.SAME_ORGANIZATION,
+        exclude_analysts: bool = False,
+    ) -> int:
+        """
+        Create the in-app message ``message`` for every user subscribed to
+        the notification type in one INSERT ... SELECT, without loading the
+        subscribers. Returns the number of messages created.
+        """
+        columns = NotificationMessage.__table__.c
+        recipients = self._subscriptions_query(
+            select(
+                *(
+                    literal(value, columns[name].type)
+                    for name, value in message.items()
+                ),
+                NotificationChannelSubscription.notification_type_id,
+                NotificationChannelSubscription.user_profile_id,
+            ).select_from(NotificationChannelSubscription),
+            notification_type,
+            ChannelEnum.IN_APP,
+            organization_id,
+            audience_type,
+        )
+        if exclude_analysts:
+            recipients = recipients.where(
+                ~select(UserRole.user_role_id)
+                .join(Role, Role.role_id == UserRole.role_id)
+                .where(
+                    UserRole.user_profile_id
+                    == NotificationChannelSubscription.user_profile_id,
+                    Role.name == RoleEnum.ANALYST,
+                )
+                .exists()
+            )
+
+        result = await self.db.execute(
+            insert(NotificationMessage)
+            .from_select(
+                [*message, "notification_type_id", "related_user_profile_id"],
+                recipients,
+            )
+            .returning(*NotificationMessage.__table__.columns)
+        )
+        created = result.mappings().all()
+        self._record_unread_changes(
+            Counter(
+                values["related_user_profile_id"]
+                for values in created
+                if not values["is_read"]
+            ),
+            created=created,
+        )
+        return len(created)
+
     @repo_handler
     async def delete_subscriptions_for_user_role(
         self, user_profile_id: int, role: RoleEnum
@@ -1,6 +1,15 @@
+import hashlib
 import math
 import json
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.responses import StreamingResponse
+
+from lcfs.db.base import current_user_var
+from lcfs.db.dependencies import get_db_session_factory, set_user_context
 from lcfs.db.models.notification import (
     NotificationChannelSubscription,
     NotificationMessage,
@@ -12,7 +21,12 @@ from lcfs.web.api.base import (
     PaginationRequestSchema,
     PaginationResponseSchema,
 )
-from lcfs.db.models.user.Role import RoleEnum
+from lcfs.services.job_queue.queue import JobQueue, QueuedJob
+from lcfs.services.job_queue.registry import register_job
+from lcfs.services.redis.dependency import get_redis_client
+from lcfs.services.redis.notification_events import notification_events_response
+from lcfs.services.redis.unread_counts import get_unread_count
+from lcfs.web.api.email.repo import CHESEmailRepository
 from lcfs.web.api.email.services import CHESEmailService
 from lcfs.web.api.notification.schema import (
     NotificationRequestSchema,
@@ -20,14 +34,25 @@ from lcfs.web.api.notification.schema import (
     SubscriptionSchema,
     NotificationMessageSchema,
 )
+from lcfs.settings import settings
 from lcfs.web.exception.exceptions import DataNotFoundException
 import structlog
 from fastapi import Depends
 from lcfs.web.api.notification.repo import NotificationRepository
 from lcfs.web.core.decorators import service_handler
 
+if TYPE_CHECKING:
+    from lcfs.db.models.user.UserProfile import UserProfile
+
 logger = structlog.get_logger(__name__)
 
+NOTIFICATION_JOB_TYPE = "notification"
+NOTIFICATION_EMAIL_JOB_TYPE = "notification_email"
+
+# Delivery is retried with the queue's backoff, so a CHES outage of up to
+# about half an hour does not lose the email
+NOTIFICATION_JOB_ATTEMPTS = 6
+
 
 class NotificationService:
 
@@ -35,9 +60,11 @@ class NotificationService:
         self,
         repo: NotificationRepository = Depends(NotificationRepository),
         email_service: CHESEmailService = Depends(CHESEmailService),
+        job_queue: JobQueue = Depends(JobQueue),
     ) -> None:
         self.repo = repo
         self.email_service = email_service
+        self.job_queue = job_queue
 
     @service_handler
     async def get_notification_messages_by_user_id(
@@ -311,7 +338,29 @@ class NotificationService:
     @service_handler
     async def send_notification(self, notification: NotificationRequestSchema):
         """
-        Send subscribed notifications to users.
+        Queues subscribed notifications for delivery. The job is written in
+        the caller's transaction, so notifications are sent only if the
+        change they announce commits, and the caller does not wait on them.
+        """
+        payload = notification.model_dump(mode="json", exclude_unset=True)
+        fingerprint = json.dumps(payload, sort_keys=True)
+        job_id, created = await self.job_queue.enqueue(
+            NOTIFICATION_JOB_TYPE,
+            payload,
+            user=current_user_var.get(),
+            organization_id=notification.notification_data.related_organization_id,
+            idempotency_key=hashlib.sha256(fingerprint.encode()).hexdigest(),
+        )
+        if not created:
+            logger.info("Notification is already queued", job_id=job_id)
+        return job_id
+
+    @service_handler
+    async def deliver_notification(self, notification: NotificationRequestSchema):
+        """
+        Creates the in-app notifications for each type and queues its email.
+        Runs on a job worker; the emails are separate jobs so that a failed
+        send is retried without creating the in-app notifications again.
         """
         # Prepare context once, outside the loop
         notification.notification_context.update(
@@ -339,59 +388,48 @@ class NotificationService:
             "recorded",
             "refused",
         ]
+        # Skip sending to Analysts if the org is not the receiving org and status is Recorded/Refused
+        related_org_id = notification.notification_data.related_organization_id
+        exclude_analysts = bool(
+            is_recorded_or_refused and to_org_id and related_org_id != to_org_id
+        )
+        message = notification.notification_data.model_dump(
+            exclude_unset=True,
+            exclude={"deleted", "notification_type_id", "related_user_profile_id"},
+        )
 
+        total = 0
         for notification_type in notification.notification_types:
             # Determine audience type based on notification type
             audience_type = self.determine_audience_type(notification_type)
 
-            in_app_subscribed_users = await self.repo.get_subscribed_users_by_channel(
+            # Fan the message out to the subscribers in the database
+            created = await self.repo.create_subscribed_notification_messages(
                 notification_type,
-                ChannelEnum.IN_APP,
-                notification.notification_data.related_organization_id,
+                message,
+                related_org_id,
                 audience_type,
+                exclude_analysts=exclude_analysts,
+            )
+            logger.info(
+                "In-app notifications created",
+                notification_type=notification_type.value,
+                count=created,
             )
 
-            # Skip sending to Analysts if the org is not the receiving org and status is Recorded/Refused
-            final_subscriptions = []
-            for sub in in_app_subscribed_users:
-                skip = False
-
-                if is_recorded_or_refused and sub.user_profile:
-                    # Check if user is Analyst
-                    roles = [ur.role.name for ur in sub.user_profile.user_roles]
-                    if RoleEnum.ANALYST in roles:
-                        org_we_are_notifying = (
-                            notification.notification_data.related_organization_id
-                        )
-                        if to_org_id and org_we_are_notifying != to_org_id:
-                            skip = True
-
-                if not skip:
-                    final_subscriptions.append(sub)
-
-            in_app_subscribed_users = final_subscriptions
-
-            # Batch create in-app notifications
-            in_app_notifications = [
-                NotificationMessage(
-                    **notification.notification_data.model_dump(
-                        exclude_unset=True, exclude={"deleted"}
-                    ),
-                    notification_type_id=subscription.notification_type_id,
-                    related_user_profile_id=subscription.user_profile_id,
+            # Queue any email notifications
+            if settings.ches_enabled:
+                await self.job_queue.enqueue(
+                    NOTIFICATION_EMAIL_JOB_TYPE,
+                    {
+                        "notification_type": notification_type.value,
+                        "notification_context": notification.notification_context,
+                        "organization_id": related_org_id,
+                        "audience_type": audience_type.value,
+                    },
                 )
-                for subscription in in_app_subscribed_users
-            ]
-            if in_app_notifications:
-                await self.repo.create_notification_messages(in_app_notifications)
-
-            # Send any email notifications
-            await self.email_service.send_notification_email(
-                notification_type,
-                notification.notification_context,
-                notification.notification_data.related_organization_id,
-                audience_type,
-            )
+            total += created
+        return total
 
     @service_handler
     async def delete_subscriptions_for_user_role(
@@ -438,3 +476,95 @@ class NotificationService:
         Removes all notification channel subscriptions for this user.
         """
         await self.repo.delete_subscriptions_for_user(user_profile_id)
+
+
+class UnreadNotificationCountService:
+    """
+    Serves the unread notification count every open page shows, polled or
+    followed as live events. It takes no request session, so a cached count
+    costs one Redis GET; only a count missing from Redis is rebuilt, on a
+    session of its own.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis = Depends(get_redis_client),
+        session_factory: Optional[async_sessionmaker] = Depends(get_db_session_factory),
+    ) -> None:
+        self.redis_client = redis_client
+        self.session_factory = session_factory
+
+    @service_handler
+    async def count_unread_notifications(self, user_id: int) -> int:
+        count = await get_unread_count(self.redis_client, user_id)
+        if count is None:
+            async with self.session_factory() as session:
+                repo = NotificationRepository(session, self.redis_client)
+                count = await repo.get_unread_notification_message_count_by_user_id(
+                    user_id
+                )
+        return count
+
+    def stream_notification_events(
+        self, user_id: int, last_event_id: Optional[str] = None
+    ) -> StreamingResponse:
+        """
+        Streams the user's new notifications and unread count, resuming
+        after ``last_event_id`` when a client reconnects.
+        """
+        return notification_events_response(
+            self.redis_client,
+            user_id,
+            lambda: self.count_unread_notifications(user_id),
+            last_event_id,
+        )
+
+
+@asynccontextmanager
+async def notification_session(
+    user: Optional["UserProfile"],
+) -> AsyncIterator[AsyncSession]:
+    """A pooled session for a notification job, committed when the block exits."""
+    # The worker imports the user model, which imports this module
+    from lcfs.services.job_queue.worker import get_job_resources
+
+    async with get_job_resources().session_factory() as session:
+        async with session.begin():
+            if user:
+                await set_user_context(session, user.keycloak_username)
+                current_user_var.set(user)
+            yield session
+
+
+@register_job(
+    NOTIFICATION_JOB_TYPE, priority=20, max_attempts=NOTIFICATION_JOB_ATTEMPTS
+)
+async def run_notification_job(job: QueuedJob) -> dict:
+    notification = NotificationRequestSchema.model_validate(job.payload)
+    # The worker imports the user model, which imports this module
+    from lcfs.services.job_queue.worker import get_job_resources
+
+    async with notification_session(job.user) as session:
+        service = NotificationService(
+            NotificationRepository(session, get_job_resources().redis_client),
+            CHESEmailService(CHESEmailRepository(session)),
+            JobQueue(session),
+        )
+        created = await service.deliver_notification(notification)
+    return {"created": created}
+
+
+@register_job(
+    NOTIFICATION_EMAIL_JOB_TYPE, priority=20, max_attempts=NOTIFICATION_JOB_ATTEMPTS
+)
+async def run_notification_email_job(job: QueuedJob) -> dict:
+    async with notification_session(job.user) as session:
+        email_service = CHESEmailService(CHESEmailRepository(session))
+        sent = await email_service.send_notification_email(
+            NotificationTypeEnum(job.payload["notification_type"]),
+            job.payload["notification_context"],
+            job.payload["organization_id"],
+            AudienceType(job.payload["audience_type"]),
+            raise_on_failure=True,
+        )
+    return {"sent": bool(sent)}
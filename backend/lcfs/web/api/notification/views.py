@@ -19,9 +19,13 @@ from lcfs.web.api.notification.schema import (
     NotificationCountSchema,
     NotificationBatchOperationSchema,
 )
-from lcfs.web.api.notification.services import NotificationService
+from lcfs.web.api.notification.services import (
+    NotificationService,
+    UnreadNotificationCountService,
+)
 from lcfs.web.core.decorators import view_handler
 from starlette import status
+from starlette.responses import StreamingResponse
 
 
 router = APIRouter()
@@ -109,18 +113,35 @@ async def delete_notification_messages(
 )
 @view_handler(["*"])
 async def get_unread_notifications(
-    request: Request, service: NotificationService = Depends()
+    request: Request, service: UnreadNotificationCountService = Depends()
 ):
     """
     Retrieve counter for unread notifications by user id
     """
     # Count unread notifications
-    count = await service.count_unread_notifications_by_user_id(
+    count = await service.count_unread_notifications(
         user_id=request.user.user_profile_id
     )
     return NotificationCountSchema(count=count)
 
 
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+@view_handler(["*"])
+async def stream_notification_events(
+    request: Request, service: UnreadNotificationCountService = Depends()
+):
+    """
+    Stream new notifications and unread count changes as Server-Sent Events
+    """
+    return service.stream_notification_events(
+        request.user.user_profile_id, request.headers.get("last-event-id")
+    )
+
+
 @router.get(
     "/subscriptions",
     response_model=List[SubscriptionSchema],
@@ -1,6 +1,8 @@
+from typing import List, Optional, Tuple
+
 import structlog
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import immediateload
 
@@ -55,3 +57,115 @@ class OrganizationSnapshotRepository:
         await self.db.flush()
         await self.db.refresh(org_snapshot)
         return org_snapshot
+
+    @staticmethod
+    def _same_addresses(
+        records_address: Optional[str],
+        service_address: Optional[str],
+        head_office_address: Optional[str],
+    ):
+        return and_(
+            ComplianceReportOrganizationSnapshot.records_address.is_not_distinct_from(
+                records_address
+            ),
+            ComplianceReportOrganizationSnapshot.service_address.is_not_distinct_from(
+                service_address
+            ),
+            ComplianceReportOrganizationSnapshot.head_office_address.is_not_distinct_from(
+                head_office_address
+            ),
+        )
+
+    @repo_handler
+    async def get_coordinates_for_addresses(
+        self,
+        records_address: Optional[str],
+        service_address: Optional[str],
+        head_office_address: Optional[str],
+    ) -> Optional[Tuple[float, float]]:
+        """
+        The coordinates of a snapshot with the same addresses that has
+        already been geocoded, if there is one.
+        """
+        stmt = (
+            select(
+                ComplianceReportOrganizationSnapshot.latitude,
+                ComplianceReportOrganizationSnapshot.longitude,
+            )
+            .where(
+                self._same_addresses(
+                    records_address, service_address, head_office_address
+                ),
+                ComplianceReportOrganizationSnapshot.latitude.is_not(None),
+                ComplianceReportOrganizationSnapshot.longitude.is_not(None),
+            )
+            .limit(1)
+        )
+        row = (await self.db.execute(stmt)).first()
+        return tuple(row) if row else None
+
+    @repo_handler
+    async def set_coordinates_for_addresses(
+        self,
+        records_address: Optional[str],
+        service_address: Optional[str],
+        head_office_address: Optional[str],
+        latitude: float,
+        longitude: float,
+    ) -> int:
+        """
+        Sets the coordinates of every snapshot with these addresses that has
+        none, and returns how many were set.
+        """
+        stmt = (
+            update(ComplianceReportOrganizationSnapshot)
+            .where(
+                self._same_addresses(
+                    records_address, service_address, head_office_address
+                ),
+                ComplianceReportOrganizationSnapshot.latitude.is_(None),
+            )
+            .values(latitude=latitude, longitude=longitude)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
+
+    @repo_handler
+    async def get_ungeocoded_addresses(
+        self, after_snapshot_id: int = 0, limit: int = 100
+    ) -> List[dict]:
+        """
+        Distinct address sets of snapshots without coordinates, each with the
+        lowest snapshot ID that has it. Sets are ordered by that ID and only
+        those past ``after_snapshot_id`` are returned, so a caller can page
+        through them without seeing one twice.
+        """
+        snapshot = ComplianceReportOrganizationSnapshot
+        first_snapshot_id = func.min(snapshot.organization_snapshot_id)
+        stmt = (
+            select(
+                first_snapshot_id.label("organization_snapshot_id"),
+                snapshot.records_address,
+                snapshot.service_address,
+                snapshot.head_office_address,
+            )
+            .where(
+                snapshot.latitude.is_(None),
+                or_(
+                    func.coalesce(snapshot.records_address, "") != "",
+                    func.coalesce(snapshot.service_address, "") != "",
+                    func.coalesce(snapshot.head_office_address, "") != "",
+                ),
+            )
+            .group_by(
+                snapshot.records_address,
+                snapshot.service_address,
+                snapshot.head_office_address,
+            )
+            .having(first_snapshot_id > after_snapshot_id)
+            .order_by(first_snapshot_id)
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return [dict(row) for row in result.mappings()]
@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 import structlog
 from fastapi import Depends, Request
 from sqlalchemy.exc import NoResultFound
@@ -7,11 +10,96 @@ from typing import Optional, Tuple
 from lcfs.db.dependencies import get_async_db_session
 from lcfs.db.models import ComplianceReportOrganizationSnapshot
 from lcfs.services.geocoder.client import BCGeocoderService
-from lcfs.services.geocoder.dependency import get_geocoder_service_async
+from lcfs.services.geocoder.dependency import get_geocoder_service
+from lcfs.services.job_queue.queue import JobQueue, QueuedJob
+from lcfs.services.job_queue.registry import register_job
 from lcfs.web.api.organization_snapshot.repo import OrganizationSnapshotRepository
 
 logger = structlog.get_logger(__name__)
 
+GEOCODE_JOB_TYPE = "organization_snapshot_geocode"
+GEOCODE_JOB_ATTEMPTS = 3
+
+# Snapshot address fields in the order they are tried when geocoding
+ADDRESS_FIELDS = ("records_address", "service_address", "head_office_address")
+
+
+async def geocode_snapshot_address(
+    geocoder: BCGeocoderService,
+    records_address: Optional[str],
+    service_address: Optional[str],
+    head_office_address: Optional[str],
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Geocode organization address using priority order:
+    1. records_address - Required to be in BC where records are maintained
+    2. service_address - BC postal address for service
+    3. head_office_address - Can be international, last resort
+
+    Returns:
+        Tuple of (latitude, longitude) or (None, None) if geocoding fails
+    """
+    addresses_to_try = [
+        (records_address, "records_address"),
+        (service_address, "service_address"),
+        (head_office_address, "head_office_address"),
+    ]
+
+    for address, address_type in addresses_to_try:
+        if address:
+            try:
+                result = await geocoder.forward_geocode(address, use_fallback=True)
+                if result.success and result.address:
+                    logger.info(
+                        f"Geocoded {address_type} successfully",
+                        latitude=result.address.latitude,
+                        longitude=result.address.longitude,
+                        source=result.source,
+                    )
+                    return result.address.latitude, result.address.longitude
+                else:
+                    logger.debug(
+                        f"Geocoding failed for {address_type}",
+                        address=address[:50],
+                        error=result.error,
+                    )
+            except Exception as e:
+                logger.warning(
+                    f"Geocoding error for {address_type}",
+                    address=address[:50],
+                    error=str(e),
+                )
+
+    logger.info("All geocoding attempts failed for organization snapshot")
+    return None, None
+
+
+@register_job(GEOCODE_JOB_TYPE, max_attempts=GEOCODE_JOB_ATTEMPTS, concurrency=2)
+async def run_geocode_job(job: QueuedJob) -> dict:
+    """
+    Geocodes one set of snapshot addresses and writes the coordinates to
+    every snapshot that has those addresses and none yet.
+    """
+    # The worker imports the user model, which imports this module
+    from lcfs.services.job_queue.worker import get_job_resources
+
+    resources = get_job_resources()
+    addresses = [job.payload.get(field) for field in ADDRESS_FIELDS]
+    async with resources.session_factory() as session:
+        async with session.begin():
+            repo = OrganizationSnapshotRepository(session)
+            coordinates = await repo.get_coordinates_for_addresses(*addresses)
+            if coordinates is None:
+                geocoder = get_geocoder_service(resources.redis_client)
+                latitude, longitude = await geocode_snapshot_address(
+                    geocoder, *addresses
+                )
+                if latitude is None or longitude is None:
+                    return {"updated": 0}
+                coordinates = (latitude, longitude)
+            updated = await repo.set_coordinates_for_addresses(*addresses, *coordinates)
+    return {"updated": updated}
+
 
 class OrganizationSnapshotService:
     def __init__(
@@ -19,61 +107,36 @@ class OrganizationSnapshotService:
         request: Request = None,
         repo: OrganizationSnapshotRepository = Depends(OrganizationSnapshotRepository),
         session: AsyncSession = Depends(get_async_db_session),
-        geocoder: BCGeocoderService = Depends(get_geocoder_service_async),
+        job_queue: JobQueue = Depends(JobQueue),
     ) -> None:
         self.repo = repo
         self.request = request
         self.session = session
-        self.geocoder = geocoder
+        self.job_queue = job_queue
 
-    async def _geocode_snapshot_address(
-        self,
-        records_address: Optional[str],
-        service_address: Optional[str],
-        head_office_address: Optional[str],
-    ) -> Tuple[Optional[float], Optional[float]]:
+    async def _queue_geocoding(
+        self, snapshot: ComplianceReportOrganizationSnapshot
+    ) -> None:
         """
-        Geocode organization address using priority order:
-        1. records_address - Required to be in BC where records are maintained
-        2. service_address - BC postal address for service
-        3. head_office_address - Can be international, last resort
-
-        Returns:
-            Tuple of (latitude, longitude) or (None, None) if geocoding fails
+        Gives the snapshot the coordinates of an earlier snapshot with the
+        same addresses, or else queues a job to geocode them. The job is
+        shared by every snapshot with those addresses while it is queued,
+        and writes to all of them.
         """
-        addresses_to_try = [
-            (records_address, "records_address"),
-            (service_address, "service_address"),
-            (head_office_address, "head_office_address"),
-        ]
-
-        for address, address_type in addresses_to_try:
-            if address:
-                try:
-                    result = await self.geocoder.forward_geocode(address, use_fallback=True)
-                    if result.success and result.address:
-                        logger.info(
-                            f"Geocoded {address_type} successfully",
-                            latitude=result.address.latitude,
-                            longitude=result.address.longitude,
-                            source=result.source,
-                        )
-                        return result.address.latitude, result.address.longitude
-                    else:
-                        logger.debug(
-                            f"Geocoding failed for {address_type}",
-                            address=address[:50],
-                            error=result.error,
-                        )
-                except Exception as e:
-                    logger.warning(
-                        f"Geocoding error for {address_type}",
-                        address=address[:50],
-                        error=str(e),
-                    )
+        addresses = {field: getattr(snapshot, field) for field in ADDRESS_FIELDS}
+        if not any(addresses.values()):
+            return
+        coordinates = await self.repo.get_coordinates_for_addresses(*addresses.values())
+        if coordinates:
+            snapshot.latitude, snapshot.longitude = coordinates
+            return
 
-        logger.info("All geocoding attempts failed for organization snapshot")
-        return None, None
+        fingerprint = json.dumps(list(addresses.values()))
+        await self.job_queue.enqueue(
+            GEOCODE_JOB_TYPE,
+            addresses,
+            idempotency_key=hashlib.sha256(fingerprint.encode()).hexdigest(),
+        )
 
     async def get_by_compliance_report_id(self, compliance_report_id):
         snapshot = await self.repo.get_by_compliance_report_id(compliance_report_id)
@@ -108,17 +171,6 @@ class OrganizationSnapshotService:
                     prev_report_id
                 )
                 if prev_snapshot:
-                    # Reuse existing coordinates if available, otherwise geocode
-                    latitude = prev_snapshot.latitude
-                    longitude = prev_snapshot.longitude
-
-                    if latitude is None or longitude is None:
-                        latitude, longitude = await self._geocode_snapshot_address(
-                            prev_snapshot.records_address,
-                            prev_snapshot.service_address,
-                            prev_snapshot.head_office_address,
-                        )
-
                     org_snapshot = ComplianceReportOrganizationSnapshot(
                         name=prev_snapshot.name,
                         operating_name=prev_snapshot.operating_name,
@@ -127,10 +179,12 @@ class OrganizationSnapshotService:
                         head_office_address=prev_snapshot.head_office_address,
                         records_address=prev_snapshot.records_address,
                         service_address=prev_snapshot.service_address,
-                        latitude=latitude,
-                        longitude=longitude,
+                        latitude=prev_snapshot.latitude,
+                        longitude=prev_snapshot.longitude,
                         compliance_report_id=compliance_report_id,
                     )
+                    if org_snapshot.latitude is None or org_snapshot.longitude is None:
+                        await self._queue_geocoding(org_snapshot)
                     return await self.repo.save_snapshot(org_snapshot)
             except NoResultFound:
                 pass
@@ -170,13 +224,6 @@ class OrganizationSnapshotService:
 
         records_address = organization.records_address
 
-        # Geocode the address
-        latitude, longitude = await self._geocode_snapshot_address(
-            records_address,
-            service_address,
-            head_office_address,
-        )
-
         org_snapshot = ComplianceReportOrganizationSnapshot(
             name=organization.name,
             operating_name=organization.operating_name or organization.name,
@@ -185,10 +232,9 @@ class OrganizationSnapshotService:
             head_office_address=head_office_address,
             records_address=records_address,
             service_address=service_address,
-            latitude=latitude,
-            longitude=longitude,
             compliance_report_id=compliance_report_id,
         )
+        await self._queue_geocoding(org_snapshot)
 
         org_snapshot = await self.repo.save_snapshot(org_snapshot)
         return org_snapshot
@@ -196,7 +242,8 @@ class OrganizationSnapshotService:
     async def update(self, request_data, compliance_report_id):
         """
         Updates the snapshot fields for the specified compliance report using `request_data`.
-        Re-geocodes the address if any address field has changed.
+        Queues the address to be geocoded again if any address field has
+        changed.
         """
 
         snapshot = await self.repo.get_by_compliance_report_id(compliance_report_id)
@@ -223,12 +270,10 @@ class OrganizationSnapshotService:
         snapshot.is_edited = True
 
         # Re-geocode if address changed or coordinates are missing
-        if address_changed or snapshot.latitude is None or snapshot.longitude is None:
-            snapshot.latitude, snapshot.longitude = await self._geocode_snapshot_address(
-                request_data.records_address,
-                request_data.service_address,
-                request_data.head_office_address,
-            )
+        if address_changed:
+            snapshot.latitude = snapshot.longitude = None
+        if snapshot.latitude is None or snapshot.longitude is None:
+            await self._queue_geocoding(snapshot)
 
         updated_snapshot = await self.repo.save_snapshot(snapshot)
         return updated_snapshot
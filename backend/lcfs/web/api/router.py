@@ -38,6 +38,8 @@ from lcfs.web.api import (
     geocoder,
     charging_site,
     login_bg_image,
+    export_job,
+    background_job,
 )
 
 api_router = APIRouter()
@@ -133,3 +135,9 @@ api_router.include_router(
 api_router.include_router(
     login_bg_image.router, prefix="/login-bg-images", tags=["login_bg_image"]
 )
+api_router.include_router(
+    export_job.router, prefix="/export-jobs", tags=["export_jobs"]
+)
+api_router.include_router(
+    background_job.router, prefix="/jobs", tags=["background_jobs"]
+)
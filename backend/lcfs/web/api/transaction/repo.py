@@ -4,7 +4,7 @@ import zoneinfo
 import structlog
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from fastapi import Depends
 from sqlalchemy import (
@@ -40,6 +40,7 @@ from lcfs.db.models.compliance.ComplianceReportStatus import (
 )
 from lcfs.db.models.compliance.ComplianceReport import ComplianceReport
 from lcfs.db.models.compliance.CompliancePeriod import CompliancePeriod
+from lcfs.utils.spreadsheet_builder import EXPORT_STREAM_BATCH_SIZE
 from lcfs.web.core.decorators import repo_handler
 
 
@@ -79,6 +80,58 @@ class TransactionRepository:
         Returns:
             A tuple of (list of TransactionView instances, total count).
         """
+        query, query_conditions = await self._transactions_query(
+            conditions, sort_orders, organization_id
+        )
+
+        # Execute count query for total records matching the filter
+        count_query = select(func.count(TransactionView.transaction_id)).where(
+            and_(*query_conditions)
+        )
+        total_count_result = await self.db.execute(count_query)
+        total_count = total_count_result.scalar_one()
+
+        # Apply pagination
+        query = query.offset(offset).limit(limit)
+
+        # Execute the query
+        result = await self.db.execute(query)
+        transactions = result.scalars().all()
+
+        return transactions, total_count
+
+    async def stream_transactions(
+        self,
+        conditions: list,
+        sort_orders: list,
+        organization_id: Optional[int] = None,
+        batch_size: int = EXPORT_STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[TransactionView]:
+        """
+        Yields the transactions get_transactions_paginated would return,
+        reading through a server-side cursor so exports do not hold every
+        row in memory.
+        """
+        query, _ = await self._transactions_query(
+            conditions, sort_orders, organization_id
+        )
+        result = await self.db.stream_scalars(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            for transaction in partition:
+                yield transaction
+
+    async def _transactions_query(
+        self,
+        conditions: list,
+        sort_orders: list,
+        organization_id: Optional[int],
+    ):
+        """
+        Builds the filtered and sorted transaction query, applying the
+        visibility rules for the requesting organization or government.
+        """
         query_conditions = conditions
 
         # Base condition for transaction type "Transfer"
@@ -184,21 +237,7 @@ class TransactionRepository:
             else:
                 query = query.order_by(direction(getattr(TransactionView, order.field)))
 
-        # Execute count query for total records matching the filter
-        count_query = select(func.count(TransactionView.transaction_id)).where(
-            and_(*query_conditions)
-        )
-        total_count_result = await self.db.execute(count_query)
-        total_count = total_count_result.scalar_one()
-
-        # Apply pagination
-        query = query.offset(offset).limit(limit)
-
-        # Execute the query
-        result = await self.db.execute(query)
-        transactions = result.scalars().all()
-
-        return transactions, total_count
+        return query, query_conditions
 
     @repo_handler
     async def get_transaction_by_id(self, transaction_id: int) -> Transaction:
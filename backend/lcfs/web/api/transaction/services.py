@@ -2,9 +2,11 @@ import io
 import logging
 import zoneinfo
 from datetime import datetime, timezone
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Union
 from fastapi import Depends
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from lcfs.db.dependencies import get_db_session_factory
 from math import ceil
 from lcfs.db.models.transaction.Transaction import Transaction
 from sqlalchemy import or_, and_, cast, String
@@ -42,9 +44,12 @@ logger = logging.getLogger(__name__)
 
 class TransactionsService:
     def __init__(
-        self, repo: TransactionRepository = Depends(TransactionRepository)
+        self,
+        repo: TransactionRepository = Depends(TransactionRepository),
+        session_factory: Optional[async_sessionmaker] = Depends(get_db_session_factory),
     ) -> None:
         self.repo = repo
+        self.session_factory = session_factory
 
     @staticmethod
     def _to_pacific(dt):
@@ -233,88 +238,32 @@ class TransactionsService:
         if pagination.filters:
             self.apply_transaction_filters(pagination, conditions)
 
-        results = await self.repo.get_transactions_paginated(
-            0,
-            None,
-            conditions,
-            [SortOrder(field="update_date", direction="desc")],
-            organization_id,
-        )
+        sort_orders = [SortOrder(field="update_date", direction="desc")]
 
-        # Prepare data for the spreadsheet
-        data = []
-        for result in results[0]:
-            # Mask the status if it matches "Recommended"
-            masked_status = (
-                TransferStatusEnum.Submitted.name
-                if result.status == TransferStatusEnum.Recommended.value
-                else result.status
+        if export_format == "xls":
+            # xls cannot be streamed; build it in memory as before
+            results = await self.repo.get_transactions_paginated(
+                0, None, conditions, sort_orders, organization_id
             )
-
-            prefix = transaction_type_to_id_prefix_map.get(result.transaction_type)
-            if not prefix:
-                logger.warning(
-                    "No prefix configured for transaction type '%s'; using fallback",
-                    result.transaction_type,
-                )
-                prefix = (
-                    result.transaction_type[:2].upper()
-                    if result.transaction_type
-                    else "NA"
-                )
-
-            row_data = None
-            try:
-                row_data = [
-                    f"{prefix}{result.transaction_id}",
-                    result.compliance_period,
-                    result.transaction_type,
-                    result.from_organization,
-                    result.to_organization,
-                    result.quantity,
-                    result.price_per_unit,
-                    result.category,
-                    masked_status,
-                    (
-                        result.transaction_effective_date.strftime("%Y-%m-%d")
-                        if result.transaction_effective_date
-                        else None
-                    ),
-                    (
-                        self._to_pacific(result.recorded_date).strftime("%Y-%m-%d")
-                        if result.recorded_date
-                        else None
-                    ),
-                    (
-                        self._to_pacific(result.approved_date).strftime("%Y-%m-%d")
-                        if result.approved_date
-                        else None
-                    ),
-                    result.from_org_comment,
-                    result.to_org_comment,
-                    result.government_comment,
-                ]
-                data.append(row_data)
-            except Exception as exc:
-                logger.error(
-                    "Failed to append transaction %s to export data: %s | data=%s",
-                    result.transaction_id,
-                    exc,
-                    row_data if row_data is not None else vars(result),
-                )
-                continue
-
-        # Create a spreadsheet
-        builder = SpreadsheetBuilder(file_format=export_format)
-
-        builder.add_sheet(
-            sheet_name=LCFS_Constants.TRANSACTIONS_EXPORT_SHEETNAME,
-            columns=LCFS_Constants.TRANSACTIONS_EXPORT_COLUMNS,
-            rows=data,
-            styles={"bold_headers": True},
-        )
-
-        file_content = builder.build_spreadsheet()
+            builder = SpreadsheetBuilder(file_format=export_format)
+            builder.add_sheet(
+                sheet_name=LCFS_Constants.TRANSACTIONS_EXPORT_SHEETNAME,
+                columns=LCFS_Constants.TRANSACTIONS_EXPORT_COLUMNS,
+                rows=[
+                    row for row in map(self._export_row, results[0]) if row is not None
+                ],
+                styles={"bold_headers": True},
+            )
+            content = io.BytesIO(builder.build_spreadsheet())
+        else:
+            builder = SpreadsheetBuilder(file_format=export_format, streaming=True)
+            builder.add_sheet(
+                sheet_name=LCFS_Constants.TRANSACTIONS_EXPORT_SHEETNAME,
+                columns=LCFS_Constants.TRANSACTIONS_EXPORT_COLUMNS,
+                rows=self._stream_export_rows(conditions, sort_orders, organization_id),
+                styles={"bold_headers": True},
+            )
+            content = builder.stream()
 
         # Get the current date in YYYY-MM-DD format
         current_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
@@ -323,7 +272,94 @@ class TransactionsService:
         headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
 
         return StreamingResponse(
-            io.BytesIO(file_content),
+            content,
             media_type=FILE_MEDIA_TYPE[export_format.upper()].value,
             headers=headers,
         )
+
+    async def _stream_export_rows(
+        self, conditions: list, sort_orders: list, organization_id: int | None
+    ):
+        """
+        Read transactions through a server-side cursor while the response is
+        sent. The request session is closed by then, so a session of our own
+        is used when the app provides a factory.
+        """
+        if self.session_factory is None:
+            transactions = self.repo.stream_transactions(
+                conditions, sort_orders, organization_id
+            )
+            async for result in transactions:
+                row = self._export_row(result)
+                if row is not None:
+                    yield row
+            return
+
+        async with self.session_factory() as session:
+            transactions = TransactionRepository(session).stream_transactions(
+                conditions, sort_orders, organization_id
+            )
+            async for result in transactions:
+                row = self._export_row(result)
+                if row is not None:
+                    yield row
+
+    def _export_row(self, result) -> List | None:
+        """Spreadsheet row for a transaction, or None if it cannot be formatted."""
+        # Mask the status if it matches "Recommended"
+        masked_status = (
+            TransferStatusEnum.Submitted.name
+            if result.status == TransferStatusEnum.Recommended.value
+            else result.status
+        )
+
+        prefix = transaction_type_to_id_prefix_map.get(result.transaction_type)
+        if not prefix:
+            logger.warning(
+                "No prefix configured for transaction type '%s'; using fallback",
+                result.transaction_type,
+            )
+            prefix = (
+                result.transaction_type[:2].upper() if result.transaction_type else "NA"
+            )
+
+        row_data = None
+        try:
+            row_data = [
+                f"{prefix}{result.transaction_id}",
+                result.compliance_period,
+                result.transaction_type,
+                result.from_organization,
+                result.to_organization,
+                result.quantity,
+                result.price_per_unit,
+                result.category,
+                masked_status,
+                (
+                    result.transaction_effective_date.strftime("%Y-%m-%d")
+                    if result.transaction_effective_date
+                    else None
+                ),
+                (
+                    self._to_pacific(result.recorded_date).strftime("%Y-%m-%d")
+                    if result.recorded_date
+                    else None
+                ),
+                (
+                    self._to_pacific(result.approved_date).strftime("%Y-%m-%d")
+                    if result.approved_date
+                    else None
+                ),
+                result.from_org_comment,
+                result.to_org_comment,
+                result.government_comment,
+            ]
+        except Exception as exc:
+            logger.error(
+                "Failed to append transaction %s to export data: %s | data=%s",
+                result.transaction_id,
+                exc,
+                row_data if row_data is not None else vars(result),
+            )
+            return None
+        return row_data
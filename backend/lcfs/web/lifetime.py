@@ -9,8 +9,19 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
+from lcfs.services.ches.client import close_ches_client
+from lcfs.services.clamav.clamd import close_clamd_pool
+from lcfs.services.job_queue.runtime import (
+    shutdown_embedded_worker,
+    start_embedded_worker,
+)
 from lcfs.services.redis.lifetime import init_redis, shutdown_redis
+from lcfs.services.redis.notification_events import close_notification_event_hub
+from lcfs.services.redis.unread_counts import wait_for_unread_updates
+from lcfs.services.rendering.pool import shutdown_render_pool
+from lcfs.services.s3.transfer import shutdown_s3_executor
 from lcfs.settings import settings
+from lcfs.web.api.email.services import compile_templates
 
 
 def _setup_db(app: FastAPI) -> None:  # pragma: no cover
@@ -67,9 +78,15 @@ def register_startup_event(
         # Initialize FastAPI cache with the Redis client
         FastAPICache.init(RedisBackend(app.state.redis_client), prefix="lcfs")
 
+        # Compile the email templates before the first notification
+        compile_templates()
+
         # Start the scheduler
         start_scheduler(app)
 
+        # Start running queued background jobs in this process
+        start_embedded_worker()
+
     return _startup
 
 
@@ -87,8 +104,22 @@ def register_shutdown_event(
     async def _shutdown() -> None:  # noqa: WPS430
         await app.state.db_engine.dispose()
 
+        # Finish updating unread counts for sessions that already committed
+        await wait_for_unread_updates()
+        # End the notification events subscription
+        await close_notification_event_hub()
         await shutdown_redis(app)
+        # Close pooled clamd sessions
+        await close_clamd_pool()
+        # Close pooled CHES connections
+        await close_ches_client()
         # Shutdown the scheduler
         shutdown_scheduler()
+        # Stop document render worker processes
+        shutdown_render_pool()
+        # Stop the S3 transfer threads
+        shutdown_s3_executor()
+        # Stop the embedded job worker; unfinished jobs are retried elsewhere
+        shutdown_embedded_worker()
 
     return _shutdown
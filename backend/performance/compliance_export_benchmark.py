@@ -0,0 +1,111 @@
+"""
+Measure compliance report workbook rendering latency and event-loop lag.
+
+Renders a synthetic report (5k fuel supply rows by default) either on the
+event loop, as the exporter used to, or through the render pool, while a
+ticker coroutine records how late the loop wakes it up.
+
+Run from the backend directory:
+    python performance/compliance_export_benchmark.py [rows]
+"""
+
+import asyncio
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lcfs.web.application  # noqa: E402,F401  (load API packages in app order)
+from lcfs.services.rendering import pool  # noqa: E402
+from lcfs.settings import settings  # noqa: E402
+from lcfs.web.api.compliance_report.schema import (  # noqa: E402
+    FUEL_SUPPLY_COLUMNS,
+    FUEL_SUPPLY_SHEET,
+)
+from lcfs.web.api.compliance_report.sheet_exporters import (  # noqa: E402
+    ExportSheet,
+    render_compliance_report_workbook,
+)
+
+TICK_SECONDS = 0.005
+
+
+def build_sheets(row_count):
+    headers = [col.label for col in FUEL_SUPPLY_COLUMNS]
+    rows = [
+        [
+            1000 + i,
+            "Biodiesel",
+            "Diesel",
+            "Any",
+            "Fuel code - section 19 (b) (i)",
+            f"BCLCF{i % 300}.1",
+            "Yes",
+            "",
+            10_000 + i,
+            "L",
+            Decimal("79.28"),
+            Decimal("12.14"),
+            None,
+            Decimal("35.40"),
+            Decimal("1.0"),
+            Decimal("354000.0"),
+        ][: len(headers)]
+        for i in range(row_count)
+    ]
+    total_row = [sum(r[0] for r in rows), "Total"] + [None] * (len(headers) - 2)
+    data = [headers] + rows + [[None] * len(headers), total_row]
+    return [ExportSheet(FUEL_SUPPLY_SHEET, data)]
+
+
+async def measure(render, sheets):
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + TICK_SECONDS
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK_SECONDS * 2)
+    start = time.perf_counter()
+    content = await render(sheets)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+    return elapsed, max(lags, default=0.0), len(content)
+
+
+async def render_on_loop(sheets):
+    return render_compliance_report_workbook(None, sheets)
+
+
+async def render_in_pool(sheets):
+    return await pool.run_in_render_pool(
+        render_compliance_report_workbook, None, sheets
+    )
+
+
+async def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    sheets = build_sheets(row_count)
+
+    settings.render_pool_workers = max(settings.render_pool_workers, 1)
+    # Start and warm the pool so process start-up is not part of the numbers.
+    await render_in_pool(build_sheets(10))
+
+    print(f"{row_count} rows")
+    print(f"{'mode':>10} {'seconds':>9} {'max loop lag ms':>16} {'size KiB':>9}")
+    for mode, render in (("on loop", render_on_loop), ("pool", render_in_pool)):
+        elapsed, lag, size = await measure(render, sheets)
+        print(f"{mode:>10} {elapsed:>9.2f} {lag * 1000:>16.1f} {size / 2**10:>9.0f}")
+
+    pool.shutdown_render_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
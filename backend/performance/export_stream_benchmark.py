@@ -0,0 +1,99 @@
+"""
+Compare time-to-first-byte and peak memory of the in-memory ledger export
+path with SpreadsheetBuilder.stream() fed from an async row source, the way
+the credit ledger and transaction exports read a server-side cursor.
+
+Run from the backend directory:
+    python performance/export_stream_benchmark.py [row counts...]
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lcfs.web.application  # noqa: E402,F401  (load API packages in app order)
+from lcfs.utils.constants import LCFS_Constants  # noqa: E402
+from lcfs.utils.spreadsheet_builder import (  # noqa: E402
+    EXPORT_STREAM_BATCH_SIZE,
+    SpreadsheetBuilder,
+)
+
+DEFAULT_ROW_COUNTS = [10_000, 100_000]
+
+
+def ledger_row(i):
+    return [2024, i * 3, i % 500, "Compliance Report – Original", "2024-03-31"]
+
+
+async def cursor_rows(count):
+    for i in range(count):
+        if i % EXPORT_STREAM_BATCH_SIZE == 0:
+            await asyncio.sleep(0)  # a round trip for the next partition
+        yield ledger_row(i)
+
+
+async def in_memory(row_count, file_format):
+    rows = [ledger_row(i) for i in range(row_count)]
+    builder = SpreadsheetBuilder(file_format=file_format)
+    builder.add_sheet(
+        sheet_name="Ledger",
+        columns=LCFS_Constants.CREDIT_LEDGER_EXPORT_COLUMNS,
+        rows=rows,
+        styles={"bold_headers": True},
+    )
+    yield builder.build_spreadsheet()
+
+
+async def streamed(row_count, file_format):
+    builder = SpreadsheetBuilder(file_format=file_format, streaming=True)
+    builder.add_sheet(
+        sheet_name="Ledger",
+        columns=LCFS_Constants.CREDIT_LEDGER_EXPORT_COLUMNS,
+        rows=cursor_rows(row_count),
+        styles={"bold_headers": True},
+    )
+    async for chunk in builder.stream():
+        yield chunk
+
+
+async def consume(body):
+    start = time.perf_counter()
+    first_byte = None
+    async for _ in body:
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+    return first_byte, time.perf_counter() - start
+
+
+async def run(row_count, file_format, path):
+    ttfb, total = await consume(path(row_count, file_format))
+
+    tracemalloc.start()
+    await consume(path(row_count, file_format))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ttfb, total, peak
+
+
+async def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    print(
+        f"{'rows':>8} {'format':>6} {'mode':>10} "
+        f"{'TTFB s':>8} {'total s':>8} {'peak MiB':>9}"
+    )
+    for row_count in row_counts:
+        for file_format in ("csv", "xlsx"):
+            for mode, path in (("in-memory", in_memory), ("streaming", streamed)):
+                ttfb, total, peak = await run(row_count, file_format, path)
+                print(
+                    f"{row_count:>8} {file_format:>6} {mode:>10} "
+                    f"{ttfb:>8.2f} {total:>8.2f} {peak / 2**20:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
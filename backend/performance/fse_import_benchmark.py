@@ -0,0 +1,159 @@
+"""
+Compare FSE import throughput of the per-row service path with the chunked
+bulk-insert pipeline used by the spreadsheet importer.
+
+Both paths write to the configured database inside a transaction that is
+rolled back, against a throwaway organization and compliance report.
+
+Run from the backend directory with a migrated database:
+    python performance/fse_import_benchmark.py [rows]
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lcfs.web.application  # noqa: E402,F401  (load API packages in app order)
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from lcfs.db.dependencies import db_url  # noqa: E402
+from lcfs.db.models import Organization  # noqa: E402
+from lcfs.db.models.compliance import (  # noqa: E402
+    CompliancePeriod,
+    ComplianceReport,
+    ComplianceReportStatus,
+)
+from lcfs.web.api.compliance_report.repo import ComplianceReportRepository  # noqa: E402
+from lcfs.web.api.final_supply_equipment.importer import (  # noqa: E402
+    IMPORT_CHUNK_SIZE,
+    _import_chunk,
+    _ImportLookups,
+)
+from lcfs.web.api.final_supply_equipment.repo import (  # noqa: E402
+    FinalSupplyEquipmentRepository,
+)
+from lcfs.web.api.final_supply_equipment.schema import (  # noqa: E402
+    FinalSupplyEquipmentCreateSchema,
+)
+from lcfs.web.api.final_supply_equipment.services import (  # noqa: E402
+    FinalSupplyEquipmentServices,
+)
+from lcfs.web.api.fuel_supply.repo import FuelSupplyRepository  # noqa: E402
+from lcfs.web.api.organizations.repo import OrganizationsRepository  # noqa: E402
+
+DEFAULT_ROWS = 3000
+POSTAL_CODES = [f"V{d}A {d}B{d}" for d in range(10)]
+
+
+async def setup(session, run):
+    organization = Organization(
+        name=f"FSE benchmark {run}", organization_code=f"B{run}"
+    )
+    session.add(organization)
+    period = await session.scalar(select(CompliancePeriod).limit(1))
+    report_status = await session.scalar(select(ComplianceReportStatus).limit(1))
+    await session.flush()
+    report = ComplianceReport(
+        compliance_period_id=period.compliance_period_id,
+        organization_id=organization.organization_id,
+        current_status_id=report_status.compliance_report_status_id,
+        compliance_report_group_uuid=str(uuid.uuid4()),
+        version=0,
+    )
+    session.add(report)
+    await session.flush()
+    return organization, report
+
+
+def build_rows(fse_repo_data, report, count):
+    use_type, user_type, level = fse_repo_data
+    return [
+        (
+            i + 2,
+            FinalSupplyEquipmentCreateSchema(
+                compliance_report_id=report.compliance_report_id,
+                organization_name="Benchmark",
+                supply_from_date=date(2024, 1, 1),
+                supply_to_date=date(2024, 12, 31),
+                serial_nbr=f"SN{i}",
+                manufacturer="Maker",
+                level_of_equipment=level.name,
+                intended_use_types=[use_type.type],
+                intended_user_types=[user_type.type_name],
+                street_address=f"{i} Main St",
+                city="Victoria",
+                postal_code=POSTAL_CODES[i % len(POSTAL_CODES)],
+                latitude=48.4,
+                longitude=-123.3,
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+async def run_path(engine, row_count, mode):
+    async with AsyncSession(engine) as session:
+        async with session.begin():
+            organization, report = await setup(session, mode[:4].upper())
+            fse_repo = FinalSupplyEquipmentRepository(session)
+            use_type = (await fse_repo.get_intended_use_types())[0]
+            user_type = (await fse_repo.get_intended_user_types())[0]
+            levels = await fse_repo.get_levels_of_equipment()
+            rows = build_rows((use_type, user_type, levels[0]), report, row_count)
+
+            start = time.perf_counter()
+            if mode == "per-row":
+                org_repo = OrganizationsRepository(session)
+                service = FinalSupplyEquipmentServices(
+                    repo=fse_repo,
+                    compliance_report_repo=ComplianceReportRepository(
+                        session, FuelSupplyRepository(session)
+                    ),
+                    organization_repo=org_repo,
+                )
+                for _, fse_data in rows:
+                    await service.create_final_supply_equipment(
+                        fse_data, organization.organization_id
+                    )
+            else:
+                lookups = _ImportLookups(
+                    use_type_ids={use_type.type: use_type.end_use_type_id},
+                    user_type_ids={user_type.type_name: user_type.end_user_type_id},
+                    level_ids={
+                        level.name: level.level_of_equipment_id for level in levels
+                    },
+                    organization_code=organization.organization_code,
+                    username="benchmark",
+                )
+                for i in range(0, row_count, IMPORT_CHUNK_SIZE):
+                    created, errors = await _import_chunk(
+                        session, fse_repo, lookups, rows[i : i + IMPORT_CHUNK_SIZE]
+                    )
+                    assert not errors, errors[:3]
+            elapsed = time.perf_counter() - start
+            await session.rollback()
+    return elapsed
+
+
+async def main(row_count):
+    engine = create_async_engine(db_url)
+    try:
+        print(f"{'mode':>8} {'rows':>6} {'seconds':>8} {'rows/s':>8}")
+        for mode in ("per-row", "chunked"):
+            elapsed = await run_path(engine, row_count, mode)
+            print(
+                f"{mode:>8} {row_count:>6} {elapsed:>8.2f} {row_count / elapsed:>8.0f}"
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    asyncio.run(main(rows))
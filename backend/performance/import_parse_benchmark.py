@@ -0,0 +1,96 @@
+"""
+Compare parsing an uploaded import sheet with a full openpyxl load against
+the read-only streaming mode used by the spreadsheet importers.
+
+For each row count a synthetic FSE-shaped sheet is written in memory, then
+read back both ways, reporting time to the first row, total time and peak
+Python memory.
+
+Run from the backend directory:
+    python performance/import_parse_benchmark.py [row counts...]
+"""
+
+import io
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from openpyxl import Workbook, load_workbook
+
+DEFAULT_ROW_COUNTS = [10_000, 50_000]
+HEADERS = [
+    "Organization",
+    "Supply from date",
+    "Supply to date",
+    "Serial #",
+    "Manufacturer",
+    "Model",
+    "Level of equipment",
+    "Intended use",
+    "Street address",
+    "City",
+    "Postal code",
+    "Latitude",
+    "Longitude",
+]
+
+
+def build_sheet(row_count):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("FSE")
+    sheet.append(HEADERS)
+    for i in range(row_count):
+        sheet.append(
+            [
+                "Benchmark",
+                date(2024, 1, 1),
+                date(2024, 12, 31),
+                f"SN{i}",
+                "Maker",
+                f"Model {i % 20}",
+                "Level 2 - Residential",
+                "Light duty motor vehicles",
+                f"{i} Main St",
+                "Victoria",
+                "V8V 1A1",
+                48.4,
+                -123.3,
+            ]
+        )
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer
+
+
+def measure(buffer, read_only):
+    buffer.seek(0)
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_row = None
+    workbook = load_workbook(buffer, read_only=read_only, data_only=True)
+    for _ in workbook["FSE"].iter_rows(min_row=2, values_only=True):
+        if first_row is None:
+            first_row = time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    workbook.close()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_row, elapsed, peak
+
+
+def main(row_counts):
+    print(f"{'mode':>9} {'rows':>7} {'first row s':>11} {'total s':>8} {'peak MB':>8}")
+    for row_count in row_counts:
+        buffer = build_sheet(row_count)
+        for mode, read_only in (("full", False), ("streaming", True)):
+            first_row, elapsed, peak = measure(buffer, read_only)
+            print(
+                f"{mode:>9} {row_count:>7} {first_row:>11.2f} {elapsed:>8.2f} "
+                f"{peak / 1024 / 1024:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    main(counts)
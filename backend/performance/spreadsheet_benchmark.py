@@ -0,0 +1,80 @@
+"""
+Compare the in-memory and streaming xlsx writers of SpreadsheetBuilder.
+
+Run from the backend directory:
+    python performance/spreadsheet_benchmark.py [row counts...]
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryFile
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lcfs.utils.spreadsheet_builder import (  # noqa: E402
+    SpreadsheetBuilder,
+    SpreadsheetColumn,
+)
+
+COLUMNS = [
+    SpreadsheetColumn("ID", "int"),
+    SpreadsheetColumn("Compliance period", "text"),
+    SpreadsheetColumn("Organization name", "text"),
+    SpreadsheetColumn("Number of units", "int"),
+    SpreadsheetColumn("Value per unit", "float"),
+    SpreadsheetColumn("Transaction date", "date"),
+]
+DEFAULT_ROW_COUNTS = [1_000, 10_000, 100_000]
+
+
+def generate_rows(count):
+    for i in range(count):
+        yield [i, "2024", f"Organization {i % 50}", i * 10, 12.5, date(2024, 1, 1)]
+
+
+def build(row_count, streaming):
+    builder = SpreadsheetBuilder(file_format="xlsx", streaming=streaming)
+    rows = generate_rows(row_count)
+    builder.add_sheet(
+        sheet_name="Benchmark",
+        columns=COLUMNS,
+        rows=rows if streaming else list(rows),
+        styles={"bold_headers": True},
+    )
+    with TemporaryFile() as output:
+        builder.write_to(output)
+        return output.tell()
+
+
+def run(row_count, streaming):
+    # Time and memory are measured in separate passes because tracemalloc
+    # slows allocation-heavy code down considerably.
+    start = time.perf_counter()
+    size = build(row_count, streaming)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    build(row_count, streaming)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    print(f"{'rows':>8} {'mode':>10} {'seconds':>9} {'peak MiB':>9} {'size KiB':>9}")
+    for row_count in row_counts:
+        for streaming in (False, True):
+            elapsed, peak, size = run(row_count, streaming)
+            mode = "streaming" if streaming else "in-memory"
+            print(
+                f"{row_count:>8} {mode:>10} {elapsed:>9.2f} "
+                f"{peak / 2**20:>9.1f} {size / 2**10:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
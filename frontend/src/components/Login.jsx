@@ -14,6 +14,9 @@ import { useTranslation } from 'react-i18next'
 import { useLocation, useNavigate } from 'react-router-dom'
 import { ROUTES } from '@/routes/routes'
 
+// Widths the API keeps WebP copies of login backgrounds at
+const BG_IMAGE_WIDTHS = [1280, 1920, 2560]
+
 export const Login = () => {
   const { t } = useTranslation()
   const { keycloak } = useKeycloak()
@@ -31,7 +34,13 @@ export const Login = () => {
       .then((res) => (res.ok ? res.json() : null))
       .then((data) => {
         if (data?.loginBgImageId) {
-          const streamUrl = `${CONFIG.API_BASE}${apiRoutes.loginBgImageStream.replace(':imageId', data.loginBgImageId)}`
+          // Ask for the smallest pre-sized copy covering the screen; keeping
+          // to these widths lets browsers and proxies share cached copies
+          const screenWidth = window.innerWidth * (window.devicePixelRatio || 1)
+          const width =
+            BG_IMAGE_WIDTHS.find((w) => w >= screenWidth) ??
+            BG_IMAGE_WIDTHS[BG_IMAGE_WIDTHS.length - 1]
+          const streamUrl = `${CONFIG.API_BASE}${apiRoutes.loginBgImageStream.replace(':imageId', data.loginBgImageId)}?width=${width}`
           setBgUrl(streamUrl)
           const creditParts = [data.displayName, data.caption].filter(Boolean)
           setCredits(creditParts.length ? creditParts.join(' — ') : null)